@@ -14,8 +14,12 @@
 #    under the License.
 
 
+from rally.common.plugin import plugin
 from rally.common import utils
+from rally import osclients
 from rally.task import atomic
+from rally.task import context
+from rally.task import runner
 from rally.task import scenario
 
 
@@ -48,3 +52,54 @@ class CalculateAtomic(scenario.Scenario, utils.RandomNameGeneratorMixin):
             for _ in range(number_of_atomics):
                 with atomic.ActionTimer(atomic_inst, tmp_name):
                     pass
+
+
+@scenario.configure(name="RallyProfile.prepare_iteration_context")
+class PrepareIterationContext(scenario.Scenario):
+
+    def run(self, number_of_users, number_of_iterations):
+        """Prepare contexts of iterations from a big users context.
+
+        :param number_of_users: int number of users in the context
+        :param number_of_iterations: int number of iteration contexts to
+                                     prepare
+        """
+        users = [{"id": "user_%s" % i, "tenant_id": "tenant_%s" % (i % 100),
+                  "credential": {"username": "user_%s" % i,
+                                 "password": "password"},
+                  "secgroup": {"id": "secgroup_%s" % i}}
+                 for i in range(number_of_users)]
+        tenants = dict(("tenant_%s" % i,
+                        {"id": "tenant_%s" % i,
+                         "users": [u for u in users
+                                   if u["tenant_id"] == "tenant_%s" % i],
+                         "networks": [{"id": "net_%s" % i,
+                                       "subnets": ["subnet_%s" % i]}]})
+                       for i in range(100))
+        context = utils.LockedDict({"users": users, "tenants": tenants,
+                                    "user_choice_method": "random"})
+
+        with atomic.ActionTimer(self, "prepare_%s_contexts_of_%s_users"
+                                % (number_of_iterations, number_of_users)):
+            for i in range(number_of_iterations):
+                runner._get_scenario_context(i, context)
+
+
+@scenario.configure(name="RallyProfile.lookup_plugins")
+class LookupPlugins(scenario.Scenario):
+
+    def run(self, number_of_lookups):
+        """Look up plugins the way it is done while a task is running.
+
+        Lookups are done while all the plugins are loaded: clients are
+        looked up by OpenStack clients manager, contexts are looked up
+        by context manager and charts are looked up by task reports.
+
+        :param number_of_lookups: int number of lookups of each plugin
+        """
+        with atomic.ActionTimer(self, "lookup_%s_plugins"
+                                % number_of_lookups):
+            for i in range(number_of_lookups):
+                osclients.OSClient.get("nova")
+                context.Context.get_all(name="users", allow_hidden=True)
+                plugin.Plugin.get("StatsTable")
@@ -1,2 +0,0 @@
-# FIXME(andreykurilin): implement Rally-as-a-Service
-pass
@@ -0,0 +1,273 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Rally agent: HTTP daemon which generates load for distributed runners.
+
+An agent registers itself in the workers table by its address
+("<address>:<port>") and keeps the registration live by heartbeats, so
+the distributed runner (see rally.plugins.common.runners.distributed) can
+find live agents and split the load of a workload between them.
+
+The runner sends a part of the load to an agent as a "POST /run" request
+and the agent runs it with a regular runner. Results and events of the
+runner are streamed back in the response as json objects, one per line,
+until {"finished": true} or {"error": "..."} is sent. Empty lines are sent
+when there is nothing to send for a while, so the runner can detect lost
+agents. A run is aborted by a "POST /abort" request.
+
+Agents use the same database as Rally engines and should be accessible
+only by Rally engines, since anyone who can send requests to an agent
+can run scenarios with credentials from these requests. If the secret
+is set in the [agent] section of the config, requests without it (in the
+X-Rally-Agent-Secret header) are rejected.
+"""
+
+import json
+import signal
+import sys
+import threading
+import time
+
+from oslo_config import cfg
+
+from rally.aas import agent_utils
+from rally.aas import service
+from rally import api
+from rally.common import db
+from rally.common.i18n import _, _LE, _LI, _LW
+from rally.common import logging
+from rally import exceptions
+from rally import plugins
+from rally.task import runner
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+
+def _respond(start_response, status, body):
+    body = (json.dumps(body) + "\n").encode("utf-8")
+    start_response(status, [("Content-Type", "application/json"),
+                            ("Content-Length", str(len(body)))])
+    return [body]
+
+
+class Agent(object):
+    """WSGI application which runs parts of loads of distributed runners."""
+
+    def __init__(self, heartbeat_interval=5, secret=None):
+        self.heartbeat_interval = heartbeat_interval
+        self.secret = secret
+        self._runners = {}
+        self._aborted = set()
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def abort(self, run):
+        """Abort the run."""
+        with self._lock:
+            runner_obj = self._runners.get(run)
+            if runner_obj is None:
+                # the request to abort can outrun the request to run
+                self._aborted.add(run)
+        if runner_obj is not None:
+            runner_obj.abort()
+
+    def stop(self):
+        """Abort all the runs, they are finished with an error."""
+        with self._lock:
+            self._stopped = True
+            runners = list(self._runners.values())
+        for runner_obj in runners:
+            runner_obj.abort()
+
+    def run(self, run, name, config, context, args):
+        """Start the part of the load.
+
+        :param run: ID of the run which is used to abort it
+        :param name: name of the scenario
+        :param config: config of the runner
+        :param context: context of the workload
+        :param args: arguments of the scenario
+        :returns: generator of lines with results and events of the runner
+        """
+        runner_obj = runner.ScenarioRunner.get(config["type"])(
+            context["task"], config)
+        with self._lock:
+            self._runners[run] = runner_obj
+            if run in self._aborted:
+                self._aborted.discard(run)
+                runner_obj.abort()
+
+        errors = []
+
+        def run_load():
+            try:
+                runner_obj.run(name, context, args)
+            except Exception as e:
+                LOG.exception(e)
+                errors.append("%s: %s" % (e.__class__.__name__, e))
+
+        thread = threading.Thread(target=run_load)
+        thread.start()
+        return self._stream(run, runner_obj, thread, errors)
+
+    def _stream(self, run, runner_obj, thread, errors):
+        sent_at = time.time()
+        try:
+            while True:
+                # the runner is checked first, so everything it has sent
+                # is taken before the stream is finished
+                running = thread.is_alive()
+                messages = []
+                while runner_obj.event_queue:
+                    messages.append(
+                        {"event": runner_obj.event_queue.popleft()})
+                while runner_obj.result_queue:
+                    messages.append(
+                        {"results": runner_obj.result_queue.popleft()})
+
+                if messages:
+                    sent_at = time.time()
+                    yield "".join(json.dumps(m) + "\n"
+                                  for m in messages).encode("utf-8")
+                elif not running:
+                    break
+                else:
+                    if time.time() - sent_at > self.heartbeat_interval:
+                        sent_at = time.time()
+                        yield b"\n"
+                    runner_obj.result_queue.wait(0.1)
+
+            if self._stopped:
+                errors.append(_("The agent is stopped."))
+            if errors:
+                yield (json.dumps({"error": errors[0]}) + "\n").encode("utf-8")
+            else:
+                yield (json.dumps({"finished": True}) + "\n").encode("utf-8")
+        finally:
+            if thread.is_alive():
+                # nobody waits for the results anymore
+                runner_obj.abort()
+            with self._lock:
+                self._runners.pop(run, None)
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if (environ.get("REQUEST_METHOD") != "POST" or
+                path not in ("/run", "/abort")):
+            return _respond(start_response, "404 Not Found",
+                            {"error": _("Unknown request %s") % path})
+        if not agent_utils.check_secret(
+                environ.get("HTTP_X_RALLY_AGENT_SECRET"), self.secret):
+            LOG.warning(_LW("Rejected %(path)s from %(addr)s: wrong secret")
+                        % {"path": path,
+                           "addr": environ.get("REMOTE_ADDR")})
+            return _respond(start_response, "403 Forbidden",
+                            {"error": _("Wrong secret of the agent.")})
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            kwargs = agent_utils.loads(
+                environ["wsgi.input"].read(length).decode("utf-8"))
+            if path == "/abort":
+                self.abort(kwargs["run"])
+                return _respond(start_response, "200 OK", {})
+            lines = self.run(**kwargs)
+        except (ValueError, KeyError, TypeError,
+                exceptions.RallyException) as e:
+            LOG.warning(_LW("Failed to process %(path)s: %(error)s")
+                        % {"path": path, "error": e})
+            return _respond(start_response, "400 Bad Request",
+                            {"error": "%s: %s" % (e.__class__.__name__, e)})
+        start_response("200 OK", [("Content-Type", "application/json")])
+        return lines
+
+
+class Heartbeat(threading.Thread):
+    """Registers the agent as a worker and keeps the registration live."""
+
+    def __init__(self, hostname, interval):
+        super(Heartbeat, self).__init__()
+        self.daemon = True
+        self.hostname = hostname
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def start(self):
+        try:
+            db.register_worker({"hostname": self.hostname})
+        except exceptions.WorkerAlreadyRegistered:
+            # NOTE: the agent listens on this address, so the record is
+            # left by an agent which was not stopped properly
+            db.update_worker(self.hostname)
+        super(Heartbeat, self).start()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                try:
+                    db.update_worker(self.hostname)
+                except exceptions.WorkerNotFound:
+                    db.register_worker({"hostname": self.hostname})
+            except Exception as e:
+                LOG.warning(_LW("Failed to send a heartbeat: %s") % e)
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+        try:
+            db.unregister_worker(self.hostname)
+        except exceptions.WorkerNotFound:
+            pass
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt()
+
+
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    try:
+        api.API(config_args=argv[1:])
+    except exceptions.RallyException as e:
+        LOG.error(_LE("Failed to start Rally agent: %s") % e)
+        return 2
+
+    plugins.load()
+    if not CONF.agent.secret:
+        LOG.warning(_LW("The secret of the agent is not set, so requests "
+                        "to the agent are not authenticated."))
+    app = Agent(heartbeat_interval=CONF.agent.heartbeat_interval,
+                secret=CONF.agent.secret)
+    server = service.make_server(app, CONF.agent.host, CONF.agent.port)
+    hostname = "%s:%s" % (CONF.agent.address or CONF.agent.host,
+                          server.server_port)
+    heartbeat = Heartbeat(hostname, CONF.agent.heartbeat_interval)
+    heartbeat.start()
+    signal.signal(signal.SIGTERM, _interrupt)
+    LOG.info(_LI("Rally agent %s is started.") % hostname)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        heartbeat.stop()
+        app.stop()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Options and helpers shared by Rally agents and Rally engines.
+
+This module does not depend on Rally API, so the distributed runner can
+use it without importing the agent daemon.
+"""
+
+import datetime as dt
+import hmac
+import json
+
+from oslo_config import cfg
+from oslo_utils import timeutils
+
+from rally.common import db
+from rally.common import objects
+from rally.deployment import credential
+
+
+CONF = cfg.CONF
+
+AGENT_OPTS = [
+    cfg.StrOpt("host", default="127.0.0.1",
+               help="Address to listen on."),
+    cfg.PortOpt("port", default=0,
+                help="Port to listen on, a free port is chosen if it is 0."),
+    cfg.StrOpt("address",
+               help="Address by which Rally engines connect to the agent. "
+                    "The address to listen on is used if it is not set."),
+    cfg.IntOpt("heartbeat_interval", default=5, min=1,
+               help="Interval in seconds between heartbeats of the agent."),
+    cfg.IntOpt("heartbeat_timeout", default=30, min=1,
+               help="Agents which have not sent a heartbeat for this number "
+                    "of seconds are not used to generate load."),
+    cfg.StrOpt("secret", secret=True,
+               help="Secret shared by agents and Rally engines. Agents "
+                    "reject requests without it, so it should be set if "
+                    "agents are accessible not only by Rally engines.")
+]
+
+SECRET_HEADER = "X-Rally-Agent-Secret"
+
+
+def get_headers():
+    """Return headers of requests to agents."""
+    headers = {"Content-Type": "application/json"}
+    if CONF.agent.secret:
+        headers[SECRET_HEADER] = CONF.agent.secret
+    return headers
+
+
+def check_secret(secret, expected):
+    """Check the secret of a request to an agent or Rally service.
+
+    :param secret: the secret from the request or None
+    :param expected: the secret of the agent or the service, any request
+        is accepted if it is not set
+    """
+    if not expected:
+        return True
+    # the comparison takes the same time for any secret of the same
+    # length, so the secret can not be guessed by timing
+    return hmac.compare_digest((secret or "").encode("utf-8"),
+                               expected.encode("utf-8"))
+
+
+def _encode(obj):
+    if isinstance(obj, objects.Task):
+        return {"__rally_task__": obj["uuid"]}
+    if isinstance(obj, credential.Credential):
+        return {"__rally_credential__": obj.get_namespace(),
+                "value": obj.to_dict()}
+    raise TypeError("%r can not be sent to Rally agent" % obj)
+
+
+def _decode(obj):
+    if "__rally_task__" in obj:
+        return objects.Task.get(obj["__rally_task__"])
+    if "__rally_credential__" in obj:
+        return credential.get(obj["__rally_credential__"])(**obj["value"])
+    return obj
+
+
+def dumps(obj):
+    """Serialize the object to be sent to an agent.
+
+    Besides json types, tasks and credentials (e.g. in the context of a
+    workload) are supported. Tasks are sent by UUID and are loaded from
+    the database by the agent.
+    """
+    return json.dumps(obj, default=_encode)
+
+
+def loads(data):
+    """Deserialize the object serialized by `dumps`."""
+    return json.loads(data, object_hook=_decode)
+
+
+def get_agents():
+    """Return addresses of live agents."""
+    updated_since = timeutils.utcnow() - dt.timedelta(
+        seconds=CONF.agent.heartbeat_timeout)
+    return [worker["hostname"]
+            for worker in db.get_workers(updated_since=updated_since)]
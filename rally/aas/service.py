@@ -0,0 +1,353 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Rally-as-a-Service: HTTP daemon which serves Rally API.
+
+Every method of Rally API decorated by `rally.api.api_wrapper` is served
+at its path. Arguments of a call are transmitted as a json object in the
+body of the request, the result is returned as {"result": <result>}, and
+an error as {"error": {...}} with the error code of the exception as the
+status, so `rally.api.API(rally_endpoint=...)` can be used as a client.
+
+If the secret is set in the [service] section of the config, requests
+without it (in the X-Rally-Service-Secret header) are rejected, so
+credentials of deployments are not given to anyone who can connect.
+
+The daemon loads plugins and connects to the database once, so calls
+do not pay for it. Task and verification executions are run by a pool of
+background workers, which are not interrupted if the client disconnects.
+A call of task/start returns [<task UUID>, <status>] as soon as the task
+is queued, so the client should poll task/get for its status (errors of
+the task are in its "verification_log") and may abort it meanwhile.
+Calls of verification/start and verification/rerun block until the
+verification is finished, since the verification is created only when it
+is run.
+"""
+
+import collections
+import datetime as dt
+import json
+import sys
+import threading
+import traceback
+from wsgiref import simple_server
+
+from oslo_config import cfg
+import six
+from six.moves import http_client
+from six.moves import queue
+from six.moves import socketserver
+
+from rally.aas import agent_utils
+from rally import api
+from rally.common.i18n import _, _LE, _LI, _LW
+from rally.common import logging
+from rally.common import objects
+from rally.common import utils
+from rally import consts
+from rally import exceptions
+from rally import plugins
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+TASK_CREATE_PATH = api.API_REQUEST_PREFIX + "/task/create"
+TASK_START_PATH = api.API_REQUEST_PREFIX + "/task/start"
+
+# Calls which run executions, they are run by background workers.
+BACKGROUND_PATHS = (
+    TASK_START_PATH,
+    api.API_REQUEST_PREFIX + "/verification/start",
+    api.API_REQUEST_PREFIX + "/verification/rerun"
+)
+
+# Results are streamed to clients by parts of at least this size in bytes.
+RESPONSE_BUFFER_SIZE = 64 * 1024
+
+
+def _to_primitive(obj):
+    """Convert the result of a call to objects which json can encode.
+
+    Iterables which are not lists, tuples or sets (e.g. LazyChunkedList of
+    iterations returned by `task.get_detailed(lazy=True)`) are converted
+    to generators, so they are loaded while the response is streamed.
+    """
+    if hasattr(obj, "to_dict"):
+        obj = obj.to_dict()
+    if obj is None or isinstance(obj, (six.string_types, bool,
+                                       six.integer_types, float)):
+        return obj
+    if isinstance(obj, dict):
+        return collections.OrderedDict(
+            (k, _to_primitive(v)) for k, v in obj.items())
+    if isinstance(obj, (dt.datetime, dt.date)):
+        return obj.isoformat()
+    if isinstance(obj, dt.timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [_to_primitive(item) for item in obj]
+    if hasattr(obj, "__iter__"):
+        return (_to_primitive(item) for item in obj)
+    raise TypeError("%r is not JSON serializable" % obj)
+
+
+def _encode_result(result, buffer_size=None):
+    """Encode the result of a call to parts of the body of the response."""
+    buffer_size = buffer_size or RESPONSE_BUFFER_SIZE
+    parts = []
+    size = 0
+    for part in utils.json_iterencode({"result": _to_primitive(result)},
+                                      indent=0):
+        parts.append(part)
+        size += len(part)
+        if size >= buffer_size:
+            yield "".join(parts).encode("utf-8")
+            parts = []
+            size = 0
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+class _Job(object):
+    def __init__(self, func, kwargs):
+        self.func = func
+        self.kwargs = kwargs
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def run(self):
+        try:
+            self.result = self.func(**self.kwargs)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+
+class Workers(object):
+    """Pool of threads which run jobs in background."""
+
+    def __init__(self, count):
+        self._queue = queue.Queue()
+        self._threads = []
+        for i in range(count):
+            thread = threading.Thread(target=self._work)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            job.run()
+
+    def submit(self, func, **kwargs):
+        job = _Job(func, kwargs)
+        self._queue.put(job)
+        return job
+
+    def stop(self):
+        for thread in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+class Application(object):
+    """WSGI application which serves Rally API."""
+
+    def __init__(self, rapi, execution_workers=1, secret=None):
+        """Initialize the application.
+
+        :param rapi: an instance of rally.api.API to serve, it should not
+            be a client of other Rally service
+        :param execution_workers: number of workers which run executions
+        :param secret: secret which clients should send, any request is
+            accepted if it is not set
+        """
+        self.secret = secret
+        self.routes = {}
+        for group in (rapi.deployment, rapi.task, rapi.verifier,
+                      rapi.verification):
+            for name in dir(group):
+                method = getattr(group, name)
+                if hasattr(method, "path"):
+                    self.routes[method.path] = method
+        self.workers = Workers(execution_workers)
+
+    @staticmethod
+    def _run_task(start, kwargs):
+        try:
+            start(**kwargs)
+        except Exception as e:
+            LOG.error(_LE("Failed to run task %(uuid)s: %(error)s")
+                      % {"uuid": kwargs["task"], "error": e})
+            # the engine saves errors of validation and execution, the
+            # task is left in init status only by earlier errors
+            task = objects.Task.get(kwargs["task"])
+            if task["status"] == consts.TaskStatus.INIT:
+                task.set_failed(type(e).__name__, str(e),
+                                traceback.format_exc())
+
+    def _start_task(self, func, kwargs):
+        """Queue the task and return its UUID and status at once."""
+        kwargs = dict(kwargs)
+        if kwargs.get("task") is None:
+            task = self.routes[TASK_CREATE_PATH](
+                deployment=kwargs.get("deployment"), tag=None)
+            kwargs["task"] = task["uuid"]
+        status = objects.Task.get_status(kwargs["task"])
+        self.workers.submit(self._run_task, start=func, kwargs=kwargs)
+        return [kwargs["task"], status]
+
+    def _call(self, path, kwargs):
+        func = self.routes[path]
+        if path not in BACKGROUND_PATHS:
+            return func(**kwargs)
+        if path == TASK_START_PATH:
+            return self._start_task(func, kwargs)
+        job = self.workers.submit(func, **kwargs)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    @staticmethod
+    def _start_response(start_response, status_code, headers=()):
+        start_response(
+            "%s %s" % (status_code,
+                       http_client.responses.get(status_code, "Error")),
+            [("Content-Type", "application/json")] + list(headers))
+
+    def _response(self, start_response, status_code, body):
+        body = json.dumps(body).encode("utf-8")
+        self._start_response(start_response, status_code,
+                             [("Content-Length", str(len(body)))])
+        return [body]
+
+    def _stream(self, path, first, rest):
+        yield first
+        try:
+            for part in rest:
+                yield part
+        except Exception as e:
+            # the status is already sent, so the response is cut off and
+            # the client fails to decode it
+            LOG.error(_LE("Failed to send the result of %(path)s: "
+                          "%(error)s") % {"path": path, "error": e})
+
+    def _error(self, start_response, e):
+        e = exceptions.make_exception(e)
+        error = {"msg": e.format_message(),
+                 "args": None,
+                 "type": e.__class__.__name__,
+                 "kwargs": json.loads(json.dumps(e.kwargs, default=str))}
+        return self._response(start_response, e.error_code,
+                              {"error": error})
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        method = environ.get("REQUEST_METHOD", "GET")
+        if not agent_utils.check_secret(
+                environ.get("HTTP_X_RALLY_SERVICE_SECRET"), self.secret):
+            LOG.warning(_LW("Rejected %(path)s from %(addr)s: wrong secret")
+                        % {"path": path, "addr": environ.get("REMOTE_ADDR")})
+            return self._error(start_response, exceptions.ForbiddenException(
+                _("wrong secret of Rally service")))
+        if path not in self.routes:
+            return self._error(start_response, exceptions.NotFoundException(
+                _("Unknown API call %s") % path))
+        if self.routes[path].method != method:
+            return self._error(
+                start_response, exceptions.InvalidArgumentsException(
+                    _("%(path)s should be called by %(method)s request")
+                    % {"path": path, "method": self.routes[path].method}))
+
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            body = environ["wsgi.input"].read(length) if length else b""
+            kwargs = json.loads(body.decode("utf-8")) if body else {}
+            if not isinstance(kwargs, dict):
+                raise ValueError(_("Arguments should be a json object."))
+        except ValueError as e:
+            return self._error(start_response,
+                               exceptions.InvalidArgumentsException(str(e)))
+
+        try:
+            result = self._call(path, kwargs)
+            # the first part is encoded here, so a failure before it is
+            # reported by the status, and small results are sent at once
+            parts = _encode_result(result)
+            first = next(parts)
+        except Exception as e:
+            LOG.warning(_("Failed to process %(path)s: %(error)s")
+                        % {"path": path, "error": e})
+            return self._error(start_response, e)
+
+        self._start_response(start_response, 200)
+        return self._stream(path, first, parts)
+
+
+class _ThreadingWSGIServer(socketserver.ThreadingMixIn,
+                           simple_server.WSGIServer):
+    daemon_threads = True
+
+
+class _RequestHandler(simple_server.WSGIRequestHandler):
+    def log_message(self, format, *args):
+        LOG.debug("%s - %s" % (self.address_string(), format % args))
+
+
+def make_server(app, host, port):
+    """Make HTTP server which serves the application in threads."""
+    return simple_server.make_server(host, port, app,
+                                     server_class=_ThreadingWSGIServer,
+                                     handler_class=_RequestHandler)
+
+
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    try:
+        rapi = api.API(config_args=argv[1:])
+    except exceptions.RallyException as e:
+        LOG.error(_LE("Failed to start Rally service: %s") % e)
+        return 2
+
+    # all plugins are imported at start, so calls do not wait for it
+    plugins.load()
+    if not CONF.service.secret:
+        LOG.warning(_LW("The secret of Rally service is not set, so requests "
+                        "to the service are not authenticated."))
+    app = Application(rapi, execution_workers=CONF.service.execution_workers,
+                      secret=CONF.service.secret)
+    server = make_server(app, CONF.service.host, CONF.service.port)
+    LOG.info(_LI("Rally service is listening on %(host)s:%(port)s.")
+             % {"host": CONF.service.host, "port": server.server_port})
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        app.workers.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Options and helpers shared by Rally service and its clients.
+
+This module does not depend on Rally API, so options can be listed
+without importing the service daemon.
+"""
+
+from oslo_config import cfg
+
+
+CONF = cfg.CONF
+
+
+SERVICE_OPTS = [
+    cfg.StrOpt("host", default="127.0.0.1",
+               help="Address to listen on."),
+    cfg.PortOpt("port", default=8000,
+                help="Port to listen on."),
+    cfg.IntOpt("execution_workers", default=4, min=1,
+               help="Number of workers which run executions of tasks and "
+                    "verifications, other executions wait in a queue."),
+    cfg.StrOpt("secret", secret=True,
+               help="Secret shared by Rally service and its clients. The "
+                    "service rejects requests without it, so it should be "
+                    "set if the service is accessible not only by trusted "
+                    "clients.")
+]
+
+SECRET_HEADER = "X-Rally-Service-Secret"
+
+
+def get_headers():
+    """Return headers which authenticate requests to the service."""
+    if CONF.service.secret:
+        return {SECRET_HEADER: CONF.service.secret}
+    return {}
@@ -20,13 +20,14 @@ import sys
 import time
 import traceback
 
-import jinja2
-import jinja2.meta
 import jsonschema
 from oslo_config import cfg
+from oslo_utils import timeutils
 import requests
 from requests.packages import urllib3
+import six
 
+from rally.aas import service_utils
 from rally.common import opts
 from rally.common.i18n import _, _LI, _LE
 from rally.common import logging
@@ -263,8 +264,26 @@ class _Task(APIGroup):
 
     @api_wrapper(path=API_REQUEST_PREFIX + "/task/list",
                  method="GET")
-    def list(self, **filters):
-        return [task.to_dict() for task in objects.Task.list(**filters)]
+    def list(self, status=None, deployment=None, limit=None, offset=None,
+             since=None):
+        """List tasks.
+
+        Results of tasks are not included, use `get` to obtain them.
+
+        :param status: Status to filter tasks by
+        :param deployment: Deployment name or UUID to filter tasks by
+        :param limit: Maximum number of tasks to return
+        :param offset: Number of tasks to skip. Tasks are ordered by the
+                       time of creation
+        :param since: UTC time in ISO 8601 format (or datetime) to list
+                      only tasks created after it
+        """
+        if isinstance(since, six.string_types):
+            since = timeutils.normalize_time(timeutils.parse_isotime(since))
+        return [task.to_dict(include_results=False)
+                for task in objects.Task.list(
+                    status=status, deployment=deployment, limit=limit,
+                    offset=offset, since=since)]
 
     def _get(self, task_id):
         return objects.Task.get(task_id)
@@ -276,16 +295,22 @@ class _Task(APIGroup):
 
     @api_wrapper(path=API_REQUEST_PREFIX + "/task/get_detailed",
                  method="GET")
-    def get_detailed(self, task_id, extended_results=False):
+    def get_detailed(self, task_id, extended_results=False,
+                     include_data=True, lazy=False):
         """Get detailed task data.
 
         :param task_id: str task UUID
         :param extended_results: whether to return task data as dict
                                  with extended results
+        :param include_data: whether to load iterations of workloads
+                             which have their statistics saved
+        :param lazy: whether to load iterations of workloads lazily,
+                     chunk by chunk, while they are iterated over
         :returns: rally.common.db.sqlalchemy.models.Task
         :returns: dict
         """
-        task = objects.Task.get_detailed(task_id)
+        task = objects.Task.get_detailed(task_id, include_data=include_data,
+                                         lazy=lazy)
         if task and extended_results:
             task = dict(task)
             task["results"] = objects.Task.extend_results(task["results"])
@@ -316,6 +341,10 @@ class _Task(APIGroup):
                 return False
             return True
 
+        # jinja2 takes a noticeable time to import, while it is needed
+        # only to render templates of tasks
+        import jinja2
+        import jinja2.meta
         # NOTE(boris-42): We have to import builtins to get the full list of
         #                 builtin functions (e.g. range()). Unfortunately,
         #                 __builtins__ doesn't return them (when it is not
@@ -1082,16 +1111,15 @@ class _Verification(APIGroup):
             run_args["concurrency"] = concurrency
 
         verification = self._get(verification_uuid)
-        tests = verification.tests
 
         if failed:
-            tests = [t for t, r in tests.items() if r["status"] == "fail"]
+            tests = list(verification.get_tests(status="fail"))
             if not tests:
                 raise exceptions.RallyException(
                     "There are no failed tests from verification (UUID=%s)."
                     % verification_uuid)
         else:
-            tests = tests.keys()
+            tests = list(verification.tests)
 
         deployment = (deployment_id if deployment_id
                       else verification.deployment_uuid)
@@ -1125,9 +1153,10 @@ class _Verification(APIGroup):
         :param tags: Tags to filter verifications by
         :param status: Status to filter verifications by
         """
-        return [item.to_dict() for item in objects.Verification.list(
-            verifier_id, deployment_id=deployment_id,
-            tags=tags, status=status)]
+        return [item.to_dict(include_tests=False)
+                for item in objects.Verification.list(
+                    verifier_id, deployment_id=deployment_id,
+                    tags=tags, status=status)]
 
     @api_wrapper(path=API_REQUEST_PREFIX + "/verification/delete",
                  method="DELETE")
@@ -1219,7 +1248,9 @@ class API(object):
         :type config_file: str
         :param config_args: Arguments for initialization current configuration
         :type config_args: list
-        :param rally_endpoint: [Restricted]Rally endpoint connection string.
+        :param rally_endpoint: URL of Rally service (see rally.aas.service).
+            If it is specified, all calls are sent to the service and
+            database and plugins are not checked or loaded locally
         :type rally_endpoint: str
         :param plugin_paths: Additional custom plugin locations
         :type plugin_paths: list
@@ -1227,10 +1258,8 @@ class API(object):
         :type skip_db_check: bool
         """
 
-        self.endpoint_url = rally_endpoint
-        if rally_endpoint:
-            raise NotImplementedError(_("Sorry, but Rally-as-a-Service is "
-                                        "not ready yet."))
+        self.endpoint_url = rally_endpoint.rstrip("/") if rally_endpoint \
+            else None
 
         try:
             config_files = ([config_file] if config_file else
@@ -1280,16 +1309,17 @@ class API(object):
             raise exceptions.RallyException(_(
                 "Failed to read configuration file(s): %s") % cfg_files)
 
-        # Check that db is upgraded to the latest revision
-        if not skip_db_check:
-            self.check_db_revision()
+        if not self.endpoint_url:
+            # Check that db is upgraded to the latest revision
+            if not skip_db_check:
+                self.check_db_revision()
 
-        # Load plugins
-        plugin_paths = plugin_paths or []
-        if "plugin_paths" in CONF:
-            plugin_paths.extend(CONF.get("plugin_paths") or [])
-        for path in plugin_paths:
-            discover.load_plugins(path)
+            # Load plugins
+            plugin_paths = plugin_paths or []
+            if "plugin_paths" in CONF:
+                plugin_paths.extend(CONF.get("plugin_paths") or [])
+            for path in plugin_paths:
+                discover.load_plugins(path)
 
         # NOTE(andreykurilin): There is no reason to auto-discover API's. We
         # have only 4 classes, so let's do it in good old way - hardcode them:)
@@ -1326,6 +1356,7 @@ class API(object):
             "RALLY-CLIENT-VERSION": rally_version.version_string(),
             "RALLY-API": "1.0"
         }
+        headers.update(service_utils.get_headers())
         response = requests.request(method, path,
                                     json=kwargs, headers=headers)
         if response.status_code != 200:
@@ -45,10 +45,17 @@ class PluginCommands(object):
     @plugins.ensure_plugins_are_loaded
     def show(self, api, name, namespace=None):
         """Show detailed information about a Rally plugin."""
-        name_lw = name.lower()
-        all_plugins = plugin.Plugin.get_all(namespace=namespace)
-        found = [p for p in all_plugins if name_lw in p.get_name().lower()]
-        exact_match = [p for p in found if name_lw == p.get_name().lower()]
+        # Plugin with exactly the same name is looked up at first, since
+        # it does not require to load all the plugins.
+        found = plugin.Plugin.get_all(name=name, namespace=namespace)
+        exact_match = found
+        if len(found) != 1:
+            name_lw = name.lower()
+            all_plugins = plugin.Plugin.get_all(namespace=namespace)
+            found = [p for p in all_plugins
+                     if name_lw in p.get_name().lower()]
+            exact_match = [p for p in found
+                           if name_lw == p.get_name().lower()]
 
         if not found:
             if namespace:
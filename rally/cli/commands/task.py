@@ -308,7 +308,8 @@ class TaskCommands(object):
         :param task_id: str, task uuid
         :param iterations_data: bool, include results for each iteration
         """
-        task = api.task.get_detailed(task_id=task_id, extended_results=True)
+        task = api.task.get_detailed(task_id=task_id, extended_results=True,
+                                     include_data=iterations_data)
 
         if not task:
             print("The task %s can not be found" % task_id)
@@ -398,7 +399,17 @@ class TaskCommands(object):
                 if itr.get("error"):
                     task_errors.append(TaskCommands._format_task_error(itr))
 
-            self._print_task_errors(task_id, task_errors)
+            if not iterations_data and "errors" in result["info"]:
+                # iterations are not loaded, since their errors and output
+                # are saved with the statistics
+                output = result["info"]["output"]
+                task_errors = [TaskCommands._format_task_error({"error": e})
+                               for e in result["info"]["errors"]]
+                self._print_task_errors(task_id, task_errors,
+                                        result["info"]["iterations_failed"])
+            else:
+                output = [out.render() for out in output]
+                self._print_task_errors(task_id, task_errors)
 
             cols = plot.charts.MainStatsTable.columns
             float_cols = result["info"]["stat"]["cols"][1:7]
@@ -430,8 +441,7 @@ class TaskCommands(object):
                                   [cliutils.pretty_float_formatter(col, 3)
                                    for col in float_cols]))
 
-                for out in output:
-                    data = out.render()
+                for data in output:
                     rows = [dict(zip(cols, r)) for r in data["data"]["rows"]]
                     if rows:
                         # NOTE(amaretskiy): print title explicitly because
@@ -465,7 +475,7 @@ class TaskCommands(object):
 
         :param task_id: Task uuid
         """
-        task = api.task.get(task_id=task_id)
+        task = api.task.get_detailed(task_id=task_id, lazy=True)
         finished_statuses = (consts.TaskStatus.FINISHED,
                              consts.TaskStatus.ABORTED)
         if task["status"] not in finished_statuses:
@@ -474,14 +484,15 @@ class TaskCommands(object):
             return 1
 
         # TODO(chenhb): Ensure `rally task results` puts out old format.
-        for result in task["results"]:
-            for itr in result["data"]["raw"]:
+        def old_format(raw):
+            for itr in raw:
                 itr["atomic_actions"] = collections.OrderedDict(
                     tutils.WrapperForAtomicActions(
                         itr["atomic_actions"]).items()
                 )
+                yield itr
 
-        results = [{"key": x["key"], "result": x["data"]["raw"],
+        results = [{"key": x["key"], "result": old_format(x["data"]["raw"]),
                     "sla": x["data"]["sla"],
                     "hooks": x["data"].get("hooks", []),
                     "load_duration": x["data"]["load_duration"],
@@ -489,7 +500,10 @@ class TaskCommands(object):
                     "created_at": x["created_at"]}
                    for x in task["results"]]
 
-        print(json.dumps(results, sort_keys=False, indent=4))
+        # Iterations are loaded lazily, so json is printed by parts.
+        for part in rutils.json_iterencode(results, indent=4):
+            sys.stdout.write(part)
+        sys.stdout.write("\n")
 
     @cliutils.args("--deployment", dest="deployment", type=str,
                    metavar="<uuid>", required=False,
@@ -502,9 +516,18 @@ class TaskCommands(object):
                    " Available statuses: %s" % ", ".join(consts.TaskStatus))
     @cliutils.args("--uuids-only", action="store_true",
                    dest="uuids_only", help="List task UUIDs only.")
+    @cliutils.args("--limit", type=int, dest="limit", metavar="<N>",
+                   help="Maximum number of tasks to list.")
+    @cliutils.args("--offset", type=int, dest="offset", metavar="<N>",
+                   help="Number of tasks to skip. Tasks are ordered by "
+                        "the time of creation.")
+    @cliutils.args("--since", type=str, dest="since", metavar="<time>",
+                   help="List tasks created after the given UTC time in "
+                        "ISO 8601 format, e.g. 2017-01-31 or "
+                        "2017-01-31T18:00:00.")
     @envutils.with_default_deployment(cli_arg_name="deployment")
     def list(self, api, deployment=None, all_deployments=False, status=None,
-             uuids_only=False):
+             uuids_only=False, limit=None, offset=None, since=None):
         """List tasks, started and finished.
 
         Displayed tasks can be filtered by status or deployment.  By
@@ -516,6 +539,9 @@ class TaskCommands(object):
             Available task statuses are in rally.consts.TaskStatus
         :param all_deployments: display tasks from all deployments
         :param uuids_only: list task UUIDs only
+        :param limit: maximum number of tasks to list
+        :param offset: number of tasks to skip
+        :param since: list tasks created after this time
         """
 
         filters = {}
@@ -533,6 +559,10 @@ class TaskCommands(object):
 
         if not all_deployments:
             filters.setdefault("deployment", deployment)
+        for key, value in (("limit", limit), ("offset", offset),
+                           ("since", since)):
+            if value is not None:
+                filters[key] = value
 
         task_list = api.task.list(**filters)
 
@@ -601,9 +631,11 @@ class TaskCommands(object):
                                "sla": x["data"]["sla"],
                                "hooks": x["data"].get("hooks", []),
                                "result": x["data"]["raw"],
+                               "statistics": x["data"].get("statistics"),
                                "load_duration": x["data"]["load_duration"],
                                "full_duration": x["data"]["full_duration"]},
-                    api.task.get_detailed(task_id=task_id)["results"])
+                    api.task.get_detailed(task_id=task_id,
+                                          include_data=False)["results"])
             else:
                 print(_("ERROR: Invalid UUID or file name passed: %s")
                       % task_id, file=sys.stderr)
@@ -674,7 +706,7 @@ class TaskCommands(object):
                                "full_duration": x["data"]["full_duration"],
                                "created_at": x["created_at"]},
                     api.task.get_detailed(
-                        task_id=task_file_or_uuid)["results"])
+                        task_id=task_file_or_uuid, lazy=True)["results"])
             else:
                 print(_("ERROR: Invalid UUID or file name passed: %s"
                         ) % task_file_or_uuid,
@@ -767,7 +799,8 @@ class TaskCommands(object):
         :param task_id: Task uuid.
         :returns: Number of failed criteria.
         """
-        results = api.task.get_detailed(task_id=task_id)["results"]
+        results = api.task.get_detailed(task_id=task_id,
+                                        include_data=False)["results"]
         failed_criteria = 0
         data = []
         STATUS_PASS = "PASS"
@@ -849,12 +882,17 @@ class TaskCommands(object):
         })
 
     @staticmethod
-    def _print_task_errors(task_id, task_errors):
+    def _print_task_errors(task_id, task_errors, errors_count=None):
+        if errors_count is None:
+            errors_count = len(task_errors)
         print(cliutils.make_header("Task %s has %d error(s)" %
-                                   (task_id, len(task_errors))))
+                                   (task_id, errors_count)))
         for err_data in task_errors:
             print(*err_data, sep="\n")
             print("-" * 80)
+        if errors_count > len(task_errors):
+            print(_("Only %d of them are shown, run with --iterations-data "
+                    "to show all of them.\n") % len(task_errors))
 
     @staticmethod
     def _format_task_error(data):
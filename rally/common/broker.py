@@ -15,19 +15,140 @@
 
 import collections
 import threading
+import time
 
 from rally.common.i18n import _LW
 from rally.common import logging
+from rally.common import streaming_algorithms
 
 
 LOG = logging.getLogger(__name__)
 
+# Size of the streaming queue per consumer if it is not specified
+QUEUE_SIZE_PER_CONSUMER = 10
 
-def _consumer(consume, queue):
+
+class StreamingQueue(object):
+    """Bounded blocking queue that connects a publisher with consumers.
+
+    The queue is compatible with the part of deque interface used by
+    publishers, so publish() callables do not depend on the broker mode.
+    append() blocks while the queue is full, popleft() blocks while it is
+    empty and raises IndexError after the end of the stream.
+    """
+
+    def __init__(self, maxsize=0):
+        """Init the queue.
+
+        :param maxsize: max number of items in the queue, 0 for unbounded
+        """
+        self.maxsize = maxsize
+        self._items = collections.deque()
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def __len__(self):
+        return len(self._items)
+
+    def append(self, item):
+        """Put an item to the queue, wait for a free slot if it is full."""
+        with self._condition:
+            while self.maxsize and len(self._items) >= self.maxsize:
+                self._condition.wait()
+            self._items.append((item, time.time()))
+            self._condition.notify_all()
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def popleft(self, with_timestamp=False):
+        """Remove an item from the queue, wait for it if the queue is empty.
+
+        :param with_timestamp: return a tuple of the item and the time it
+            was put to the queue
+        :raises IndexError: if the queue is empty and closed
+        """
+        with self._condition:
+            while not self._items and not self._closed:
+                self._condition.wait()
+            if not self._items:
+                raise IndexError("pop from a closed empty queue")
+            item, timestamp = self._items.popleft()
+            self._condition.notify_all()
+        return (item, timestamp) if with_timestamp else item
+
+    def close(self):
+        """Signal the end of the stream."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class Statistics(object):
+    """Thread-safe statistics of consumed jobs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.jobs = 0
+        self.failed = 0
+        self._latency = {
+            "min": streaming_algorithms.MinComputation(),
+            "median": streaming_algorithms.PercentileComputation(0.5),
+            "90%ile": streaming_algorithms.PercentileComputation(0.9),
+            "max": streaming_algorithms.MaxComputation(),
+            "avg": streaming_algorithms.MeanComputation()}
+        self._wait = streaming_algorithms.MeanComputation()
+
+    def add(self, latency, failed=False, wait=None):
+        """Add a consumed job.
+
+        :param latency: duration of consume() call
+        :param failed: whether consume() failed
+        :param wait: time the job spent in the queue
+        """
+        with self._lock:
+            self.jobs += 1
+            if failed:
+                self.failed += 1
+            for computation in self._latency.values():
+                computation.add(latency)
+            if wait is not None:
+                self._wait.add(wait)
+
+    def to_dict(self, duration):
+        """Return statistics of jobs consumed in the duration."""
+        with self._lock:
+            return {
+                "jobs": self.jobs,
+                "failed": self.failed,
+                "duration": duration,
+                "throughput": self.jobs / duration if duration else 0,
+                "latency": dict((k, v.result())
+                                for k, v in self._latency.items()),
+                "queue_wait": self._wait.result()}
+
+
+def _consume(consume, cache, args, stats=None, wait=None):
+    started = time.time()
+    failed = False
+    try:
+        consume(cache, args)
+    except Exception as e:
+        failed = True
+        LOG.warning(_LW("Failed to consume a task from the queue: %s") % e)
+        if logging.is_debug():
+            LOG.exception(e)
+    if stats is not None:
+        stats.add(time.time() - started, failed=failed, wait=wait)
+
+
+def _consumer(consume, queue, stats=None):
     """Infinity worker that consumes tasks from queue.
 
     :param consume: method that consumes an object removed from the queue
     :param queue: deque object to popleft() objects from
+    :param stats: Statistics object to add consumed jobs to
     """
     cache = {}
     while True:
@@ -39,12 +160,23 @@ def _consumer(consume, queue):
             except IndexError:
                 # consumed by other thread
                 continue
+        _consume(consume, cache, args, stats)
+
+
+def _stream_consumer(consume, queue, stats=None):
+    """Worker that consumes tasks from queue until the end of the stream.
+
+    :param consume: method that consumes an object removed from the queue
+    :param queue: StreamingQueue object to popleft() objects from
+    :param stats: Statistics object to add consumed jobs to
+    """
+    cache = {}
+    while True:
         try:
-            consume(cache, args)
-        except Exception as e:
-            LOG.warning(_LW("Failed to consume a task from the queue: %s") % e)
-            if logging.is_debug():
-                LOG.exception(e)
+            args, timestamp = queue.popleft(with_timestamp=True)
+        except IndexError:
+            break
+        _consume(consume, cache, args, stats, wait=time.time() - timestamp)
 
 
 def _publisher(publish, queue):
@@ -61,7 +193,8 @@ def _publisher(publish, queue):
             LOG.exception(e)
 
 
-def run(publish, consume, consumers_count=1):
+def run(publish, consume, consumers_count=1, streaming=False,
+        queue_size=None):
     """Run broker.
 
     publish() put to queue, consume() process one element from queue.
@@ -69,18 +202,49 @@ def run(publish, consume, consumers_count=1):
     When publish() is finished and elements from queue are processed process
     is finished all consumers threads are cleaned.
 
+    In the streaming mode consumers are started before publish() is called,
+    so elements are processed while publish() is still putting them to the
+    queue. The queue is bounded, publish() is blocked while it is full.
+
     :param publish: Function that puts values to the queue
     :param consume: Function that processes a single value from the queue
     :param consumers_count: Number of consumers
+    :param streaming: Whether to run publish() and consumers simultaneously
+    :param queue_size: Max size of the queue in the streaming mode, by
+        default it is QUEUE_SIZE_PER_CONSUMER per consumer
+    :returns: dict with statistics of consumed values: number of jobs and
+        failed jobs, duration and throughput, latency of jobs and average
+        time jobs spent in the queue (in the streaming mode only)
     """
-    queue = collections.deque()
-    _publisher(publish, queue)
+    stats = Statistics()
+    started = time.time()
+    if streaming and consumers_count > 0:
+        if queue_size is None:
+            queue_size = consumers_count * QUEUE_SIZE_PER_CONSUMER
+        queue = StreamingQueue(queue_size)
+        target = _stream_consumer
+    else:
+        queue = collections.deque()
+        target = _consumer
+        _publisher(publish, queue)
 
     consumers = []
     for i in range(consumers_count):
-        consumer = threading.Thread(target=_consumer, args=(consume, queue))
+        consumer = threading.Thread(target=target,
+                                    args=(consume, queue, stats))
         consumer.start()
         consumers.append(consumer)
 
+    if target is _stream_consumer:
+        try:
+            _publisher(publish, queue)
+        finally:
+            queue.close()
+
     for consumer in consumers:
         consumer.join()
+
+    result = stats.to_dict(time.time() - started)
+    LOG.debug("Broker consumed %(jobs)d jobs (%(failed)d failed) in "
+              "%(duration).2f sec, %(throughput).2f jobs/sec" % result)
+    return result
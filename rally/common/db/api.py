@@ -154,13 +154,19 @@ def task_get_detailed_last():
     return get_impl().task_get_detailed_last()
 
 
-def task_get_detailed(uuid):
+def task_get_detailed(uuid, include_data=True, lazy=False):
     """Returns task with results by uuid.
 
     :param uuid: UUID of the task.
+    :param include_data: whether to load raw data of iterations of
+        workloads which have their statistics saved
+    :param lazy: whether to load raw data of iterations lazily. If True,
+        raw data of each workload is an iterable which loads chunks of
+        iterations one by one on each iteration over it.
     :returns: task dict with data on the task and its results.
     """
-    return get_impl().task_get_detailed(uuid)
+    return get_impl().task_get_detailed(uuid, include_data=include_data,
+                                        lazy=lazy)
 
 
 def task_create(values):
@@ -197,7 +203,8 @@ def task_update_status(task_uuid, status, allowed_statuses):
                                          status)
 
 
-def task_list(status=None, deployment=None):
+def task_list(status=None, deployment=None, limit=None, offset=None,
+              since=None):
     """Get a list of tasks.
 
     :param status: Task status to filter the returned list on. If set to
@@ -205,9 +212,14 @@ def task_list(status=None, deployment=None):
     :param deployment: Deployment UUID to filter the returned list on.
                       If set to None, tasks from all deployments will be
                       returned.
+    :param limit: Maximum number of tasks to return.
+    :param offset: Number of tasks to skip. Tasks are ordered by the time
+                   of creation.
+    :param since: datetime to return only tasks created after it.
     :returns: A list of dicts with data on the tasks.
     """
-    return get_impl().task_list(status=status, deployment=deployment)
+    return get_impl().task_list(status=status, deployment=deployment,
+                                limit=limit, offset=offset, since=since)
 
 
 def task_delete(uuid, status=None):
@@ -234,16 +246,19 @@ def task_result_get_all_by_uuid(task_uuid):
     return get_impl().task_result_get_all_by_uuid(task_uuid)
 
 
-def subtask_create(task_uuid, title, description=None, context=None):
+def subtask_create(task_uuid, title, description=None, context=None,
+                   run_in_parallel=False):
     """Create a subtask.
 
     :param task_uuid: string with UUID of Task instance.
     :param title: subtask title.
     :param description: subtask description.
     :param context: subtask context dict.
+    :param run_in_parallel: whether workloads of the subtask run in parallel.
     :returns: a dict with data on the subtask.
     """
-    return get_impl().subtask_create(task_uuid, title, description, context)
+    return get_impl().subtask_create(task_uuid, title, description, context,
+                                     run_in_parallel)
 
 
 def subtask_update(subtask_uuid, values):
@@ -480,6 +495,47 @@ def verification_delete(verification_uuid):
     return get_impl().verification_delete(verification_uuid)
 
 
+def verification_tests_add(verification_uuid, tests):
+    """Store results of tests of a verification.
+
+    Results of tests which are already stored are replaced.
+
+    :param verification_uuid: verification UUID
+    :param tests: a dict with IDs of tests and their results
+    """
+    return get_impl().verification_tests_add(verification_uuid, tests)
+
+
+def verification_tests_get(verification_uuids, status=None,
+                           min_duration=None):
+    """Get results of tests of verifications.
+
+    :param verification_uuids: a list of verifications UUIDs
+    :param status: a status or a list of statuses to filter tests by
+    :param min_duration: get only tests which took at least the given
+        number of seconds
+    :returns: a dict with verifications UUIDs and dicts with IDs of tests
+        and their results ordered by IDs of tests
+    """
+    return get_impl().verification_tests_get(
+        verification_uuids, status=status, min_duration=min_duration)
+
+
+def verification_tests_compare(verification_uuids):
+    """Get results of tests of verifications side by side.
+
+    Results are grouped by tests in the database, so each test comes with
+    its results in all the verifications at once.
+
+    :param verification_uuids: a list of verifications UUIDs
+    :returns: an iterator over pairs of IDs of tests and dicts with
+        verifications UUIDs (in the given order) and results of the test,
+        only verifications which have the test are included. Tests are
+        ordered by IDs.
+    """
+    return get_impl().verification_tests_compare(verification_uuids)
+
+
 def verification_update(uuid, **properties):
     """Update a verification record.
 
@@ -515,6 +571,16 @@ def get_worker(hostname):
     return get_impl().get_worker(hostname)
 
 
+def get_workers(updated_since=None):
+    """Get a list of worker services ordered by hostname.
+
+    :param updated_since: datetime, only workers which were updated (see
+                          update_worker) since this time are returned
+    :returns: A list of workers.
+    """
+    return get_impl().get_workers(updated_since=updated_since)
+
+
 def unregister_worker(hostname):
     """Unregister this worker with the service registry.
 
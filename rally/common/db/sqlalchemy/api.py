@@ -16,8 +16,10 @@
 SQLAlchemy implementation for DB.API
 """
 
+import collections
 import copy
 import datetime as dt
+import functools
 import json
 import os
 import time
@@ -30,13 +32,16 @@ from oslo_config import cfg
 from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import session as db_session
 from oslo_utils import timeutils
+import sqlalchemy as sa
 from sqlalchemy import or_
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm import load_only as sa_loadonly
 
 from rally.common.db import api as db_api
 from rally.common.db.sqlalchemy import models
+from rally.common.db.sqlalchemy import types as sa_types
 from rally.common.i18n import _
+from rally.common import utils
 from rally import consts
 from rally import exceptions
 
@@ -80,6 +85,13 @@ def _alembic_config():
 
 class Connection(object):
 
+    # maximum number of uuids in a single query of tags
+    TAGS_BATCH_SIZE = 500
+    # maximum number of results of tests in a single query
+    TESTS_BATCH_SIZE = 500
+    TASK_LIST_COLUMNS = ("id", "uuid", "deployment_uuid", "status",
+                         "created_at", "updated_at", "validation_result")
+
     def engine_reset(self):
         global _FACADE
 
@@ -187,6 +199,25 @@ class Connection(object):
 
         return list(set(t.tag for t in tags))
 
+    def _tags_get_by_uuids(self, uuids, tag_type, session=None):
+        """Get tags of several objects at once.
+
+        :returns: dict with uuids of objects and lists of their tags
+        """
+        tags = dict((uuid, set()) for uuid in uuids)
+        uuids = list(tags)
+        # the number of parameters of a query is limited by some backends,
+        # so tags are requested in batches
+        for i in range(0, len(uuids), self.TAGS_BATCH_SIZE):
+            query = (self.model_query(models.Tag, session=session).
+                     options(sa_loadonly("uuid", "tag")).
+                     filter(models.Tag.type == tag_type,
+                            models.Tag.uuid.in_(
+                                uuids[i:i + self.TAGS_BATCH_SIZE])))
+            for tag in query:
+                tags[tag.uuid].add(tag.tag)
+        return dict((uuid, list(t)) for uuid, t in tags.items())
+
     def _uuids_by_tags_get(self, tag_type, tags):
         tags = (self.model_query(models.Tag).
                 filter(models.Tag.type == tag_type,
@@ -204,8 +235,9 @@ class Connection(object):
             raise exceptions.TaskNotFound(uuid=uuid)
         return task
 
-    def _make_old_task(self, task):
-        tags = self._tags_get(task.uuid, consts.TagType.TASK)
+    def _make_old_task(self, task, tags=None):
+        if tags is None:
+            tags = self._tags_get(task.uuid, consts.TagType.TASK)
         tag = tags[0] if tags else ""
 
         return {
@@ -219,10 +251,7 @@ class Connection(object):
             "verification_log": json.dumps(task.validation_result)
         }
 
-    def _make_old_task_result(self, workload, workload_data_list):
-        raw_data = [data
-                    for workload_data in workload_data_list
-                    for data in workload_data.chunk_data["raw"]]
+    def _make_old_task_result(self, workload, raw_data):
         return {
             "id": workload.id,
             "task_uuid": workload.task_uuid,
@@ -245,7 +274,8 @@ class Connection(object):
                 "load_duration": workload.load_duration,
                 "full_duration": workload.full_duration,
                 "sla": workload.sla_results.get("sla", []),
-                "hooks": workload.hooks
+                "hooks": workload.hooks,
+                "statistics": workload.statistics
             }
         }
 
@@ -255,39 +285,68 @@ class Connection(object):
             results = (self.model_query(models.WorkloadData, session=session).
                        filter_by(workload_uuid=workload_uuid).
                        order_by(models.WorkloadData.chunk_order.asc()))
-            if results.first() and results[0].chunk_data["raw"] and isinstance(
-                    results[0].chunk_data["raw"][0]["atomic_actions"], dict):
-                # NOTE(andreykurilin): It is an old format of atomic actions.
-                #   We do not have migration yet, since it can take too much
-                #   time on the big databases. Let's lazy-migrate results which
-                #   user greps and force a migration after several releases.
-
+            if results.first() and self._is_old_workload_data(results[0]):
                 for workload_data in results:
-                    chunk_data = copy.deepcopy(workload_data.chunk_data)
-                    for chunk in chunk_data["raw"]:
-                        new_atomic_actions = []
-                        started_at = chunk["timestamp"]
-                        for name, d in chunk["atomic_actions"].items():
-                            finished_at = started_at + d
-                            new_atomic_actions.append(
-                                {"name": name, "children": [],
-                                 "started_at": started_at,
-                                 "finished_at": finished_at})
-                            started_at = finished_at
-                        chunk["atomic_actions"] = new_atomic_actions
-                    workload_data.update({"chunk_data": chunk_data})
+                    self._migrate_workload_data(workload_data)
 
         return results
 
+    def _task_workload_data_iter(self, workload_uuid):
+        """Iterate over raw data of workload loading chunks one by one."""
+        uuids = [workload_data.uuid for workload_data in (
+            self.model_query(models.WorkloadData).
+            options(sa_loadonly("uuid")).
+            filter_by(workload_uuid=workload_uuid).
+            order_by(models.WorkloadData.chunk_order.asc()))]
+        for uuid in uuids:
+            session = get_session()
+            with session.begin():
+                workload_data = (
+                    self.model_query(models.WorkloadData, session=session).
+                    filter_by(uuid=uuid).first())
+                if self._is_old_workload_data(workload_data):
+                    self._migrate_workload_data(workload_data)
+            yield workload_data.chunk_data["raw"]
+
+    @staticmethod
+    def _is_old_workload_data(workload_data):
+        # NOTE(andreykurilin): It is an old format of atomic actions.
+        #   We do not have migration yet, since it can take too much
+        #   time on the big databases. Let's lazy-migrate results which
+        #   user greps and force a migration after several releases.
+        return bool(workload_data.chunk_data["raw"] and isinstance(
+            workload_data.chunk_data["raw"][0]["atomic_actions"], dict))
+
+    @staticmethod
+    def _migrate_workload_data(workload_data):
+        chunk_data = copy.deepcopy(workload_data.chunk_data)
+        for chunk in chunk_data["raw"]:
+            new_atomic_actions = []
+            started_at = chunk["timestamp"]
+            for name, d in chunk["atomic_actions"].items():
+                finished_at = started_at + d
+                new_atomic_actions.append(
+                    {"name": name, "children": [],
+                     "started_at": started_at,
+                     "finished_at": finished_at})
+                started_at = finished_at
+            chunk["atomic_actions"] = new_atomic_actions
+        chunk_data = sa_types.ChunkData(chunk_data)
+        workload_data.update({
+            "chunk_data": chunk_data,
+            "chunk_size": chunk_data.size,
+            "compressed_chunk_size": chunk_data.compressed_size})
+
     # @db_api.serialize
     def task_get(self, uuid):
         task = self._task_get(uuid)
         return self._make_old_task(task)
 
     # @db_api.serialize
-    def task_get_detailed(self, uuid):
+    def task_get_detailed(self, uuid, include_data=True, lazy=False):
         task = self.task_get(uuid)
-        task["results"] = self._task_result_get_all_by_uuid(uuid)
+        task["results"] = self._task_result_get_all_by_uuid(
+            uuid, include_data=include_data, lazy=lazy)
         return task
 
     @db_api.serialize
@@ -365,20 +424,45 @@ class Connection(object):
         return result
 
     # @db_api.serialize
-    def task_list(self, status=None, deployment=None):
-        query = self.model_query(models.Task)
-
-        filters = {}
-        if status is not None:
-            filters["status"] = status
-        if deployment is not None:
-            filters["deployment_uuid"] = self.deployment_get(
-                deployment)["uuid"]
-
-        if filters:
-            query = query.filter_by(**filters)
+    def task_list(self, status=None, deployment=None, limit=None,
+                  offset=None, since=None):
+        session = get_session()
+        with session.begin():
+            # only columns which are listed are loaded, the input task and
+            # the description can be big
+            query = (session.query(models.Task, models.Deployment.name).
+                     outerjoin(models.Deployment,
+                               models.Task.deployment_uuid ==
+                               models.Deployment.uuid).
+                     options(sa_loadonly(*self.TASK_LIST_COLUMNS)))
 
-        return [self._make_old_task(task) for task in query.all()]
+            if status is not None:
+                query = query.filter(models.Task.status == status)
+            if deployment is not None:
+                deployment_uuid = self._deployment_get(
+                    deployment, session=session)["uuid"]
+                query = query.filter(
+                    models.Task.deployment_uuid == deployment_uuid)
+            if since is not None:
+                query = query.filter(models.Task.created_at >= since)
+
+            query = query.order_by(models.Task.id.asc())
+            if offset:
+                query = query.offset(offset)
+            if limit is not None:
+                query = query.limit(limit)
+
+            rows = query.all()
+            tags = self._tags_get_by_uuids([task.uuid for task, name in rows],
+                                           consts.TagType.TASK,
+                                           session=session)
+
+        tasks = []
+        for task, deployment_name in rows:
+            task_dict = self._make_old_task(task, tags=tags[task.uuid])
+            task_dict["deployment_name"] = deployment_name
+            tasks.append(task_dict)
+        return tasks
 
     def task_delete(self, uuid, status=None):
         session = get_session()
@@ -411,18 +495,29 @@ class Connection(object):
                                                            actual=task.status)
                 raise exceptions.TaskNotFound(uuid=uuid)
 
-    def _task_result_get_all_by_uuid(self, uuid):
+    def _task_result_get_all_by_uuid(self, uuid, include_data=True,
+                                     lazy=False):
         results = []
 
         workloads = (self.model_query(models.Workload).
                      filter_by(task_uuid=uuid).all())
 
         for workload in workloads:
-            workload_data_list = self._task_workload_data_get_all(
-                workload.uuid)
+            if not include_data and workload.statistics:
+                # Statistics of iterations are saved with the workload,
+                # so its raw data is not needed.
+                raw_data = []
+            elif lazy:
+                raw_data = utils.LazyChunkedList(functools.partial(
+                    self._task_workload_data_iter, workload.uuid))
+            else:
+                raw_data = [
+                    data
+                    for workload_data in self._task_workload_data_get_all(
+                        workload.uuid)
+                    for data in workload_data.chunk_data["raw"]]
 
-            results.append(
-                self._make_old_task_result(workload, workload_data_list))
+            results.append(self._make_old_task_result(workload, raw_data))
 
         return results
 
@@ -431,12 +526,14 @@ class Connection(object):
         return self._task_result_get_all_by_uuid(uuid)
 
     @db_api.serialize
-    def subtask_create(self, task_uuid, title, description=None, context=None):
+    def subtask_create(self, task_uuid, title, description=None, context=None,
+                       run_in_parallel=False):
         subtask = models.Subtask(task_uuid=task_uuid)
         subtask.update({
             "title": title,
             "description": description or "",
             "context": context or {},
+            "run_in_parallel": run_in_parallel,
         })
         subtask.save()
         return subtask
@@ -501,16 +598,16 @@ class Connection(object):
         if finished_at == 0:
             finished_at = now
 
+        chunk_data = sa_types.ChunkData(raw=raw_data)
         workload_data.update({
             "task_uuid": task_uuid,
             "workload_uuid": workload_uuid,
             "chunk_order": chunk_order,
             "iteration_count": iter_count,
             "failed_iteration_count": failed_iter_count,
-            "chunk_data": {"raw": raw_data},
-            # TODO(ikhudoshyn)
-            "chunk_size": 0,
-            "compressed_chunk_size": 0,
+            "chunk_data": chunk_data,
+            "chunk_size": chunk_data.size,
+            "compressed_chunk_size": chunk_data.compressed_size,
             "started_at": dt.datetime.fromtimestamp(started_at),
             "finished_at": dt.datetime.fromtimestamp(finished_at)
         })
@@ -522,30 +619,38 @@ class Connection(object):
         workload = self.model_query(models.Workload).filter_by(
             uuid=workload_uuid).first()
 
-        workload_data_list = self._task_workload_data_get_all(workload.uuid)
+        statistics = data.get("statistics")
+        if statistics:
+            iter_count = statistics["iterations_count"]
+            failed_iter_count = statistics["iterations_failed"]
+            min_duration = statistics["min_duration"]
+            max_duration = statistics["max_duration"]
+        else:
+            workload_data_list = self._task_workload_data_get_all(
+                workload.uuid)
 
-        raw_data = [raw
-                    for workload_data in workload_data_list
-                    for raw in workload_data.chunk_data["raw"]]
-        iter_count = len(raw_data)
+            raw_data = [raw
+                        for workload_data in workload_data_list
+                        for raw in workload_data.chunk_data["raw"]]
+            iter_count = len(raw_data)
 
-        failed_iter_count = 0
-        max_duration = 0
-        min_duration = 0
+            failed_iter_count = 0
+            max_duration = 0
+            min_duration = None
 
-        success = True
+            for d in raw_data:
+                if d.get("error"):
+                    failed_iter_count += 1
 
-        for d in raw_data:
-            if d.get("error"):
-                failed_iter_count += 1
+                duration = d.get("duration", 0)
 
-            duration = d.get("duration", 0)
+                if duration > max_duration:
+                    max_duration = duration
 
-            if duration > max_duration:
-                max_duration = duration
+                if min_duration is None or min_duration > duration:
+                    min_duration = duration
 
-            if min_duration and min_duration > duration:
-                min_duration = duration
+            statistics = {}
 
         sla = data.get("sla", [])
         # TODO(ikhudoshyn): if no SLA was specified and there are
@@ -567,13 +672,13 @@ class Connection(object):
             "hooks": data.get("hooks", []),
             "load_duration": data.get("load_duration", 0),
             "full_duration": data.get("full_duration", 0),
-            "min_duration": min_duration,
+            "min_duration": min_duration or 0,
             "max_duration": max_duration,
             "total_iteration_count": iter_count,
             "failed_iteration_count": failed_iter_count,
             # TODO(ikhudoshyn)
             "start_time": start,
-            "statistics": {},
+            "statistics": statistics,
             "pass_sla": success
         })
 
@@ -772,26 +877,32 @@ class Connection(object):
             if status:
                 filter_by["status"] = status
 
-            query = self.model_query(models.Verification, session=session)
-            if filter_by:
-                query = query.filter_by(**filter_by)
-
-            def add_tags_to_verifications(verifications):
-                for verification in verifications:
-                    verification.tags = sorted(self._tags_get(
-                        verification.uuid, consts.TagType.VERIFICATION))
-                return verifications
+            query = session.query(*models.Verification.__table__.columns)
+            for key, value in filter_by.items():
+                query = query.filter(
+                    getattr(models.Verification, key) == value)
 
             if tags:
                 uuids = self._uuids_by_tags_get(
                     consts.TagType.VERIFICATION, tags)
                 query = query.filter(models.Verification.uuid.in_(uuids))
 
-        return add_tags_to_verifications(query.all())
+            verifications = [dict(zip(row.keys(), row)) for row in query]
+            all_tags = self._tags_get_by_uuids(
+                [v["uuid"] for v in verifications],
+                consts.TagType.VERIFICATION, session=session)
+
+        for verification in verifications:
+            verification["tags"] = sorted(all_tags[verification["uuid"]])
+        return verifications
 
     def verification_delete(self, verification_uuid):
         session = get_session()
         with session.begin():
+            self.model_query(
+                models.VerificationTest, session=session).filter_by(
+                verification_uuid=verification_uuid).delete(
+                synchronize_session=False)
             count = self.model_query(
                 models.Verification, session=session).filter_by(
                 uuid=verification_uuid).delete(synchronize_session=False)
@@ -807,6 +918,101 @@ class Connection(object):
             verification.save()
         return verification
 
+    @staticmethod
+    def _make_verification_test(verification_uuid, test_id, result):
+        try:
+            duration = float(result.get("duration", 0))
+        except (TypeError, ValueError):
+            duration = 0.0
+        return {"verification_uuid": verification_uuid,
+                "test_id": test_id,
+                "status": result["status"],
+                "duration": duration,
+                "tags": result.get("tags") or [],
+                "details": dict((k, v) for k, v in result.items()
+                                if k not in ("status", "tags"))}
+
+    def verification_tests_add(self, verification_uuid, tests):
+        table = models.VerificationTest.__table__
+        tests = sorted(tests.items())
+        session = get_session()
+        with session.begin():
+            for i in range(0, len(tests), self.TESTS_BATCH_SIZE):
+                batch = tests[i:i + self.TESTS_BATCH_SIZE]
+                # results of tests are replaced, if they are stored already
+                session.execute(table.delete().where(sa.and_(
+                    table.c.verification_uuid == verification_uuid,
+                    table.c.test_id.in_([test_id for test_id, r in batch]))))
+                now = timeutils.utcnow()
+                rows = []
+                for test_id, result in batch:
+                    row = self._make_verification_test(verification_uuid,
+                                                       test_id, result)
+                    row["created_at"] = row["updated_at"] = now
+                    rows.append(row)
+                session.execute(table.insert(), rows)
+
+    def verification_tests_get(self, verification_uuids, status=None,
+                               min_duration=None):
+        table = models.VerificationTest.__table__
+        # results are loaded without ORM, there can be a lot of them. Json
+        # columns are decoded here without keeping order of keys, which is
+        # not needed for details and makes decoding a lot faster.
+        query = sa.select([table.c.verification_uuid, table.c.test_id,
+                           table.c.status,
+                           sa.type_coerce(table.c.tags, sa.Text),
+                           sa.type_coerce(table.c.details, sa.Text)])
+        query = query.where(table.c.verification_uuid.in_(verification_uuids))
+        if status is not None:
+            if isinstance(status, (list, tuple)):
+                query = query.where(table.c.status.in_(status))
+            else:
+                query = query.where(table.c.status == status)
+        if min_duration is not None:
+            query = query.where(table.c.duration >= min_duration)
+        query = query.order_by(table.c.test_id)
+
+        tests = dict((uuid, collections.OrderedDict())
+                     for uuid in verification_uuids)
+        rows = get_session().execute(query)
+        for chunk in iter(lambda: rows.fetchmany(self.TESTS_BATCH_SIZE), []):
+            for v_uuid, test_id, status, tags, details in chunk:
+                details = json.loads(details)
+                details["status"] = status
+                details["tags"] = json.loads(tags)
+                tests[v_uuid][test_id] = details
+        return tests
+
+    def verification_tests_compare(self, verification_uuids):
+        table = models.VerificationTest.__table__
+        # results are pivoted by the database: rows are grouped by tests
+        # and each verification gets its own columns, which are null if
+        # the verification does not have the test
+        columns = [table.c.test_id]
+        for uuid in verification_uuids:
+            in_verification = table.c.verification_uuid == uuid
+            for column in (table.c.status, table.c.tags, table.c.details):
+                columns.append(sa.func.max(sa.case(
+                    [(in_verification, sa.type_coerce(column, sa.Text))])))
+        query = (sa.select(columns).
+                 where(table.c.verification_uuid.in_(verification_uuids)).
+                 group_by(table.c.test_id).
+                 order_by(table.c.test_id))
+
+        rows = get_session().execute(query)
+        for chunk in iter(lambda: rows.fetchmany(self.TESTS_BATCH_SIZE), []):
+            for row in chunk:
+                results = collections.OrderedDict()
+                for i, uuid in enumerate(verification_uuids):
+                    status, tags, details = row[3 * i + 1:3 * i + 4]
+                    if status is None:
+                        continue
+                    details = json.loads(details)
+                    details["status"] = status
+                    details["tags"] = json.loads(tags)
+                    results[uuid] = details
+                yield row[0], results
+
     @db_api.serialize
     def register_worker(self, values):
         try:
@@ -827,6 +1033,13 @@ class Connection(object):
         except NoResultFound:
             raise exceptions.WorkerNotFound(worker=hostname)
 
+    @db_api.serialize
+    def get_workers(self, updated_since=None):
+        query = self.model_query(models.Worker)
+        if updated_since is not None:
+            query = query.filter(models.Worker.updated_at >= updated_since)
+        return query.order_by(models.Worker.hostname).all()
+
     def unregister_worker(self, hostname):
         count = (self.model_query(models.Worker).
                  filter_by(hostname=hostname).delete())
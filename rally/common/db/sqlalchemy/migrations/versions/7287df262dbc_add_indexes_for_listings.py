@@ -0,0 +1,44 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""add indexes for listings
+
+Revision ID: 7287df262dbc
+Revises: d27e2d93c44b
+Create Date: 2026-10-17 00:12:45.527311
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "7287df262dbc"
+down_revision = "d27e2d93c44b"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+from rally import exceptions
+
+
+def upgrade():
+    op.create_index("subtask_task_uuid", "subtasks", ["task_uuid"])
+    op.create_index("workload_task_uuid", "workloads", ["task_uuid"])
+    op.create_index("workload_data_workload_uuid", "workloaddata",
+                    ["workload_uuid", "chunk_order"])
+    op.create_index("workload_data_task_uuid", "workloaddata", ["task_uuid"])
+    op.create_index("tag_type_uuid", "tags", ["type", "uuid"])
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
@@ -0,0 +1,106 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""store results of verification tests
+
+Revision ID: c517b0011857
+Revises: 7287df262dbc
+Create Date: 2026-10-17 01:03:19.218536
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "c517b0011857"
+down_revision = "7287df262dbc"
+branch_labels = None
+depends_on = None
+
+import json
+
+from alembic import op
+from oslo_utils import timeutils
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import types as sa_types
+from rally import exceptions
+
+
+verifications_helper = sa.Table(
+    "verifications",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("uuid", sa.String(36), nullable=False),
+    sa.Column("tests", sa.Text)
+)
+
+BATCH_SIZE = 500
+
+
+def _make_row(verification_uuid, test_id, result, now):
+    details = dict((k, v) for k, v in result.items()
+                   if k not in ("status", "tags"))
+    try:
+        duration = float(result.get("duration", 0))
+    except (TypeError, ValueError):
+        duration = 0.0
+    return {"verification_uuid": verification_uuid,
+            "test_id": test_id,
+            "status": result.get("status", ""),
+            "duration": duration,
+            "tags": result.get("tags") or [],
+            "details": details,
+            "created_at": now,
+            "updated_at": now}
+
+
+def upgrade():
+    tests_table = op.create_table(
+        "verification_tests",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("verification_uuid", sa.String(36), nullable=False),
+        sa.Column("test_id", sa.Text, nullable=False),
+        sa.Column("status", sa.String(36), nullable=False),
+        sa.Column("duration", sa.Float),
+        sa.Column("tags", sa_types.JSONEncodedList, nullable=False),
+        sa.Column("details", sa_types.JSONEncodedDict, nullable=False),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+        sa.ForeignKeyConstraint(["verification_uuid"],
+                                ["verifications.uuid"])
+    )
+    op.create_index("verification_test_status", "verification_tests",
+                    ["verification_uuid", "status"])
+
+    connection = op.get_bind()
+    # results of tests can be huge, so verifications are loaded one by one
+    verifications = [(row.id, row.uuid) for row in connection.execute(
+        sa.select([verifications_helper.c.id, verifications_helper.c.uuid]))]
+    now = timeutils.utcnow()
+    for verification_id, verification_uuid in verifications:
+        tests = connection.execute(
+            sa.select([verifications_helper.c.tests]).where(
+                verifications_helper.c.id == verification_id)).scalar()
+        tests = sorted(json.loads(tests).items()) if tests else []
+        for i in range(0, len(tests), BATCH_SIZE):
+            connection.execute(
+                tests_table.insert(),
+                [_make_row(verification_uuid, test_id, result, now)
+                 for test_id, result in tests[i:i + BATCH_SIZE]])
+
+    with op.batch_alter_table("verifications") as batch_op:
+        batch_op.drop_column("tests")
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
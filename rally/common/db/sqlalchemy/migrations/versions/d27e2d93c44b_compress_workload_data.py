@@ -0,0 +1,69 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""compress workload data
+
+Revision ID: d27e2d93c44b
+Revises: 92aaaa2a6bb3
+Create Date: 2026-10-16 21:40:12.734210
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "d27e2d93c44b"
+down_revision = "92aaaa2a6bb3"
+branch_labels = None
+depends_on = None
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import types as sa_types
+from rally import exceptions
+
+
+workload_data_helper = sa.Table(
+    "workloaddata",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("chunk_size", sa.Integer, nullable=False),
+    sa.Column("compressed_chunk_size", sa.Integer, nullable=False),
+    sa.Column("chunk_data", sa.Text, nullable=False)
+)
+
+
+def upgrade():
+    connection = op.get_bind()
+    # Chunks can be huge, so they are loaded one by one.
+    ids = [row.id for row in connection.execute(
+        sa.select([workload_data_helper.c.id]))]
+    for chunk_id in ids:
+        chunk_data = connection.execute(
+            sa.select([workload_data_helper.c.chunk_data]).where(
+                workload_data_helper.c.id == chunk_id)).scalar()
+        if chunk_data.startswith(sa_types.CHUNK_PREFIX):
+            continue
+
+        chunk = sa_types.ChunkData(json.loads(chunk_data))
+        connection.execute(workload_data_helper.update().where(
+            workload_data_helper.c.id == chunk_id).values(
+            chunk_data=chunk.encoded,
+            chunk_size=chunk.size,
+            compressed_chunk_size=chunk.compressed_size))
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
@@ -178,6 +178,7 @@ class Subtask(BASE, RallyBase):
     __table_args__ = (
         sa.Index("subtask_uuid", "uuid", unique=True),
         sa.Index("subtask_status", "status"),
+        sa.Index("subtask_task_uuid", "task_uuid"),
     )
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
@@ -215,6 +216,7 @@ class Workload(BASE, RallyBase):
     __tablename__ = "workloads"
     __table_args__ = (
         sa.Index("workload_uuid", "uuid", unique=True),
+        sa.Index("workload_task_uuid", "task_uuid"),
     )
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
@@ -286,6 +288,9 @@ class WorkloadData(BASE, RallyBase):
     __tablename__ = "workloaddata"
     __table_args__ = (
         sa.Index("workload_data_uuid", "uuid", unique=True),
+        sa.Index("workload_data_workload_uuid", "workload_uuid",
+                 "chunk_order"),
+        sa.Index("workload_data_task_uuid", "task_uuid"),
     )
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
@@ -320,13 +325,14 @@ class WorkloadData(BASE, RallyBase):
     finished_at = sa.Column(sa.DateTime, default=lambda: timeutils.utcnow(),
                             nullable=False)
     chunk_data = sa.Column(
-        sa_types.MutableJSONEncodedDict, default={}, nullable=False)
+        sa_types.CompressedChunkData, default={}, nullable=False)
 
 
 class Tag(BASE, RallyBase):
     __tablename__ = "tags"
     __table_args__ = (
         sa.Index("d_type_tag", "uuid", "type", "tag", unique=True),
+        sa.Index("tag_type_uuid", "type", "uuid"),
     )
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
@@ -395,7 +401,27 @@ class Verification(BASE, RallyBase):
     expected_failures = sa.Column(sa.Integer, default=0)
     tests_duration = sa.Column(sa.Float, default=0.0)
 
-    tests = sa.Column(sa_types.MutableJSONEncodedDict, default={})
+
+class VerificationTest(BASE, RallyBase):
+    """Represents a result of a test of a verification."""
+
+    __tablename__ = "verification_tests"
+    __table_args__ = (
+        sa.Index("verification_test_status", "verification_uuid", "status"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+
+    verification_uuid = sa.Column(sa.String(36),
+                                  sa.ForeignKey(Verification.uuid),
+                                  nullable=False)
+
+    test_id = sa.Column(sa.Text, nullable=False)
+    status = sa.Column(sa.String(36), nullable=False)
+    duration = sa.Column(sa.Float, default=0.0)
+    tags = sa.Column(sa_types.JSONEncodedList, default=[], nullable=False)
+    # the rest data of the result, e.g. name, reason and traceback
+    details = sa.Column(sa_types.JSONEncodedDict, default={}, nullable=False)
 
 
 class Worker(BASE, RallyBase):
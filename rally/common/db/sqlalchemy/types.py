@@ -13,9 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import array
+import base64
 import collections
 import json
+import struct
+import sys
+import zlib
 
+import six
 from sqlalchemy.dialects import mysql as mysql_types
 from sqlalchemy.ext import mutable
 from sqlalchemy import types as sa_types
@@ -37,6 +43,10 @@ class LongText(sa_types.TypeDecorator):
             return dialect.type_descriptor(sa_types.Text)
 
 
+_ORDERED_DECODER = json.JSONDecoder(
+    object_pairs_hook=collections.OrderedDict)
+
+
 class JSONEncodedDict(LongText):
     """Represents an immutable structure as a json-encoded string."""
 
@@ -49,8 +59,7 @@ class JSONEncodedDict(LongText):
 
     def process_result_value(self, value, dialect):
         if value is not None:
-            value = json.loads(
-                value, object_pairs_hook=collections.OrderedDict)
+            value = _ORDERED_DECODER.decode(value)
         return value
 
 
@@ -63,6 +72,283 @@ class JSONEncodedList(JSONEncodedDict):
         return value
 
 
+CHUNK_PREFIX = "rally-chunk-v1:"
+
+
+class ChunkData(dict):
+    """Workload data chunk together with its compressed representation.
+
+    The chunk is encoded at creation, so sizes of the encoded data are
+    known before it is saved. The representation is not updated if the
+    chunk is modified afterwards.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(ChunkData, self).__init__(*args, **kwargs)
+        self.encoded, self.size, self.compressed_size = _encode_chunk(self)
+
+
+class CompressedChunkData(LongText):
+    """Represents workload data chunk as a compressed columnar structure.
+
+       Durations, timestamps and times of atomic actions are stored as
+       packed arrays of floats, errors, names of atomic actions and all
+       the rest data of iterations are dictionary-encoded. The result is
+       compressed by zlib and base64-encoded to fit text columns. Chunks
+       stored as json-encoded strings are loaded transparently.
+    """
+
+    impl = sa_types.Text
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        if not isinstance(value, ChunkData):
+            value = ChunkData(value)
+        return value.encoded
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        if value.startswith(CHUNK_PREFIX):
+            return _decode_chunk(value)
+        return json.loads(value, object_pairs_hook=collections.OrderedDict)
+
+
+_FLOAT_COLUMNS = ("timestamp", "duration", "idle_duration")
+_ACTION_KEYS = ("name", "started_at", "finished_at", "children")
+
+# integers are stored as doubles, which represent them exactly up to 2 ** 53
+_MAX_EXACT_INT = 2 ** 53
+
+
+class _IrregularData(Exception):
+    """Data can not be stored in columns, so it is kept as is."""
+
+
+def _is_int(value):
+    return (isinstance(value, six.integer_types) and
+            not isinstance(value, bool))
+
+
+def _is_number(value):
+    return (isinstance(value, float) or
+            (_is_int(value) and abs(value) <= _MAX_EXACT_INT))
+
+
+class _Table(object):
+    """Dictionary-encoding of json values."""
+
+    def __init__(self):
+        self.values = []
+        self._indexes = {}
+
+    def index(self, value):
+        key = json.dumps(value, sort_keys=True)
+        if key not in self._indexes:
+            self._indexes[key] = len(self.values)
+            self.values.append(json.dumps(value))
+        return self._indexes[key]
+
+
+def _add_numbers(arrays, ints, name, values):
+    """Add an array of numbers, remembering which of them are integers."""
+    arrays.append((name, array.array("d", values)))
+    positions = [i for i, value in enumerate(values) if _is_int(value)]
+    if positions and len(positions) == len(values):
+        ints[name] = True
+    elif positions:
+        ints[name] = False
+        arrays.append((name + "_ints", array.array("i", positions)))
+
+
+def _encode_actions(iterations, tables, arrays, ints):
+    counts = array.array("i")
+    action_names = array.array("i")
+    children = array.array("i")
+    started_at = []
+    finished_at = []
+    action_extras = array.array("i")
+    action_keys = array.array("i")
+
+    def encode(actions):
+        if not isinstance(actions, list):
+            raise _IrregularData()
+        for action in actions:
+            if (not isinstance(action, dict)
+                    or not isinstance(action.get("name"), six.string_types)
+                    or not _is_number(action.get("started_at"))
+                    or not _is_number(action.get("finished_at"))
+                    or not isinstance(action.get("children"), list)):
+                raise _IrregularData()
+            action_names.append(tables["names"].index(action["name"]))
+            children.append(len(action["children"]))
+            started_at.append(action["started_at"])
+            finished_at.append(action["finished_at"])
+            action_extras.append(tables["extras"].index(
+                dict((k, v) for k, v in action.items()
+                     if k not in _ACTION_KEYS)))
+            action_keys.append(tables["keys"].index(list(action)))
+            encode(action["children"])
+
+    for iteration in iterations:
+        actions = iteration.get("atomic_actions")
+        encode(actions)
+        counts.append(len(actions))
+
+    arrays.extend([("action_counts", counts),
+                   ("action_names", action_names),
+                   ("action_children", children),
+                   ("action_extras", action_extras),
+                   ("action_keys", action_keys)])
+    _add_numbers(arrays, ints, "action_started_at", started_at)
+    _add_numbers(arrays, ints, "action_finished_at", finished_at)
+
+
+def _encode_chunk(chunk):
+    """Encode workload data chunk.
+
+    :returns: tuple of the encoded string, size of the encoded data and
+        size of the compressed data
+    """
+    iterations = chunk.get("raw", [])
+    rest_chunk = dict((k, v) for k, v in chunk.items() if k != "raw")
+    columns = [key for key in _FLOAT_COLUMNS
+               if all(_is_number(it.get(key)) for it in iterations)]
+    tables = {"errors": _Table(), "rest": _Table(), "keys": _Table(),
+              "names": _Table(), "extras": _Table()}
+    arrays = []
+    ints = {}
+    for key in columns:
+        _add_numbers(arrays, ints, key, [it[key] for it in iterations])
+    columnar = set(columns)
+
+    try:
+        action_arrays = []
+        action_ints = {}
+        _encode_actions(iterations, tables, action_arrays, action_ints)
+        arrays.extend(action_arrays)
+        ints.update(action_ints)
+        columnar.add("atomic_actions")
+    except _IrregularData:
+        pass
+
+    errors = array.array("i")
+    rest = array.array("i")
+    keys = array.array("i")
+    for iteration in iterations:
+        if "error" in iteration:
+            errors.append(tables["errors"].index(iteration["error"]))
+        else:
+            errors.append(-1)
+        rest.append(tables["rest"].index(
+            dict((k, v) for k, v in iteration.items()
+                 if k not in columnar and k != "error")))
+        keys.append(tables["keys"].index(list(iteration)))
+    arrays.extend([("errors", errors), ("rest", rest), ("keys", keys)])
+
+    header = json.dumps({
+        "count": len(iterations),
+        "raw": "raw" in chunk,
+        "keys": list(chunk),
+        "columns": columns,
+        "atomic_actions": "atomic_actions" in columnar,
+        # doubles are decoded as floats, so integers are converted back
+        "ints": ints,
+        "arrays": [(name, values.typecode, len(values))
+                   for name, values in arrays],
+        "tables": dict((name, table.values)
+                       for name, table in tables.items()),
+        "chunk": rest_chunk}).encode("utf-8")
+    payload = [struct.pack("<I", len(header)), header]
+    for name, values in arrays:
+        if sys.byteorder == "big":
+            values.byteswap()
+        payload.append(values.tobytes() if six.PY3 else values.tostring())
+    payload = b"".join(payload)
+
+    compressed = zlib.compress(payload)
+    encoded = CHUNK_PREFIX + base64.b64encode(compressed).decode("ascii")
+    return encoded, len(payload), len(compressed)
+
+
+def _loads(value):
+    return json.loads(value, object_pairs_hook=collections.OrderedDict)
+
+
+def _ordered(keys, values):
+    """Return an ordered dict of values with the original order of keys."""
+    return collections.OrderedDict((key, values[key]) for key in keys)
+
+
+def _decode_chunk(value):
+    payload = zlib.decompress(base64.b64decode(value[len(CHUNK_PREFIX):]))
+    header_size = struct.unpack("<I", payload[:4])[0]
+    offset = 4 + header_size
+    header = _loads(payload[4:offset].decode("utf-8"))
+
+    arrays = {}
+    for name, typecode, length in header["arrays"]:
+        values = array.array(typecode)
+        end = offset + values.itemsize * length
+        if six.PY3:
+            values.frombytes(payload[offset:end])
+        else:
+            values.fromstring(payload[offset:end])
+        if sys.byteorder == "big":
+            values.byteswap()
+        arrays[name] = values
+        offset = end
+    for name, all_ints in header["ints"].items():
+        values = list(arrays[name])
+        for i in (range(len(values)) if all_ints
+                  else arrays[name + "_ints"]):
+            values[i] = int(values[i])
+        arrays[name] = values
+
+    tables = header["tables"]
+    names = [json.loads(v) for v in tables["names"]]
+    extras = [_loads(v) for v in tables["extras"]]
+    keys = [json.loads(v) for v in tables["keys"]]
+    if header["atomic_actions"]:
+        actions = iter(six.moves.zip(
+            arrays["action_names"], arrays["action_children"],
+            arrays["action_started_at"], arrays["action_finished_at"],
+            arrays["action_extras"], arrays["action_keys"]))
+
+    def decode_actions(count):
+        result = []
+        for name, children, started_at, finished_at, extra, action_keys in (
+                next(actions) for i in range(count)):
+            action = {"name": names[name],
+                      "started_at": started_at,
+                      "finished_at": finished_at}
+            action["children"] = decode_actions(children)
+            action.update(extras[extra])
+            result.append(_ordered(keys[action_keys], action))
+        return result
+
+    iterations = []
+    for i in range(header["count"]):
+        # Json is decoded for every iteration, so iterations do not
+        # share values.
+        iteration = _loads(tables["rest"][arrays["rest"][i]])
+        for key in header["columns"]:
+            iteration[key] = arrays[key][i]
+        if arrays["errors"][i] != -1:
+            iteration["error"] = _loads(
+                tables["errors"][arrays["errors"][i]])
+        if header["atomic_actions"]:
+            iteration["atomic_actions"] = decode_actions(
+                arrays["action_counts"][i])
+        iterations.append(_ordered(keys[arrays["keys"][i]], iteration))
+
+    chunk = header["chunk"]
+    if header["raw"]:
+        chunk["raw"] = iterations
+    return _ordered(header["keys"], chunk)
+
+
 class MutableDict(mutable.Mutable, dict):
     @classmethod
     def coerce(cls, key, value):
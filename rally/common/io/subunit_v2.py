@@ -14,6 +14,9 @@
 #    under the License.
 #
 
+import bisect
+import collections
+
 from oslo_utils import encodeutils
 from subunit import v2
 
@@ -58,13 +61,17 @@ def _parse_test_tags(test_id):
 class SubunitV2StreamResult(object):
 
     def __init__(self, expected_failures=None, skipped_tests=None, live=False,
-                 logger_name=None):
+                 logger_name=None, on_test_finished=None):
         self._tests = {}
         self._expected_failures = expected_failures or {}
         self._skipped_tests = skipped_tests or {}
 
         self._live = live
         self._logger = logging.getLogger(logger_name or __name__)
+        # NOTE: on_test_finished is called with ID and a copy of the result
+        # of every test when its status becomes known. The result can be
+        # changed later, if whole test class is failed or skipped.
+        self._on_test_finished = on_test_finished
 
         self._timestamps = {}
         # NOTE(andreykurilin): _first_timestamp and _last_timestamp variables
@@ -76,57 +83,108 @@ class SubunitV2StreamResult(object):
         self._unknown_entities = {}
         self._is_parsed = False
 
+        # NOTE: Attachments come in a lot of small chunks, so chunks are
+        # collected in lists and joined when the status of test is known.
+        self._files = {}
+        # Number of tests by status, it is updated on each status change.
+        self._statuses = collections.Counter()
+
     @staticmethod
     def _get_test_name(test_id):
         return test_id.split("[")[0] if test_id.find("[") > -1 else test_id
 
+    def _add_test(self, test_id, test):
+        if test_id in self._tests:
+            self._statuses[self._tests[test_id]["status"]] -= 1
+        self._files.pop(test_id, None)
+        self._tests[test_id] = test
+        self._statuses[test["status"]] += 1
+
+    def _set_status(self, test_id, status):
+        test = self._tests[test_id]
+        self._statuses[test["status"]] -= 1
+        self._statuses[status] += 1
+        test["status"] = status
+
+    def _add_file(self, entity_id, file_name, file_bytes):
+        files = self._files.setdefault(entity_id, {})
+        files.setdefault(file_name, []).append(file_bytes)
+
+    def _join_files(self, entity_id, entity):
+        for file_name, chunks in self._files.pop(entity_id, {}).items():
+            data = b"".join(chunks)
+            if file_name not in entity:
+                entity[file_name] = data
+            else:
+                entity[file_name] += data
+
     def _check_expected_failure(self, test_id):
         if (test_id in self._expected_failures or
                 self._get_test_name(test_id) in self._expected_failures):
             if self._tests[test_id]["status"] == "fail":
-                self._tests[test_id]["status"] = "xfail"
+                self._set_status(test_id, "xfail")
                 if self._expected_failures[test_id]:
                     self._tests[test_id]["reason"] = (
                         self._expected_failures[test_id])
             elif self._tests[test_id]["status"] == "success":
-                self._tests[test_id]["status"] = "uxsuccess"
+                self._set_status(test_id, "uxsuccess")
+
+    def _test_finished(self, test_id):
+        if self._on_test_finished is None:
+            return
+        result = dict(self._tests[test_id])
+        for file_name in ["traceback", "reason"]:
+            if file_name in result:
+                result[file_name] = encodeutils.safe_decode(result[file_name])
+        self._on_test_finished(test_id, result)
 
     def _process_skipped_tests(self):
         for t_id in self._skipped_tests.copy():
             if t_id not in self._tests:
                 status = "skip"
                 name = self._get_test_name(t_id)
-                self._tests[t_id] = {"status": status,
-                                     "name": name,
-                                     "duration": "%.3f" % 0,
-                                     "tags": _parse_test_tags(t_id)}
+                self._add_test(t_id, {"status": status,
+                                      "name": name,
+                                      "duration": "%.3f" % 0,
+                                      "tags": _parse_test_tags(t_id)})
                 if self._skipped_tests[t_id]:
                     self._tests[t_id]["reason"] = self._skipped_tests[t_id]
                     status += ": %s" % self._tests[t_id]["reason"]
                 if self._live:
                     self._logger.info("{-} %s ... %s", name, status)
+                self._test_finished(t_id)
 
             self._skipped_tests.pop(t_id)
 
+    def _get_tests_of(self, entity_id, sorted_test_ids):
+        """Find IDs of the test and the tests of the test class."""
+        if entity_id in self._tests:
+            yield entity_id
+        prefix = "%s." % entity_id
+        i = bisect.bisect_left(sorted_test_ids, prefix)
+        while (i < len(sorted_test_ids) and
+               sorted_test_ids[i].startswith(prefix)):
+            yield sorted_test_ids[i]
+            i += 1
+
     def _parse(self):
+        for test_id, test in self._tests.items():
+            self._join_files(test_id, test)
+
         # NOTE(andreykurilin): When whole test class is marked as skipped or
         # failed, there is only one event with reason and status. So we should
         # modify all tests of test class manually.
-        for test_id in self._unknown_entities:
-            known_test_ids = filter(lambda t:
-                                    t == test_id or t.startswith(
-                                        "%s." % test_id), self._tests)
-            for t_id in known_test_ids:
+        sorted_test_ids = sorted(self._tests) if self._unknown_entities else []
+        for test_id, entity in self._unknown_entities.items():
+            self._join_files(test_id, entity)
+            for t_id in self._get_tests_of(test_id, sorted_test_ids):
                 if self._tests[t_id]["status"] == "init":
-                    self._tests[t_id]["status"] = (
-                        self._unknown_entities[test_id]["status"])
+                    self._set_status(t_id, entity["status"])
 
-                if self._unknown_entities[test_id].get("reason"):
-                    self._tests[t_id]["reason"] = (
-                        self._unknown_entities[test_id]["reason"])
-                elif self._unknown_entities[test_id].get("traceback"):
-                    self._tests[t_id]["traceback"] = (
-                        self._unknown_entities[test_id]["traceback"])
+                if entity.get("reason"):
+                    self._tests[t_id]["reason"] = entity["reason"]
+                elif entity.get("traceback"):
+                    self._tests[t_id]["traceback"] = entity["traceback"]
 
         # decode data
         for test_id in self._tests:
@@ -153,11 +211,11 @@ class SubunitV2StreamResult(object):
 
         return {"tests_count": len(self.tests),
                 "tests_duration": "%.3f" % td,
-                "failures": len(self.filter_tests("fail")),
-                "skipped": len(self.filter_tests("skip")),
-                "success": len(self.filter_tests("success")),
-                "unexpected_success": len(self.filter_tests("uxsuccess")),
-                "expected_failures": len(self.filter_tests("xfail"))}
+                "failures": self._statuses["fail"],
+                "skipped": self._statuses["skip"],
+                "success": self._statuses["success"],
+                "unexpected_success": self._statuses["uxsuccess"],
+                "expected_failures": self._statuses["xfail"]}
 
     @prepare_input_args
     def status(self, test_id=None, test_status=None, timestamp=None, tags=None,
@@ -169,10 +227,10 @@ class SubunitV2StreamResult(object):
             self._last_timestamp = timestamp
 
         if test_status == "exists":
-            self._tests[test_id] = {"status": "init",
-                                    "name": self._get_test_name(test_id),
-                                    "duration": "%.3f" % 0,
-                                    "tags": tags if tags else []}
+            self._add_test(test_id, {"status": "init",
+                                     "name": self._get_test_name(test_id),
+                                     "duration": "%.3f" % 0,
+                                     "tags": tags if tags else []})
         elif test_id in self._tests:
             if test_status == "inprogress":
                 # timestamp of test start
@@ -182,23 +240,21 @@ class SubunitV2StreamResult(object):
             elif test_status:
                 self._tests[test_id]["duration"] = "%.3f" % (
                     timestamp - self._timestamps[test_id]).total_seconds()
-                self._tests[test_id]["status"] = test_status
+                self._join_files(test_id, self._tests[test_id])
+                self._set_status(test_id, test_status)
 
                 self._check_expected_failure(test_id)
-            else:
-                if file_name in ["traceback", "reason"]:
-                    if file_name not in self._tests[test_id]:
-                        self._tests[test_id][file_name] = file_bytes
-                    else:
-                        self._tests[test_id][file_name] += file_bytes
+                self._test_finished(test_id)
+            elif file_name in ["traceback", "reason"]:
+                self._add_file(test_id, file_name, file_bytes)
         else:
-            self._unknown_entities.setdefault(test_id, {"name": test_id})
-            self._unknown_entities[test_id]["status"] = test_status
+            entity = self._unknown_entities.setdefault(test_id,
+                                                       {"name": test_id})
+            entity["status"] = test_status
             if file_name in ["traceback", "reason"]:
-                if file_name not in self._unknown_entities[test_id]:
-                    self._unknown_entities[test_id][file_name] = file_bytes
-                else:
-                    self._unknown_entities[test_id][file_name] += file_bytes
+                self._add_file(test_id, file_name, file_bytes)
+            if test_status:
+                self._join_files(test_id, entity)
 
         if self._skipped_tests:
             self._process_skipped_tests()
@@ -227,25 +283,21 @@ class SubunitV2StreamResult(object):
 
     def filter_tests(self, status):
         """Filter tests by given status."""
-        filtered_tests = {}
-        for test in self.tests:
-            if self.tests[test]["status"] == status:
-                filtered_tests[test] = self.tests[test]
-
-        return filtered_tests
+        return dict((test_id, test) for test_id, test in self.tests.items()
+                    if test["status"] == status)
 
 
 def parse(stream, expected_failures=None, skipped_tests=None, live=False,
-          logger_name=None):
+          logger_name=None, on_test_finished=None):
     results = SubunitV2StreamResult(expected_failures, skipped_tests, live,
-                                    logger_name)
+                                    logger_name, on_test_finished)
     v2.ByteStreamToStreamResult(stream, "non-subunit").run(results)
 
     return results
 
 
 def parse_file(filename, expected_failures=None, skipped_tests=None,
-               live=False, logger_name=None):
+               live=False, logger_name=None, on_test_finished=None):
     with open(filename, "rb") as stream:
         return parse(stream, expected_failures, skipped_tests, live,
-                     logger_name)
+                     logger_name, on_test_finished)
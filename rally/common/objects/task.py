@@ -19,6 +19,8 @@ import uuid
 
 from rally.common import db
 from rally.common.i18n import _LE
+from rally.common import streaming_algorithms as streaming
+from rally.common import utils
 from rally import consts
 from rally import exceptions
 from rally.task.processing import charts
@@ -319,6 +321,131 @@ TASK_EXTENDED_RESULT_SCHEMA = {
 }
 
 
+class WorkloadStatistics(object):
+    """Aggregated data of workload iterations.
+
+    Iterations are processed one by one, so statistics can be gathered
+    while the workload is running and saved along with its results.
+    Reports can use the saved statistics instead of processing all the
+    iterations again.
+
+    Besides the rendered table of durations, the state of the mean and
+    the percentile computations of durations of each atomic action (and
+    of iterations as "total") is saved, so they can be restored and
+    merged with the ones of other workloads. Errors of iterations (up to
+    `max_errors` of them) and tables of additive output are saved too.
+    """
+
+    max_errors = 100
+
+    def __init__(self):
+        self.iterations_count = 0
+        self.iterations_failed = 0
+        self.min_duration = None
+        self.max_duration = None
+        self.tstamp_start = None
+        self.atomic = collections.OrderedDict()
+        self.durations = collections.OrderedDict()
+        self.total_durations = self._make_durations(1)
+        self.durations_stat = charts.MainStatsTable({})
+        self.errors = []
+        self.output = []
+
+    @staticmethod
+    def _make_durations(count):
+        return {"count": count,
+                "mean": streaming.MeanComputation(),
+                "percentile": streaming.PercentileComputation(0.5)}
+
+    def _merge_atomic(self, atomic_actions):
+        merged_atomic = collections.OrderedDict()
+        for action in atomic_actions:
+            name = action["name"]
+            duration = action["finished_at"] - action["started_at"]
+            if name not in merged_atomic:
+                merged_atomic[name] = {"duration": duration, "count": 1}
+            else:
+                merged_atomic[name]["duration"] += duration
+                merged_atomic[name]["count"] += 1
+        return merged_atomic
+
+    def _add_durations(self, name, duration, count):
+        # the same as in the table of durations, only iterations with the
+        # biggest number of calls of the atomic action are counted
+        durations = self.durations.get(name)
+        if durations is None or count > durations["count"]:
+            durations = self.durations[name] = self._make_durations(count)
+        elif count < durations["count"]:
+            return
+        durations["mean"].add(duration)
+        durations["percentile"].add(duration)
+
+    def add_iteration(self, iteration):
+        self.iterations_count += 1
+        merged_atomic = self._merge_atomic(
+            iteration.get("atomic_actions", []))
+        for name, value in merged_atomic.items():
+            duration = value["duration"]
+            count = value["count"]
+            if name not in self.atomic or count > self.atomic[name]["count"]:
+                self.atomic[name] = {"min_duration": duration,
+                                     "max_duration": duration,
+                                     "count": count}
+            elif count == self.atomic[name]["count"]:
+                if duration < self.atomic[name]["min_duration"]:
+                    self.atomic[name]["min_duration"] = duration
+                if duration > self.atomic[name]["max_duration"]:
+                    self.atomic[name]["max_duration"] = duration
+
+        if (self.tstamp_start is None
+                or iteration["timestamp"] < self.tstamp_start):
+            self.tstamp_start = iteration["timestamp"]
+
+        if iteration.get("error"):
+            self.iterations_failed += 1
+            if len(self.errors) < self.max_errors:
+                self.errors.append((iteration["timestamp"],
+                                    iteration["error"]))
+        else:
+            duration = iteration["duration"] or 0
+            if self.min_duration is None or duration < self.min_duration:
+                self.min_duration = duration
+            if self.max_duration is None or duration > self.max_duration:
+                self.max_duration = duration
+            for name, value in merged_atomic.items():
+                self._add_durations(name, value["duration"], value["count"])
+            self.total_durations["mean"].add(duration)
+            self.total_durations["percentile"].add(duration)
+
+        additive = iteration.get("output", {}).get("additive", [])
+        for idx, output in enumerate(additive):
+            if len(self.output) <= idx:
+                self.output.append(charts.OutputStatsTable(
+                    {}, title=output["title"]))
+            self.output[idx].add_iteration(output["data"])
+
+        self.durations_stat.add_iteration(iteration)
+
+    def to_dict(self):
+        durations = collections.OrderedDict()
+        for name, value in (list(self.durations.items())
+                            + [("total", self.total_durations)]):
+            durations[name] = {"count": value["count"],
+                               "mean": value["mean"].to_dict(),
+                               "percentile": value["percentile"].to_dict()}
+        return {"stat": self.durations_stat.render(),
+                "atomic": self.atomic,
+                "durations": durations,
+                "errors": [error for timestamp, error
+                           in sorted(self.errors, key=lambda e: e[0])],
+                "output": [table.render() for table in self.output],
+                "iterations_count": self.iterations_count,
+                "iterations_failed": self.iterations_failed,
+                "min_duration": self.min_duration or 0,
+                "max_duration": self.max_duration or 0,
+                "tstamp_start": self.tstamp_start or 0}
+
+
 class Task(object):
     """Represents a task object.
 
@@ -362,17 +489,20 @@ class Task(object):
     def __getitem__(self, key):
         return self.task[key]
 
-    def to_dict(self):
+    def to_dict(self, include_results=True):
         db_task = self.task
-        deployment_name = db.deployment_get(
-            self.task["deployment_uuid"])["name"]
-        db_task["deployment_name"] = deployment_name
+        if "deployment_name" not in db_task:
+            # the name is already loaded by the list of tasks
+            db_task["deployment_name"] = db.deployment_get(
+                self.task["deployment_uuid"])["name"]
         db_task["duration"] = db_task.get(
             "updated_at") - db_task.get("created_at")
         db_task["created_at"] = db_task.get("created_at",
                                             "").strftime(self.TIME_FORMAT)
         db_task["updated_at"] = db_task.get("updated_at",
                                             "").strftime(self.TIME_FORMAT)
+        if not include_results:
+            return db_task
         db_results = self.get_results()
         results = []
         for result in db_results:
@@ -385,8 +515,10 @@ class Task(object):
         return db_task
 
     @staticmethod
-    def get_detailed(task_id):
-        task_detail = db.api.task_get_detailed(task_id)
+    def get_detailed(task_id, include_data=True, lazy=False):
+        task_detail = db.api.task_get_detailed(task_id,
+                                               include_data=include_data,
+                                               lazy=lazy)
         results = []
         for result in task_detail["results"]:
             result["created_at"] = result.get("created_at", "").strftime(
@@ -406,8 +538,10 @@ class Task(object):
         return db.task_get_status(uuid)
 
     @staticmethod
-    def list(status=None, deployment=None):
-        return [Task(db_task) for db_task in db.task_list(status, deployment)]
+    def list(status=None, deployment=None, limit=None, offset=None,
+             since=None):
+        return [Task(db_task) for db_task in db.task_list(
+            status, deployment, limit=limit, offset=offset, since=since)]
 
     @staticmethod
     def delete_by_uuid(uuid, status=None):
@@ -440,6 +574,24 @@ class Task(object):
     def get_results(self):
         return db.task_result_get_all_by_uuid(self.task["uuid"])
 
+    @staticmethod
+    def _fix_output(itr):
+        if "output" not in itr:
+            itr["output"] = {"additive": [], "complete": []}
+
+            # NOTE(amaretskiy): Deprecated "scenario_output"
+            #     is supported for backward compatibility
+            if ("scenario_output" in itr
+                    and itr["scenario_output"]["data"]):
+                itr["output"]["additive"].append(
+                    {"items":
+                        itr["scenario_output"]["data"].items(),
+                     "title": "Scenario output",
+                     "description": "",
+                     "chart": "OutputStackedAreaChart"})
+                del itr["scenario_output"]
+        return itr
+
     @classmethod
     def extend_results(cls, results, serializable=False):
         """Modify and extend results with aggregated data.
@@ -461,7 +613,9 @@ class Task(object):
                   key - dict, scenario input data
                   sla - list, SLA results
                   iterations - if serializable, then iterator with
-                               iterations data, otherwise a list
+                               iterations data, otherwise a list;
+                               generator if iterations are loaded
+                               lazily
                   created_at - str datetime,
                   updated_at - str datetime,
                   info:
@@ -477,95 +631,38 @@ class Task(object):
                       load_duration - float load scenario duration
         """
 
-        def _merge_atomic(atomic_actions):
-            merged_atomic = collections.OrderedDict()
-            for action in atomic_actions:
-                name = action["name"]
-                duration = action["finished_at"] - action["started_at"]
-                if name not in merged_atomic:
-                    merged_atomic[name] = {"duration": duration, "count": 1}
-                else:
-                    merged_atomic[name]["duration"] += duration
-                    merged_atomic[name]["count"] += 1
-            return merged_atomic
-
         extended = []
         for scenario_result in results:
             scenario = dict(scenario_result)
-            tstamp_start = 0
-            min_duration = 0
-            max_duration = 0
-            iterations_failed = 0
-            atomic = collections.OrderedDict()
-
-            for itr in scenario["data"]["raw"]:
-                merged_atomic = _merge_atomic(itr["atomic_actions"])
-                for name, value in merged_atomic.items():
-                    duration = value["duration"]
-                    count = value["count"]
-                    if name not in atomic or count > atomic[name]["count"]:
-                        atomic[name] = {"min_duration": duration,
-                                        "max_duration": duration,
-                                        "count": count}
-                    elif count == atomic[name]["count"]:
-                        if duration < atomic[name]["min_duration"]:
-                            atomic[name]["min_duration"] = duration
-                        if duration > atomic[name]["max_duration"]:
-                            atomic[name]["max_duration"] = duration
-
-                if not tstamp_start or itr["timestamp"] < tstamp_start:
-                    tstamp_start = itr["timestamp"]
-
-                if "output" not in itr:
-                    itr["output"] = {"additive": [], "complete": []}
-
-                    # NOTE(amaretskiy): Deprecated "scenario_output"
-                    #     is supported for backward compatibility
-                    if ("scenario_output" in itr
-                            and itr["scenario_output"]["data"]):
-                        itr["output"]["additive"].append(
-                            {"items": itr["scenario_output"]["data"].items(),
-                             "title": "Scenario output",
-                             "description": "",
-                             "chart": "OutputStackedAreaChart"})
-                        del itr["scenario_output"]
-
-                if itr["error"]:
-                    iterations_failed += 1
-                else:
-                    duration = itr["duration"] or 0
-                    if not min_duration or duration < min_duration:
-                        min_duration = duration
-                    if not max_duration or duration > max_duration:
-                        max_duration = duration
+            statistics = scenario["data"].get("statistics")
+            raw = scenario["data"]["raw"]
+            if not statistics:
+                workload_stats = WorkloadStatistics()
+                for itr in raw:
+                    workload_stats.add_iteration(cls._fix_output(itr))
+                statistics = workload_stats.to_dict()
 
             for k in "created_at", "updated_at":
                 if scenario[k] and isinstance(scenario[k], dt.datetime):
                     scenario[k] = scenario[k].strftime("%Y-%d-%m %H:%M:%S")
 
-            durations_stat = charts.MainStatsTable(
-                {"iterations_count": len(scenario["data"]["raw"]),
-                 "atomic": atomic})
-
-            for itr in scenario["data"]["raw"]:
-                durations_stat.add_iteration(itr)
-
-            scenario["info"] = {
-                "stat": durations_stat.render(),
-                "atomic": atomic,
-                "iterations_count": len(scenario["data"]["raw"]),
-                "iterations_failed": iterations_failed,
-                "min_duration": min_duration,
-                "max_duration": max_duration,
-                "tstamp_start": tstamp_start,
-                "full_duration": scenario["data"]["full_duration"],
-                "load_duration": scenario["data"]["load_duration"]}
-            iterations = sorted(scenario["data"]["raw"],
-                                key=lambda itr: itr["timestamp"])
-            if serializable:
-                scenario["iterations"] = list(iterations)
+            scenario["info"] = dict(
+                statistics,
+                full_duration=scenario["data"]["full_duration"],
+                load_duration=scenario["data"]["load_duration"])
+            if isinstance(raw, utils.LazyChunkedList):
+                # Iterations are loaded chunk by chunk, so they are
+                # sorted and fixed on the fly instead of being loaded
+                # all at once.
+                scenario["iterations"] = (
+                    cls._fix_output(itr) for itr in raw.iter_sorted(
+                        key=lambda itr: itr["timestamp"]))
             else:
-                scenario["iterations"] = iter(iterations)
+                iterations = sorted(raw, key=lambda itr: itr["timestamp"])
+                if serializable:
+                    scenario["iterations"] = list(iterations)
+                else:
+                    scenario["iterations"] = iter(iterations)
             scenario["sla"] = scenario["data"]["sla"]
             scenario["hooks"] = scenario["data"].get("hooks", [])
             del scenario["data"]
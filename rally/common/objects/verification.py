@@ -20,6 +20,9 @@ from rally import consts
 class Verification(object):
     """Represents a verification object."""
     TIME_FORMAT = consts.TimeFormat.ISO8601
+    # number of results of tests which are stored at once while tests
+    # are running
+    TESTS_BATCH_SIZE = 100
 
     def __init__(self, verification):
         """Init a verification object.
@@ -28,6 +31,11 @@ class Verification(object):
                              in the database
         """
         self._db_entry = verification
+        self._tests = None
+        # results of tests which are added, but not stored yet
+        self._new_tests = {}
+        # results of tests which are stored while tests are running
+        self._stored_tests = {}
 
     def __getattr__(self, attr):
         return self._db_entry[attr]
@@ -35,11 +43,39 @@ class Verification(object):
     def __getitem__(self, item):
         return self._db_entry[item]
 
-    def to_dict(self, item=None):
+    @property
+    def tests(self):
+        """Results of all tests of the verification."""
+        if self._tests is None:
+            self._tests = self.get_tests()
+        return self._tests
+
+    def get_tests(self, status=None, min_duration=None):
+        """Get results of tests of the verification.
+
+        Tests are filtered by the database.
+
+        :param status: a status or a list of statuses to filter tests by
+        :param min_duration: get only tests which took at least the given
+            number of seconds
+        """
+        return db.verification_tests_get(
+            [self.uuid], status=status, min_duration=min_duration)[self.uuid]
+
+    @staticmethod
+    def compare_tests(verifications):
+        """Get results of tests of several verifications side by side.
+
+        Results are grouped by tests in the database, see
+        rally.common.db.api.verification_tests_compare.
+        """
+        return db.verification_tests_compare([v.uuid for v in verifications])
+
+    def to_dict(self, item=None, include_tests=True):
         data = {}
         formatters = ["created_at", "updated_at"]
         fields = ["deployment_uuid", "verifier_uuid", "uuid", "id",
-                  "unexpected_success", "status", "tests", "skipped",
+                  "unexpected_success", "status", "skipped",
                   "tags", "tests_duration", "run_args", "success",
                   "expected_failures", "tests_count", "failures"]
         for field in fields:
@@ -47,6 +83,8 @@ class Verification(object):
         for field in formatters:
             data[field] = self._db_entry.get(field, "").strftime(
                 self.TIME_FORMAT)
+        if include_tests:
+            data["tests"] = self.tests
         return data
 
     @classmethod
@@ -74,14 +112,38 @@ class Verification(object):
     def update_status(self, status):
         self._update(status=status)
 
+    def add_test(self, test_id, result):
+        """Add a result of a test while tests are running.
+
+        Results are stored by batches.
+        """
+        self._new_tests[test_id] = result
+        if len(self._new_tests) >= self.TESTS_BATCH_SIZE:
+            self._store_tests(self._new_tests)
+
+    def _store_tests(self, tests):
+        db.verification_tests_add(self.uuid, tests)
+        self._stored_tests.update(tests)
+        self._new_tests = {}
+        self._tests = None
+
     def finish(self, totals, tests):
         if (totals.get("failures", 0) == 0 and
                 totals.get("unexpected_success", 0) == 0):
             status = consts.VerificationStatus.FINISHED
         else:
             status = consts.VerificationStatus.FAILED
-        self._update(status=status, tests=tests, **totals)
+        # only results which are not stored yet or are changed after they
+        # were stored (e.g. by failures of whole test classes) are saved
+        changed = dict((test_id, result) for test_id, result in tests.items()
+                       if self._stored_tests.get(test_id) != result)
+        if changed:
+            self._store_tests(changed)
+        self._tests = tests
+        self._update(status=status, **totals)
 
     def set_error(self, error_message):
         # TODO(andreykurilin): Save error message in the database.
+        if self._new_tests:
+            self._store_tests(self._new_tests)
         self.update_status(consts.VerificationStatus.CRASHED)
@@ -16,29 +16,44 @@ import itertools
 
 from oslo_config import cfg
 
+from rally.aas import agent_utils
+from rally.aas import service_utils
 from rally.common import logging
 from rally import osclients
 from rally.plugins.openstack.cfg import opts as openstack_opts
 from rally.task import engine
+from rally.task import utils as task_utils
 
 CONF = cfg.CONF
 
 
 def list_opts():
-
     merged_opts = {}
     for category, options in openstack_opts.list_opts().items():
         merged_opts.setdefault(category, [])
         merged_opts[category].extend(options)
     merged_opts["DEFAULT"] = itertools.chain(logging.DEBUG_OPTS,
                                              osclients.OSCLIENTS_OPTS,
-                                             engine.TASK_ENGINE_OPTS)
+                                             engine.TASK_ENGINE_OPTS,
+                                             task_utils.RESULT_VALIDATION_OPTS,
+                                             task_utils.STATUS_POLLER_OPTS)
+    merged_opts["service"] = service_utils.SERVICE_OPTS
+    merged_opts["agent"] = agent_utils.AGENT_OPTS
     return merged_opts.items()
 
 
-def register():
+def register(categories=None):
+    """Register options listed by list_opts.
+
+    :param categories: names of option groups (including "DEFAULT") to
+        register, all the options are registered by default
+    """
     for category, options in list_opts():
+        if categories is not None and category not in categories:
+            continue
+        if category == "DEFAULT":
+            CONF.register_opts(options)
+            continue
         group = cfg.OptGroup(name=category, title="%s options" % category)
-        if category != "DEFAULT":
-            CONF.register_group(group)
+        CONF.register_group(group)
         CONF.register_opts(options, group=group)
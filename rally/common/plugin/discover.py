@@ -19,6 +19,7 @@ import os
 import pkg_resources
 import pkgutil
 import sys
+import threading
 
 from oslo_utils import importutils
 import six
@@ -29,6 +30,14 @@ from rally.common import logging
 
 LOG = logging.getLogger(__name__)
 
+# Modules with plugins which are imported only when their plugins are
+# requested, indexed by names of plugins.
+_LAZY_PLUGINS = {}
+# Other modules which are imported only when all the plugins (or other
+# subclasses, e.g. resource managers of cleanup) are requested.
+_LAZY_MODULES = []
+_LAZY_PLUGINS_LOCK = threading.RLock()
+
 
 def itersubclasses(cls, seen=None):
     """Generator over all subclasses of a given class in depth first order.
@@ -37,6 +46,9 @@ def itersubclasses(cls, seen=None):
     cls maybe has multiple super classes of the same plugin.
     """
 
+    if seen is None:
+        # subclasses can be defined in modules which are not imported yet
+        import_lazy_modules()
     seen = seen or set()
     try:
         subs = cls.__subclasses__()
@@ -50,11 +62,13 @@ def itersubclasses(cls, seen=None):
                 yield sub
 
 
-def import_modules_from_package(package):
-    """Import modules from package and append into sys.modules
+def find_modules_from_package(package):
+    """Find modules of package without importing them.
 
     :param package: Full package name. For example: rally.deployment.engines
+    :returns: list of tuples with module name and path to its file
     """
+    modules = []
     path = [os.path.dirname(rally.__file__), ".."] + package.split(".")
     path = os.path.join(*path)
     for root, dirs, files in os.walk(path):
@@ -63,13 +77,22 @@ def import_modules_from_package(package):
                 continue
             new_package = ".".join(root.split(os.sep)).split("....")[1]
             module_name = "%s.%s" % (new_package, filename[:-3])
-            if module_name not in sys.modules:
-                sys.modules[module_name] = importutils.import_module(
-                    module_name)
+            modules.append((module_name, os.path.join(root, filename)))
+    return modules
 
 
-def import_modules_by_entry_point():
-    """Import plugins by entry-point 'rally_plugins'."""
+def import_modules_from_package(package):
+    """Import modules from package and append into sys.modules
+
+    :param package: Full package name. For example: rally.deployment.engines
+    """
+    for module_name, path in find_modules_from_package(package):
+        if module_name not in sys.modules:
+            sys.modules[module_name] = importutils.import_module(
+                module_name)
+
+
+def _walk_entry_points():
     for ep in pkg_resources.iter_entry_points("rally_plugins"):
         if ep.name == "path":
             try:
@@ -79,19 +102,101 @@ def import_modules_by_entry_point():
                 else:
                     path = [m.__file__]
                 prefix = m.__name__ + "."
-                for loader, name, _is_pkg in pkgutil.walk_packages(
-                        path, prefix=prefix):
-                    sys.modules[name] = importlib.import_module(name)
+                yield ep, pkgutil.walk_packages(path, prefix=prefix)
             except Exception as e:
-                msg = ("\t Failed to load plugins from module '%(module)s' "
-                       "(package: '%(package)s')" %
-                       {"module": ep.module_name,
-                        "package": "%s %s" % (ep.dist.project_name,
-                                              ep.dist.version)})
-                if logging.is_debug():
-                    LOG.exception(msg)
+                _log_entry_point_error(ep, e)
+
+
+def _log_entry_point_error(ep, e):
+    msg = ("\t Failed to load plugins from module '%(module)s' "
+           "(package: '%(package)s')" %
+           {"module": ep.module_name,
+            "package": "%s %s" % (ep.dist.project_name, ep.dist.version)})
+    if logging.is_debug():
+        LOG.exception(msg)
+    else:
+        LOG.warning(msg + (": %s" % six.text_type(e)))
+
+
+def find_modules_by_entry_point():
+    """Find modules of plugins by entry-point 'rally_plugins'.
+
+    Packages are imported to walk over them, modules are not imported.
+
+    :returns: list of tuples with module name and path to its file
+    """
+    modules = []
+    for ep, packages in _walk_entry_points():
+        try:
+            for loader, name, is_pkg in packages:
+                path = os.path.join(getattr(loader, "path", ""),
+                                    name.rsplit(".", 1)[-1])
+                if is_pkg:
+                    path = os.path.join(path, "__init__.py")
                 else:
-                    LOG.warning(msg + (": %s" % six.text_type(e)))
+                    path += ".py"
+                modules.append((name, path))
+        except Exception as e:
+            _log_entry_point_error(ep, e)
+    return modules
+
+
+def import_modules_by_entry_point():
+    """Import plugins by entry-point 'rally_plugins'."""
+    for ep, packages in _walk_entry_points():
+        try:
+            for loader, name, _is_pkg in packages:
+                sys.modules[name] = importlib.import_module(name)
+        except Exception as e:
+            _log_entry_point_error(ep, e)
+
+
+def import_lazily(plugins, modules=()):
+    """Register modules with plugins to import them on demand.
+
+    :param plugins: list of dicts with name, namespace and module of
+        each plugin
+    :param modules: names of other modules which are imported only when
+        all the registered modules are imported
+    """
+    with _LAZY_PLUGINS_LOCK:
+        for p in plugins:
+            _LAZY_PLUGINS.setdefault(p["name"], []).append(
+                (p["namespace"], p["module"]))
+        _LAZY_MODULES.extend(modules)
+
+
+def import_lazy_modules(name=None, namespace=None):
+    """Import registered modules with plugins.
+
+    :param name: import only modules with plugins of this name. All the
+        registered modules are imported if name is not specified.
+    :param namespace: import only modules with plugins of this namespace
+    """
+    with _LAZY_PLUGINS_LOCK:
+        if not _LAZY_PLUGINS and not _LAZY_MODULES:
+            return
+        if name is None:
+            modules = [module for plugins in _LAZY_PLUGINS.values()
+                       for ns, module in plugins]
+            modules.extend(_LAZY_MODULES)
+            _LAZY_PLUGINS.clear()
+            del _LAZY_MODULES[:]
+        else:
+            plugins = _LAZY_PLUGINS.get(name, [])
+            modules = [module for ns, module in plugins
+                       if namespace in (None, ns)]
+            plugins = [(ns, module) for ns, module in plugins
+                       if namespace not in (None, ns)]
+            if plugins:
+                _LAZY_PLUGINS[name] = plugins
+            else:
+                _LAZY_PLUGINS.pop(name, None)
+        # modules are unregistered before they are imported, so plugins
+        # which are configured while importing do not import them again
+        for module in modules:
+            if module not in sys.modules:
+                importutils.import_module(module)
 
 
 def load_plugins(dir_or_file):
@@ -14,6 +14,7 @@
 #    under the License.
 
 import sys
+import weakref
 
 from rally.common.i18n import _
 from rally.common.i18n import _LE
@@ -23,6 +24,37 @@ from rally.common.plugin import meta
 from rally import exceptions
 
 
+# Index of configured plugins by their names. It allows to find plugin
+# without walking over the whole tree of subclasses. Weak references are
+# stored, so the index does not keep alive plugins which are not used
+# anymore (the same way as cls.__subclasses__() does not).
+_PLUGINS_BY_NAME = {}
+
+
+def _index_plugin(plugin_cls, name):
+    refs = _PLUGINS_BY_NAME.setdefault(name, [])
+    if not any(ref() is plugin_cls for ref in refs):
+        refs.append(weakref.ref(plugin_cls))
+
+
+def _unindex_plugin(plugin_cls, name):
+    refs = [ref for ref in _PLUGINS_BY_NAME.get(name, [])
+            if ref() is not None and ref() is not plugin_cls]
+    if refs:
+        _PLUGINS_BY_NAME[name] = refs
+    else:
+        _PLUGINS_BY_NAME.pop(name, None)
+
+
+def _get_indexed_plugins(name):
+    refs = _PLUGINS_BY_NAME.get(name, [])
+    plugins = [ref() for ref in refs]
+    if None in plugins:
+        _PLUGINS_BY_NAME[name] = [ref for ref in refs if ref() is not None]
+        plugins = [p for p in plugins if p is not None]
+    return plugins
+
+
 def deprecated(reason, rally_version):
     """Mark plugin as deprecated.
 
@@ -170,6 +202,8 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
     @classmethod
     def unregister(cls):
         """Removes all plugin meta information and makes it undiscoverable."""
+        if cls._meta_is_inited(raise_exc=False):
+            _unindex_plugin(cls, cls.get_name())
         cls._meta_clear()
 
     @classmethod
@@ -187,6 +221,7 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
         except exceptions.PluginNotFound:
             cls._meta_set("name", name)
             cls._meta_set("namespace", namespace)
+            _index_plugin(cls, name)
         else:
             raise exceptions.PluginWithSuchNameExists(
                 name=name, namespace=existing_plugin.get_namespace(),
@@ -214,8 +249,8 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
             fallback_to_default=True):
         """Return plugin by its name from specified namespace.
 
-        This method iterates over all subclasses of cls and returns plugin
-        by name from specified namespace.
+        This method looks for plugin by name among subclasses of cls and
+        returns plugin from specified namespace.
 
         If namespace is not specified, it will return first found plugin from
         any of namespaces.
@@ -261,13 +296,25 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
 
         All plugins that are not configured will be ignored.
 
+        If name is specified, plugins are taken from the index of configured
+        plugins instead of walking over all subclasses of plugin.
+
         :param namespace: return only plugins from specified namespace.
         :param name: return only plugins with specified name.
         :param allow_hidden: if False return only non hidden plugins
         """
         plugins = []
 
-        for p in discover.itersubclasses(cls):
+        if name:
+            # modules of plugins can be not imported yet, if plugins are
+            # loaded lazily
+            discover.import_lazy_modules(name, namespace)
+            subclasses = [p for p in _get_indexed_plugins(name)
+                          if cls in p.__mro__[1:]]
+        else:
+            subclasses = discover.itersubclasses(cls)
+
+        for p in subclasses:
             if not issubclass(p, Plugin):
                 continue
             if not p._meta_is_inited(raise_exc=False):
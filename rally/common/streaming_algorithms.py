@@ -16,12 +16,12 @@
 from __future__ import division
 
 import abc
+import array
+import bisect
 import math
 
 import six
 
-from rally.task.processing import utils
-
 
 @six.add_metaclass(abc.ABCMeta)
 class StreamingAlgorithm(object):
@@ -66,6 +66,18 @@ class MeanComputation(StreamingAlgorithm):
             return self.total / self.count
         return None
 
+    def to_dict(self):
+        """Return the state of the computation, it can be saved as json."""
+        return {"count": self.count, "total": self.total}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore the computation from the state returned by to_dict()."""
+        computation = cls()
+        computation.count = data["count"]
+        computation.total = data["total"]
+        return computation
+
 
 class StdDevComputation(StreamingAlgorithm):
     """Compute standard deviation for a stream of numbers."""
@@ -153,43 +165,262 @@ class MaxComputation(StreamingAlgorithm):
         return self._value
 
 
+class _LogHistogram(object):
+    """Logarithmic histogram of a stream of numbers.
+
+    Values are counted in buckets with bounds growing by the factor of
+    (1 + accuracy) / (1 - accuracy), so the value of a bucket differs from
+    values counted in it by at most `accuracy` of their value. If
+    `max_buckets` is set, the histogram holds at most `max_buckets`
+    buckets for positive and for negative values, when it overflows the
+    buckets closest to zero are collapsed together (that affects only the
+    precision of the smallest values).
+    """
+
+    def __init__(self, accuracy, max_buckets=None):
+        self._max_buckets = max_buckets
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.zeros = 0
+        self.positive = {}
+        self.negative = {}
+        self._floors = {"positive": None, "negative": None}
+
+    def add(self, value, count=1):
+        if value > 0:
+            self._add_to_buckets("positive", self._bucket_index(value), count)
+        elif value < 0:
+            self._add_to_buckets("negative", self._bucket_index(-value),
+                                 count)
+        else:
+            self.zeros += count
+
+    def merge(self, other):
+        self.zeros += other.zeros
+        for sign in ("positive", "negative"):
+            for index, count in getattr(other, sign).items():
+                self._add_to_buckets(sign, index, count)
+
+    def _bucket_index(self, value):
+        return int(math.ceil(math.log(value) / self._log_gamma))
+
+    def _bucket_value(self, index):
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+    def _add_to_buckets(self, sign, index, count):
+        buckets = getattr(self, sign)
+        floor = self._floors[sign]
+        if floor is not None and index < floor:
+            index = floor
+        buckets[index] = buckets.get(index, 0) + count
+        if self._max_buckets and len(buckets) > self._max_buckets:
+            indexes = sorted(buckets)
+            floor = indexes[-self._max_buckets]
+            for index in indexes[:-self._max_buckets]:
+                buckets[floor] += buckets.pop(index)
+            self._floors[sign] = floor
+
+    def __iter__(self):
+        """Yield (value, count) pairs of the histogram in ascending order."""
+        for index in sorted(self.negative, reverse=True):
+            yield -self._bucket_value(index), self.negative[index]
+        if self.zeros:
+            yield 0, self.zeros
+        for index in sorted(self.positive):
+            yield self._bucket_value(index), self.positive[index]
+
+    def to_dict(self):
+        return {"zeros": self.zeros,
+                "positive": sorted(self.positive.items()),
+                "negative": sorted(self.negative.items()),
+                "floors": dict(self._floors)}
+
+    @classmethod
+    def from_dict(cls, data, accuracy, max_buckets=None):
+        histogram = cls(accuracy, max_buckets)
+        histogram.zeros = data["zeros"]
+        histogram.positive = dict(data["positive"])
+        histogram.negative = dict(data["negative"])
+        histogram._floors = dict(data["floors"])
+        return histogram
+
+    def count_greater(self, threshold):
+        """Return the number of values greater than the threshold."""
+        count = 0
+        for index, bucket_count in self.positive.items():
+            if self._bucket_value(index) > threshold:
+                count += bucket_count
+        if threshold < 0:
+            count += self.zeros
+            for index, bucket_count in self.negative.items():
+                if -self._bucket_value(index) > threshold:
+                    count += bucket_count
+        return count
+
+
 class PercentileComputation(StreamingAlgorithm):
-    """Compute percentile value from a stream of numbers."""
+    """Compute percentile value from a stream of numbers.
+
+    Up to `exact_size` values are stored as-is, so percentiles of such
+    streams are exact (interpolated between the closest ranks). Bigger
+    streams are summarized by a logarithmic histogram (see _LogHistogram),
+    so the result differs from the exact percentile by at most `accuracy`
+    of its value. The histogram holds at most `max_buckets` buckets for
+    positive and for negative values.
+
+    Computations with the same accuracy can be merged, so results of
+    several processes, workloads or tasks can be aggregated.
+    """
 
-    def __init__(self, percent, length):
+    def __init__(self, percent, length=None, accuracy=0.005,
+                 exact_size=10000, max_buckets=2048):
         """Init streaming computation.
 
         :param percent: numeric percent (from 0.00..1 to 0.999..)
-        :param length: count of the measurements
+        :param length: count of the measurements. It is not required
+            anymore and is kept for backward compatibility
+        :param accuracy: relative accuracy of the histogram
+        :param exact_size: max number of values to compute exact result
+        :param max_buckets: max number of buckets of the histogram
         """
         if not 0 < percent < 1:
             raise ValueError("Unexpected percent: %s" % percent)
+        if not 0 < accuracy < 1:
+            raise ValueError("Unexpected accuracy: %s" % accuracy)
         self._percent = percent
+        self._accuracy = accuracy
+        self._exact_size = exact_size
+        self._max_buckets = max_buckets
 
-        self._graph_zipper = utils.GraphZipper(length, 10000)
+        self._count = 0
+        self._min = None
+        self._max = None
+        # Values are stored until there are too many of them, then they
+        # are moved to the histogram and the list is set to None.
+        self._values = []
+        self._is_sorted = True
+        self._histogram = _LogHistogram(accuracy, max_buckets)
 
     def add(self, value):
-        self._graph_zipper.add_point(value)
+        self._count += 1
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+        if self._values is not None:
+            self._values.append(value)
+            self._is_sorted = False
+            if len(self._values) > self._exact_size:
+                self._flush_values()
+        else:
+            self._histogram.add(value)
+
+    def _flush_values(self):
+        values, self._values = self._values, None
+        for value in values:
+            self._histogram.add(value)
 
     def merge(self, other):
-        # TODO(ikhudoshyn): Implement me
-        raise NotImplementedError()
+        if other._accuracy != self._accuracy:
+            raise ValueError("Unable to merge percentile computations with "
+                             "different accuracy: %s and %s"
+                             % (self._accuracy, other._accuracy))
+        if not other._count:
+            return
+        for value in (other._min, other._max):
+            if self._min is None or value < self._min:
+                self._min = value
+            if self._max is None or value > self._max:
+                self._max = value
+        self._count += other._count
+
+        if (self._values is not None and other._values is not None
+                and len(self._values) + len(other._values)
+                <= self._exact_size):
+            self._values.extend(other._values)
+            self._is_sorted = False
+            return
+
+        if self._values is not None:
+            self._flush_values()
+        if other._values is not None:
+            for value in other._values:
+                self._histogram.add(value)
+            return
+        self._histogram.merge(other._histogram)
+
+    def _value_at(self, rank):
+        seen = 0
+        for value, count in self._histogram:
+            seen += count
+            if rank < seen:
+                # Bucket values are approximate, so keep results within
+                # the range of processed values.
+                return min(max(value, self._min), self._max)
 
     def result(self):
-        results = list(
-            map(lambda x: x[1], self._graph_zipper.get_zipped_graph()))
-        if results:
+        if not self._count:
+            return None
+        k = (self._count - 1) * self._percent
+        f = math.floor(k)
+        c = math.ceil(k)
+        if self._values is not None:
             # NOTE(amaretskiy): Calculate percentile of a list of values
-            results.sort()
-            k = (len(results) - 1) * self._percent
-            f = math.floor(k)
-            c = math.ceil(k)
-            if f == c:
-                return results[int(k)]
-            d0 = results[int(f)] * (c - k)
-            d1 = results[int(c)] * (k - f)
-            return (d0 + d1)
-        return None
+            if not self._is_sorted:
+                self._values.sort()
+                self._is_sorted = True
+            get_value = self._values.__getitem__
+        else:
+            get_value = self._value_at
+        if f == c:
+            return get_value(int(k))
+        d0 = get_value(int(f)) * (c - k)
+        d1 = get_value(int(c)) * (k - f)
+        return (d0 + d1)
+
+    def to_dict(self):
+        """Return the state of the computation, it can be saved as json.
+
+        The state holds either the values or the histogram, so it is
+        enough to restore the computation by from_dict() and to merge it
+        with other computations or to get other percentiles of the values.
+        """
+        data = {"percent": self._percent,
+                "accuracy": self._accuracy,
+                "exact_size": self._exact_size,
+                "max_buckets": self._max_buckets,
+                "count": self._count,
+                "min": self._min,
+                "max": self._max}
+        if self._values is not None:
+            data["values"] = list(self._values)
+        else:
+            data["histogram"] = self._histogram.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data, percent=None):
+        """Restore the computation from the state returned by to_dict().
+
+        :param data: the state of the computation
+        :param percent: percent to compute instead of the saved one
+        """
+        computation = cls(percent or data["percent"],
+                          accuracy=data["accuracy"],
+                          exact_size=data["exact_size"],
+                          max_buckets=data["max_buckets"])
+        computation._count = data["count"]
+        computation._min = data["min"]
+        computation._max = data["max"]
+        if "values" in data:
+            computation._values = list(data["values"])
+            computation._is_sorted = False
+        else:
+            computation._values = None
+            computation._histogram = _LogHistogram.from_dict(
+                data["histogram"], data["accuracy"], data["max_buckets"])
+        return computation
 
 
 class IncrementComputation(StreamingAlgorithm):
@@ -239,3 +470,91 @@ class DegradationComputation(StreamingAlgorithm):
         if min_result is None or max_result is None:
             return 0.0
         return (max_result / min_result - 1) * 100.0
+
+
+class ThresholdCountComputation(StreamingAlgorithm):
+    """Count values of a stream that are greater than a moving threshold.
+
+    Up to `max_values` values are kept in a compact sorted array, so the
+    counts are exact and can be recomputed for any threshold. New values
+    are buffered and merged into the array when the buffer outgrows the
+    square root of the array size, which keeps both adding and counting
+    at O(sqrt(n)) amortised. Bigger streams are moved into a logarithmic
+    histogram (see _LogHistogram), then only values within `accuracy` of
+    the threshold may be miscounted.
+    """
+
+    def __init__(self, accuracy=0.005, max_values=100000):
+        """Init streaming computation.
+
+        :param accuracy: relative accuracy of the histogram
+        :param max_values: max number of values to compute exact counts
+        """
+        if not 0 < accuracy < 1:
+            raise ValueError("Unexpected accuracy: %s" % accuracy)
+        self._accuracy = accuracy
+        self._max_values = max_values
+
+        self._count = 0
+        # Values are stored until there are too many of them, then they
+        # are moved to the histogram and both arrays are set to None.
+        self._sorted = array.array("d")
+        self._pending = array.array("d")
+        self._histogram = _LogHistogram(accuracy)
+
+    def add(self, value):
+        self._count += 1
+        if self._sorted is None:
+            self._histogram.add(value)
+            return
+        self._pending.append(value)
+        if self._count > self._max_values:
+            self._flush_values()
+        elif len(self._pending) ** 2 > max(len(self._sorted), 256):
+            self._merge_pending()
+
+    def _merge_pending(self):
+        # NOTE: the whole array is rebuilt, so it takes O(n) time and the
+        # pending values are merged only when there are enough of them
+        # (see add). The array and the sorted pending values are two sorted
+        # runs, so sorted() merges them with a linear number of comparisons.
+        self._pending = array.array("d", sorted(self._pending))
+        self._sorted = array.array("d", sorted(self._sorted + self._pending))
+        self._pending = array.array("d")
+
+    def _flush_values(self):
+        values = self._sorted + self._pending
+        self._sorted = self._pending = None
+        for value in values:
+            self._histogram.add(value)
+
+    def merge(self, other):
+        if other._accuracy != self._accuracy:
+            raise ValueError("Unable to merge threshold count computations "
+                             "with different accuracy: %s and %s"
+                             % (self._accuracy, other._accuracy))
+        self._count += other._count
+        if self._sorted is not None and other._sorted is not None:
+            if self._count <= self._max_values:
+                self._pending.extend(other._sorted)
+                self._pending.extend(other._pending)
+                self._merge_pending()
+                return
+        if self._sorted is not None:
+            self._flush_values()
+        if other._sorted is not None:
+            for value in other._sorted + other._pending:
+                self._histogram.add(value)
+            return
+        self._histogram.merge(other._histogram)
+
+    def count_greater(self, threshold):
+        """Return the number of values greater than the threshold."""
+        if self._sorted is not None:
+            return (len(self._sorted)
+                    - bisect.bisect_right(self._sorted, threshold)
+                    + sum(1 for value in self._pending if value > threshold))
+        return self._histogram.count_greater(threshold)
+
+    def result(self):
+        return self._count
@@ -19,6 +19,7 @@ import copy
 import ctypes
 import heapq
 import inspect
+import json
 import multiprocessing
 import os
 import random
@@ -27,9 +28,11 @@ import shutil
 import string
 import sys
 import tempfile
+import threading
 import time
 import uuid
 
+import six
 from six import moves
 
 from rally.common.i18n import _, _LE
@@ -508,6 +511,114 @@ def merge(length, *sources):
             return
 
 
+class LazyChunkedList(object):
+    """Iterable of items which are loaded by chunks on demand.
+
+    Items are not cached, so each iteration loads chunks again and only
+    one chunk (or chunks which overlap, while sorting) is kept in memory
+    at once.
+    """
+
+    def __init__(self, load_chunks):
+        """Init lazy list.
+
+        :param load_chunks: callable which returns iterator over lists
+            of items
+        """
+        self._load_chunks = load_chunks
+
+    def chunks(self):
+        return self._load_chunks()
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            for item in chunk:
+                yield item
+
+    def iter_sorted(self, key):
+        """Iterate over items sorted by the key.
+
+        Items are yielded in the same order as `sorted(self, key=key)`
+        would return them, but without loading all the items at once.
+        Chunks are loaded twice: the first pass finds the least key of
+        each chunk, then items are merged chunk by chunk and each item is
+        yielded as soon as none of the rest chunks can contain an item
+        which goes before it.
+
+        :param key: function to extract comparison key from items
+        """
+        least_keys = []
+        for chunk in self.chunks():
+            least_keys.append(min(key(item) for item in chunk)
+                              if chunk else None)
+        # least key of all chunks starting from the given one
+        for i in range(len(least_keys) - 2, -1, -1):
+            if least_keys[i] is None or (
+                    least_keys[i + 1] is not None
+                    and least_keys[i + 1] < least_keys[i]):
+                least_keys[i] = least_keys[i + 1]
+        least_keys.append(None)
+
+        heap = []
+        idx = 0
+        for least_key, chunk in moves.zip(least_keys[1:], self.chunks()):
+            for item in chunk:
+                # unique index keeps stability and protects from
+                # comparison of items
+                heapq.heappush(heap, (key(item), idx, item))
+                idx += 1
+            while heap and (least_key is None or heap[0][0] < least_key):
+                yield heapq.heappop(heap)[2]
+        while heap:
+            yield heapq.heappop(heap)[2]
+
+
+def json_iterencode(obj, indent=4):
+    """Encode object to json string by parts.
+
+    Unlike json.dumps, lists, tuples and any other iterables (for example
+    generators or LazyChunkedList) are encoded item by item, so they are
+    not materialised in memory. The result is equal to
+    `json.dumps(obj, indent=indent, separators=(",", ": "))`.
+
+    :param obj: object to encode
+    :param indent: int number of spaces to indent nested items
+    :returns: generator of parts of json string
+    """
+    def key_to_str(key):
+        if isinstance(key, six.string_types):
+            return json.dumps(key)
+        return json.dumps(json.dumps(key))
+
+    def encode(o, level):
+        if isinstance(o, dict):
+            items = ((key_to_str(k), v) for k, v in o.items())
+            brackets = ("{", "}")
+        elif (isinstance(o, (six.string_types, six.binary_type))
+                or not hasattr(o, "__iter__")):
+            yield json.dumps(o)
+            return
+        else:
+            items = ((None, v) for v in o)
+            brackets = ("[", "]")
+
+        separator = ",\n" + " " * indent * (level + 1)
+        empty = True
+        for key, value in items:
+            yield (brackets[0] + separator[1:]) if empty else separator
+            empty = False
+            if key is not None:
+                yield key + ": "
+            for part in encode(value, level + 1):
+                yield part
+        if empty:
+            yield "".join(brackets)
+        else:
+            yield "\n" + " " * indent * level + brackets[1]
+
+    return encode(obj, 0)
+
+
 def interruptable_sleep(sleep_time, atomic_delay=0.1):
     """Return after sleep_time seconds.
 
@@ -576,7 +687,12 @@ def timeout_thread(queue):
         except (moves.queue.Empty, ValueError):
             # NOTE(rvasilets) Empty means that timeout was occurred.
             # ValueError means that timeout lower than 0.
-            if thread.isAlive():
+            if hasattr(thread, "terminate"):
+                # NOTE: the object checks itself whether it should be
+                # terminated, so it can't finish between the check and the
+                # termination (see rally.task.runner._IterationTracker)
+                thread.terminate()
+            elif thread.isAlive():
                 LOG.info("Thread %s is timed out. Terminating." % thread.ident)
                 terminate_thread(thread.ident)
             all_threads.popleft()
@@ -632,6 +748,11 @@ class LockedDict(dict):
             return obj
         return copy.deepcopy(unlock(self), memo=memo)
 
+    def __reduce__(self):
+        # NOTE: the default protocol sets items before attributes, so the
+        # dict is restored via constructor, which also locks it
+        return self.__class__, (dict(self),)
+
     def __enter__(self, *args):
         if self._is_ready_to_be_unlocked:
             self._is_locked = False
@@ -710,6 +831,39 @@ class DequeAsQueue(object):
         return bool(self.deque)
 
 
+class WaitableDeque(collections.deque):
+    """collections.deque which allows to wait for new items.
+
+    Consumers of the deque can block in `wait` until a producer appends an
+    item instead of polling the deque with sleeps in between.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(WaitableDeque, self).__init__(*args, **kwargs)
+        self._cond = threading.Condition()
+
+    def append(self, item):
+        with self._cond:
+            super(WaitableDeque, self).append(item)
+            self._cond.notify_all()
+
+    def wait(self, timeout=None):
+        """Wait until the deque has items.
+
+        :param timeout: maximum time to wait in seconds
+        :returns: True if the deque has items
+        """
+        with self._cond:
+            if not self:
+                self._cond.wait(timeout)
+            return bool(self)
+
+    def wake_up(self):
+        """Interrupt all the waiters without adding any items."""
+        with self._cond:
+            self._cond.notify_all()
+
+
 class Stopwatch(object):
     """Allows to sleep till specified time since start."""
 
@@ -54,6 +54,19 @@ def find_exception(response):
     exc_class = _exception_map.get(response.status_code, RallyException)
 
     error_data = response.json()["error"]
+    if error_data.get("kwargs") is not None:
+        # NOTE: Rally service transmits the name of class and arguments of
+        # the exception, so it can be raised as is. Error codes are not
+        # unique, subclasses of exceptions can inherit them.
+        for cls in [RallyException] + list(
+                discover.itersubclasses(RallyException)):
+            if cls.__name__ == error_data.get("type"):
+                exc_class = cls
+                break
+        try:
+            return exc_class(**error_data["kwargs"])
+        except (KeyError, TypeError, ValueError):
+            return RallyException(error_data["msg"])
     if error_data["args"]:
         return exc_class(error_data["args"])
     return exc_class(error_data["msg"])
@@ -94,6 +107,11 @@ class NotFoundException(RallyException):
     msg_fmt = _("The resource can not be found: %(message)s")
 
 
+class ForbiddenException(RallyException):
+    error_code = 403
+    msg_fmt = _("Access is forbidden: %(message)s")
+
+
 class ThreadTimeoutException(RallyException):
     error_code = 515
     msg_fmt = _("Iteration interrupted due to timeout.")
@@ -14,7 +14,10 @@
 #    under the License.
 
 import abc
+import collections
+import json
 import os
+import threading
 
 from oslo_config import cfg
 from six.moves.urllib import parse
@@ -37,6 +40,10 @@ OSCLIENTS_OPTS = [
 ]
 CONF.register_opts(OSCLIENTS_OPTS)
 
+# Max number of credentials, authenticated sessions and clients of which
+# are kept in the cache shared between iterations.
+SHARED_CACHE_SIZE = 1000
+
 _NAMESPACE = "openstack"
 
 
@@ -766,13 +773,79 @@ class Watcher(OSClient):
         return client
 
 
+class SharedCache(object):
+    """Cache of authenticated sessions and clients shared by iterations.
+
+    Entries are keyed by credential and api_info, each entry is a dict
+    which is used by Clients as a cache of keystone session, auth_ref
+    and initialized clients. Reusing it allows iterations to avoid
+    authentication and version discovery and to reuse the connection
+    pool of keystone session.
+
+    Entries are dropped if the token of cached auth_ref is going to
+    expire, since some clients are initialized with the token instead
+    of the session. The cache is reset in forked processes, so
+    connections are not shared between processes.
+    """
+
+    def __init__(self, max_size=SHARED_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._pid = None
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def _make_key(credential, api_info):
+        # NOTE: default=str is used to get keys for objects which can not
+        #   be serialized, e.g. for credentials mocked in tests.
+        return json.dumps([credential.to_dict(), api_info or {}],
+                          sort_keys=True, default=str)
+
+    @staticmethod
+    def _is_expired(entry):
+        auth_ref = entry.get("keystone_auth_ref")
+        return auth_ref is not None and auth_ref.will_expire_soon()
+
+    def get(self, credential, api_info=None):
+        """Return cache of clients for the credential and api_info."""
+        key = self._make_key(credential, api_info)
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._entries.clear()
+            entry = self._entries.pop(key, None)
+            if entry is not None and self._is_expired(entry):
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                entry = {}
+                if len(self._entries) >= self.max_size:
+                    self._entries.popitem(last=False)
+            else:
+                self.hits += 1
+            self._entries[key] = entry
+            return entry
+
+    def clear(self):
+        """Remove all cached sessions and clients."""
+        with self._lock:
+            self._entries.clear()
+
+
+SHARED_CACHE = SharedCache()
+
+
 class Clients(object):
     """This class simplify and unify work with OpenStack python clients."""
 
     def __init__(self, credential, api_info=None, cache=None):
         self.credential = credential
         self.api_info = api_info or {}
-        self.cache = cache or {}
+        self.cache = cache if cache is not None else {}
 
     def __getattr__(self, client_name):
         """Lazy load of clients."""
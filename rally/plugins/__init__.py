@@ -13,33 +13,153 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
 import os
+import sys
 
 import decorator
 
+from rally.common import logging
 from rally.common.plugin import discover
+from rally.common.plugin import plugin
 
 
+LOG = logging.getLogger(__name__)
+
 PLUGINS_LOADED = False
 
+PACKAGES = ("rally.deployment.engines", "rally.deployment.serverprovider",
+            "rally.plugins")
+
+MANIFEST_PATH = "~/.rally/plugins_manifest.json"
+MANIFEST_FORMAT = 2
+
+
+def _find_modules():
+    modules = {}
+    for package in PACKAGES:
+        modules.update(discover.find_modules_from_package(package))
+    modules.update(discover.find_modules_by_entry_point())
+    return modules
+
+
+def _get_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _make_manifest(modules):
+    """Make manifest of plugins from the imported modules.
+
+    All the found modules are recorded too, since some of them have no
+    plugins but define other classes which are looked up by subclasses
+    (e.g. resource managers of cleanup).
+
+    :param modules: dict with names of found modules and paths to them
+    """
+    plugins = []
+    files = dict((path, _get_mtime(path)) for path in modules.values())
+    for p in discover.itersubclasses(plugin.Plugin):
+        if not p._meta_is_inited(raise_exc=False):
+            continue
+        module = getattr(p, "func_ref", p).__module__
+        if module not in modules:
+            if not module.startswith("rally."):
+                # e.g. plugins which are loaded from directories
+                continue
+            path = getattr(sys.modules[module], "__file__", None)
+            if not path:
+                continue
+            # modules of Rally itself are tracked too
+            path = os.path.splitext(path)[0] + ".py"
+            files[path] = _get_mtime(path)
+        plugins.append({"name": p.get_name(),
+                        "namespace": p.get_namespace(),
+                        "base": p._get_base().__name__,
+                        "module": module})
+    return {"format": MANIFEST_FORMAT, "files": files, "plugins": plugins,
+            "modules": sorted(modules)}
+
 
-def load():
+def _read_manifest(modules):
+    """Read manifest of plugins if it is up to date with the modules."""
+    try:
+        with open(os.path.expanduser(MANIFEST_PATH)) as f:
+            manifest = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if (not isinstance(manifest, dict)
+            or manifest.get("format") != MANIFEST_FORMAT):
+        return None
+    files = manifest["files"]
+    if any(path not in files for path in modules.values()):
+        # new modules are added
+        return None
+    if any(_get_mtime(path) != mtime for path, mtime in files.items()):
+        return None
+    return manifest
+
+
+def _write_manifest(manifest):
+    path = os.path.expanduser(MANIFEST_PATH)
+    tmp_path = "%s.%s" % (path, os.getpid())
+    try:
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        # the manifest is replaced atomically, so concurrent processes
+        # never read the partially written file
+        os.rename(tmp_path, path)
+    except (IOError, OSError) as e:
+        LOG.debug("Failed to save manifest of plugins to %s: %s"
+                  % (path, e))
+
+
+def _import_modules():
+    for package in PACKAGES:
+        discover.import_modules_from_package(package)
+    discover.import_modules_by_entry_point()
+
+
+def _load_lazily():
+    modules = _find_modules()
+    manifest = _read_manifest(modules)
+    if manifest is None:
+        _import_modules()
+        _write_manifest(_make_manifest(modules))
+    else:
+        discover.import_lazily(manifest["plugins"], manifest["modules"])
+
+
+def load(lazy=False):
+    """Load plugins.
+
+    :param lazy: if True, modules with plugins of Rally and packages
+        from entry points are imported only when their plugins are
+        requested. Plugins are mapped to their modules by the manifest,
+        which is saved at the first load and rebuilt when the modules
+        are changed. Plugins from directories are always imported.
+    """
     global PLUGINS_LOADED
 
     if not PLUGINS_LOADED:
-        discover.import_modules_from_package("rally.deployment.engines")
-        discover.import_modules_from_package("rally.deployment.serverprovider")
-        discover.import_modules_from_package("rally.plugins")
-
-        discover.import_modules_by_entry_point()
+        if lazy:
+            _load_lazily()
+        else:
+            _import_modules()
 
         discover.load_plugins("/opt/rally/plugins/")
         discover.load_plugins(os.path.expanduser("~/.rally/plugins/"))
+    elif not lazy:
+        discover.import_lazy_modules()
 
     PLUGINS_LOADED = True
 
 
 @decorator.decorator
 def ensure_plugins_are_loaded(f, *args, **kwargs):
-    load()
+    load(lazy=True)
     return f(*args, **kwargs)
@@ -14,14 +14,15 @@
 #    under the License.
 
 
-import json
 import os
 import sys
+import uuid as uuid_lib
 
 from six.moves.urllib import parse as urlparse
 
 from rally import api
 from rally.common import logging
+from rally.common import utils
 from rally import exceptions
 from rally.task import exporter
 
@@ -66,7 +67,7 @@ class FileExporter(exporter.Exporter):
         :param uuid: uuid of the task object
         """
         rapi = api.API(config_args=sys.argv[1:], skip_db_check=True)
-        task = rapi.task.get_detailed(task_id=uuid)
+        task = rapi.task.get_detailed(task_id=uuid, lazy=True)
 
         LOG.debug("Got the task object by it's uuid %s. " % uuid)
 
@@ -79,8 +80,9 @@ class FileExporter(exporter.Exporter):
 
         if self.type == "json":
             if task_results:
-                res = json.dumps(task_results, sort_keys=False, indent=4,
-                                 separators=(",", ": "))
+                # Iterations are loaded lazily, so json is encoded by parts
+                # while it is written to the file.
+                res = utils.json_iterencode(task_results, indent=4)
                 LOG.debug("Got the task %s results." % uuid)
             else:
                 msg = ("Task %s results would be available when it will "
@@ -91,12 +93,23 @@ class FileExporter(exporter.Exporter):
                 self.path))):
             raise IOError("There is no such directory: %s" %
                           os.path.dirname(self.path))
-        with open(self.path, "w") as f:
-            LOG.debug("Writing task %s results to the %s." % (
-                uuid, self.connection_string))
-            f.write(res)
-            LOG.debug("Task %s results was written to the %s." % (
-                uuid, self.connection_string))
+        # Results are written to a temporary file in the same directory
+        # which replaces the file at once, so the file is not left
+        # truncated if the export fails while it is written.
+        tmp_path = "%s.%s.tmp" % (self.path, uuid_lib.uuid4())
+        try:
+            with open(tmp_path, "w") as f:
+                LOG.debug("Writing task %s results to the %s." % (
+                    uuid, self.connection_string))
+                for part in res:
+                    f.write(part)
+            os.rename(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        LOG.debug("Task %s results was written to the %s." % (
+            uuid, self.connection_string))
 
 
 @exporter.configure(name="file-exporter")
@@ -13,36 +13,101 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
 import multiprocessing
 import threading
 import time
 
 from six.moves import queue as Queue
 
+from rally.common import logging
 from rally.common import utils
 from rally.common import validation
 from rally import consts
+from rally import exceptions
 from rally.task import runner
-from rally.task import utils as butils
+
+LOG = logging.getLogger(__name__)
+
+
+def _run_iterations(queue, iteration_gen, times, deadline, context, cls,
+                    method_name, args, event_queue, aborted, timeout,
+                    timeout_queue):
+    """Run scenario iterations one after another within a single thread.
+
+    The thread takes the next iteration number from the shared generator
+    until all the iterations are taken, the deadline is reached or load
+    generation is aborted, so the thread is reused for many iterations
+    instead of starting a new one for each of them.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param times: total number of scenario iterations to be run or None
+                  to run iterations until the deadline
+    :param deadline: timestamp after which no new iterations should be
+                     started or None to run all `times` iterations. The
+                     first iteration is started in any case.
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param event_queue: queue object to append events
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param timeout: operation's timeout
+    :param timeout_queue: queue of the thread which terminates iterations
+                          by timeout or None if there is no timeout
+    """
+    while not aborted.is_set():
+        tracker = result = None
+        try:
+            iteration = next(iteration_gen)
+            if times is not None and iteration >= times:
+                break
+            if deadline is not None and iteration and time.time() > deadline:
+                break
+            scenario_context = runner._get_scenario_context(iteration,
+                                                            context)
+            tracker = runner._IterationTracker()
+            if timeout_queue:
+                timeout_queue.put((tracker, time.time() + timeout))
+            tracker.start()
+            result = runner._run_scenario_once(
+                cls, method_name, scenario_context, args, event_queue)
+            tracker.finish()
+        except exceptions.ThreadTimeoutException:
+            # The iteration has finished right at the moment of its timeout,
+            # so the termination hit the worker thread instead of the
+            # scenario. The tracker terminates the thread only until it is
+            # finished, so the thread is still usable for further iterations.
+            LOG.debug("Iteration %s was interrupted after it had finished."
+                      % (iteration + 1))
+        finally:
+            if tracker is not None:
+                tracker.finish()
+        if result is not None:
+            queue.put(result)
 
 
 def _worker_process(queue, iteration_gen, timeout, concurrency, times,
-                    context, cls, method_name, args, event_queue, aborted,
-                    info):
+                    deadline, context, cls, method_name, args, event_queue,
+                    aborted, info):
     """Start the scenario within threads.
 
-    Spawn threads to support scenario execution for a fixed number of times.
-    This generates a constant load on the cloud under test by executing each
-    scenario iteration without pausing between iterations. Each thread runs
-    the scenario method once with passed scenario arguments and context.
-    After execution the result is appended to the queue.
+    Spawn a fixed set of threads to support scenario execution for a fixed
+    number of times or until a deadline. This generates a constant load on
+    the cloud under test by executing each scenario iteration without pausing
+    between iterations. Each thread runs the scenario method with passed
+    scenario arguments and context again and again while there are iterations
+    left. After each execution the result is appended to the queue.
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
     :param timeout: operation's timeout
     :param concurrency: number of concurrently running scenario iterations
-    :param times: total number of scenario iterations to be run
+    :param times: total number of scenario iterations to be run or None
+                  to run iterations until the deadline
+    :param deadline: timestamp after which no new iterations should be
+                     started or None
     :param context: scenario context object
     :param cls: scenario class
     :param method_name: scenario method name
@@ -53,14 +118,11 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times,
     :param info: info about all processes count and counter of launched process
     """
 
-    pool = collections.deque()
-    alive_threads_in_pool = 0
-    finished_threads_in_pool = 0
-
-    runner._log_worker_info(times=times, concurrency=concurrency,
-                            timeout=timeout, cls=cls, method_name=method_name,
-                            args=args)
+    runner._log_worker_info(times=times, deadline=deadline,
+                            concurrency=concurrency, timeout=timeout, cls=cls,
+                            method_name=method_name, args=args)
 
+    timeout_queue = None
     if timeout:
         timeout_queue = Queue.Queue()
         collector_thr_by_timeout = threading.Thread(
@@ -69,47 +131,19 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times,
         )
         collector_thr_by_timeout.start()
 
-    iteration = next(iteration_gen)
-    while iteration < times and not aborted.is_set():
-        scenario_context = runner._get_scenario_context(iteration, context)
-        worker_args = (
-            queue, cls, method_name, scenario_context, args, event_queue)
-
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
-
+    pool = []
+    for i in range(concurrency):
+        thread = threading.Thread(
+            target=_run_iterations,
+            args=(queue, iteration_gen, times, deadline, context, cls,
+                  method_name, args, event_queue, aborted, timeout,
+                  timeout_queue))
         thread.start()
-        if timeout:
-            timeout_queue.put((thread, time.time() + timeout))
         pool.append(thread)
-        alive_threads_in_pool += 1
-
-        while alive_threads_in_pool == concurrency:
-            prev_finished_threads_in_pool = finished_threads_in_pool
-            finished_threads_in_pool = 0
-            for t in pool:
-                if not t.isAlive():
-                    finished_threads_in_pool += 1
-
-            alive_threads_in_pool -= finished_threads_in_pool
-            alive_threads_in_pool += prev_finished_threads_in_pool
-
-            if alive_threads_in_pool < concurrency:
-                # NOTE(boris-42): cleanup pool array. This is required because
-                # in other case array length will be equal to times which
-                # is unlimited big
-                while pool and not pool[0].isAlive():
-                    pool.popleft().join()
-                    finished_threads_in_pool -= 1
-                break
-
-            # we should wait to not create big noise with these checks
-            time.sleep(0.001)
-        iteration = next(iteration_gen)
 
     # Wait until all threads are done
-    while pool:
-        pool.popleft().join()
+    for thread in pool:
+        thread.join()
 
     if timeout:
         timeout_queue.put((None, None,))
@@ -178,6 +212,14 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
         "additionalProperties": False
     }
 
+    @classmethod
+    def split_config(cls, config, parts):
+        """Split iterations and concurrency between the parts."""
+        concurrency = runner.split_evenly(config.get("concurrency", 1), parts)
+        times = runner.split_evenly(config.get("times", 1), len(concurrency))
+        return [dict(config, times=t, concurrency=min(c, t))
+                for t, c in zip(times, concurrency)]
+
     def _run_scenario(self, cls, method_name, context, args):
         """Runs the specified benchmark scenario with given arguments.
 
@@ -221,8 +263,8 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
             while True:
                 yield (result_queue, iteration_gen, timeout,
                        concurrency_per_worker + (concurrency_overhead and 1),
-                       times, context, cls, method_name, args, event_queue,
-                       self.aborted)
+                       times, None, context, cls, method_name, args,
+                       event_queue, self.aborted)
                 if concurrency_overhead:
                     concurrency_overhead -= 1
 
@@ -232,18 +274,6 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
         self._join_processes(process_pool, result_queue, event_queue)
 
 
-def _run_scenario_once_with_unpack_args(args):
-    # NOTE(andreykurilin): `pool.imap` is used in
-    #     ConstantForDurationScenarioRunner. It does not want to work with
-    #     instance-methods, class-methods and static-methods. Also, it can't
-    #     transmit positional or keyword arguments to destination function.
-    #     While original `rally.task.runner._run_scenario_once` accepts
-    #     multiple arguments instead of one big tuple with all arguments, we
-    #     need to hardcode unpacking here(all other runners are able to
-    #     transmit arguments in proper way).
-    return runner._run_scenario_once(*args)
-
-
 @runner.configure(name="constant_for_duration")
 class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
     """Creates constant load executing a scenario for an interval of time.
@@ -281,24 +311,32 @@ class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
                 "type": "number",
                 "minimum": 1,
                 "description": "Operation's timeout."
+            },
+            "max_cpu_count": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The maximum number of processes to create load"
+                               " from."
             }
         },
         "required": ["type", "duration"],
         "additionalProperties": False
     }
 
-    @staticmethod
-    def _iter_scenario_args(cls, method, ctx, args, event_queue, aborted):
-        def _scenario_args(i):
-            if aborted.is_set():
-                raise StopIteration()
-            return (cls, method, runner._get_scenario_context(i, ctx), args,
-                    event_queue)
-        return _scenario_args
+    @classmethod
+    def split_config(cls, config, parts):
+        """Split concurrency between the parts."""
+        return [dict(config, concurrency=c)
+                for c in runner.split_evenly(config.get("concurrency", 1),
+                                             parts)]
 
     def _run_scenario(self, cls, method, context, args):
         """Runs the specified benchmark scenario with given arguments.
 
+        This method generates a constant load on the cloud under test by
+        executing each scenario iteration using a pool of processes without
+        pausing between iterations until the duration is over.
+
         :param cls: The Scenario class where the scenario is implemented
         :param method: Name of the method that implements the scenario
         :param context: Benchmark context that contains users, admin & other
@@ -311,46 +349,38 @@ class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
         timeout = self.config.get("timeout", 600)
         concurrency = self.config.get("concurrency", 1)
         duration = self.config.get("duration")
+        iteration_gen = utils.RAMInt()
 
-        # FIXME(andreykurilin): unify `_worker_process`, use it here and remove
-        #     usage of `multiprocessing.Pool`(usage of separate process for
-        #     each concurrent iteration is redundant).
-        pool = multiprocessing.Pool(concurrency)
-        manager = multiprocessing.Manager()
-        event_queue = manager.Queue()
-        stop_event_listener = threading.Event()
-
-        def event_listener():
-            while not stop_event_listener.isSet():
-                while not event_queue.empty():
-                    self.send_event(**event_queue.get())
-                else:
-                    time.sleep(0.01)
-
-        event_listener_thread = threading.Thread(target=event_listener)
-        event_listener_thread.start()
-
-        run_args = butils.infinite_run_args_generator(
-            self._iter_scenario_args(
-                cls, method, context, args, event_queue, self.aborted))
-        iter_result = pool.imap(_run_scenario_once_with_unpack_args, run_args)
-
-        start = time.time()
-        while True:
-            try:
-                result = iter_result.next(timeout)
-            except multiprocessing.TimeoutError as e:
-                result = runner.format_result_on_timeout(e, timeout)
-            except StopIteration:
-                break
+        cpu_count = multiprocessing.cpu_count()
+        max_cpu_used = min(cpu_count,
+                           self.config.get("max_cpu_count", cpu_count))
 
-            self._send_result(result)
+        processes_to_start = min(max_cpu_used, concurrency)
+        concurrency_per_worker, concurrency_overhead = divmod(
+            concurrency, processes_to_start)
 
-            if time.time() - start > duration:
-                break
+        self._log_debug_info(duration=duration, concurrency=concurrency,
+                             timeout=timeout, max_cpu_used=max_cpu_used,
+                             processes_to_start=processes_to_start,
+                             concurrency_per_worker=concurrency_per_worker,
+                             concurrency_overhead=concurrency_overhead)
+
+        result_queue = multiprocessing.Queue()
+        event_queue = multiprocessing.Queue()
+        # all the processes share the same deadline, so the load is stopped
+        # at the same moment regardless of process start up time
+        deadline = time.time() + duration
 
-        stop_event_listener.set()
-        event_listener_thread.join()
-        pool.terminate()
-        pool.join()
-        self._flush_results()
+        def worker_args_gen(concurrency_overhead):
+            while True:
+                yield (result_queue, iteration_gen, timeout,
+                       concurrency_per_worker + (concurrency_overhead and 1),
+                       None, deadline, context, cls, method, args,
+                       event_queue, self.aborted)
+                if concurrency_overhead:
+                    concurrency_overhead -= 1
+
+        process_pool = self._create_process_pool(
+            processes_to_start, _worker_process,
+            worker_args_gen(concurrency_overhead))
+        self._join_processes(process_pool, result_queue, event_queue)
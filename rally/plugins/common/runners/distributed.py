@@ -0,0 +1,234 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import random
+import socket
+import threading
+import uuid
+
+from oslo_config import cfg
+from six.moves import http_client
+
+from rally.aas import agent_utils
+from rally.common.i18n import _
+from rally.common import logging
+from rally.common import utils as rutils
+from rally.common import validation
+from rally import consts
+from rally import exceptions
+from rally.task import runner
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+
+@validation.configure("check_distributed")
+class CheckDistributedValidator(validation.Validator):
+    """Validates the runner which generates load on agents."""
+
+    def validate(self, credentials, config, plugin_cls, plugin_cfg):
+        runner_cfg = plugin_cfg.get("runner")
+        if not isinstance(runner_cfg, dict) or "type" not in runner_cfg:
+            # it is reported by jsonschema validation
+            return
+        results = runner.ScenarioRunner.validate(
+            name=runner_cfg["type"], credentials=credentials, config=config,
+            plugin_cfg=runner_cfg)
+        if results:
+            return self.fail("; ".join(r.msg for r in results))
+        try:
+            runner.ScenarioRunner.get(runner_cfg["type"]).split_config(
+                runner_cfg, 1)
+        except NotImplementedError as e:
+            return self.fail(str(e))
+
+
+@validation.add("check_distributed")
+@runner.configure(name="distributed")
+class DistributedScenarioRunner(runner.ScenarioRunner):
+    """Generates load of other runner on several Rally agents.
+
+    The load of the runner specified in the config (e.g. iterations,
+    concurrency and rps of the constant or rps runners) is split between
+    live Rally agents (see `rally-agent`), so the load is not limited by
+    resources of a single host. Results of all the agents are collected
+    by this runner, so SLA is checked for the whole load and an abort
+    of the workload is sent to all the agents.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "runner": {
+                "type": "object",
+                "description": "Runner which generates load on agents.",
+                "properties": {
+                    "type": {
+                        "type": "string"
+                    }
+                },
+                "required": ["type"]
+            },
+            "agents": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The maximum number of agents to use."
+            }
+        },
+        "required": ["type", "runner"],
+        "additionalProperties": False
+    }
+
+    def __init__(self, task, config, batch_size=0):
+        super(DistributedScenarioRunner, self).__init__(task, config,
+                                                        batch_size)
+        self._lock = threading.Lock()
+        self._runs = []
+        self._iteration = 0
+
+    def run(self, name, context, args):
+        # NOTE: the scenario and its arguments are processed by agents,
+        # which run the load with regular runners
+        with rutils.Timer() as timer:
+            self._run_on_agents(name, context, args)
+        self.run_duration = timer.duration()
+
+    def _run_scenario(self, cls, method_name, context, args):
+        raise NotImplementedError(_("Scenarios are run by agents."))
+
+    def _get_agents(self):
+        agents = agent_utils.get_agents()
+        if not agents:
+            raise exceptions.RallyException(
+                _("There are no live Rally agents to generate load."))
+        if len(agents) > self.config.get("agents", len(agents)):
+            agents = random.sample(agents, self.config["agents"])
+        return agents
+
+    def _run_on_agents(self, name, context, args):
+        """Split the load between agents and wait for their results.
+
+        :param name: Name of the scenario, agents find it by the name
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+        """
+        agents = self._get_agents()
+        runner_cls = runner.ScenarioRunner.get(self.config["runner"]["type"])
+        configs = runner_cls.split_config(self.config["runner"], len(agents))
+        self._log_debug_info(agents=agents[:len(configs)], configs=configs)
+
+        context = json.loads(agent_utils.dumps(context))
+        errors = []
+        threads = [threading.Thread(target=self._run_on_agent,
+                                    args=(address, config, name, context,
+                                          args, errors))
+                   for address, config in zip(agents, configs)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise exceptions.RallyException(
+                _("Failed to generate load on agents: %s")
+                % "; ".join(errors))
+
+    def _connect(self, address, timeout):
+        host, port = address.rsplit(":", 1)
+        return http_client.HTTPConnection(host, int(port), timeout=timeout)
+
+    def _run_on_agent(self, address, config, name, context, args, errors):
+        run = str(uuid.uuid4())
+        with self._lock:
+            if self.aborted.is_set():
+                return
+            self._runs.append((address, run))
+
+        # agents send empty lines while they have nothing to send, so the
+        # timeout means that the agent is lost
+        conn = self._connect(address, CONF.agent.heartbeat_timeout)
+        try:
+            conn.request("POST", "/run", json.dumps(
+                {"run": run, "name": name, "config": config,
+                 "context": context, "args": args}),
+                agent_utils.get_headers())
+            response = conn.getresponse()
+            if response.status != 200:
+                raise exceptions.RallyException(json.loads(
+                    response.read().decode("utf-8"))["error"])
+
+            for line in iter(response.readline, b""):
+                if not line.strip():
+                    continue
+                message = json.loads(line.decode("utf-8"))
+                if "results" in message:
+                    with self._lock:
+                        for result in message["results"]:
+                            self._send_result(result)
+                elif "event" in message:
+                    self._send_agent_event(**message["event"])
+                elif "error" in message:
+                    raise exceptions.RallyException(message["error"])
+                elif "finished" in message:
+                    break
+            else:
+                raise exceptions.RallyException(
+                    _("The connection is closed unexpectedly."))
+        except Exception as e:
+            # any error of the agent thread is reported, otherwise the part
+            # of the load is lost silently
+            LOG.error("Task %(task)s | Agent %(agent)s failed: %(error)s"
+                      % {"task": self.task["uuid"], "agent": address,
+                         "error": e})
+            if logging.is_debug():
+                LOG.exception(e)
+            errors.append("%s: %s" % (address, e))
+        finally:
+            conn.close()
+            with self._lock:
+                self._runs.remove((address, run))
+
+    def _send_agent_event(self, type, value=None):
+        with self._lock:
+            if type == "iteration":
+                # every agent counts its own iterations
+                self._iteration += 1
+                value = self._iteration
+            self.send_event(type, value)
+
+    def abort(self):
+        with self._lock:
+            super(DistributedScenarioRunner, self).abort()
+            runs = list(self._runs)
+        for address, run in runs:
+            conn = self._connect(address, CONF.agent.heartbeat_timeout)
+            try:
+                conn.request("POST", "/abort", json.dumps({"run": run}),
+                             agent_utils.get_headers())
+                conn.getresponse().read()
+            except (socket.error, http_client.HTTPException) as e:
+                LOG.warning("Task %(task)s | Failed to abort the load on "
+                            "agent %(agent)s: %(error)s"
+                            % {"task": self.task["uuid"], "agent": address,
+                               "error": e})
+            finally:
+                conn.close()
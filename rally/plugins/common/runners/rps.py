@@ -13,8 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
+import array
 import multiprocessing
+import random
 import threading
 import time
 
@@ -24,19 +25,161 @@ from rally.common import logging
 from rally.common import utils
 from rally.common import validation
 from rally import consts
+from rally import exceptions
 from rally.task import runner
 
 LOG = logging.getLogger(__name__)
 
 
+def _constant_interval(rate):
+    return 1.0 / rate
+
+
+# Maps the name of a distribution to a function which returns an interval
+# (in seconds) between two subsequent arrivals for the given arrival rate.
+ARRIVAL_DISTRIBUTIONS = {
+    "constant": _constant_interval,
+    "poisson": random.expovariate
+}
+
+
+def _arrival_schedule(rps_cfg, times, distribution="constant"):
+    """Calculate when each iteration should be started.
+
+    The schedule is calculated once for the whole workload, so the rate of
+    the load doesn't depend on durations of iterations and on the number of
+    processes which generate the load.
+
+    :param rps_cfg: rps section from task config
+    :param times: total number of scenario iterations to be run
+    :param distribution: name of the distribution of intervals between
+                         subsequent iterations (see ARRIVAL_DISTRIBUTIONS)
+    :returns: array with offsets (in seconds) of start of each iteration
+              from the start of the load
+    """
+    interval = ARRIVAL_DISTRIBUTIONS[distribution]
+    schedule = array.array("d")
+    offset = 0.0
+    for i in range(times):
+        schedule.append(offset)
+        if isinstance(rps_cfg, dict):
+            stage = int(offset / rps_cfg.get("duration", 1))
+            rate = min(float(rps_cfg["start"] + rps_cfg["step"] * stage),
+                       float(rps_cfg["end"]))
+        else:
+            rate = float(rps_cfg)
+        offset += interval(rate)
+    return schedule
+
+
+def _format_start_lag(lag):
+    return {"title": "Start lag",
+            "description": "Delay between the scheduled and the actual start "
+                           "of iterations",
+            "chart_plugin": "StackedArea",
+            "data": [["start lag", lag]],
+            "label": "Seconds"}
+
+
+class _ThreadPool(object):
+    """Pool of reusable threads which run scheduled iterations.
+
+    Threads are started lazily, only when all the already started threads
+    are busy, so the number of threads never exceeds the number of
+    iterations which run at the same time.
+    """
+
+    def __init__(self, queue, max_concurrent, context, cls, method_name,
+                 args, event_queue, timeout, timeout_queue):
+        self.queue = queue
+        self.context = context
+        self.cls = cls
+        self.method_name = method_name
+        self.args = args
+        self.event_queue = event_queue
+        self.timeout = timeout
+        self.timeout_queue = timeout_queue
+
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.iterations = Queue.Queue()
+        self.threads = []
+        self._busy = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until there is a free slot for one more iteration."""
+        self.slots.acquire()
+
+    def dispatch(self, iteration, scheduled_at):
+        """Run the iteration in a free thread of the pool.
+
+        :param iteration: iteration number
+        :param scheduled_at: timestamp when the iteration should be started
+        """
+        with self._lock:
+            self._busy += 1
+            start_thread = self._busy > len(self.threads)
+        if start_thread:
+            thread = threading.Thread(target=self._run_iterations)
+            thread.start()
+            self.threads.append(thread)
+        self.iterations.put((iteration, scheduled_at))
+
+    def stop(self):
+        """Wait for running iterations and stop all the threads."""
+        for thread in self.threads:
+            self.iterations.put(None)
+        for thread in self.threads:
+            thread.join()
+
+    def _run_iterations(self):
+        while True:
+            item = self.iterations.get()
+            if item is None:
+                break
+            iteration, scheduled_at = item
+            tracker = result = None
+            try:
+                scenario_context = runner._get_scenario_context(
+                    iteration, self.context)
+                tracker = runner._IterationTracker()
+                if self.timeout_queue:
+                    self.timeout_queue.put(
+                        (tracker, time.time() + self.timeout))
+                lag = max(time.time() - scheduled_at, 0.0)
+                tracker.start()
+                result = runner._run_scenario_once(
+                    self.cls, self.method_name, scenario_context, self.args,
+                    self.event_queue)
+                tracker.finish()
+            except exceptions.ThreadTimeoutException:
+                # The iteration has finished right at the moment of its
+                # timeout, so the termination hit the worker thread instead
+                # of the scenario.
+                LOG.debug("Iteration %s was interrupted after it had "
+                          "finished." % (iteration + 1))
+            finally:
+                if tracker is not None:
+                    tracker.finish()
+                with self._lock:
+                    self._busy -= 1
+                self.slots.release()
+            if result is not None:
+                result["output"]["additive"].append(_format_start_lag(lag))
+                self.queue.put(result)
+
+
 def _worker_process(queue, iteration_gen, timeout, times, max_concurrent,
                     context, cls, method_name, args, event_queue, aborted,
-                    runs_per_second, rps_cfg, processes_to_start, info):
+                    schedule, start_time, info):
     """Start scenario within threads.
 
-    Spawn N threads per second. Each thread runs the scenario once, and appends
-    result to queue. A maximum of max_concurrent threads will be ran
-    concurrently.
+    Take iterations one by one from the shared generator, wait until the
+    scheduled start time of the iteration and run it in a pool of reused
+    threads. All the processes share the same schedule, so the aggregated
+    rate of iterations doesn't depend on the number of processes. A maximum
+    of max_concurrent iterations will be ran concurrently, an iteration
+    which doesn't have a free slot is delayed and its start lag grows.
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
@@ -47,74 +190,42 @@ def _worker_process(queue, iteration_gen, timeout, times, max_concurrent,
     :param cls: scenario class
     :param method_name: scenario method name
     :param args: scenario args
+    :param event_queue: queue object to append events
     :param aborted: multiprocessing.Event that aborts load generation if
                     the flag is set
-    :param runs_per_second: function that should return desired rps value
-    :param rps_cfg: rps section from task config
-    :param processes_to_start: int, number of started processes for scenario
-                               execution
+    :param schedule: offsets of iterations' start times from the start_time
+    :param start_time: timestamp of the start of the load
     :param info: info about all processes count and counter of runned process
     """
 
-    pool = collections.deque()
-    if isinstance(rps_cfg, dict):
-        rps = rps_cfg["start"]
-    else:
-        rps = rps_cfg
-    sleep = 1.0 / rps
-
-    runner._log_worker_info(times=times, rps=rps, timeout=timeout,
-                            cls=cls, method_name=method_name, args=args)
-
-    time.sleep(
-        (sleep * info["processes_counter"]) / info["processes_to_start"])
-
-    start = time.time()
-    timeout_queue = Queue.Queue()
+    runner._log_worker_info(times=times, max_concurrent=max_concurrent,
+                            timeout=timeout, cls=cls, method_name=method_name,
+                            args=args)
 
+    timeout_queue = None
     if timeout:
+        timeout_queue = Queue.Queue()
         collector_thr_by_timeout = threading.Thread(
             target=utils.timeout_thread,
             args=(timeout_queue, )
         )
         collector_thr_by_timeout.start()
 
-    i = 0
-    while i < times and not aborted.is_set():
-        scenario_context = runner._get_scenario_context(next(iteration_gen),
-                                                        context)
-        worker_args = (
-            queue, cls, method_name, scenario_context, args, event_queue)
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
-
-        i += 1
-        thread.start()
-        if timeout:
-            timeout_queue.put((thread, time.time() + timeout))
-        pool.append(thread)
-
-        time_gap = time.time() - start
-        real_rps = i / time_gap if time_gap else "Infinity"
-
-        LOG.debug("Worker: %s rps: %s (requested rps: %s)" %
-                  (i, real_rps, runs_per_second(
-                      rps_cfg, start, processes_to_start)))
-
-        # try to join latest thread(s) until it finished, or until time to
-        # start new thread (if we have concurrent slots available)
-        while i / (time.time() - start) > runs_per_second(
-                rps_cfg, start, processes_to_start) or (
-                    len(pool) >= max_concurrent):
-            if pool:
-                pool[0].join(0.001)
-                if not pool[0].isAlive():
-                    pool.popleft()
-            else:
-                time.sleep(0.001)
+    pool = _ThreadPool(queue, max_concurrent, context, cls, method_name, args,
+                       event_queue, timeout, timeout_queue)
 
-    while pool:
-        pool.popleft().join()
+    while not aborted.is_set():
+        iteration = next(iteration_gen)
+        if iteration >= times:
+            break
+        scheduled_at = start_time + schedule[iteration]
+        delay = scheduled_at - time.time()
+        if delay > 0 and aborted.wait(delay):
+            break
+        pool.acquire()
+        pool.dispatch(iteration, scheduled_at)
+
+    pool.stop()
 
     if timeout:
         timeout_queue.put((None, None,))
@@ -144,6 +255,11 @@ class RPSScenarioRunner(runner.ScenarioRunner):
     An example of a rps scenario is booting 1 VM per second. This
     execution type is thus very helpful in understanding the maximal load that
     a certain cloud can handle.
+
+    Start times of all iterations are scheduled in advance (at exact
+    intervals or as a Poisson process), so the load doesn't slow down when
+    the cloud responds slowly. The delay between the scheduled and the actual
+    start of each iteration is saved in the iteration output as "Start lag".
     """
 
     CONFIG_SCHEMA = {
@@ -193,6 +309,14 @@ class RPSScenarioRunner(runner.ScenarioRunner):
                     }
                 ],
             },
+            "distribution": {
+                "enum": sorted(ARRIVAL_DISTRIBUTIONS),
+                "description": "Distribution of intervals between starts "
+                               "of subsequent iterations. 'constant' starts "
+                               "iterations at exact intervals, 'poisson' "
+                               "models independent arrivals with exponential "
+                               "intervals."
+            },
             "timeout": {
                 "type": "number",
             },
@@ -209,6 +333,33 @@ class RPSScenarioRunner(runner.ScenarioRunner):
         "additionalProperties": False
     }
 
+    @classmethod
+    def split_config(cls, config, parts):
+        """Split iterations between the parts.
+
+        The rate of each part is proportional to its number of iterations,
+        so all the parts finish at the same time.
+        """
+        max_concurrency = config.get("max_concurrency")
+        if max_concurrency:
+            parts = min(parts, max_concurrency)
+        times = runner.split_evenly(config["times"], parts)
+        configs = []
+        for part_times in times:
+            ratio = float(part_times) / config["times"]
+            if isinstance(config["rps"], dict):
+                rps = dict(config["rps"])
+                for key in ("start", "end", "step"):
+                    rps[key] *= ratio
+            else:
+                rps = config["rps"] * ratio
+            configs.append(dict(config, times=part_times, rps=rps))
+        if max_concurrency:
+            for part, concurrency in zip(configs, runner.split_evenly(
+                    max_concurrency, len(configs))):
+                part["max_concurrency"] = concurrency
+        return configs
+
     def _run_scenario(self, cls, method_name, context, args):
         """Runs the specified benchmark scenario with given arguments.
 
@@ -234,21 +385,8 @@ class RPSScenarioRunner(runner.ScenarioRunner):
         max_cpu_used = min(cpu_count,
                            self.config.get("max_cpu_count", cpu_count))
 
-        def runs_per_second(rps_cfg, start_timer, number_of_processes):
-            """At the given second return desired rps."""
-
-            if not isinstance(rps_cfg, dict):
-                return float(rps_cfg) / number_of_processes
-            stage_order = (time.time() - start_timer) / rps_cfg.get(
-                "duration", 1) - 1
-            rps = (float(rps_cfg["start"] + rps_cfg["step"] * stage_order) /
-                   number_of_processes)
-
-            return min(rps, float(rps_cfg["end"]))
-
         processes_to_start = min(max_cpu_used, times,
                                  self.config.get("max_concurrency", times))
-        times_per_worker, times_overhead = divmod(times, processes_to_start)
 
         # Determine concurrency per worker
         concurrency_per_worker, concurrency_overhead = divmod(
@@ -257,42 +395,38 @@ class RPSScenarioRunner(runner.ScenarioRunner):
         self._log_debug_info(times=times, timeout=timeout,
                              max_cpu_used=max_cpu_used,
                              processes_to_start=processes_to_start,
-                             times_per_worker=times_per_worker,
-                             times_overhead=times_overhead,
                              concurrency_per_worker=concurrency_per_worker,
                              concurrency_overhead=concurrency_overhead)
 
+        schedule = _arrival_schedule(
+            self.config["rps"], times,
+            self.config.get("distribution", "constant"))
+
         result_queue = multiprocessing.Queue()
         event_queue = multiprocessing.Queue()
+        start_time = time.time()
 
-        def worker_args_gen(times_overhead, concurrency_overhead):
+        def worker_args_gen(concurrency_overhead):
             """Generate arguments for process worker.
 
-            Remainder of threads per process division is distributed to
+            Remainder of concurrency per process division is distributed to
             process workers equally - one thread per each process worker
-            until the remainder equals zero. The same logic is applied
-            to concurrency overhead.
-            :param times_overhead: remaining number of threads to be
-                                   distributed to workers
+            until the remainder equals zero.
             :param concurrency_overhead: remaining number of maximum
                                          concurrent threads to be
                                          distributed to workers
             """
             while True:
                 yield (
-                    result_queue, iteration_gen, timeout,
-                    times_per_worker + (times_overhead and 1),
+                    result_queue, iteration_gen, timeout, times,
                     concurrency_per_worker + (concurrency_overhead and 1),
                     context, cls, method_name, args, event_queue,
-                    self.aborted, runs_per_second, self.config["rps"],
-                    processes_to_start
+                    self.aborted, schedule, start_time
                 )
-                if times_overhead:
-                    times_overhead -= 1
                 if concurrency_overhead:
                     concurrency_overhead -= 1
 
         process_pool = self._create_process_pool(
             processes_to_start, _worker_process,
-            worker_args_gen(times_overhead, concurrency_overhead))
+            worker_args_gen(concurrency_overhead))
         self._join_processes(process_pool, result_queue, event_queue)
@@ -46,6 +46,12 @@ class SerialScenarioRunner(runner.ScenarioRunner):
         "additionalProperties": True
     }
 
+    @classmethod
+    def split_config(cls, config, parts):
+        """Split iterations between the parts."""
+        return [dict(config, times=t)
+                for t in runner.split_evenly(config.get("times", 1), parts)]
+
     def _run_scenario(self, cls, method_name, context, args):
         """Runs the specified benchmark scenario with given arguments.
 
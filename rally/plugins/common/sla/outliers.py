@@ -31,6 +31,12 @@ class Outliers(sla.SLA):
 
     The outliers are detected automatically using the computation of the mean
     and standard deviation (std) of the data.
+
+    By default each iteration is compared only with the threshold computed
+    from the iterations preceding it, so the number of outliers is a rough
+    approximation. With "exact" set to true durations of all iterations are
+    compared with the threshold computed from the whole data, and they are
+    recounted every time the threshold moves.
     """
     CONFIG_SCHEMA = {
         "type": "object",
@@ -39,7 +45,8 @@ class Outliers(sla.SLA):
             "max": {"type": "integer", "minimum": 0},
             "min_iterations": {"type": "integer", "minimum": 3},
             "sigmas": {"type": "number", "minimum": 0.0,
-                       "exclusiveMinimum": True}
+                       "exclusiveMinimum": True},
+            "exact": {"type": "boolean"}
         },
         "additionalProperties": False,
     }
@@ -50,13 +57,34 @@ class Outliers(sla.SLA):
         # NOTE(msdubov): Having 3 as default is reasonable (need enough data).
         self.min_iterations = self.criterion_value.get("min_iterations", 3)
         self.sigmas = self.criterion_value.get("sigmas", 3.0)
+        self.exact = self.criterion_value.get("exact", False)
         self.iterations = 0
         self.outliers = 0
         self.threshold = None
         self.mean_comp = streaming_algorithms.MeanComputation()
         self.std_comp = streaming_algorithms.StdDevComputation()
+        if self.exact:
+            self.durations = streaming_algorithms.ThresholdCountComputation()
+
+    def _update_threshold(self):
+        if self.iterations >= 2:
+            mean = self.mean_comp.result()
+            std = self.std_comp.result()
+            self.threshold = mean + self.sigmas * std
+        if self.exact and self.iterations >= self.min_iterations:
+            self.outliers = self.durations.count_greater(self.threshold)
 
     def add_iteration(self, iteration):
+        if self.exact:
+            if not iteration.get("error"):
+                self.iterations += 1
+                self.mean_comp.add(iteration["duration"])
+                self.std_comp.add(iteration["duration"])
+                self.durations.add(iteration["duration"])
+                self._update_threshold()
+            self.success = self.outliers <= self.max_outliers
+            return self.success
+
         # NOTE(ikhudoshyn): This method can not be implemented properly.
         # After adding a new iteration, both mean and standard deviation
         # may change. Hence threshold will change as well. In this case we
@@ -64,7 +92,7 @@ class Outliers(sla.SLA):
         # to the threshold. Unfortunately we can not do it since
         # we do not store durations.
         # Implementation provided here only gives rough approximation
-        # of outliers number.
+        # of outliers number. Use "exact" mode to get the exact one.
         if not iteration.get("error"):
             duration = iteration["duration"]
             self.iterations += 1
@@ -77,15 +105,21 @@ class Outliers(sla.SLA):
             # NOTE(msdubov): Then update the threshold value
             self.mean_comp.add(duration)
             self.std_comp.add(duration)
-            if self.iterations >= 2:
-                mean = self.mean_comp.result()
-                std = self.std_comp.result()
-                self.threshold = mean + self.sigmas * std
+            self._update_threshold()
 
         self.success = self.outliers <= self.max_outliers
         return self.success
 
     def merge(self, other):
+        if self.exact:
+            self.iterations += other.iterations
+            self.mean_comp.merge(other.mean_comp)
+            self.std_comp.merge(other.std_comp)
+            self.durations.merge(other.durations)
+            self._update_threshold()
+            self.success = self.outliers <= self.max_outliers
+            return self.success
+
         # NOTE(ikhudoshyn): This method can not be implemented properly.
         # After merge, both mean and standard deviation may change.
         # Hence threshold will change as well. In this case we
@@ -93,16 +127,12 @@ class Outliers(sla.SLA):
         # to the threshold. Unfortunately we can not do it since
         # we do not store durations.
         # Implementation provided here only gives rough approximation
-        # of outliers number.
+        # of outliers number. Use "exact" mode to get the exact one.
         self.iterations += other.iterations
         self.outliers += other.outliers
         self.mean_comp.merge(other.mean_comp)
         self.std_comp.merge(other.std_comp)
-
-        if self.iterations >= 2:
-            mean = self.mean_comp.result()
-            std = self.std_comp.result()
-            self.threshold = mean + self.sigmas * std
+        self._update_threshold()
 
         self.success = self.outliers <= self.max_outliers
         return self.success
@@ -18,6 +18,7 @@ import json
 import re
 import xml.etree.ElementTree as ET
 
+from rally.common import objects
 from rally.common import version
 from rally import consts
 from rally.ui import utils
@@ -208,7 +209,11 @@ class JSONReporter(reporter.VerificationReporter):
                 "failures": v.failures,
             }
 
-            for test_id, result in v.tests.items():
+        # results are grouped by tests in the database, so each test comes
+        # with its results in all the verifications
+        for test_id, results in objects.Verification.compare_tests(
+                self.verifications):
+            for uuid, result in results.items():
                 if test_id not in tests:
                     # NOTE(ylobankov): It is more convenient to see test ID
                     #                  at the first place in the report.
@@ -218,7 +223,7 @@ class JSONReporter(reporter.VerificationReporter):
                                       "name": result["name"],
                                       "by_verification": {}}
 
-                tests[test_id]["by_verification"][v.uuid] = {
+                tests[test_id]["by_verification"][uuid] = {
                     "status": result["status"],
                     "duration": result["duration"]
                 }
@@ -234,7 +239,7 @@ class JSONReporter(reporter.VerificationReporter):
                 sep = "\n\n" if reason and traceback else ""
                 d = (reason + sep + traceback.strip()) or None
                 if d:
-                    tests[test_id]["by_verification"][v.uuid]["details"] = d
+                    tests[test_id]["by_verification"][uuid]["details"] = d
 
         return {"verifications": verifications, "tests": tests}
 
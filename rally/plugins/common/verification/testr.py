@@ -123,10 +123,12 @@ class TestrLauncher(manager.VerifierManager):
                                   stderr=subprocess.STDOUT)
         xfail_list = run_args.get("xfail_list")
         skip_list = run_args.get("skip_list")
-        results = subunit_v2.parse(stream.stdout, live=True,
-                                   expected_failures=xfail_list,
-                                   skipped_tests=skip_list,
-                                   logger_name=self.verifier.name)
+        # results of tests are stored while tests are running
+        verification = context.get("verification")
+        results = subunit_v2.parse(
+            stream.stdout, live=True, expected_failures=xfail_list,
+            skipped_tests=skip_list, logger_name=self.verifier.name,
+            on_test_finished=verification.add_test if verification else None)
         stream.wait()
 
         return results
@@ -35,6 +35,7 @@ from rally.plugins.openstack.cfg import tempest
 
 from rally.plugins.openstack.cfg import keystone_roles
 from rally.plugins.openstack.cfg import keystone_users
+from rally.plugins.openstack.cfg import tenants
 
 from rally.plugins.openstack.cfg import cleanup
 
@@ -47,7 +48,7 @@ def list_opts():
                    nova.OPTS, profiler.OPTS, sahara.OPTS, vm.OPTS, glance.OPTS,
                    watcher.OPTS, tempest.OPTS, keystone_roles.OPTS,
                    keystone_users.OPTS, cleanup.OPTS, senlin.OPTS,
-                   neutron.OPTS):
+                   neutron.OPTS, tenants.OPTS):
         for category, opt in l_opts.items():
             opts.setdefault(category, [])
             opts[category].extend(opt)
@@ -13,8 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
+import operator
+import sys
+import threading
 import time
 
+import six
+
 from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
@@ -22,11 +28,74 @@ from rally.common.plugin import discover
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
 from rally.plugins.openstack.cleanup import base
+from rally.task import utils as task_utils
 
 
 LOG = logging.getLogger(__name__)
 
 
+class _DeletionChecker(object):
+    """Checks deletion of resources of the same type in batches.
+
+    Resources that are being deleted are not fetched one by one. Instead,
+    the client manager is listed at most once per polling interval and the
+    listing is shared by all consumers which wait for the deletion.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listing_locks = {}
+        self._listings = {}
+        self.list_calls = 0
+
+    @staticmethod
+    def is_supported(resource):
+        """Whether the resource uses the default is_deleted() check."""
+        return (isinstance(resource, base.ResourceManager)
+                and six.get_unbound_function(type(resource).is_deleted)
+                is six.get_unbound_function(base.ResourceManager.is_deleted))
+
+    def is_listed(self, resource):
+        """Checks that the resource is listed and not deleted yet.
+
+        :param resource: instance of resource manager
+        :returns: True if the resource is still listed. False means that
+            the resource is missing from the listing (or the listing failed),
+            so it should be checked by is_deleted()
+        """
+        try:
+            client_manager = resource._manager()
+        except Exception:
+            return False
+        key = id(client_manager)
+        # NOTE: the listing is made under the lock of its key, so consumers
+        #   of the same client manager wait for one listing and listings of
+        #   different client managers don't block each other.
+        with self._lock:
+            listing_lock = self._listing_locks.setdefault(key,
+                                                          threading.Lock())
+        with listing_lock:
+            listing = self._listings.get(key)
+            if (listing is None
+                    or time.time() - listing[1] >= resource._interval):
+                with self._lock:
+                    self.list_calls += 1
+                try:
+                    ids = set(
+                        r.id for r in client_manager.list()
+                        if task_utils.get_status(r) not in (
+                            "DELETED", "DELETE_COMPLETE"))
+                except Exception as e:
+                    LOG.debug("Failed to list %s.%s resources: %s"
+                              % (resource._service, resource._resource, e))
+                    ids = set()
+                # NOTE: the client manager is kept in the listing to not
+                #   let its id be reused by another object.
+                listing = (client_manager, time.time(), ids)
+                self._listings[key] = listing
+        return resource.id() in listing[2]
+
+
 class SeekAndDestroy(object):
 
     def __init__(self, manager_cls, admin, users, api_versions=None,
@@ -51,6 +120,9 @@ class SeekAndDestroy(object):
         self.resource_classes = resource_classes or [
             rutils.RandomNameGeneratorMixin]
         self.task_id = task_id
+        self._deletion_checker = _DeletionChecker()
+        self._stats_lock = threading.Lock()
+        self._stats = {"deleted": 0, "failed": 0}
 
     def _get_cached_client(self, user):
         """Simplifies initialization and caching OpenStack clients."""
@@ -67,8 +139,12 @@ class SeekAndDestroy(object):
 
         Writes in LOG warning with UUID of resource that wasn't deleted
 
+        While resources with the default is_deleted() method are listed by
+        the client manager, they are not fetched one by one.
+
         :param resource: instance of resource manager initiated with resource
                          that should be deleted.
+        :returns: True if the resource is deleted, otherwise False
         """
 
         msg_kw = {
@@ -95,10 +171,13 @@ class SeekAndDestroy(object):
         else:
             started = time.time()
             failures_count = 0
+            batched = self._deletion_checker.is_supported(resource)
             while time.time() - started < resource._timeout:
                 try:
+                    if batched and self._deletion_checker.is_listed(resource):
+                        continue
                     if resource.is_deleted():
-                        return
+                        return True
                 except Exception as e:
                     LOG.warning(
                         _("Seems like %s.%s.is_deleted(self) method is broken "
@@ -118,6 +197,7 @@ class SeekAndDestroy(object):
             LOG.warning(_("Resource deletion failed, timeout occurred for "
                           "%(service)s.%(resource)s: %(uuid)s.")
                         % msg_kw)
+        return False
 
     def _publisher(self, queue):
         """Publisher for deletion jobs.
@@ -177,13 +257,35 @@ class SeekAndDestroy(object):
                 rutils.name_matches_object(
                     manager.name(), *self.resource_classes,
                     task_id=self.task_id, exact=False)):
-            self._delete_single_resource(manager)
+            deleted = self._delete_single_resource(manager)
+            with self._stats_lock:
+                self._stats["deleted" if deleted else "failed"] += 1
 
     def exterminate(self):
-        """Delete all resources for passed users, admin and resource_mgr."""
+        """Delete all resources for passed users, admin and resource_mgr.
 
+        Resources are deleted while they are still being listed.
+
+        :returns: dict with amounts of deleted and failed resources, duration
+            of the cleanup and its throughput (deleted resources per second)
+        """
+        started = time.time()
         broker.run(self._publisher, self._consumer,
-                   consumers_count=self.manager_cls._threads)
+                   consumers_count=self.manager_cls._threads,
+                   streaming=True)
+        duration = time.time() - started
+
+        stats = dict(self._stats)
+        stats["duration"] = duration
+        stats["throughput"] = stats["deleted"] / duration if duration else 0
+        stats["list_calls"] = self._deletion_checker.list_calls
+        if stats["deleted"] or stats["failed"]:
+            LOG.info("Cleanup of %(service)s.%(resource)s: %(deleted)d "
+                     "deleted, %(failed)d failed in %(duration).2f sec "
+                     "(%(throughput).2f resources/sec)"
+                     % dict(stats, service=self.manager_cls._service,
+                            resource=self.manager_cls._resource))
+        return stats
 
 
 def list_resource_names(admin_required=None):
@@ -279,7 +381,8 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
     if not resource_classes and issubclass(superclass,
                                            rutils.RandomNameGeneratorMixin):
         resource_classes.append(superclass)
-    for manager in find_resource_managers(names, admin_required):
+
+    def exterminate(manager):
         LOG.debug("Cleaning up %(service)s %(resource)s objects" %
                   {"service": manager._service,
                    "resource": manager._resource})
@@ -287,3 +390,35 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
                        api_versions=api_versions,
                        resource_classes=resource_classes,
                        task_id=task_id).exterminate()
+
+    # Resource managers with the same order do not depend on each other,
+    # so they are processed simultaneously.
+    for order, managers in itertools.groupby(
+            find_resource_managers(names, admin_required),
+            key=operator.attrgetter("_order")):
+        managers = list(managers)
+        if len(managers) == 1:
+            exterminate(managers[0])
+            continue
+        errors = []
+
+        def run(manager):
+            try:
+                exterminate(manager)
+            except Exception as e:
+                LOG.error("Failed to clean up %(service)s %(resource)s "
+                          "objects: %(error)s"
+                          % {"service": manager._service,
+                             "resource": manager._resource, "error": e})
+                errors.append(sys.exc_info())
+
+        threads = [threading.Thread(target=run, args=(manager,))
+                   for manager in managers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # NOTE: the errors are raised as in case of a single manager, after
+        #   the rest managers of the same order are processed
+        if errors:
+            six.reraise(*errors[0])
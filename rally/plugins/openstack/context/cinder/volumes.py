@@ -14,10 +14,10 @@
 
 from rally.common.i18n import _
 from rally.common import logging
-from rally.common import utils as rutils
 from rally import consts
 from rally import osclients
 from rally.plugins.openstack.cleanup import manager as resource_manager
+from rally.plugins.openstack.context import utils as context_utils
 from rally.plugins.openstack.services.storage import block
 from rally.task import context
 
@@ -64,8 +64,7 @@ class VolumeGenerator(context.Context):
         volume_type = self.config.get("type", None)
         volumes_per_tenant = self.config["volumes_per_tenant"]
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
+        def create_volumes(user, tenant_id, iteration):
             self.context["tenants"][tenant_id].setdefault("volumes", [])
             clients = osclients.Clients(
                 user["credential"],
@@ -78,6 +77,8 @@ class VolumeGenerator(context.Context):
                 self.context["tenants"][tenant_id]["volumes"].append(
                     vol._asdict())
 
+        context_utils.run_per_tenants(self, create_volumes)
+
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Volumes`"))
     def cleanup(self):
         resource_manager.cleanup(
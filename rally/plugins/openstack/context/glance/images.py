@@ -21,6 +21,7 @@ from rally.common import validation
 from rally import consts
 from rally import osclients
 from rally.plugins.openstack.cleanup import manager as resource_manager
+from rally.plugins.openstack.context import utils as context_utils
 from rally.plugins.openstack.services.image import image
 from rally.task import context
 
@@ -168,8 +169,7 @@ class ImageGenerator(context.Context):
         if "image_name" in self.config and images_per_tenant == 1:
             image_name = self.config["image_name"]
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
+        def create_images(user, tenant_id, iteration):
             current_images = []
             clients = osclients.Clients(
                 user["credential"],
@@ -190,6 +190,8 @@ class ImageGenerator(context.Context):
 
             self.context["tenants"][tenant_id]["images"] = current_images
 
+        context_utils.run_per_tenants(self, create_images)
+
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Images`"))
     def cleanup(self):
         if self.context.get("admin", {}):
@@ -15,10 +15,10 @@
 
 from rally.common.i18n import _
 from rally.common import logging
-from rally.common import utils as rutils
 from rally.common import validation
 from rally import consts
 from rally.plugins.openstack.cleanup import manager as resource_manager
+from rally.plugins.openstack.context import utils as context_utils
 from rally.plugins.openstack.scenarios.heat import utils as heat_utils
 from rally.task import context
 
@@ -76,8 +76,8 @@ class StackGenerator(context.Context):
     def setup(self):
         template = self._prepare_stack_template(
             self.config["resources_per_stack"])
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
+
+        def create_stacks(user, tenant_id, iteration):
             heat_scenario = heat_utils.HeatScenario(
                 {"user": user, "task": self.context["task"],
                  "owner_id": self.context["owner_id"]})
@@ -86,6 +86,8 @@ class StackGenerator(context.Context):
                 stack = heat_scenario._create_stack(template)
                 self.context["tenants"][tenant_id]["stacks"].append(stack.id)
 
+        context_utils.run_per_tenants(self, create_stacks)
+
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Stacks`"))
     def cleanup(self):
         resource_manager.cleanup(names=["heat.stacks"],
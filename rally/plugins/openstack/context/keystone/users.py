@@ -150,7 +150,7 @@ class UserGenerator(context.Context):
             tenants.append(tenant_dict)
 
         # NOTE(msdubov): consume() will fill the tenants list in the closure.
-        broker.run(publish, consume, threads)
+        broker.run(publish, consume, threads, streaming=True)
         tenants_dict = {}
         for t in tenants:
             tenants_dict[t["id"]] = t
@@ -203,7 +203,7 @@ class UserGenerator(context.Context):
                           "tenant_id": tenant_id})
 
         # NOTE(msdubov): consume() will fill the users list in the closure.
-        broker.run(publish, consume, threads)
+        broker.run(publish, consume, threads, streaming=True)
         return list(users)
 
     def _get_consumer_for_deletion(self, func_name):
@@ -222,7 +222,7 @@ class UserGenerator(context.Context):
                 queue.append(tenant_id)
 
         broker.run(publish, self._get_consumer_for_deletion("delete_project"),
-                   threads)
+                   threads, streaming=True)
         self.context["tenants"] = {}
 
     def _delete_users(self):
@@ -233,7 +233,7 @@ class UserGenerator(context.Context):
                 queue.append(user["id"])
 
         broker.run(publish, self._get_consumer_for_deletion("delete_user"),
-                   threads)
+                   threads, streaming=True)
         self.context["users"] = []
 
     @logging.log_task_wrapper(LOG.info, _("Enter context: `users`"))
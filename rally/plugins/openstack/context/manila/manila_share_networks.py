@@ -17,12 +17,12 @@ from oslo_config import cfg
 
 from rally.common.i18n import _
 from rally.common import logging
-from rally.common import utils
 from rally.common import validation
 from rally import consts as rally_consts
 from rally import exceptions
 from rally.plugins.openstack.cleanup import manager as resource_manager
 from rally.plugins.openstack.context.manila import consts
+from rally.plugins.openstack.context import utils as context_utils
 from rally.plugins.openstack.scenarios.manila import utils as manila_utils
 from rally.task import context
 
@@ -143,8 +143,7 @@ class ShareNetworks(context.Context):
 
     def _setup_for_autocreated_users(self):
         # Create share network for each network of tenant
-        for user, tenant_id in (utils.iterate_per_tenants(
-                self.context.get("users", []))):
+        def setup_tenant(user, tenant_id, iteration):
             networks = self.context["tenants"][tenant_id].get("networks")
             manila_scenario = manila_utils.ManilaScenario({
                 "task": self.task,
@@ -185,6 +184,8 @@ class ShareNetworks(context.Context):
             else:
                 _setup_share_network(tenant_id, data)
 
+        context_utils.run_per_tenants(self, setup_tenant)
+
     @logging.log_task_wrapper(LOG.info, _("Enter context: `%s`")
                               % CONTEXT_NAME)
     def setup(self):
@@ -13,12 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 from rally.common.i18n import _
 from rally.common import logging
-from rally.common import utils
 from rally.common import validation
 from rally import consts
 from rally import osclients
+from rally.plugins.openstack.context import utils as context_utils
 from rally.plugins.openstack.wrappers import network as network_wrapper
 from rally.task import context
 
@@ -79,20 +81,24 @@ class Network(context.Context):
         #               multithreading/multiprocessing, it is likely the
         #               sockets are left open. This problem is eliminated by
         #               creating a connection in setup and cleanup separately.
-        net_wrapper = network_wrapper.wrap(
-            osclients.Clients(self.context["admin"]["credential"]),
-            self, config=self.config)
+        # Tenants are processed in parallel, so every thread uses its own
+        # connection.
+        local = threading.local()
         kwargs = {}
         if self.config["dns_nameservers"] is not None:
             kwargs["dns_nameservers"] = self.config["dns_nameservers"]
-        for user, tenant_id in (utils.iterate_per_tenants(
-                self.context.get("users", []))):
+
+        def create_networks(user, tenant_id, iteration):
+            if not hasattr(local, "net_wrapper"):
+                local.net_wrapper = network_wrapper.wrap(
+                    osclients.Clients(self.context["admin"]["credential"]),
+                    self, config=self.config)
             self.context["tenants"][tenant_id]["networks"] = []
             for i in range(self.config["networks_per_tenant"]):
                 # NOTE(amaretskiy): add_router and subnets_num take effect
                 #                   for Neutron only.
                 network_create_args = self.config["network_create_args"].copy()
-                network = net_wrapper.create_network(
+                network = local.net_wrapper.create_network(
                     tenant_id,
                     add_router=True,
                     subnets_num=self.config["subnets_per_network"],
@@ -100,6 +106,8 @@ class Network(context.Context):
                     **kwargs)
                 self.context["tenants"][tenant_id]["networks"].append(network)
 
+        context_utils.run_per_tenants(self, create_networks)
+
     @logging.log_task_wrapper(LOG.info, _("Exit context: `network`"))
     def cleanup(self):
         net_wrapper = network_wrapper.wrap(
@@ -14,10 +14,10 @@
 
 from rally.common.i18n import _
 from rally.common import logging
-from rally.common import utils as rutils
 from rally.common import validation
 from rally import osclients
 from rally.plugins.openstack.cleanup import manager as resource_manager
+from rally.plugins.openstack.context import utils as context_utils
 from rally.plugins.openstack.scenarios.nova import utils as nova_utils
 from rally.plugins.openstack import types
 from rally.task import context
@@ -102,8 +102,7 @@ class ServerGenerator(context.Context):
         flavor_id = types.Flavor.transform(clients=clients,
                                            resource_config=flavor)
 
-        for iter_, (user, tenant_id) in enumerate(rutils.iterate_per_tenants(
-                self.context["users"])):
+        def boot_servers(user, tenant_id, iter_):
             LOG.debug("Booting servers for user tenant %s "
                       % (user["tenant_id"]))
             tmp_context = {"user": user,
@@ -133,6 +132,8 @@ class ServerGenerator(context.Context):
             self.context["tenants"][tenant_id][
                 "servers"] = current_servers
 
+        context_utils.run_per_tenants(self, boot_servers)
+
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Servers`"))
     def cleanup(self):
         resource_manager.cleanup(names=["nova.servers"],
@@ -54,7 +54,7 @@ class SwiftObjectMixin(object):
                                       "objects": []})
             containers.append((user["tenant_id"], container_name))
 
-        broker.run(publish, consume, threads)
+        broker.run(publish, consume, threads, streaming=True)
 
         return containers
 
@@ -96,7 +96,7 @@ class SwiftObjectMixin(object):
                 objects.append((user["tenant_id"], container["container"],
                                 object_name))
 
-            broker.run(publish, consume, threads)
+            broker.run(publish, consume, threads, streaming=True)
 
         return objects
 
@@ -122,7 +122,7 @@ class SwiftObjectMixin(object):
             cache[user["id"]]._delete_container(container["container"])
             tenant_containers.remove(container)
 
-        broker.run(publish, consume, threads)
+        broker.run(publish, consume, threads, streaming=True)
 
     def _delete_objects(self, context, threads):
         """Delete objects created by Swift context and update Rally context.
@@ -148,4 +148,4 @@ class SwiftObjectMixin(object):
                                              object_name)
             container["objects"].remove(object_name)
 
-        broker.run(publish, consume, threads)
+        broker.run(publish, consume, threads, streaming=True)
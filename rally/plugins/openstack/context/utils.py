@@ -0,0 +1,75 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_config import cfg
+
+from rally.common import broker
+from rally.common.i18n import _
+from rally.common import logging
+from rally.common import opts
+from rally.common import utils as rutils
+from rally import exceptions
+
+
+opts.register(categories=["tenants_context"])
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+
+def run_per_tenants(ctx, func, workers=None):
+    """Call func for a single user of each tenant in parallel.
+
+    A failure in one tenant does not interrupt processing of others. All
+    the failures are logged and reported together after all tenants are
+    processed.
+
+    :param ctx: context instance with users and tenants in its context
+    :param func: function that accepts user, tenant id and number of the
+        tenant
+    :param workers: number of concurrent threads, by default it is
+        `resource_management_workers` option of `tenants_context` group
+    :raises ContextSetupFailure: if func failed for any tenant
+    """
+    workers = workers or CONF.tenants_context.resource_management_workers
+    tenants = list(enumerate(rutils.iterate_per_tenants(
+        ctx.context.get("users", []))))
+    failures = []
+
+    def publish(queue):
+        for iteration, (user, tenant_id) in tenants:
+            queue.append((user, tenant_id, iteration))
+
+    def consume(cache, args):
+        user, tenant_id, iteration = args
+        try:
+            func(user, tenant_id, iteration)
+        except Exception as e:
+            failures.append((tenant_id, e))
+            LOG.error(_("Context %(ctx)s failed for tenant %(tenant)s: "
+                        "%(error)s") % {"ctx": ctx.get_name(),
+                                        "tenant": tenant_id, "error": e})
+            if logging.is_debug():
+                LOG.exception(e)
+
+    broker.run(publish, consume, min(workers, len(tenants)),
+               streaming=True)
+
+    if failures:
+        raise exceptions.ContextSetupFailure(
+            ctx_name=ctx.get_name(),
+            msg=_("Failed for %(count)d of %(total)d tenants: %(errors)s")
+            % {"count": len(failures), "total": len(tenants),
+               "errors": "; ".join("%s: %s" % f for f in failures)})
@@ -42,15 +42,20 @@ class OpenStackScenario(scenario.Scenario):
                             "service_type")}
 
             if admin_clients is None and "admin" in context:
+                credential = context["admin"]["credential"]
                 self._admin_clients = osclients.Clients(
-                    context["admin"]["credential"], api_info)
+                    credential, api_info,
+                    cache=osclients.SHARED_CACHE.get(credential, api_info))
             if clients is None:
                 if "users" in context and "user" not in context:
                     self._choose_user(context)
 
                 if "user" in context:
+                    credential = context["user"]["credential"]
                     self._clients = osclients.Clients(
-                        context["user"]["credential"], api_info)
+                        credential, api_info,
+                        cache=osclients.SHARED_CACHE.get(credential,
+                                                         api_info))
 
         if admin_clients:
             self._admin_clients = admin_clients
@@ -15,8 +15,12 @@
 
 import functools
 
+import six
+
 from rally.common import logging
 from rally.common import utils
+from rally import exceptions
+from rally.task import utils as task_utils
 
 LOG = logging.getLogger(__name__)
 
@@ -47,7 +51,12 @@ class ActionTimer(utils.Timer):
 
         :param instance: instance of subclass of ActionTimerMixin
         :param name: name of the ActionBuilder
+        :raises RallyException: if name of the action is not a string
         """
+        if (task_utils.need_result_validation()
+                and not isinstance(name, six.string_types)):
+            raise exceptions.RallyException(
+                "Name of atomic action should be a string, not %r" % name)
         super(ActionTimer, self).__init__()
         self.instance = instance
         self.name = name
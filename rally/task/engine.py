@@ -16,6 +16,7 @@
 import collections
 import copy
 import json
+import multiprocessing
 import threading
 import time
 import traceback
@@ -81,6 +82,7 @@ class ResultConsumer(object):
         self.workload_data_count = 0
 
         self.sla_checker = sla.SLAChecker(key["kw"])
+        self.statistics = objects.WorkloadStatistics()
         self.hook_executor = hook.HookExecutor(key["kw"], self.task)
         self.abort_on_sla_failure = abort_on_sla_failure
         self.is_done = threading.Event()
@@ -101,6 +103,7 @@ class ResultConsumer(object):
 
     def _consume_results(self):
         task_aborted = False
+        logged_at = 0
         while True:
             if self.runner.result_queue:
                 results = self.runner.result_queue.popleft()
@@ -111,6 +114,7 @@ class ResultConsumer(object):
                     self.load_finished_at = max(r["duration"] + r["timestamp"],
                                                 self.load_finished_at)
                     success = self.sla_checker.add_iteration(r)
+                    self.statistics.add_iteration(r)
                     if (self.abort_on_sla_failure and
                             not success and
                             not task_aborted):
@@ -130,10 +134,20 @@ class ResultConsumer(object):
                                                     {"raw": results_chunk})
                     self.workload_data_count += 1
 
+                if logging.is_debug() and time.time() - logged_at > 1:
+                    logged_at = time.time()
+                    LOG.debug("Task %(task)s | %(queued)s batches of results "
+                              "are waiting in the runner queue, %(buffered)s "
+                              "results are waiting to be saved."
+                              % {"task": self.task["uuid"],
+                                 "queued": len(self.runner.result_queue),
+                                 "buffered": len(self.results)})
+
             elif self.is_done.isSet():
                 break
             else:
-                time.sleep(0.1)
+                # the timeout protects from a wake up missed at the end
+                self.runner.result_queue.wait(0.1)
 
     def _consume_events(self):
         while not self.is_done.isSet() or self.runner.event_queue:
@@ -142,11 +156,13 @@ class ResultConsumer(object):
                 self.hook_executor.on_event(
                     event_type=event["type"], value=event["value"])
             else:
-                time.sleep(0.01)
+                self.runner.event_queue.wait(0.1)
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         self.finish = time.time()
         self.is_done.set()
+        self.runner.result_queue.wake_up()
+        self.runner.event_queue.wake_up()
         self.aborting_checker.join()
         self.thread.join()
 
@@ -170,6 +186,7 @@ class ResultConsumer(object):
             "load_duration": load_duration,
             "full_duration": self.finish - self.start,
             "sla": self.sla_checker.results(),
+            "statistics": self.statistics.to_dict()
         }
         if "hooks" in self.key["kw"]:
             self.event_thread.join()
@@ -459,9 +476,15 @@ class TaskEngine(object):
                 LOG.exception(e)
             raise exceptions.InvalidTaskException(str(e))
 
-    def _get_runner(self, config):
+    def _get_runner(self, config, max_cpu_count=None):
         config = config or {"type": "serial"}
-        return runner.ScenarioRunner.get(config["type"])(self.task, config)
+        runner_cls = runner.ScenarioRunner.get(config["type"])
+        if (max_cpu_count and "max_cpu_count" in
+                runner_cls.CONFIG_SCHEMA.get("properties", {})):
+            # The explicitly specified limit is not overridden
+            config = dict(config)
+            config.setdefault("max_cpu_count", max_cpu_count)
+        return runner_cls(self.task, config)
 
     def _prepare_context(self, ctx, name, owner_id):
         scenario_cls = scenario.Scenario.get(name)
@@ -517,8 +540,12 @@ class TaskEngine(object):
 
         try:
             # TODO(astudenov): add subtask context here
-            for workload in subtask.workloads:
-                self._run_workload(subtask_obj, workload)
+            if subtask.run_in_parallel and len(subtask.workloads) > 1:
+                self._run_workloads_in_parallel(subtask_obj,
+                                                subtask.workloads)
+            else:
+                for workload in subtask.workloads:
+                    self._run_workload(subtask_obj, workload)
         except TaskAborted:
             subtask_obj.update_status(consts.SubtaskStatus.ABORTED)
             raise
@@ -534,7 +561,38 @@ class TaskEngine(object):
         else:
             subtask_obj.update_status(consts.SubtaskStatus.FINISHED)
 
-    def _run_workload(self, subtask_obj, workload):
+    def _run_workloads_in_parallel(self, subtask_obj, workloads):
+        """Run workloads of the subtask simultaneously.
+
+        Every workload has its own runner, ResultConsumer and SLA checks.
+        CPUs are shared equally between runners which do not limit the
+        number of used CPUs explicitly. Errors are raised after all the
+        workloads are finished, a crash takes precedence over an abort.
+        """
+        max_cpu_count = max(1, multiprocessing.cpu_count() // len(workloads))
+        errors = []
+
+        def run(workload):
+            try:
+                self._run_workload(subtask_obj, workload,
+                                   max_cpu_count=max_cpu_count)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(workload,))
+                   for workload in workloads]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for e in errors:
+            if not isinstance(e, TaskAborted):
+                raise e
+        if errors:
+            raise errors[0]
+
+    def _run_workload(self, subtask_obj, workload, max_cpu_count=None):
         if ResultConsumer.is_task_in_aborting_status(self.task["uuid"]):
             raise TaskAborted()
 
@@ -542,7 +600,8 @@ class TaskEngine(object):
         workload_obj = subtask_obj.add_workload(key)
         LOG.info("Running benchmark with key: \n%s"
                  % json.dumps(key, indent=2))
-        runner_obj = self._get_runner(workload.runner)
+        runner_obj = self._get_runner(workload.runner,
+                                      max_cpu_count=max_cpu_count)
         context_obj = self._prepare_context(
             workload.context, workload.name, workload_obj["uuid"])
         try:
@@ -753,12 +812,14 @@ class SubTask(object):
         self.workloads = [Workload(wconf, pos)
                           for pos, wconf in enumerate(config["workloads"])]
         self.context = config.get("context", {})
+        self.run_in_parallel = config.get("run_in_parallel", False)
 
     def to_dict(self):
         return {
             "title": self.title,
             "description": self.description,
             "context": self.context,
+            "run_in_parallel": self.run_in_parallel,
         }
 
 
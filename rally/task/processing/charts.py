@@ -50,6 +50,8 @@ class Chart(plugin.Plugin):
         self._workload_info = workload_info
         self.base_size = workload_info.get("iterations_count", 0)
         self.zipped_size = zipped_size
+        self._atomic_merger = None
+        self._atomic_names = None
 
     def add_iteration(self, iteration):
         """Add iteration data.
@@ -65,6 +67,22 @@ class Chart(plugin.Plugin):
                                                      self.zipped_size)
             self._data[name].add_point(value)
 
+    def add_columns(self, columns):
+        """Add data of all the iterations at once.
+
+        This is an alternative to add_iteration() which processes whole
+        columns of values instead of iterations one by one, so the values
+        of iterations are taken once for all the charts of a workload.
+        Results are the same as if each iteration is added.
+
+        :param columns: utils.IterationColumns instance
+        """
+        for name, values in self._map_columns(columns):
+            points = self._data.setdefault(
+                name, utils.GraphZipper(self.base_size, self.zipped_size))
+            for value in values:
+                points.add_point(value)
+
     def render(self):
         """Generate chart data ready for drawing."""
         return [(name, points.get_zipped_graph())
@@ -81,19 +99,54 @@ class Chart(plugin.Plugin):
             atomic_actions.setdefault(name, 0)
         return atomic_actions
 
+    def _get_atomic_merger(self):
+        # Merger and merged names do not change between iterations, so
+        # they are created once instead of once per iteration.
+        if self._atomic_merger is None:
+            self._atomic_merger = utils.AtomicMerger(
+                self._workload_info["atomic"])
+        return self._atomic_merger
+
     def _get_atomic_names(self):
-        atomic_merger = utils.AtomicMerger(self._workload_info["atomic"])
-        return atomic_merger.get_merged_names()
+        if self._atomic_names is None:
+            self._atomic_names = self._get_atomic_merger().get_merged_names()
+        return list(self._atomic_names)
 
     def _merge_atomic_actions(self, atomic_actions):
-        atomic_merger = utils.AtomicMerger(self._workload_info["atomic"])
-        return atomic_merger.merge_atomic_actions(
+        return self._get_atomic_merger().merge_atomic_actions(
             atomic_actions)
 
+    def _get_atomic_columns(self, columns):
+        """Get columns of atomic actions with `0' for missed actions.
+
+        Names go in the same order as _fix_atomic_actions() gives them for
+        the first iteration: actions of this iteration first.
+        """
+        if not len(columns):
+            return []
+        present, missed = [], []
+        for name, values in columns.atomic.items():
+            (missed if values[0] is None else present).append(
+                (name, [0 if value is None else value for value in values]))
+        return present + missed
+
     @abc.abstractmethod
     def _map_iteration_values(self, iteration):
         """Get values for processing, from given iteration."""
 
+    def _map_columns(self, columns):
+        """Get columns of values for processing, from given columns.
+
+        By default values are taken from each iteration restored from the
+        columns by _map_iteration_values(), so charts which only implement
+        it support add_columns() too.
+        """
+        result = collections.OrderedDict()
+        for iteration in columns.rows():
+            for name, value in self._map_iteration_values(iteration):
+                result.setdefault(name, []).append(value)
+        return list(result.items())
+
 
 class MainStackedAreaChart(Chart):
 
@@ -113,6 +166,18 @@ class MainStackedAreaChart(Chart):
                 result.append(("failed_duration", 0))
         return result
 
+    def _map_columns(self, columns):
+        if not len(columns):
+            return []
+        rows = list(zip(columns.duration, columns.idle_duration,
+                        columns.error))
+        result = [("duration", [0 if e else d for d, i, e in rows]),
+                  ("idle_duration", [0 if e else i for d, i, e in rows])]
+        if self._workload_info["iterations_failed"]:
+            result.append(("failed_duration",
+                           [d + i if e else 0 for d, i, e in rows]))
+        return result
+
 
 class AtomicStackedAreaChart(Chart):
 
@@ -133,6 +198,20 @@ class AtomicStackedAreaChart(Chart):
             atomics.append(("failed_duration", failed_duration))
         return atomics
 
+    def _map_columns(self, columns):
+        atomics = self._get_atomic_columns(columns)
+        if len(columns) and self._workload_info["iterations_failed"]:
+            # atomic actions are summed in the same order as in
+            # _map_iteration_values(), so the sums are the same
+            atomic_values = list(columns.atomic.values())
+            failed_duration = [
+                (columns.duration[idx] + columns.idle_duration[idx]
+                 - sum([(values[idx] or 0) for values in atomic_values]))
+                if error else 0
+                for idx, error in enumerate(columns.error)]
+            atomics.append(("failed_duration", failed_duration))
+        return atomics
+
 
 class AvgChart(Chart):
     """Base class for charts with average results."""
@@ -145,6 +224,12 @@ class AvgChart(Chart):
                 self._data[name] = streaming.MeanComputation()
             self._data[name].add(value or 0)
 
+    def add_columns(self, columns):
+        for name, values in self._map_columns(columns):
+            mean = self._data.setdefault(name, streaming.MeanComputation())
+            for value in values:
+                mean.add(value or 0)
+
     def render(self):
         return [(k, v.result()) for k, v in self._data.items()]
 
@@ -157,6 +242,9 @@ class AtomicAvgChart(AvgChart):
         atomic_actions = self._fix_atomic_actions(atomic_actions)
         return list(atomic_actions.items())
 
+    def _map_columns(self, columns):
+        return self._get_atomic_columns(columns)
+
 
 class LoadProfileChart(Chart):
     """Chart for parallel durations."""
@@ -189,7 +277,13 @@ class LoadProfileChart(Chart):
         return (iteration["timestamp"], iteration["duration"])
 
     def add_iteration(self, iteration):
-        timestamp, duration = self._map_iteration_values(iteration)
+        self._add_load(*self._map_iteration_values(iteration))
+
+    def add_columns(self, columns):
+        for timestamp, duration in zip(columns.timestamp, columns.duration):
+            self._add_load(timestamp, duration)
+
+    def _add_load(self, timestamp, duration):
         ts_start = timestamp - self._tstamp_start
         started_idx = bisect.bisect(self._time_axis, ts_start)
         ended_idx = bisect.bisect(self._time_axis, ts_start + duration)
@@ -243,11 +337,27 @@ class HistogramChart(Chart):
         for name, value in self._map_iteration_values(iteration):
             if name not in self._data:
                 raise KeyError("Unexpected histogram name: %s" % name)
-            for i, view in enumerate(self._data[name]["views"]):
-                for bin_i, bin_v in enumerate(view["x"]):
-                    if (value or 0) <= bin_v:
-                        self._data[name]["views"][i]["y"][bin_i] += 1
-                        break
+            for view in self._data[name]["views"]:
+                # Bins are sorted, so the first one which is not less
+                # than the value is found by binary search.
+                bin_i = bisect.bisect_left(view["x"], value or 0)
+                if bin_i < len(view["x"]):
+                    view["y"][bin_i] += 1
+
+    def add_columns(self, columns):
+        for name, values in self._map_columns(columns):
+            if name not in self._data:
+                raise KeyError("Unexpected histogram name: %s" % name)
+            values = sorted(value or 0 for value in values)
+            for view in self._data[name]["views"]:
+                # Values are sorted once, so the number of values which
+                # fall into each bin is found by binary search. Values
+                # which are greater than the last bin are not counted.
+                counted = 0
+                for bin_i, x in enumerate(view["x"]):
+                    below = bisect.bisect_right(values, x)
+                    view["y"][bin_i] += below - counted
+                    counted = below
 
     def render(self):
         data = []
@@ -277,12 +387,16 @@ class MainHistogramChart(HistogramChart):
     def _map_iteration_values(self, iteration):
         return [("task", 0 if iteration["error"] else iteration["duration"])]
 
+    def _map_columns(self, columns):
+        return [("task", [0 if error else duration for duration, error
+                          in zip(columns.duration, columns.error)])]
+
 
 class AtomicHistogramChart(HistogramChart):
 
     def __init__(self, workload_info):
         super(AtomicHistogramChart, self).__init__(workload_info)
-        atomic_merger = utils.AtomicMerger(self._workload_info["atomic"])
+        atomic_merger = self._get_atomic_merger()
         for i, name in enumerate(self._workload_info["atomic"]):
             value = self._workload_info["atomic"][name]
             self._data[atomic_merger.get_merged_name(name)] = {
@@ -296,6 +410,9 @@ class AtomicHistogramChart(HistogramChart):
         atomic_actions = self._fix_atomic_actions(atomic_actions)
         return list(atomic_actions.items())
 
+    def _map_columns(self, columns):
+        return self._get_atomic_columns(columns)
+
 
 @six.add_metaclass(abc.ABCMeta)
 class Table(Chart):
@@ -366,41 +483,96 @@ class Table(Chart):
 
 
 class MainStatsTable(Table):
+    """Table with statistics of iterations durations and atomic actions.
+
+    If workload info has no `atomic' key, atomic actions are collected
+    from iterations themselves. Since the number of calls of an atomic
+    action is not known in advance in this case, values are gathered
+    separately for each number of calls and only the biggest number is
+    rendered, the same way as AtomicMerger does.
+    """
 
     columns = ["Action", "Min (sec)", "Median (sec)", "90%ile (sec)",
                "95%ile (sec)", "Max (sec)", "Avg (sec)", "Success", "Count"]
 
     def __init__(self, *args, **kwargs):
         super(MainStatsTable, self).__init__(*args, **kwargs)
-        iters_num = self._workload_info["iterations_count"]
-        for name in (self._get_atomic_names() + ["total"]):
-            self._data[name] = [
-                [streaming.MinComputation(), None],
-                [streaming.PercentileComputation(0.5, iters_num), None],
-                [streaming.PercentileComputation(0.9, iters_num), None],
-                [streaming.PercentileComputation(0.95, iters_num), None],
-                [streaming.MaxComputation(), None],
-                [streaming.MeanComputation(), None],
-                [streaming.MeanComputation(),
-                 lambda st, has_result: ("%.1f%%" % (st.result() * 100)
-                                         if has_result else "n/a")],
-                [streaming.IncrementComputation(),
-                 lambda st, has_result: st.result()]]
+        self._atomic_rows = None
+        if "atomic" in self._workload_info:
+            names = self._get_atomic_names()
+        else:
+            self._atomic_rows = collections.OrderedDict()
+            names = []
+        for name in (names + ["total"]):
+            self._data[name] = self._make_row()
+
+    def _make_row(self):
+        return [
+            [streaming.MinComputation(), None],
+            [streaming.PercentileComputation(0.5), None],
+            [streaming.PercentileComputation(0.9), None],
+            [streaming.PercentileComputation(0.95), None],
+            [streaming.MaxComputation(), None],
+            [streaming.MeanComputation(), None],
+            [streaming.MeanComputation(),
+             lambda st, has_result: ("%.1f%%" % (st.result() * 100)
+                                     if has_result else "n/a")],
+            [streaming.IncrementComputation(),
+             lambda st, has_result: st.result()]]
 
     def _map_iteration_values(self, iteration):
         atomic_actions = self._merge_atomic_actions(
             iteration["atomic_actions"])
         return dict(atomic_actions, total=iteration["duration"])
 
+    def _add_value(self, row, value, error):
+        row[-1][0].add()
+        if error:
+            row[-2][0].add(0)
+        else:
+            row[-2][0].add(1)
+            for idx, dummy in enumerate(row[:-2]):
+                row[idx][0].add(value)
+
     def add_iteration(self, iteration):
-        for name, value in self._map_iteration_values(iteration).items():
-            self._data[name][-1][0].add()
-            if iteration["error"]:
-                self._data[name][-2][0].add(0)
-            else:
-                self._data[name][-2][0].add(1)
-                for idx, dummy in enumerate(self._data[name][:-2]):
-                    self._data[name][idx][0].add(value)
+        if self._atomic_rows is None:
+            for name, value in self._map_iteration_values(iteration).items():
+                self._add_value(self._data[name], value, iteration["error"])
+            return
+
+        calls = collections.OrderedDict()
+        for action in iteration.get("atomic_actions", []):
+            count, duration = calls.get(action["name"], (0, 0))
+            calls[action["name"]] = (
+                count + 1,
+                duration + action["finished_at"] - action["started_at"])
+        for name, (count, duration) in calls.items():
+            rows = self._atomic_rows.setdefault(name, {})
+            if count not in rows:
+                rows[count] = self._make_row()
+            self._add_value(rows[count], duration, iteration.get("error"))
+        self._add_value(self._data["total"], iteration["duration"],
+                        iteration.get("error"))
+
+    def add_columns(self, columns):
+        # NOTE: columns are built from workload info with `atomic' key,
+        # so rows of atomic actions are known in advance
+        for name, values in (list(columns.atomic.items())
+                             + [("total", columns.duration)]):
+            for value, error in zip(values, columns.error):
+                if value is not None:
+                    self._add_value(self._data[name], value, error)
+
+    def get_rows(self):
+        if self._atomic_rows is not None:
+            data = collections.OrderedDict()
+            for name, rows in self._atomic_rows.items():
+                count = max(rows)
+                atomic_merger = utils.AtomicMerger({name: {"count": count}})
+                data[atomic_merger.get_merged_name(name)] = rows[count]
+            data["total"] = self._data["total"]
+            self._data = data
+        return super(MainStatsTable, self).get_rows()
 
 
 class OutputChart(Chart):
@@ -574,12 +746,11 @@ class OutputStatsTable(OutputTable):
     def add_iteration(self, iteration):
         for name, value in self._map_iteration_values(iteration):
             if name not in self._data:
-                iters_num = self._workload_info["iterations_count"]
                 self._data[name] = [
                     [streaming.MinComputation(), None],
-                    [streaming.PercentileComputation(0.5, iters_num), None],
-                    [streaming.PercentileComputation(0.9, iters_num), None],
-                    [streaming.PercentileComputation(0.95, iters_num), None],
+                    [streaming.PercentileComputation(0.5), None],
+                    [streaming.PercentileComputation(0.9), None],
+                    [streaming.PercentileComputation(0.95), None],
                     [streaming.MaxComputation(), None],
                     [streaming.MeanComputation(), None],
                     [streaming.IncrementComputation(),
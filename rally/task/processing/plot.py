@@ -24,6 +24,7 @@ from rally.common import objects
 from rally.common.plugin import plugin
 from rally.common import version
 from rally.task.processing import charts
+from rally.task.processing import utils
 from rally.ui import utils as ui_utils
 
 
@@ -91,6 +92,8 @@ def _process_scenario(data, pos):
     atomic_area = charts.AtomicStackedAreaChart(data["info"])
     atomic_hist = charts.AtomicHistogramChart(data["info"])
 
+    # values of iterations are taken once for all the charts above
+    columns = utils.IterationColumns(data["info"])
     errors = []
     output_errors = []
     additive_output_charts = []
@@ -122,10 +125,11 @@ def _process_scenario(data, pos):
             complete_chart["widget"] = chart_cls.widget
             complete_charts.append(complete_chart)
         complete_output.append(complete_charts)
+        columns.add_iteration(itr)
 
-        for chart in (main_area, main_hist, main_stat, load_profile,
-                      atomic_pie, atomic_area, atomic_hist):
-            chart.add_iteration(itr)
+    for chart in (main_area, main_hist, main_stat, load_profile,
+                  atomic_pie, atomic_area, atomic_hist):
+        chart.add_columns(columns)
 
     kw = data["key"]["kw"]
     cls, method = data["key"]["name"].split(".")
@@ -200,6 +204,7 @@ def _extend_results(results):
                    "data": {"sla": result["sla"],
                             "hooks": result.get("hooks"),
                             "raw": result["result"],
+                            "statistics": result.get("statistics"),
                             "full_duration": result["full_duration"],
                             "load_duration": result["load_duration"]},
                    "created_at": result.get("created_at"),
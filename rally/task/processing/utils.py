@@ -93,15 +93,65 @@ class AtomicMerger(object):
         return self._merge_name(name, self._atomic[name].get("count", 1))
 
     def merge_atomic_actions(self, atomic_actions):
+        # Actions are grouped in a single pass; durations of each name are
+        # still summed in order of actions, so results do not change.
+        merged = {}
+        for action in atomic_actions:
+            name = action["name"]
+            if name in self._atomic:
+                duration, count = merged.get(name, (0, 0))
+                merged[name] = (
+                    duration + (action["finished_at"] - action["started_at"]),
+                    count + 1)
+
         new_atomic_actions = collections.OrderedDict()
-        for name in self._atomic.keys():
-            count = 0
-            duration = 0
-            for action in atomic_actions:
-                if action["name"] == name:
-                    duration += action["finished_at"] - action["started_at"]
-                    count += 1
-            if count == self._atomic[name].get("count", 1):
+        for name, value in self._atomic.items():
+            duration, count = merged.get(name, (0, 0))
+            if count == value.get("count", 1):
                 new_name = self._merge_name(name, count)
                 new_atomic_actions[new_name] = duration
         return new_atomic_actions
+
+
+class IterationColumns(object):
+    """Values of workload iterations stored by columns.
+
+    Charts of a workload take the same values from each iteration, so the
+    values are taken from the iterations in a single pass and the charts
+    process whole columns of them (see Chart.add_columns). Atomic actions
+    are merged once per iteration; a column of an atomic action has None
+    for iterations in which the action is missing. Original atomic actions
+    are kept too, so iterations (without output) can be restored by
+    rows() for charts which do not process columns.
+    """
+
+    def __init__(self, workload_info):
+        self._atomic_merger = AtomicMerger(workload_info["atomic"])
+        self.duration = []
+        self.idle_duration = []
+        self.timestamp = []
+        self.error = []
+        self.atomic_actions = []
+        self.atomic = collections.OrderedDict(
+            (name, []) for name in self._atomic_merger.get_merged_names())
+
+    def __len__(self):
+        return len(self.duration)
+
+    def add_iteration(self, iteration):
+        self.duration.append(iteration["duration"])
+        self.idle_duration.append(iteration["idle_duration"])
+        self.timestamp.append(iteration["timestamp"])
+        self.error.append(iteration["error"])
+        self.atomic_actions.append(iteration["atomic_actions"])
+        atomic_actions = self._atomic_merger.merge_atomic_actions(
+            iteration["atomic_actions"])
+        for name, values in self.atomic.items():
+            values.append(atomic_actions.get(name))
+
+    def rows(self):
+        """Iterate over iterations restored from the columns."""
+        for row in zip(self.duration, self.idle_duration, self.timestamp,
+                       self.error, self.atomic_actions):
+            yield dict(zip(("duration", "idle_duration", "timestamp",
+                            "error", "atomic_actions"), row))
@@ -17,15 +17,16 @@ import abc
 import collections
 import copy
 import multiprocessing
+import threading
 import time
 
 import six
+from six.moves import queue as Queue
 
 from rally.common import logging
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
 from rally.common import validation
-from rally.task.processing import charts
 from rally.task import scenario
 from rally.task import types
 from rally.task import utils
@@ -46,11 +47,34 @@ def format_result_on_timeout(exc, timeout):
 
 
 def _get_scenario_context(iteration, context_obj):
-    context_obj = copy.deepcopy(context_obj)
+    """Return context for the given iteration.
+
+    Only the top level of the context is copied. The nested structures are
+    shared by all the iterations, so the runner locks the context (see
+    `rally.common.utils.LockedDict`) before the load starts. A scenario
+    which needs to change some nested structure should make a copy of it
+    explicitly via `copy.deepcopy`.
+
+    :param iteration: iteration number (starts from `0')
+    :param context_obj: benchmark context
+    :returns: dict with context of the iteration
+    """
+    context_obj = dict(context_obj)
     context_obj["iteration"] = iteration + 1  # Numeration starts from `1'
     return context_obj
 
 
+def _copy_scenario_args(scenario_kwargs):
+    """Copy scenario arguments to isolate iterations from each other.
+
+    Deep copy is made only if there are nested mutable structures.
+    """
+    for value in scenario_kwargs.values():
+        if isinstance(value, (dict, list, set)):
+            return copy.deepcopy(scenario_kwargs)
+    return dict(scenario_kwargs)
+
+
 def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
                        event_queue):
     iteration = context_obj["iteration"]
@@ -60,7 +84,7 @@ def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
     })
 
     # provide arguments isolation between iterations
-    scenario_kwargs = copy.deepcopy(scenario_kwargs)
+    scenario_kwargs = _copy_scenario_args(scenario_kwargs)
 
     LOG.info("Task %(task)s | ITER: %(iteration)s START" %
              {"task": context_obj["task"]["uuid"], "iteration": iteration})
@@ -94,6 +118,63 @@ def _worker_thread(queue, cls, method_name, context_obj, scenario_kwargs,
                                  scenario_kwargs, event_queue))
 
 
+class _IterationTracker(object):
+    """Represent a single iteration of a reusable worker thread.
+
+    `rally.common.utils.timeout_thread` watches thread-like objects and
+    terminates them by their ident. Worker threads which run many iterations
+    one after another must not be terminated out of the iteration they were
+    registered for, so each iteration is registered with its own tracker
+    which terminates the thread only between `start` and `finish` calls.
+    The check and the termination are made under the lock, so the iteration
+    can't finish in between.
+    """
+
+    def __init__(self):
+        self.ident = threading.current_thread().ident
+        self._running = False
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def isAlive(self):
+        return not self._finished
+
+    def start(self):
+        with self._lock:
+            self._running = not self._finished
+
+    def finish(self):
+        with self._lock:
+            self._running = False
+            self._finished = True
+
+    def terminate(self):
+        """Terminate the thread if the iteration is still running."""
+        with self._lock:
+            if self._running:
+                LOG.info("Thread %s is timed out. Terminating." % self.ident)
+                rutils.terminate_thread(self.ident)
+                self._running = False
+            self._finished = True
+
+
+def split_evenly(number, parts):
+    """Split the number into at most `parts` positive integers.
+
+    The integers differ from each other by 1 at most and the bigger ones go
+    first, e.g. split_evenly(10, 3) == [4, 3, 3].
+
+    :param number: integer to split
+    :param parts: maximum number of integers
+    :returns: list of integers which sum up to the number
+    """
+    parts = min(number, parts)
+    if parts < 1:
+        return []
+    share, rest = divmod(number, parts)
+    return [share + 1] * rest + [share] * (parts - rest)
+
+
 def _log_worker_info(**info):
     """Log worker parameters for debugging.
 
@@ -137,8 +218,8 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
         """
         self.task = task
         self.config = config
-        self.result_queue = collections.deque()
-        self.event_queue = collections.deque()
+        self.result_queue = rutils.WaitableDeque()
+        self.event_queue = rutils.WaitableDeque()
         self.aborted = multiprocessing.Event()
         self.run_duration = 0
         self.batch_size = batch_size
@@ -170,11 +251,32 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
             cls, method_name = (scenario_plugin._meta_get("cls_ref"),
                                 name.split(".", 1).pop())
 
+        # the context is shared by all the iterations, so it is locked to
+        # make iterations isolated from each other without copying the whole
+        # context for each of them
+        context = rutils.LockedDict(context)
+
         with rutils.Timer() as timer:
             self._run_scenario(cls, method_name, context, args)
 
         self.run_duration = timer.duration()
 
+    @classmethod
+    def split_config(cls, config, parts):
+        """Split the load generated by the runner into several parts.
+
+        Runners which support it are used by the distributed runner to
+        generate the load on several Rally agents at once.
+
+        :param config: Dict with runner section from benchmark configuration
+        :param parts: maximum number of parts
+        :returns: list of configs of runners which generate the same load
+                  together
+        :raises NotImplementedError: if the load can not be split
+        """
+        raise NotImplementedError(
+            "Load of `%s' runner can not be split." % cls.get_name())
+
     def abort(self):
         """Abort the execution of further benchmark scenario iterations."""
         self.aborted.set()
@@ -205,28 +307,96 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
     def _join_processes(self, process_pool, result_queue, event_queue):
         """Join the processes in the pool and send their results to the queue.
 
+        Results and events are received by separate threads which block on
+        the queues, so they are passed to the consumer as soon as they
+        arrive.
+
         :param process_pool: pool of processes to join
         :param result_queue: multiprocessing.Queue that receives the results
         :param event_queue: multiprocessing.Queue that receives the events
         """
-        while process_pool:
-            while process_pool and not process_pool[0].is_alive():
-                process_pool.popleft().join()
-
-            if result_queue.empty() and event_queue.empty():
-                # sleep a bit to avoid 100% usage of CPU by this method
-                time.sleep(0.01)
+        receivers = [
+            threading.Thread(target=self._receive,
+                             args=(result_queue, self._send_result,
+                                   "results")),
+            threading.Thread(target=self._receive,
+                             args=(event_queue,
+                                   lambda event: self.send_event(**event),
+                                   "events"))]
+        for receiver in receivers:
+            receiver.start()
 
-            while not event_queue.empty():
-                self.send_event(**event_queue.get())
+        while process_pool:
+            process_pool.popleft().join()
 
-            while not result_queue.empty():
-                self._send_result(result_queue.get())
+        # all the processes are finished, so these end markers are the last
+        # items in the queues
+        result_queue.put(None)
+        event_queue.put(None)
+        for receiver in receivers:
+            receiver.join()
 
         self._flush_results()
         result_queue.close()
         event_queue.close()
 
+    RECEIVE_BATCH_SIZE = 1000
+
+    def _receive(self, queue, handler, name):
+        """Pass items from the queue to the handler until the end marker.
+
+        The method blocks until there is at least one item in the queue and
+        then takes all the available items (up to RECEIVE_BATCH_SIZE) at
+        once. Errors of the handler are logged and don't stop receiving.
+
+        :param queue: multiprocessing.Queue to receive items from
+        :param handler: function to call for each received item
+        :param name: name of the queue to use in debug messages
+        """
+        logged_at = 0
+        while True:
+            batch = [queue.get()]
+            try:
+                while (batch[-1] is not None and
+                       len(batch) < self.RECEIVE_BATCH_SIZE):
+                    batch.append(queue.get_nowait())
+            except Queue.Empty:
+                pass
+
+            if logging.is_debug() and time.time() - logged_at > 1:
+                logged_at = time.time()
+                self._log_queue_depth(name, queue)
+
+            for item in batch:
+                if item is None:
+                    return
+                try:
+                    handler(item)
+                except Exception as e:
+                    # NOTE: the queue should be drained anyway, otherwise
+                    # the processes which put items to it never finish
+                    LOG.error("Task %(task)s | Runner `%(runner)s` | Failed "
+                              "to process %(name)s: %(error)s"
+                              % {"task": self.task["uuid"],
+                                 "runner": self.get_name(), "name": name,
+                                 "error": e})
+                    if logging.is_debug():
+                        LOG.exception(e)
+
+    def _log_queue_depth(self, name, queue):
+        try:
+            depth = queue.qsize()
+        except NotImplementedError:
+            # qsize is not implemented on some platforms (i.e. Mac OS X)
+            return
+        LOG.debug("Task %(task)s | Runner `%(runner)s` | %(depth)s %(name)s "
+                  "are waiting in the inter-process queue, %(local)s batches "
+                  "of %(name)s are waiting for the consumer."
+                  % {"task": self.task["uuid"], "runner": self.get_name(),
+                     "depth": depth, "name": name,
+                     "local": len(self.result_queue if name == "results"
+                                  else self.event_queue)})
+
     def _flush_results(self):
         if self.result_batch:
             sorted_batch = sorted(self.result_batch)
@@ -245,6 +415,9 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
         #                 to check every iteration result schema. And this
         #                 method works 200 times faster then jsonschema
         #                 which totally makes sense.
+        # Atomic actions and output are validated by scenarios while they
+        # are recorded (see `result_validation` option), so only types of
+        # the top-level fields are checked here.
         for key, proper_type in self._RESULT_SCHEMA["fields"]:
             if key not in result:
                 LOG.warning("'%s' is not result" % key)
@@ -258,60 +431,6 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
                        "actual_type": type(result[key]),
                        "proper_type": proper_type.__name__})
                 return False
-
-        actions_list = copy.deepcopy(result["atomic_actions"])
-        for action in actions_list:
-            for key in ("name", "started_at", "finished_at", "children"):
-                if key not in action:
-                    LOG.warning(
-                        "Task %(uuid)s | Atomic action %(action)s "
-                        "missing key '%(key)s'"
-                        % {"uuid": self.task["uuid"],
-                           "action": action,
-                           "key": key})
-                    return False
-            for key in ("started_at", "finished_at"):
-                if not isinstance(action[key], float):
-                    LOG.warning(
-                        "Task %(uuid)s | Atomic action %(action)s has "
-                        "wrong type '%(type)s', should be 'float'"
-                        % {"uuid": self.task["uuid"],
-                           "action": action,
-                           "type": type(action[key])})
-                    return False
-            if action["children"]:
-                actions_list.extend(action["children"])
-
-        for e in result["error"]:
-            if not isinstance(e, str):
-                LOG.warning("error value has wrong type '%s', should be 'str'"
-                            % type(e))
-                return False
-
-        for key in ("additive", "complete"):
-            if key not in result["output"]:
-                LOG.warning("Task %(uuid)s | Output missing key '%(key)s'"
-                            % {"uuid": self.task["uuid"], "key": key})
-                return False
-
-            type_ = type(result["output"][key])
-            if type_ != list:
-                LOG.warning(
-                    "Task %(uuid)s | Value of result['output']['%(key)s'] "
-                    "has wrong type '%(type)s', must be 'list'"
-                    % {"uuid": self.task["uuid"],
-                       "key": key, "type": type_.__name__})
-                return False
-
-        for key in result["output"]:
-            for output_data in result["output"][key]:
-                message = charts.validate_output(key, output_data)
-                if message:
-                    LOG.warning("Task %(uuid)s | %(message)s"
-                                % {"uuid": self.task["uuid"],
-                                   "message": message})
-                    return False
-
         return True
 
     def _send_result(self, result):
@@ -15,11 +15,14 @@
 
 import collections
 import itertools
+import os
+import threading
 import time
 import traceback
 
 import jsonschema
 from novaclient import exceptions as nova_exc
+from oslo_config import cfg
 import six
 
 from rally.common.i18n import _
@@ -30,6 +33,50 @@ from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
+
+RESULT_VALIDATION_OPTS = [
+    cfg.StrOpt("result_validation", default="full",
+               choices=["full", "sampled", "off"],
+               help="How atomic actions and output of scenarios are "
+                    "validated while they are recorded: 'full' validates "
+                    "each of them, 'sampled' validates one of each "
+                    "'result_validation_sample_rate' of them and 'off' "
+                    "disables the validation. The task engine checks only "
+                    "types of the top-level fields of iteration results."),
+    cfg.IntOpt("result_validation_sample_rate", default=100, min=1,
+               help="Validate one of each N atomic actions and output "
+                    "items in 'sampled' mode of result validation."),
+]
+
+STATUS_POLLER_OPTS = [
+    cfg.BoolOpt("batched_status_polling", default=False,
+                help="Resolve statuses of resources which are waited for by "
+                     "concurrent iterations with one list call to their "
+                     "manager per poll interval instead of getting each "
+                     "resource separately."),
+    cfg.FloatOpt("batched_status_poll_interval", default=1.0, min=0,
+                 help="Interval in seconds between list calls of batched "
+                      "status polling. It is used instead of check intervals "
+                      "of waiting for statuses."),
+]
+
+_validation_counter = itertools.count()
+
+
+def need_result_validation():
+    """Check whether the next recorded piece of result should be validated.
+
+    Scenarios call it for each atomic action and output item they record,
+    so it is cheap in all the modes of `result_validation` option.
+    """
+    mode = CONF.result_validation
+    if mode == "full":
+        return True
+    if mode == "off":
+        return False
+    return next(_validation_counter) % CONF.result_validation_sample_rate == 0
+
 
 def get_status(resource, status_attr="status"):
     """Get the status of a given resource object.
@@ -68,18 +115,9 @@ class resource_is(object):
 
 
 def get_from_manager(error_statuses=None):
-    error_statuses = error_statuses or ["ERROR"]
-    error_statuses = map(lambda str: str.upper(), error_statuses)
-
-    def _get_from_manager(resource, id_attr="id"):
-        # catch client side errors
-        try:
-            res = resource.manager.get(getattr(resource, id_attr))
-        except Exception as e:
-            if getattr(e, "code", getattr(e, "http_status", 400)) == 404:
-                raise exceptions.GetResourceNotFound(resource=resource)
-            raise exceptions.GetResourceFailure(resource=resource, err=e)
+    error_statuses = [s.upper() for s in error_statuses or ["ERROR"]]
 
+    def _check_resource(res):
         # catch abnormal status, such as "no valid host" for servers
         status = get_status(res)
 
@@ -92,9 +130,175 @@ def get_from_manager(error_statuses=None):
 
         return res
 
+    def _get_from_manager(resource, id_attr="id"):
+        # catch client side errors
+        try:
+            res = resource.manager.get(getattr(resource, id_attr))
+        except Exception as e:
+            if getattr(e, "code", getattr(e, "http_status", 400)) == 404:
+                raise exceptions.GetResourceNotFound(resource=resource)
+            raise exceptions.GetResourceFailure(resource=resource, err=e)
+
+        return _check_resource(res)
+
+    # NOTE: StatusPoller uses it to check resources taken from the list of
+    #   resources of the manager.
+    _get_from_manager.check_resource = _check_resource
     return _get_from_manager
 
 
+class _StatusWaiter(object):
+
+    def __init__(self, resource, update_resource, id_attr):
+        self.resource = resource
+        self.update_resource = update_resource
+        self.id_attr = id_attr
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.fallback = False
+
+    def get(self, timeout=None):
+        # NOTE: Event.wait returns False if the poll is not done in time
+        if not self.event.wait(timeout) or self.fallback:
+            return self.update_resource(self.resource, id_attr=self.id_attr)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _get_credential_key(manager):
+    """Return the key of the credential which the manager uses.
+
+    Managers of OpenStack clients keep the client in `api` attribute and
+    the credential is identified by the keystoneauth plugin of the client.
+    If there is no plugin, the client is used as the key.
+    """
+    api = getattr(manager, "api", manager)
+    http_client = getattr(api, "client", None)
+    auth = (getattr(http_client, "auth", None)
+            or getattr(getattr(http_client, "session", None), "auth", None))
+    try:
+        cache_id = auth.get_cache_id()
+    except (AttributeError, NotImplementedError):
+        cache_id = None
+    return cache_id or id(api)
+
+
+class StatusPoller(object):
+    """Updates resources of the same kind with one list call.
+
+    Iterations register resources they wait for and get them updated by
+    the next poll. Registered resources are grouped by the class of their
+    manager and the credential it uses, and each group is updated with one
+    `manager.list()` call. Resources that are not found in the list (e.g.
+    the list is paginated), whose manager fails to list them or which are
+    not updated in time are updated with `update_resource` by the waiting
+    iteration itself.
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending = collections.OrderedDict()
+        self._thread = None
+        self.api_calls = 0
+        self.api_calls_saved = 0
+
+    @staticmethod
+    def is_supported(resource, update_resource):
+        """Check whether updates of resource can be batched."""
+        manager = getattr(resource, "manager", None)
+        return (hasattr(update_resource, "check_resource")
+                and callable(getattr(manager, "list", None)))
+
+    def update(self, resource, update_resource, id_attr="id", timeout=None):
+        """Wait for the next poll and return the updated resource.
+
+        :param resource: resource object with `manager` attribute
+        :param update_resource: function returned by get_from_manager()
+        :param id_attr: name of resource attribute with its id
+        :param timeout: time in seconds to wait for the poll, the resource
+                        is updated with `update_resource` after it
+        """
+        waiter = _StatusWaiter(resource, update_resource, id_attr)
+        manager = resource.manager
+        key = (type(manager), _get_credential_key(manager))
+        with self._lock:
+            self._pending.setdefault(key, (manager, []))[1].append(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        return waiter.get(timeout)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                pending = self._pending
+                self._pending = collections.OrderedDict()
+                if not pending:
+                    self._thread = None
+                    LOG.debug("Status poller is idle, %(calls)d list calls "
+                              "made so far replaced %(saved)d get calls."
+                              % {"calls": self.api_calls,
+                                 "saved": self.api_calls_saved})
+                    return
+            for manager, waiters in pending.values():
+                self._poll(manager, waiters)
+            time.sleep(self.interval)
+
+    def _poll(self, manager, waiters):
+        try:
+            waiting = {}
+            for waiter in waiters:
+                res_id = getattr(waiter.resource, waiter.id_attr)
+                waiting.setdefault((waiter.id_attr, res_id), []).append(
+                    waiter)
+            id_attrs = set(id_attr for id_attr, res_id in waiting)
+
+            hits = 0
+            for res in manager.list():
+                for id_attr in id_attrs:
+                    found = waiting.pop(
+                        (id_attr, getattr(res, id_attr, None)), ())
+                    for waiter in found:
+                        hits += 1
+                        try:
+                            waiter.result = (
+                                waiter.update_resource.check_resource(res))
+                        except Exception as e:
+                            waiter.error = e
+            self.api_calls += 1
+            for not_found in waiting.values():
+                for waiter in not_found:
+                    waiter.fallback = True
+            if hits:
+                # the list call replaces one of get calls
+                self.api_calls_saved += hits - 1
+        except Exception as e:
+            LOG.debug("Failed to list resources of %s: %s" % (manager, e))
+            for waiter in waiters:
+                waiter.fallback = True
+        finally:
+            for waiter in waiters:
+                waiter.event.set()
+
+
+_status_poller = None
+_status_poller_pid = None
+
+
+def get_status_poller():
+    """Return StatusPoller of the current process."""
+    global _status_poller, _status_poller_pid
+
+    if _status_poller is None or _status_poller_pid != os.getpid():
+        _status_poller = StatusPoller(CONF.batched_status_poll_interval)
+        _status_poller_pid = os.getpid()
+    return _status_poller
+
+
 def manager_list_size(sizes):
     def _list(mgr):
         return len(mgr.list()) in sizes
@@ -204,6 +408,13 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
             "Can't wait for resource's %s status. No update method."
             % resource_repr)
 
+    poller = None
+    # NOTE: deleted resources are not listed, so waiting for deletion is
+    #   not batched, it would cost a list call in addition to a get call
+    if (CONF.batched_status_polling and not check_deletion
+            and StatusPoller.is_supported(resource, update_resource)):
+        poller = get_status_poller()
+
     start = time.time()
 
     latest_status = get_status(resource, status_attr)
@@ -211,7 +422,11 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
 
     while True:
         try:
-            if id_attr == "id":
+            if poller is not None:
+                resource = poller.update(
+                    resource, update_resource, id_attr=id_attr,
+                    timeout=max(timeout - (time.time() - start), 0))
+            elif id_attr == "id":
                 resource = update_resource(resource)
             else:
                 resource = update_resource(resource, id_attr=id_attr)
@@ -242,7 +457,9 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
                 status=status,
                 fault="Status in failure list %s" % str(failure_statuses))
 
-        time.sleep(check_interval)
+        # NOTE: the poller waits for the next poll itself
+        if poller is None:
+            time.sleep(check_interval)
         if time.time() - start > timeout:
             raise exceptions.TimeoutException(
                 desired_status="('%s')" % "', '".join(ready_statuses),
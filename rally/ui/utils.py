@@ -13,10 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import jinja2
-
 
 def get_template(template):
+    # jinja2 takes a noticeable time to import, so it is imported only
+    # when templates are rendered
+    import jinja2
 
     def include_raw_file(file_name):
         try:
@@ -0,0 +1,113 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of import time of common Rally CLI commands.
+
+Each command is executed several times in a new process. With Python 3.7+
+`python -X importtime` is used to report the total import time and the
+modules which take the most time to import, with older versions only the
+wall time of commands is reported.
+
+Usage:
+    cli_import_time.py [--runs N] [--top N] [-- <rally arguments>]
+"""
+
+from __future__ import print_function
+import argparse
+import subprocess
+import sys
+import time
+
+
+COMMANDS = (
+    ["--version"],
+    ["task", "list"],
+    ["task", "status"],
+    ["deployment", "list"],
+    ["plugin", "show", "NovaServers.boot_server"],
+)
+
+IMPORTTIME = sys.version_info >= (3, 7)
+
+
+def parse_importtime(stderr):
+    """Parse output of `python -X importtime`.
+
+    :returns: tuple of the total import time in seconds and list of
+        tuples with cumulative import time and name of each module
+    """
+    total = 0
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = [f.strip() for f in line[len("import time:"):].split("|")]
+        if not fields[0].isdigit():
+            # header line
+            continue
+        total += int(fields[0])
+        modules.append((int(fields[1]) / 10.0 ** 6, fields[2]))
+    return total / 10.0 ** 6, modules
+
+
+def run(args, runs, top):
+    cmd = [sys.executable]
+    if IMPORTTIME:
+        cmd += ["-X", "importtime"]
+    cmd += ["-m", "rally.cli.main"] + args
+
+    durations = []
+    imports = []
+    for i in range(runs):
+        started_at = time.time()
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                universal_newlines=True)
+        stdout, stderr = proc.communicate()
+        durations.append(time.time() - started_at)
+        if IMPORTTIME:
+            imports.append(parse_importtime(stderr))
+
+    print("rally %s" % " ".join(args))
+    print("  wall time: min %.3fs, max %.3fs"
+          % (min(durations), max(durations)))
+    if imports:
+        total, modules = min(imports, key=lambda x: x[0])
+        print("  import time: %.3fs, %d modules" % (total, len(modules)))
+        for duration, name in sorted(modules, reverse=True)[:top]:
+            print("    %.3fs %s" % (duration, name))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark import time of Rally CLI commands.")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="Number of runs of each command.")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Number of the slowest imports to show.")
+    parser.add_argument("args", nargs="*",
+                        help="Arguments of rally command to benchmark. "
+                             "Common commands are used by default.")
+    args = parser.parse_args()
+
+    if not IMPORTTIME:
+        print("Python 3.7+ is required to measure import time of modules, "
+              "only wall time of commands is reported.\n")
+    for command in ([args.args] if args.args else COMMANDS):
+        run(command, args.runs, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Comparison of latency of Rally CLI and Rally service.
+
+Rally service is started with the given configuration file, then wall
+time of `rally task list` and `rally task status` commands is compared
+with time of the same calls sent to the service by
+`rally.api.API(rally_endpoint=...)`.
+
+Usage:
+    rally_service_latency.py --config-file PATH [--port N] [--runs N]
+"""
+
+from __future__ import print_function
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from rally import api
+
+
+def _measure(func, runs):
+    durations = []
+    for i in range(runs):
+        started_at = time.time()
+        func()
+        durations.append(time.time() - started_at)
+    return min(durations), sorted(durations)[len(durations) // 2]
+
+
+def _run_cli(config_file, *args):
+    with open(os.devnull, "w") as devnull:
+        subprocess.check_call(
+            [sys.executable, "-m", "rally.cli.main", "--config-file",
+             config_file] + list(args),
+            stdout=devnull, stderr=devnull)
+
+
+def _wait_for_port(port, timeout=120):
+    started_at = time.time()
+    while time.time() - started_at < timeout:
+        try:
+            socket.create_connection(("127.0.0.1", port), 1).close()
+            return
+        except socket.error:
+            time.sleep(0.5)
+    raise RuntimeError("Rally service has not started in %ss." % timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare latency of Rally CLI and Rally service.")
+    parser.add_argument("--config-file", required=True,
+                        help="Rally configuration file.")
+    parser.add_argument("--port", type=int, default=18000,
+                        help="Port for Rally service.")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Number of runs of each call.")
+    args = parser.parse_args()
+
+    fd, service_config = tempfile.mkstemp(suffix=".conf")
+    with os.fdopen(fd, "w") as f:
+        f.write("[service]\nport = %s\n" % args.port)
+    devnull = open(os.devnull, "w")
+    service = subprocess.Popen(
+        [sys.executable, "-m", "rally.aas.service", "--config-file",
+         args.config_file, "--config-file", service_config],
+        stdout=devnull, stderr=devnull)
+    try:
+        _wait_for_port(args.port)
+        client = api.API(config_file=args.config_file,
+                         rally_endpoint="http://127.0.0.1:%s" % args.port)
+        tasks = client.task.list(limit=1)
+        if not tasks:
+            print("There are no tasks in the database.")
+            return 1
+        task_uuid = tasks[0]["uuid"]
+        deployment = tasks[0]["deployment_uuid"]
+
+        calls = [
+            ("task.list", lambda: client.task.list(deployment=deployment),
+             lambda: _run_cli(args.config_file, "task", "list",
+                              "--deployment", deployment)),
+            ("task.get", lambda: client.task.get(task_id=task_uuid),
+             lambda: _run_cli(args.config_file, "task", "status",
+                              "--uuid", task_uuid))]
+
+        print("%-10s %22s %22s" % ("call", "CLI (min/median)",
+                                   "service (min/median)"))
+        for name, service_call, cli_call in calls:
+            cli = _measure(cli_call, args.runs)
+            remote = _measure(service_call, args.runs)
+            print("%-10s %10.3fs/%9.3fs %10.3fs/%9.3fs"
+                  % ((name,) + cli + remote))
+    finally:
+        service.terminate()
+        service.wait()
+        devnull.close()
+        os.remove(service_config)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of parsing of subunit v2 streams.
+
+A stream similar to results of a big Tempest run is generated: tests are
+grouped by 10 in test classes, every fifth test class is skipped as a
+whole and every tenth test fails with a traceback sent in chunks.
+
+Usage:
+    subunit_v2_parse_time.py [--tests N] [--stream PATH]
+"""
+
+from __future__ import print_function
+import argparse
+import datetime as dt
+import os
+import tempfile
+import time
+
+from subunit import iso8601
+from subunit import v2
+
+from rally.common.io import subunit_v2
+
+
+def generate_stream(path, tests_count):
+    timestamp = dt.datetime(2017, 1, 1, tzinfo=iso8601.UTC)
+    test_ids = ["tempest.api.module%d.TestCase%d.test_%d[id-%d,smoke]"
+                % (i // 1000, i // 10, i, i) for i in range(tests_count)]
+    with open(path, "wb") as stream:
+        result = v2.StreamResultToBytes(stream)
+        for test_id in test_ids:
+            result.status(test_id=test_id, test_status="exists")
+        for i, test_id in enumerate(test_ids):
+            test_case = test_id.rsplit(".", 1)[0]
+            if (i // 10) % 5 == 0:
+                if i % 10 == 0:
+                    result.status(test_id=test_case, file_name="reason",
+                                  file_bytes=b"Skipped test case.",
+                                  mime_type="text/plain; charset=utf8",
+                                  eof=True, timestamp=timestamp)
+                    result.status(test_id=test_case, test_status="skip",
+                                  timestamp=timestamp)
+                continue
+            result.status(test_id=test_id, test_status="inprogress",
+                          timestamp=timestamp)
+            if i % 10 == 3:
+                for line in range(20):
+                    result.status(test_id=test_id, file_name="traceback",
+                                  file_bytes=b"x" * 500,
+                                  mime_type="text/plain; charset=utf8",
+                                  timestamp=timestamp)
+                result.status(test_id=test_id, test_status="fail",
+                              timestamp=timestamp)
+            else:
+                result.status(test_id=test_id, test_status="success",
+                              timestamp=timestamp)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark parsing of subunit v2 streams.")
+    parser.add_argument("--tests", type=int, default=100000,
+                        help="Number of tests in the generated stream.")
+    parser.add_argument("--stream",
+                        help="Path to the stream to parse. A stream is "
+                             "generated if it is not specified.")
+    args = parser.parse_args()
+
+    path = args.stream
+    if not path:
+        fd, path = tempfile.mkstemp(suffix=".subunit")
+        os.close(fd)
+        started_at = time.time()
+        generate_stream(path, args.tests)
+        print("generated %d tests in %.3fs" % (args.tests,
+                                               time.time() - started_at))
+
+    try:
+        started_at = time.time()
+        results = subunit_v2.parse_file(path)
+        parsed_at = time.time()
+        totals = results.totals
+        finished_at = time.time()
+    finally:
+        if not args.stream:
+            os.remove(path)
+
+    print("stream parsed in %.3fs" % (parsed_at - started_at))
+    print("results processed in %.3fs" % (finished_at - parsed_at))
+    for key, value in sorted(totals.items()):
+        print("  %s: %s" % (key, value))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@
 import json
 import os
 import re
+import subprocess
 import threading
 import time
 import unittest
@@ -1272,3 +1273,92 @@ class HookTestCase(unittest.TestCase):
             sorted(hook_results,
                    key=lambda i: i["config"]["trigger"]["args"]["unit"]))
         self._assert_results_time(hook_results)
+
+
+class DistributedRunnerTestCase(unittest.TestCase):
+
+    AGENTS = 3
+
+    def _start_agents(self, rally):
+        if rally.config_filename:
+            # requests of the engine to agents are authenticated by the
+            # shared secret
+            with open(rally.config_filename, "a") as f:
+                f.write("\n[agent]\nsecret = functional-tests\n")
+        agents = []
+        for i in range(self.AGENTS):
+            log_file = os.path.join(rally.tmp_dir, "agent-%s.log" % i)
+            agent = subprocess.Popen(
+                ["rally-agent"] + rally.args[1:] + ["--log-file", log_file],
+                env=rally.env)
+            self.addCleanup(agent.wait)
+            self.addCleanup(agent.terminate)
+            agents.append(log_file)
+
+        deadline = time.time() + 120
+        for log_file in agents:
+            while True:
+                if os.path.exists(log_file):
+                    with open(log_file) as f:
+                        if "Rally agent" in f.read():
+                            break
+                self.assertLess(time.time(), deadline,
+                                "Rally agents have not started.")
+                time.sleep(0.5)
+
+    def test_distributed_runner(self):
+        rally = utils.Rally()
+        self._start_agents(rally)
+        cfg = {
+            "Dummy.dummy": [
+                {
+                    "args": {
+                        "sleep": 0.1
+                    },
+                    "runner": {
+                        "type": "distributed",
+                        "runner": {
+                            "type": "constant",
+                            "times": 30,
+                            "concurrency": 3
+                        }
+                    }
+                }
+            ]
+        }
+        config = utils.TaskConfig(cfg)
+        rally("task start --task %s" % config.filename)
+        results = json.loads(rally("task results"))
+        self.assertEqual(30, len(results[0]["result"]))
+        self.assertIn("finished", rally("task status"))
+
+    def test_distributed_runner_abort_on_sla_failure(self):
+        rally = utils.Rally()
+        self._start_agents(rally)
+        cfg = {
+            "Dummy.dummy_exception": [
+                {
+                    "args": {
+                        "sleep": 0.1
+                    },
+                    "runner": {
+                        "type": "distributed",
+                        "runner": {
+                            "type": "constant",
+                            "times": 1000,
+                            "concurrency": 3
+                        }
+                    },
+                    "sla": {
+                        "failure_rate": {"max": 0}
+                    }
+                }
+            ]
+        }
+        config = utils.TaskConfig(cfg)
+        rally("task start --task %s --abort-on-sla-failure" % config.filename)
+        results = json.loads(rally("task results"))
+        self.assertLess(len(results[0]["result"]), 1000)
+        self.assertIn({"criterion": "aborted_on_sla", "success": False,
+                       "detail": "Task was aborted due to SLA failure(s)."},
+                      results[0]["sla"])
@@ -0,0 +1,266 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import json
+import threading
+
+import mock
+
+from rally.aas import agent
+from rally.common import utils as rutils
+from rally import exceptions
+from tests.unit import test
+
+
+class AgentTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AgentTestCase, self).setUp()
+        self.app = agent.Agent(heartbeat_interval=5)
+        self.start_response = mock.Mock()
+        self.runner_obj = mock.Mock(result_queue=rutils.WaitableDeque(),
+                                    event_queue=rutils.WaitableDeque())
+        patcher = mock.patch("rally.aas.agent.runner.ScenarioRunner.get")
+        self.mock_runner_get = patcher.start()
+        self.mock_runner_get.return_value.return_value = self.runner_obj
+        self.addCleanup(patcher.stop)
+
+    def _call(self, path, kwargs=None, method="POST", body=None,
+              secret=None):
+        if body is None:
+            body = json.dumps(kwargs).encode("utf-8")
+        environ = {"PATH_INFO": path,
+                   "REQUEST_METHOD": method,
+                   "CONTENT_LENGTH": str(len(body)),
+                   "wsgi.input": io.BytesIO(body)}
+        if secret is not None:
+            environ["HTTP_X_RALLY_AGENT_SECRET"] = secret
+        response = self.app(environ, self.start_response)
+        status = self.start_response.call_args[0][0]
+        lines = b"".join(response).decode("utf-8").split("\n")
+        return status, [json.loads(line) if line else None
+                        for line in lines[:-1]]
+
+    def _run(self, run="r1"):
+        return self._call("/run", {"run": run, "name": "Dummy.dummy",
+                                   "config": {"type": "constant"},
+                                   "context": {"task": {"uuid": "foo"}},
+                                   "args": {"sleep": 1}})
+
+    def test_run(self):
+        def run(name, context, args):
+            self.runner_obj.event_queue.append({"type": "iteration",
+                                                "value": 1})
+            self.runner_obj.result_queue.append([{"duration": 1}])
+            self.runner_obj.result_queue.append([{"duration": 2}])
+
+        self.runner_obj.run.side_effect = run
+
+        status, lines = self._run()
+
+        self.assertEqual("200 OK", status)
+        self.assertEqual([{"event": {"type": "iteration", "value": 1}},
+                          {"results": [{"duration": 1}]},
+                          {"results": [{"duration": 2}]},
+                          {"finished": True}], lines)
+        self.mock_runner_get.assert_called_once_with("constant")
+        self.mock_runner_get.return_value.assert_called_once_with(
+            {"uuid": "foo"}, {"type": "constant"})
+        self.runner_obj.run.assert_called_once_with(
+            "Dummy.dummy", {"task": {"uuid": "foo"}}, {"sleep": 1})
+        self.assertFalse(self.runner_obj.abort.called)
+        self.assertEqual({}, self.app._runners)
+
+    def test_run_failed(self):
+        self.runner_obj.run.side_effect = KeyError("foo")
+
+        status, lines = self._run()
+
+        self.assertEqual("200 OK", status)
+        self.assertEqual([{"error": "KeyError: 'foo'"}], lines)
+
+    def test_run_sends_heartbeats(self):
+        self.app.heartbeat_interval = 0
+        stop = threading.Event()
+        self.runner_obj.run.side_effect = lambda *args: stop.wait(5)
+
+        lines = self.app.run("r1", "Dummy.dummy", {"type": "constant"},
+                             {"task": {"uuid": "foo"}}, {})
+        self.assertEqual(b"\n", next(lines))
+        stop.set()
+        self.assertEqual([b"{\"finished\": true}\n"], list(lines))
+
+    def test_run_closed(self):
+        self.app.heartbeat_interval = 0
+        aborted = threading.Event()
+        self.runner_obj.run.side_effect = lambda *args: aborted.wait(5)
+        self.runner_obj.abort.side_effect = aborted.set
+
+        lines = self.app.run("r1", "Dummy.dummy", {"type": "constant"},
+                             {"task": {"uuid": "foo"}}, {})
+        next(lines)
+        lines.close()
+
+        self.runner_obj.abort.assert_called_once_with()
+        self.assertEqual({}, self.app._runners)
+
+    def test_abort(self):
+        self.app._runners["r1"] = self.runner_obj
+
+        status, lines = self._call("/abort", {"run": "r1"})
+
+        self.assertEqual("200 OK", status)
+        self.assertEqual([{}], lines)
+        self.runner_obj.abort.assert_called_once_with()
+
+    def test_abort_before_run(self):
+        self.app.abort("r1")
+        status, lines = self._run()
+
+        self.assertEqual([{"finished": True}], lines)
+        self.runner_obj.abort.assert_called_once_with()
+        self.assertEqual(set(), self.app._aborted)
+
+    def test_stop(self):
+        other_runner = mock.Mock()
+        self.app._runners["r0"] = other_runner
+        self.app.stop()
+        other_runner.abort.assert_called_once_with()
+
+        status, lines = self._run()
+        self.assertEqual([{"error": "The agent is stopped."}], lines)
+
+    def test_call_unknown_path(self):
+        status, lines = self._call("/foo", {})
+        self.assertEqual("404 Not Found", status)
+
+        status, lines = self._call("/run", {}, method="GET")
+        self.assertEqual("404 Not Found", status)
+
+    def test_call_with_secret(self):
+        self.app.secret = "foo"
+        self.app._runners["r1"] = self.runner_obj
+
+        for secret in (None, "", "bar", "fooo"):
+            status, lines = self._call("/abort", {"run": "r1"},
+                                       secret=secret)
+            self.assertEqual("403 Forbidden", status)
+            self.assertEqual([{"error": "Wrong secret of the agent."}],
+                             lines)
+        self.assertFalse(self.runner_obj.abort.called)
+
+        status, lines = self._call("/abort", {"run": "r1"}, secret="foo")
+        self.assertEqual("200 OK", status)
+        self.runner_obj.abort.assert_called_once_with()
+
+    def test_call_wrong_body(self):
+        status, lines = self._call("/run", body=b"{")
+        self.assertEqual("400 Bad Request", status)
+
+        status, lines = self._call("/run", {"run": "r1"})
+        self.assertEqual("400 Bad Request", status)
+        self.assertIn("TypeError", lines[0]["error"])
+
+        self.mock_runner_get.side_effect = exceptions.PluginNotFound(
+            name="foo", namespace="any of")
+        status, lines = self._run()
+        self.assertEqual("400 Bad Request", status)
+        self.assertIn("PluginNotFound", lines[0]["error"])
+
+
+class HeartbeatTestCase(test.TestCase):
+
+    @mock.patch("rally.aas.agent.db")
+    def test_start_stop(self, mock_db):
+        heartbeat = agent.Heartbeat("h:1", 0.01)
+        heartbeat.start()
+        self.assertTrue(heartbeat.is_alive())
+        heartbeat.stop()
+
+        self.assertFalse(heartbeat.is_alive())
+        mock_db.register_worker.assert_called_once_with({"hostname": "h:1"})
+        mock_db.unregister_worker.assert_called_once_with("h:1")
+
+    @mock.patch("rally.aas.agent.db")
+    def test_start_registered(self, mock_db):
+        mock_db.register_worker.side_effect = (
+            exceptions.WorkerAlreadyRegistered(worker="h:1"))
+        mock_db.unregister_worker.side_effect = exceptions.WorkerNotFound(
+            worker="h:1")
+        heartbeat = agent.Heartbeat("h:1", 10)
+        heartbeat.start()
+        heartbeat.stop()
+
+        mock_db.update_worker.assert_called_once_with("h:1")
+
+    @mock.patch("rally.aas.agent.LOG")
+    @mock.patch("rally.aas.agent.db")
+    def test_run(self, mock_db, mock_log):
+        mock_db.update_worker.side_effect = [
+            None, exceptions.WorkerNotFound(worker="h:1"), RuntimeError()]
+        heartbeat = agent.Heartbeat("h:1", 10)
+        heartbeat._stopped = mock.Mock()
+        heartbeat._stopped.wait.side_effect = [False, False, False, True]
+
+        heartbeat.run()
+
+        heartbeat._stopped.wait.assert_has_calls([mock.call(10)] * 4)
+        self.assertEqual([mock.call("h:1")] * 3,
+                         mock_db.update_worker.call_args_list)
+        mock_db.register_worker.assert_called_once_with({"hostname": "h:1"})
+        self.assertEqual(1, mock_log.warning.call_count)
+
+
+class MainTestCase(test.TestCase):
+
+    @mock.patch("rally.aas.agent.signal.signal")
+    @mock.patch("rally.aas.agent.CONF")
+    @mock.patch("rally.aas.agent.Heartbeat")
+    @mock.patch("rally.aas.agent.service.make_server")
+    @mock.patch("rally.aas.agent.Agent")
+    @mock.patch("rally.aas.agent.plugins.load")
+    @mock.patch("rally.aas.agent.api.API")
+    def test_main(self, mock_api, mock_load, mock_agent, mock_make_server,
+                  mock_heartbeat, mock_conf, mock_signal):
+        mock_conf.agent.host = "0.0.0.0"
+        mock_conf.agent.port = 0
+        mock_conf.agent.address = "10.0.0.1"
+        mock_conf.agent.heartbeat_interval = 3
+        mock_conf.agent.secret = "foo"
+        server = mock_make_server.return_value
+        server.server_port = 8001
+        server.serve_forever.side_effect = KeyboardInterrupt
+
+        self.assertEqual(0, agent.main(["rally-agent", "--foo"]))
+
+        mock_api.assert_called_once_with(config_args=["--foo"])
+        mock_load.assert_called_once_with()
+        mock_agent.assert_called_once_with(heartbeat_interval=3,
+                                           secret="foo")
+        mock_make_server.assert_called_once_with(mock_agent.return_value,
+                                                 "0.0.0.0", 0)
+        mock_heartbeat.assert_called_once_with("10.0.0.1:8001", 3)
+        mock_heartbeat.return_value.start.assert_called_once_with()
+        mock_heartbeat.return_value.stop.assert_called_once_with()
+        mock_agent.return_value.stop.assert_called_once_with()
+        server.server_close.assert_called_once_with()
+
+    @mock.patch("rally.aas.agent.LOG")
+    @mock.patch("rally.aas.agent.api.API")
+    def test_main_failed(self, mock_api, mock_log):
+        mock_api.side_effect = exceptions.RallyException("Database is missing")
+        self.assertEqual(2, agent.main(["rally-agent"]))
+        self.assertIn("Database is missing", mock_log.error.call_args[0][0])
@@ -0,0 +1,90 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime as dt
+
+import ddt
+import mock
+
+from rally.aas import agent_utils
+from rally.common import objects
+from rally.plugins.openstack import credential
+from tests.unit import test
+
+
+@ddt.ddt
+class AgentUtilsTestCase(test.TestCase):
+
+    @ddt.data({"secret": None,
+               "expected": {"Content-Type": "application/json"}},
+              {"secret": "foo",
+               "expected": {"Content-Type": "application/json",
+                            "X-Rally-Agent-Secret": "foo"}})
+    @ddt.unpack
+    @mock.patch("rally.aas.agent_utils.CONF")
+    def test_get_headers(self, mock_conf, secret, expected):
+        mock_conf.agent.secret = secret
+        self.assertEqual(expected, agent_utils.get_headers())
+
+    @ddt.data({"secret": None, "expected": None, "result": True},
+              {"secret": "foo", "expected": None, "result": True},
+              {"secret": "foo", "expected": "foo", "result": True},
+              {"secret": None, "expected": "foo", "result": False},
+              {"secret": "bar", "expected": "foo", "result": False},
+              {"secret": "fo", "expected": "foo", "result": False})
+    @ddt.unpack
+    def test_check_secret(self, secret, expected, result):
+        self.assertEqual(result, agent_utils.check_secret(secret, expected))
+
+
+class SerializationTestCase(test.TestCase):
+
+    @mock.patch("rally.aas.agent_utils.objects.Task.get")
+    def test_dumps_loads(self, mock_task_get):
+        task = objects.Task(task={"uuid": "foo"})
+        cred = credential.OpenStackCredential("http://example.com", "user",
+                                              "secret")
+        data = agent_utils.dumps({"task": task,
+                                  "admin": {"credential": cred},
+                                  "users": [{"credential": cred, "id": 1}]})
+
+        self.assertIn("{\"__rally_task__\": \"foo\"}", data)
+        context = agent_utils.loads(data)
+
+        self.assertEqual(mock_task_get.return_value, context["task"])
+        mock_task_get.assert_called_once_with("foo")
+        self.assertIsInstance(context["admin"]["credential"],
+                              credential.OpenStackCredential)
+        self.assertEqual(cred.to_dict(),
+                         context["admin"]["credential"].to_dict())
+        self.assertEqual(cred.to_dict(),
+                         context["users"][0]["credential"].to_dict())
+        self.assertEqual(1, context["users"][0]["id"])
+
+    def test_dumps_unknown_object(self):
+        self.assertRaises(TypeError, agent_utils.dumps, {"foo": object()})
+
+    @mock.patch("rally.aas.agent_utils.CONF")
+    @mock.patch("rally.aas.agent_utils.timeutils.utcnow")
+    @mock.patch("rally.aas.agent_utils.db.get_workers")
+    def test_get_agents(self, mock_get_workers, mock_utcnow, mock_conf):
+        mock_conf.agent.heartbeat_timeout = 30
+        mock_utcnow.return_value = dt.datetime(2017, 1, 1, 0, 1)
+        mock_get_workers.return_value = [{"hostname": "h1:1"},
+                                         {"hostname": "h2:2"}]
+
+        self.assertEqual(["h1:1", "h2:2"], agent_utils.get_agents())
+        mock_get_workers.assert_called_once_with(
+            updated_since=dt.datetime(2017, 1, 1, 0, 0, 30))
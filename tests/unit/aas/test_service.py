@@ -0,0 +1,363 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import datetime as dt
+import io
+import json
+
+import ddt
+import mock
+
+from rally.aas import service
+from rally import api
+from rally.common import utils
+from rally import exceptions
+from tests.unit import test
+
+
+class FakeAPI(object):
+    def __init__(self):
+        self.endpoint_url = None
+        self.deployment = api._Deployment(self)
+        self.task = api._Task(self)
+        self.verifier = api._Verifier(self)
+        self.verification = api._Verification(self)
+
+
+class ToPrimitiveTestCase(test.TestCase):
+
+    def test__to_primitive(self):
+        obj = mock.Mock()
+        obj.to_dict.return_value = {"foo": [1, 2.5, None, True]}
+        self.assertEqual({"foo": [1, 2.5, None, True]},
+                         service._to_primitive(obj))
+        self.assertEqual("2017-01-02T03:04:05",
+                         service._to_primitive(dt.datetime(2017, 1, 2,
+                                                           3, 4, 5)))
+        self.assertEqual(1.5,
+                         service._to_primitive(dt.timedelta(seconds=1.5)))
+        self.assertEqual([1], service._to_primitive({1}))
+        self.assertEqual([[1, "2017-01-02"]],
+                         service._to_primitive(((1, dt.date(2017, 1, 2)),)))
+        self.assertRaises(TypeError, service._to_primitive, object())
+        self.assertRaises(TypeError, service._to_primitive,
+                          {"foo": [object()]})
+
+    def test__to_primitive_keeps_order(self):
+        obj = collections.OrderedDict([("b", 1), ("a", 2), ("c", 3)])
+        self.assertEqual(["b", "a", "c"],
+                         list(service._to_primitive(obj).keys()))
+
+    def test__to_primitive_lazy(self):
+        load_chunks = mock.Mock(
+            return_value=iter([[{"duration": 1}], [{"duration": 2}]]))
+        result = service._to_primitive(
+            {"data": utils.LazyChunkedList(load_chunks)})
+
+        self.assertFalse(load_chunks.called)
+        self.assertEqual([{"duration": 1}, {"duration": 2}],
+                         list(result["data"]))
+
+    def test__encode_result(self):
+        result = {"foo": utils.LazyChunkedList(
+            lambda: iter([["a" * 10] * 5, ["b" * 10] * 5]))}
+
+        parts = list(service._encode_result(result, buffer_size=30))
+
+        self.assertGreater(len(parts), 1)
+        self.assertEqual({"result": {"foo": ["a" * 10] * 5 + ["b" * 10] * 5}},
+                         json.loads(b"".join(parts).decode("utf-8")))
+
+
+class WorkersTestCase(test.TestCase):
+
+    def test_submit(self):
+        workers = service.Workers(2)
+        job = workers.submit(lambda x, y: x + y, x=1, y=2)
+        failed_job = workers.submit(lambda: {}["foo"])
+        workers.stop()
+
+        self.assertTrue(job.done.is_set())
+        self.assertEqual(3, job.result)
+        self.assertIsNone(job.error)
+        self.assertTrue(failed_job.done.is_set())
+        self.assertIsInstance(failed_job.error, KeyError)
+
+
+@ddt.ddt
+class ApplicationTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ApplicationTestCase, self).setUp()
+        self.app = service.Application(FakeAPI())
+        self.addCleanup(self.app.workers.stop)
+        self.start_response = mock.Mock()
+
+    def _call(self, path, method, kwargs=None, body=b"", secret=None):
+        if kwargs is not None:
+            body = json.dumps(kwargs).encode("utf-8")
+        environ = {"PATH_INFO": path,
+                   "REQUEST_METHOD": method,
+                   "CONTENT_LENGTH": str(len(body)),
+                   "wsgi.input": io.BytesIO(body)}
+        if secret is not None:
+            environ["HTTP_X_RALLY_SERVICE_SECRET"] = secret
+        response = self.app(environ, self.start_response)
+        status = self.start_response.call_args[0][0]
+        return int(status.split()[0]), json.loads(b"".join(response).decode(
+            "utf-8"))
+
+    def test_routes(self):
+        self.assertIn("/api/task/list", self.app.routes)
+        self.assertIn("/api/verification/start", self.app.routes)
+        for path, method in self.app.routes.items():
+            self.assertEqual(path, method.path)
+
+    @mock.patch("rally.api.objects.Task.list")
+    def test_call(self, mock_task_list):
+        task = mock.Mock()
+        task.to_dict.return_value = {
+            "uuid": "foo", "created_at": dt.datetime(2017, 1, 1)}
+        mock_task_list.return_value = [task]
+
+        status, body = self._call("/api/task/list", "GET",
+                                  {"status": "finished"})
+
+        self.assertEqual(200, status)
+        self.assertEqual({"result": [{"uuid": "foo",
+                                      "created_at": "2017-01-01T00:00:00"}]},
+                         body)
+        mock_task_list.assert_called_once_with(
+            status="finished", deployment=None, limit=None, offset=None,
+            since=None)
+        task.to_dict.assert_called_once_with(include_results=False)
+
+    @mock.patch("rally.api.objects.Task.get_detailed")
+    def test_call_lazy(self, mock_task_get_detailed):
+        mock_task_get_detailed.return_value = {
+            "uuid": "foo",
+            "results": [{"data": utils.LazyChunkedList(
+                lambda: iter([[{"duration": 1}], [{"duration": 2}]]))}]}
+
+        status, body = self._call("/api/task/get_detailed", "GET",
+                                  {"task_id": "foo", "lazy": True})
+
+        self.assertEqual(200, status)
+        self.assertEqual(
+            {"result": {"uuid": "foo",
+                        "results": [{"data": [{"duration": 1},
+                                              {"duration": 2}]}]}},
+            body)
+        mock_task_get_detailed.assert_called_once_with(
+            "foo", include_data=True, lazy=True)
+
+    @mock.patch("rally.aas.service.LOG")
+    @mock.patch("rally.api.objects.Task.get_detailed")
+    def test_call_lazy_failed(self, mock_task_get_detailed, mock_log):
+        def load_chunks():
+            yield [{"duration": 1}]
+            raise exceptions.RallyException("foo")
+
+        mock_task_get_detailed.return_value = {
+            "uuid": "foo", "results": [{"data": utils.LazyChunkedList(
+                load_chunks)}]}
+
+        kwargs = json.dumps({"task_id": "foo"}).encode("utf-8")
+        environ = {"PATH_INFO": "/api/task/get_detailed",
+                   "REQUEST_METHOD": "GET",
+                   "CONTENT_LENGTH": str(len(kwargs)),
+                   "wsgi.input": io.BytesIO(kwargs)}
+        with mock.patch("rally.aas.service.RESPONSE_BUFFER_SIZE", 1):
+            response = self.app(environ, self.start_response)
+            body = b"".join(response).decode("utf-8")
+
+        self.assertTrue(self.start_response.call_args[0][0].startswith("200"))
+        self.assertRaises(ValueError, json.loads, body)
+        self.assertTrue(mock_log.error.called)
+
+    @mock.patch("rally.api.objects.Task.get")
+    def test_call_failed(self, mock_task_get):
+        mock_task_get.side_effect = exceptions.TaskNotFound(uuid="foo")
+
+        status, body = self._call("/api/task/get", "GET",
+                                  {"task_id": "foo"})
+
+        self.assertEqual(460, status)
+        self.assertEqual({"error": {"msg": "Task with uuid=foo not found.",
+                                    "args": None,
+                                    "type": "TaskNotFound",
+                                    "kwargs": {"uuid": "foo"}}}, body)
+
+    @mock.patch("rally.api.objects.Deployment.get")
+    def test_call_with_secret(self, mock_deployment_get):
+        self.app.secret = "foo"
+        mock_deployment_get.return_value.to_dict.return_value = {
+            "uuid": "d"}
+
+        for secret in (None, "", "bar"):
+            status, body = self._call("/api/deployment/get", "GET",
+                                      {"deployment": "d"}, secret=secret)
+            self.assertEqual(403, status)
+            self.assertEqual("ForbiddenException", body["error"]["type"])
+        self.assertFalse(mock_deployment_get.called)
+
+        status, body = self._call("/api/deployment/get", "GET",
+                                  {"deployment": "d"}, secret="foo")
+        self.assertEqual(200, status)
+        self.assertEqual({"result": {"uuid": "d"}}, body)
+
+    def test_call_unknown_path(self):
+        status, body = self._call("/api/task/foo", "GET")
+        self.assertEqual(404, status)
+        self.assertEqual("NotFoundException", body["error"]["type"])
+
+    def test_call_wrong_method(self):
+        status, body = self._call("/api/task/list", "POST")
+        self.assertEqual(455, status)
+        self.assertEqual("InvalidArgumentsException", body["error"]["type"])
+
+    def test_call_wrong_body(self):
+        status, body = self._call("/api/task/list", "GET", body=b"[]")
+        self.assertEqual(455, status)
+
+        status, body = self._call("/api/task/list", "GET", body=b"{")
+        self.assertEqual(455, status)
+
+    def test_call_background(self):
+        self.app.workers = mock.Mock()
+        job = self.app.workers.submit.return_value
+        job.error = None
+        job.result = {"verification": {"uuid": "v"}}
+
+        status, body = self._call("/api/verification/start", "POST",
+                                  {"verifier_id": "v",
+                                   "deployment_id": "d"})
+
+        self.assertEqual(200, status)
+        self.assertEqual({"result": {"verification": {"uuid": "v"}}}, body)
+        self.app.workers.submit.assert_called_once_with(
+            self.app.routes["/api/verification/start"], verifier_id="v",
+            deployment_id="d")
+        job.done.wait.assert_called_once_with()
+
+    def test_call_background_failed(self):
+        self.app.workers = mock.Mock()
+        job = self.app.workers.submit.return_value
+        job.error = exceptions.DeploymentNotFound(deployment="d")
+
+        status, body = self._call("/api/verification/start", "POST",
+                                  {"verifier_id": "v",
+                                   "deployment_id": "d"})
+
+        self.assertEqual(461, status)
+        self.assertEqual("DeploymentNotFound", body["error"]["type"])
+
+    @ddt.data({"kwargs": {"deployment": "d", "config": {}},
+               "created": True},
+              {"kwargs": {"deployment": "d", "config": {}, "task": "t"},
+               "created": False})
+    @ddt.unpack
+    @mock.patch("rally.aas.service.objects.Task.get_status",
+                return_value="init")
+    def test_call_task_start(self, mock_task_get_status, kwargs, created):
+        self.app.workers = mock.Mock()
+        mock_create = mock.Mock(return_value={"uuid": "t"})
+        self.app.routes[service.TASK_CREATE_PATH] = mock_create
+
+        status, body = self._call("/api/task/start", "POST", kwargs)
+
+        self.assertEqual(200, status)
+        self.assertEqual({"result": ["t", "init"]}, body)
+        if created:
+            mock_create.assert_called_once_with(deployment="d", tag=None)
+        else:
+            self.assertFalse(mock_create.called)
+        mock_task_get_status.assert_called_once_with("t")
+        self.app.workers.submit.assert_called_once_with(
+            self.app._run_task, start=self.app.routes["/api/task/start"],
+            kwargs={"deployment": "d", "config": {}, "task": "t"})
+        self.assertFalse(self.app.workers.submit.return_value.done.wait.called)
+
+    def test_call_task_start_failed(self):
+        self.app.workers = mock.Mock()
+        self.app.routes[service.TASK_CREATE_PATH] = mock.Mock(
+            side_effect=exceptions.DeploymentNotFound(deployment="d"))
+
+        status, body = self._call("/api/task/start", "POST",
+                                  {"deployment": "d", "config": {}})
+
+        self.assertEqual(461, status)
+        self.assertEqual("DeploymentNotFound", body["error"]["type"])
+        self.assertFalse(self.app.workers.submit.called)
+
+    @ddt.data({"status": "init", "set_failed": True},
+              {"status": "validation_failed", "set_failed": False})
+    @ddt.unpack
+    @mock.patch("rally.aas.service.LOG")
+    @mock.patch("rally.aas.service.objects.Task.get")
+    def test__run_task_failed(self, mock_task_get, mock_log, status,
+                              set_failed):
+        task = mock_task_get.return_value
+        task.__getitem__.side_effect = {"status": status}.__getitem__
+        func = mock.Mock(side_effect=exceptions.DeploymentNotFound(
+            deployment="d"))
+
+        self.app._run_task(func, {"deployment": "d", "task": "t"})
+
+        func.assert_called_once_with(deployment="d", task="t")
+        self.assertTrue(mock_log.error.called)
+        mock_task_get.assert_called_once_with("t")
+        if set_failed:
+            task.set_failed.assert_called_once_with(
+                "DeploymentNotFound", mock.ANY, mock.ANY)
+        else:
+            self.assertFalse(task.set_failed.called)
+
+
+class MainTestCase(test.TestCase):
+
+    @mock.patch("rally.aas.service.CONF")
+    @mock.patch("rally.aas.service.make_server")
+    @mock.patch("rally.aas.service.Application")
+    @mock.patch("rally.aas.service.plugins.load")
+    @mock.patch("rally.aas.service.api.API")
+    def test_main(self, mock_api, mock_load, mock_application,
+                  mock_make_server, mock_conf):
+        mock_conf.service.host = "127.0.0.1"
+        mock_conf.service.port = 8000
+        mock_conf.service.execution_workers = 3
+        mock_conf.service.secret = "foo"
+        server = mock_make_server.return_value
+        server.serve_forever.side_effect = KeyboardInterrupt
+
+        self.assertEqual(0, service.main(["rally-service", "--foo"]))
+
+        mock_api.assert_called_once_with(config_args=["--foo"])
+        mock_load.assert_called_once_with()
+        mock_application.assert_called_once_with(mock_api.return_value,
+                                                 execution_workers=3,
+                                                 secret="foo")
+        mock_make_server.assert_called_once_with(
+            mock_application.return_value, "127.0.0.1", 8000)
+        server.server_close.assert_called_once_with()
+        mock_application.return_value.workers.stop.assert_called_once_with()
+
+    @mock.patch("rally.aas.service.LOG")
+    @mock.patch("rally.aas.service.api.API")
+    def test_main_failed(self, mock_api, mock_log):
+        mock_api.side_effect = exceptions.RallyException("Database is missing")
+        self.assertEqual(2, service.main(["rally-service"]))
+        self.assertIn("Database is missing", mock_log.error.call_args[0][0])
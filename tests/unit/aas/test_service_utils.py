@@ -0,0 +1,33 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import ddt
+import mock
+
+from rally.aas import service_utils
+from tests.unit import test
+
+
+@ddt.ddt
+class ServiceUtilsTestCase(test.TestCase):
+
+    @ddt.data({"secret": None, "expected": {}},
+              {"secret": "foo",
+               "expected": {"X-Rally-Service-Secret": "foo"}})
+    @ddt.unpack
+    @mock.patch("rally.aas.service_utils.CONF")
+    def test_get_headers(self, mock_conf, secret, expected):
+        mock_conf.service.secret = secret
+        self.assertEqual(expected, service_utils.get_headers())
@@ -122,7 +122,10 @@ class PluginCommandsTestCase(test.TestCase):
                 mock_plugin_get_all.return_value = [self.Plugin2, self.Plugin3]
                 plugin_cmd.PluginCommands().show(None, "p", "p2_ns")
                 self.assertEqual(out.getvalue(), "Multiple plugins found:\n")
-                mock_plugin_get_all.assert_called_once_with(namespace="p2_ns")
+                self.assertEqual(
+                    [mock.call(name="p", namespace="p2_ns"),
+                     mock.call(namespace="p2_ns")],
+                    mock_plugin_get_all.call_args_list)
 
         mock_plugin_commands__print_plugins_list.assert_called_once_with([
             self.Plugin2, self.Plugin3])
@@ -19,10 +19,12 @@ import os.path
 
 import ddt
 import mock
+import six
 
 import rally
 from rally import api
 from rally.cli.commands import task
+from rally.common import objects
 from rally.common import yamlutils as yaml
 from rally import consts
 from rally import exceptions
@@ -418,7 +420,43 @@ class TaskCommandsTestCase(test.TestCase):
         self.task.detailed(self.fake_api, test_uuid,
                            iterations_data=iterations_data)
         self.fake_api.task.get_detailed.assert_called_once_with(
-            task_id=test_uuid, extended_results=True)
+            task_id=test_uuid, extended_results=True,
+            include_data=iterations_data)
+
+    @mock.patch("rally.cli.commands.task.sys.stdout",
+                new_callable=six.StringIO)
+    def test_detailed_with_saved_statistics(self, mock_stdout):
+        statistics = objects.WorkloadStatistics()
+        statistics.max_errors = 1
+        for i in range(3):
+            statistics.add_iteration(
+                {"timestamp": i, "duration": 1, "idle_duration": 0,
+                 "atomic_actions": [],
+                 "error": ["KeyError", "foo %d" % i, "trace"] if i else [],
+                 "output": {"additive": [{"title": "Foo output",
+                                          "description": "",
+                                          "chart_plugin": "StatsTable",
+                                          "data": [["bar", i]]}],
+                            "complete": []}})
+        statistics.add_iteration({"timestamp": 3, "duration": 1,
+                                  "atomic_actions": [],
+                                  "error": ["KeyError", "spam", "trace"]})
+        info = dict(statistics.to_dict(), load_duration=3, full_duration=4)
+        self.fake_api.task.get_detailed.return_value = {
+            "uuid": "foo", "status": "finished",
+            "results": [{"key": {"name": "Foo.bar", "pos": 0, "kw": {}},
+                         "info": info, "iterations": []}]}
+
+        self.task.detailed(self.fake_api, "foo")
+
+        self.fake_api.task.get_detailed.assert_called_once_with(
+            task_id="foo", extended_results=True, include_data=False)
+        out = mock_stdout.getvalue()
+        self.assertIn("Task foo has 3 error(s)", out)
+        self.assertIn("KeyError: foo 1", out)
+        self.assertNotIn("foo 2", out)
+        self.assertIn("Only 1 of them are shown", out)
+        self.assertIn("Foo output", out)
 
     @mock.patch("rally.cli.commands.task.sys.stdout")
     @mock.patch("rally.cli.commands.task.logging")
@@ -481,49 +519,53 @@ class TaskCommandsTestCase(test.TestCase):
         self.fake_api.task.get_detailed.return_value = None
         self.task.detailed(self.fake_api, test_uuid)
         self.fake_api.task.get_detailed.assert_called_once_with(
-            task_id=test_uuid, extended_results=True)
+            task_id=test_uuid, extended_results=True, include_data=False)
 
-    @mock.patch("json.dumps")
-    def test_results(self, mock_json_dumps):
+    @mock.patch("rally.cli.commands.task.sys.stdout")
+    def test_results(self, mock_stdout):
         task_id = "foo_task_id"
         created_at = dt.datetime(2017, 2, 6, 1, 1, 1)
         data = [
-            {"key": "foo_key", "data": {"raw": [{"atomic_actions": {
-                                                 "foo": 1.1}}],
+            {"key": "foo_key", "data": {"raw": iter([{"atomic_actions": [
+                                                      {"name": "foo",
+                                                       "started_at": 0,
+                                                       "finished_at": 1.1,
+                                                       "children": []}]}]),
                                         "sla": [],
                                         "hooks": [],
                                         "load_duration": 1.0,
                                         "full_duration": 2.0},
              "created_at": created_at.strftime("%Y-%d-%mT%H:%M:%S")}
         ]
-        result = map(lambda x: {"key": x["key"],
-                                "result": x["data"]["raw"],
-                                "load_duration": x["data"]["load_duration"],
-                                "full_duration": x["data"]["full_duration"],
-                                "created_at": x.get("created_at"),
-                                "hooks": x["data"]["hooks"],
-                                "sla": x["data"]["sla"]}, data)
-        fake_task = fakes.FakeTask({"status": consts.TaskStatus.FINISHED,
-                                    "results": data})
-        self.fake_api.task.get.return_value = fake_task
+        self.fake_api.task.get_detailed.return_value = {
+            "status": consts.TaskStatus.FINISHED, "results": data}
 
         self.task.results(self.fake_api, task_id)
-        self.assertEqual(1, mock_json_dumps.call_count)
-        self.assertEqual(1, len(mock_json_dumps.call_args[0]))
-        self.assertSequenceEqual(result, mock_json_dumps.call_args[0][0])
-        self.assertEqual({"sort_keys": False, "indent": 4},
-                         mock_json_dumps.call_args[1])
-        self.fake_api.task.get.assert_called_once_with(task_id=task_id)
+
+        output = "".join(c[1][0] for c in mock_stdout.write.mock_calls)
+        self.assertEqual(
+            json.dumps([{"key": "foo_key",
+                         "result": [{"atomic_actions": {"foo": 1.1}}],
+                         "sla": [],
+                         "hooks": [],
+                         "load_duration": 1.0,
+                         "full_duration": 2.0,
+                         "created_at": data[0]["created_at"]}],
+                       indent=4, separators=(",", ": ")) + "\n",
+            output)
+        self.fake_api.task.get_detailed.assert_called_once_with(
+            task_id=task_id, lazy=True)
 
     @mock.patch("rally.cli.commands.task.sys.stdout")
     def test_results_no_data(self, mock_stdout):
         task_id = "foo_task_id"
-        fake_task = fakes.FakeTask({"status": consts.TaskStatus.CRASHED})
-        self.fake_api.task.get.return_value = fake_task
+        self.fake_api.task.get_detailed.return_value = {
+            "status": consts.TaskStatus.CRASHED, "results": []}
 
         self.assertEqual(1, self.task.results(self.fake_api, task_id))
 
-        self.fake_api.task.get.assert_called_once_with(task_id=task_id)
+        self.fake_api.task.get_detailed.assert_called_once_with(
+            task_id=task_id, lazy=True)
 
         expected_out = ("Task status is %s. Results "
                         "available when it is one of %s.") % (
@@ -566,10 +608,10 @@ class TaskCommandsTestCase(test.TestCase):
                                out="output.html", out_format="html")
         expected = [
             {"load_duration": 1.2, "full_duration": 2.3, "sla": "bar_sla",
-             "hooks": "bar_hooks",
+             "hooks": "bar_hooks", "statistics": None,
              "key": {"name": "bar", "pos": 0}, "result": "bar_raw"},
             {"load_duration": 1.2, "full_duration": 2.3, "sla": "bar_sla",
-             "hooks": "bar_hooks",
+             "hooks": "bar_hooks", "statistics": None,
              "key": {"name": "bar", "pos": 0}, "result": "bar_raw"},
             "result_1_from_file", "result_2_from_file"]
         mock_plot.trends.assert_called_once_with(expected)
@@ -670,7 +712,7 @@ class TaskCommandsTestCase(test.TestCase):
 
         mock_open.side_effect().write.assert_called_once_with("html_report")
         self.fake_api.task.get_detailed.assert_called_once_with(
-            task_id=task_id)
+            task_id=task_id, lazy=True)
 
         # JUnit
         reset_mocks()
@@ -742,7 +784,8 @@ class TaskCommandsTestCase(test.TestCase):
         mock_plot.plot.assert_called_once_with(results, include_libs=False)
 
         mock_open.side_effect().write.assert_called_once_with("html_report")
-        expected_get_calls = [mock.call(task_id=task) for task in tasks]
+        expected_get_calls = [mock.call(task_id=task, lazy=True)
+                              for task in tasks]
         self.fake_api.task.get_detailed.assert_has_calls(
             expected_get_calls, any_order=True)
 
@@ -842,6 +885,20 @@ class TaskCommandsTestCase(test.TestCase):
             self.fake_api.task.list.return_value, ["uuid"],
             print_header=False, print_border=False)
 
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    def test_list_paginated(self, mock_print_list):
+        self.fake_api.task.list.return_value = [
+            fakes.FakeTask(uuid="a",
+                           created_at=dt.datetime.now(),
+                           updated_at=dt.datetime.now(),
+                           status="c",
+                           tag="d",
+                           deployment_name="some_name")]
+        self.task.list(self.fake_api, deployment="d", all_deployments=True,
+                       limit=10, offset=20, since="2017-01-31")
+        self.fake_api.task.list.assert_called_once_with(
+            limit=10, offset=20, since="2017-01-31")
+
     def test_list_wrong_status(self):
         self.assertEqual(1, self.task.list(self.fake_api, deployment="fake",
                                            status="wrong non existing status"))
@@ -895,7 +952,7 @@ class TaskCommandsTestCase(test.TestCase):
         result = self.task.sla_check(self.fake_api, task_id="fake_task_id")
         self.assertEqual(1, result)
         self.fake_api.task.get_detailed.assert_called_with(
-            task_id="fake_task_id")
+            task_id="fake_task_id", include_data=False)
 
         data[0]["data"]["sla"][0]["success"] = True
 
@@ -1042,7 +1099,7 @@ class TaskCommandsTestCase(test.TestCase):
         }
         self.task.detailed(self.fake_api, test_uuid)
         self.fake_api.task.get_detailed.assert_called_once_with(
-            task_id=test_uuid, extended_results=True)
+            task_id=test_uuid, extended_results=True, include_data=False)
         mock_stdout.write.assert_has_calls([
             mock.call(error_traceback or "No traceback available.")
         ], any_order=False)
@@ -26,6 +26,7 @@ from six import moves
 
 from rally.common import db
 from rally.common.db import api as db_api
+from rally.common import utils
 from rally import consts
 from rally import exceptions
 from tests.unit import test
@@ -199,6 +200,35 @@ class TasksTestCase(test.DBTestCase):
         self.assertEqual(task_init, get_uuids(INIT))
         self.assertEqual(sorted(task_finished), get_uuids(FINISHED))
 
+    def test_task_list_paginated(self):
+        tasks = [self._create_task({"tag": "tag-%d" % i}) for i in range(5)]
+        db.task_update(tasks[0]["uuid"], {
+            "created_at": dt.datetime(2017, 1, 1)})
+        for task in tasks[1:]:
+            db.task_update(task["uuid"], {
+                "created_at": dt.datetime(2017, 2, 1)})
+
+        listed = db.task_list(limit=2, offset=1)
+        self.assertEqual([t["uuid"] for t in tasks[1:3]],
+                         [t["uuid"] for t in listed])
+        self.assertEqual(["tag-1", "tag-2"], [t["tag"] for t in listed])
+        self.assertEqual([self.deploy["name"]] * 2,
+                         [t["deployment_name"] for t in listed])
+
+        listed = db.task_list(since=dt.datetime(2017, 1, 15), offset=3)
+        self.assertEqual([tasks[4]["uuid"]], [t["uuid"] for t in listed])
+
+    def test_task_list_tags_in_batches(self):
+        tasks = [self._create_task({"tag": "tag-%d" % i}) for i in range(5)]
+        tasks.append(self._create_task())
+
+        with mock.patch("rally.common.db.sqlalchemy.api.Connection."
+                        "TAGS_BATCH_SIZE", 2):
+            listed = db.task_list()
+        self.assertEqual(
+            dict((t["uuid"], t.get("tag", "")) for t in tasks),
+            dict((t["uuid"], t["tag"]) for t in listed))
+
     def test_task_delete(self):
         task1, task2 = self._create_task()["uuid"], self._create_task()["uuid"]
         db.task_delete(task1)
@@ -300,6 +330,7 @@ class TasksTestCase(test.DBTestCase):
             key["kw"]["args"]["task_id"] = task_id
             data["sla"][0] = {"success": True}
             data["raw"] = []
+            data["statistics"] = {}
             self.assertEqual(len(res), 1)
             self.assertEqual(res[0]["key"], key)
             self.assertEqual(res[0]["data"], data)
@@ -422,8 +453,77 @@ class TasksTestCase(test.DBTestCase):
             "load_duration": 13,
             "full_duration": 42,
             "hooks": [],
+            "statistics": {},
         }, results[0]["data"])
 
+    def test_task_get_detailed_without_data(self):
+        task = self._create_task()
+        key = {"name": "atata", "description": "tatata", "pos": 0,
+               "kw": {"runner": {"r": "R", "type": "T"}}}
+        raw = [{"duration": 1, "timestamp": 1, "error": [],
+                "atomic_actions": []}]
+        statistics = {"iterations_count": 1, "iterations_failed": 0,
+                      "min_duration": 1, "max_duration": 1,
+                      "tstamp_start": 1, "atomic": {}, "stat": {}}
+
+        subtask = db.subtask_create(task["uuid"], title="foo")
+        workload1 = db.workload_create(task["uuid"], subtask["uuid"], key)
+        db.workload_data_create(task["uuid"], workload1["uuid"], 0,
+                                {"raw": raw})
+        db.workload_set_results(workload1["uuid"],
+                                {"sla": [], "statistics": statistics})
+        workload2 = db.workload_create(task["uuid"], subtask["uuid"], key)
+        db.workload_data_create(task["uuid"], workload2["uuid"], 0,
+                                {"raw": raw})
+        db.workload_set_results(workload2["uuid"], {"sla": []})
+
+        results = db.task_get_detailed(task["uuid"],
+                                       include_data=False)["results"]
+        self.assertEqual(2, len(results))
+        # Raw data is loaded only for workloads without statistics
+        self.assertEqual(([], statistics),
+                         (results[0]["data"]["raw"],
+                          results[0]["data"]["statistics"]))
+        self.assertEqual((raw, {}),
+                         (results[1]["data"]["raw"],
+                          results[1]["data"]["statistics"]))
+
+        results = db.task_get_detailed(task["uuid"])["results"]
+        self.assertEqual(raw, results[0]["data"]["raw"])
+
+    def test_task_get_detailed_lazy(self):
+        task = self._create_task()
+        key = {"name": "atata", "description": "tatata", "pos": 0,
+               "kw": {"runner": {"r": "R", "type": "T"}}}
+        subtask = db.subtask_create(task["uuid"], title="foo")
+        workload = db.workload_create(task["uuid"], subtask["uuid"], key)
+        chunks = [[{"duration": 1, "timestamp": ts, "error": [],
+                    "atomic_actions": []} for ts in timestamps]
+                  for timestamps in ((3, 5), (1, 2, 7), (6,))]
+        # chunks are expected to be loaded in order of chunk_order
+        for chunk_order in (2, 0, 1):
+            db.workload_data_create(task["uuid"], workload["uuid"],
+                                    chunk_order, {"raw": chunks[chunk_order]})
+        old_format = [{"duration": 1, "timestamp": 8, "error": [],
+                       "atomic_actions": {"foo": 1}}]
+        db.workload_data_create(task["uuid"], workload["uuid"], 3,
+                                {"raw": old_format})
+        db.workload_set_results(workload["uuid"], {"sla": []})
+
+        results = db.task_get_detailed(task["uuid"], lazy=True)["results"]
+        raw = results[0]["data"]["raw"]
+        self.assertIsInstance(raw, utils.LazyChunkedList)
+        expected = chunks[0] + chunks[1] + chunks[2] + [
+            {"duration": 1, "timestamp": 8, "error": [],
+             "atomic_actions": [{"name": "foo", "children": [],
+                                 "started_at": 8, "finished_at": 9}]}]
+        self.assertEqual(expected, list(raw))
+        # chunks are loaded again on each iteration
+        self.assertEqual(expected, list(raw))
+        self.assertEqual([1, 2, 3, 5, 6, 7, 8],
+                         [itr["timestamp"] for itr in raw.iter_sorted(
+                             key=lambda itr: itr["timestamp"])])
+
     def test_task_get_detailed_last(self):
         task1 = self._create_task()
         key = {
@@ -469,6 +569,7 @@ class TasksTestCase(test.DBTestCase):
             "load_duration": 13,
             "full_duration": 42,
             "hooks": [],
+            "statistics": {},
         }, results[0]["data"])
 
     def test_task_result_create(self):
@@ -611,6 +712,7 @@ class TasksTestCase(test.DBTestCase):
             ],
             "sla": [{"success": True}],
             "hooks": [],
+            "statistics": {},
             "load_duration": 13,
             "full_duration": 42
         })
@@ -630,6 +732,11 @@ class SubtaskTestCase(test.DBTestCase):
         subtask = db.subtask_create(self.task["uuid"], title="foo")
         self.assertEqual("foo", subtask["title"])
         self.assertEqual(self.task["uuid"], subtask["task_uuid"])
+        self.assertFalse(subtask["run_in_parallel"])
+
+        subtask = db.subtask_create(self.task["uuid"], title="foo",
+                                    run_in_parallel=True)
+        self.assertTrue(subtask["run_in_parallel"])
 
     def test_subtask_update(self):
         subtask = db.subtask_create(self.task["uuid"], title="foo")
@@ -802,6 +909,9 @@ class WorkloadDataTestCase(test.DBTestCase):
         self.assertEqual(dt.datetime.fromtimestamp(4),
                          workload_data["finished_at"])
         self.assertEqual(data, workload_data["chunk_data"])
+        self.assertLess(0, workload_data["compressed_chunk_size"])
+        self.assertLess(workload_data["compressed_chunk_size"],
+                        workload_data["chunk_size"])
         self.assertEqual(self.task_uuid, workload_data["task_uuid"])
         self.assertEqual(self.workload_uuid, workload_data["workload_uuid"])
 
@@ -1128,11 +1238,108 @@ class VerificationTestCase(test.DBTestCase):
         self.assertEqual(len(vs), 1)
         self.assertEqual(v2["uuid"], vs[0]["uuid"])
 
+    def test_verification_list_with_tags(self):
+        v = db.verification_create(
+            self.verifier["uuid"], self.deploy["uuid"], ["foo", "bar"], {})
+
+        vs = db.verification_list()
+        self.assertEqual(1, len(vs))
+        self.assertEqual(["bar", "foo"], vs[0]["tags"])
+        self.assertEqual(v["status"], vs[0]["status"])
+
     def test_verification_delete(self):
         v = self._create_verification()
+        db.verification_tests_add(v["uuid"], {"test": {"status": "success"}})
         db.verification_delete(v["uuid"])
         self.assertRaises(exceptions.ResourceNotFound, db.verification_delete,
                           v["uuid"])
+        self.assertEqual({v["uuid"]: {}},
+                         db.verification_tests_get([v["uuid"]]))
+
+    def test_verification_tests_add(self):
+        v = self._create_verification()
+        db.verification_tests_add(v["uuid"], {
+            "test_b": {"name": "test_b", "status": "fail",
+                       "duration": "1.500", "tags": ["smoke"],
+                       "traceback": "Trace"},
+            "test_a": {"name": "test_a", "status": "success",
+                       "duration": "0.100"}})
+
+        tests = db.verification_tests_get([v["uuid"]])[v["uuid"]]
+        self.assertEqual(["test_a", "test_b"], list(tests))
+        self.assertEqual({"name": "test_b", "status": "fail",
+                          "duration": "1.500", "tags": ["smoke"],
+                          "traceback": "Trace"}, tests["test_b"])
+        self.assertEqual({"name": "test_a", "status": "success",
+                          "duration": "0.100", "tags": []}, tests["test_a"])
+
+        # results of tests are replaced
+        db.verification_tests_add(v["uuid"], {
+            "test_b": {"name": "test_b", "status": "success",
+                       "duration": "2.000"}})
+        tests = db.verification_tests_get([v["uuid"]])[v["uuid"]]
+        self.assertEqual(2, len(tests))
+        self.assertEqual("success", tests["test_b"]["status"])
+
+    def test_verification_tests_get(self):
+        v1 = self._create_verification()
+        v2 = self._create_verification()
+        db.verification_tests_add(v1["uuid"], {
+            "test_1": {"status": "success", "duration": "3"},
+            "test_2": {"status": "fail", "duration": "1"},
+            "test_3": {"status": "skip"}})
+        db.verification_tests_add(v2["uuid"], {
+            "test_1": {"status": "fail", "duration": "5"}})
+
+        tests = db.verification_tests_get([v1["uuid"], v2["uuid"]])
+        self.assertEqual(["test_1", "test_2", "test_3"],
+                         list(tests[v1["uuid"]]))
+        self.assertEqual(["test_1"], list(tests[v2["uuid"]]))
+
+        tests = db.verification_tests_get([v1["uuid"]], status="fail")
+        self.assertEqual(["test_2"], list(tests[v1["uuid"]]))
+
+        tests = db.verification_tests_get([v1["uuid"]],
+                                          status=["fail", "skip"])
+        self.assertEqual(["test_2", "test_3"], list(tests[v1["uuid"]]))
+
+        tests = db.verification_tests_get([v1["uuid"], v2["uuid"]],
+                                          min_duration=2)
+        self.assertEqual(["test_1"], list(tests[v1["uuid"]]))
+        self.assertEqual(["test_1"], list(tests[v2["uuid"]]))
+
+        self.assertEqual({"unknown": {}},
+                         db.verification_tests_get(["unknown"]))
+
+    def test_verification_tests_compare(self):
+        v1 = self._create_verification()
+        v2 = self._create_verification()
+        db.verification_tests_add(v1["uuid"], {
+            "test_2": {"status": "fail", "duration": "1",
+                       "traceback": "Trace"},
+            "test_1": {"status": "success", "duration": "3",
+                       "tags": ["smoke"]}})
+        db.verification_tests_add(v2["uuid"], {
+            "test_3": {"status": "skip", "reason": "Why"},
+            "test_1": {"status": "fail", "duration": "5"}})
+
+        tests = list(db.verification_tests_compare([v2["uuid"],
+                                                    v1["uuid"]]))
+        self.assertEqual(["test_1", "test_2", "test_3"],
+                         [test_id for test_id, results in tests])
+        self.assertEqual([[v2["uuid"], v1["uuid"]], [v1["uuid"]],
+                          [v2["uuid"]]],
+                         [list(results) for test_id, results in tests])
+        self.assertEqual(
+            {v2["uuid"]: {"status": "fail", "duration": "5", "tags": []},
+             v1["uuid"]: {"status": "success", "duration": "3",
+                          "tags": ["smoke"]}}, tests[0][1])
+        self.assertEqual({"status": "fail", "duration": "1", "tags": [],
+                          "traceback": "Trace"}, tests[1][1][v1["uuid"]])
+        self.assertEqual({"status": "skip", "reason": "Why", "tags": []},
+                         tests[2][1][v2["uuid"]])
+
+        self.assertEqual([], list(db.verification_tests_compare(["unknown"])))
 
     def test_verification_update(self):
         v = self._create_verification()
@@ -1158,6 +1365,17 @@ class WorkerTestCase(test.DBTestCase):
     def test_get_worker_not_found(self):
         self.assertRaises(exceptions.WorkerNotFound, db.get_worker, "notfound")
 
+    def test_get_workers(self):
+        worker = db.register_worker({"hostname": "a-test"})
+        self.assertEqual(["a-test", "test"],
+                         [w["hostname"] for w in db.get_workers()])
+        self.assertEqual(["a-test"],
+                         [w["hostname"] for w in db.get_workers(
+                             updated_since=worker["updated_at"])])
+
+        since = worker["updated_at"] + dt.timedelta(seconds=1)
+        self.assertEqual([], db.get_workers(updated_since=since))
+
     def test_unregister_worker(self):
         db.unregister_worker("test")
         self.assertRaises(exceptions.WorkerNotFound, db.get_worker, "test")
@@ -33,6 +33,7 @@ import rally
 from rally.common import db
 from rally.common.db.sqlalchemy import api
 from rally.common.db.sqlalchemy import models
+from rally.common.db.sqlalchemy import types as sa_types
 from rally import consts
 from rally.deployment.engines import existing
 from tests.unit.common.db import test_migrations_base
@@ -1417,3 +1418,157 @@ class MigrationWalkTestCase(rtest.DBTestCase,
                 conn.execute(
                     deployment_table.delete().where(
                         deployment_table.c.uuid == deployment))
+
+    def _pre_upgrade_d27e2d93c44b(self, engine):
+        self._d27e2d93c44b_chunks = {
+            "d27e2d93c44b-json": {"raw": [
+                {"duration": 1.5, "timestamp": 1.0, "idle_duration": 0.0,
+                 "error": [], "output": {"additive": [], "complete": []},
+                 "atomic_actions": [{"name": "foo", "children": [],
+                                     "started_at": 1.0,
+                                     "finished_at": 2.0}]},
+                {"duration": 3.0, "timestamp": 3.0, "idle_duration": 0.5,
+                 "error": ["KeyError", "msg", "trace"],
+                 "output": {"additive": [], "complete": []},
+                 "atomic_actions": {"foo": 2.0}}]},
+            "d27e2d93c44b-empty": {"raw": []}
+        }
+
+        workloaddata_table = db_utils.get_table(engine, "workloaddata")
+        with engine.connect() as conn:
+            for chunk_uuid, chunk in self._d27e2d93c44b_chunks.items():
+                conn.execute(
+                    workloaddata_table.insert(),
+                    [{"uuid": chunk_uuid,
+                      "task_uuid": "d27e2d93c44b-task",
+                      "workload_uuid": "d27e2d93c44b-workload",
+                      "chunk_order": 0,
+                      "iteration_count": len(chunk["raw"]),
+                      "failed_iteration_count": 0,
+                      "chunk_size": 0,
+                      "compressed_chunk_size": 0,
+                      "started_at": timeutils.utcnow(),
+                      "finished_at": timeutils.utcnow(),
+                      "chunk_data": json.dumps(chunk)}])
+
+    def _check_d27e2d93c44b(self, engine, data):
+        self.assertEqual("d27e2d93c44b",
+                         api.get_backend().schema_revision(engine=engine))
+
+        chunk_type = sa_types.CompressedChunkData()
+        workloaddata_table = db_utils.get_table(engine, "workloaddata")
+        with engine.connect() as conn:
+            for chunk_uuid, chunk in self._d27e2d93c44b_chunks.items():
+                chunk_obj = conn.execute(
+                    workloaddata_table.select().where(
+                        workloaddata_table.c.uuid == chunk_uuid)).fetchone()
+
+                self.assertTrue(chunk_obj.chunk_data.startswith(
+                    sa_types.CHUNK_PREFIX))
+                self.assertEqual(
+                    chunk,
+                    chunk_type.process_result_value(chunk_obj.chunk_data,
+                                                    None))
+                self.assertLess(0, chunk_obj.compressed_chunk_size)
+                self.assertLess(0, chunk_obj.chunk_size)
+
+                conn.execute(
+                    workloaddata_table.delete().where(
+                        workloaddata_table.c.uuid == chunk_uuid))
+
+    def _check_7287df262dbc(self, engine, data):
+        self.assertEqual("7287df262dbc",
+                         api.get_backend().schema_revision(engine=engine))
+
+        inspector = sa.inspect(engine)
+        expected = {
+            "subtasks": {"subtask_task_uuid": ["task_uuid"]},
+            "workloads": {"workload_task_uuid": ["task_uuid"]},
+            "workloaddata": {
+                "workload_data_workload_uuid": ["workload_uuid",
+                                                "chunk_order"],
+                "workload_data_task_uuid": ["task_uuid"]},
+            "tags": {"tag_type_uuid": ["type", "uuid"]}}
+        for table, indexes in expected.items():
+            existing = dict((index["name"], index["column_names"])
+                            for index in inspector.get_indexes(table))
+            for name, columns in indexes.items():
+                self.assertEqual(columns, existing.get(name))
+
+    def _pre_upgrade_c517b0011857(self, engine):
+        self._c517b0011857_deployment_uuid = "c517b0011857-deployment"
+        self._c517b0011857_verifier_uuid = "c517b0011857-verifier"
+        self._c517b0011857_verifications = {
+            "c517b0011857-verification-1": {
+                "test_2": {"name": "test_2", "status": "fail",
+                           "duration": "1.500", "tags": ["smoke"],
+                           "traceback": "Trace"},
+                "test_1": {"name": "test_1", "status": "success",
+                           "duration": "0.100"}},
+            "c517b0011857-verification-2": {}
+        }
+
+        deployment_table = db_utils.get_table(engine, "deployments")
+        verifiers_table = db_utils.get_table(engine, "verifiers")
+        verifications_table = db_utils.get_table(engine, "verifications")
+
+        with engine.connect() as conn:
+            conn.execute(
+                deployment_table.insert(),
+                [{"uuid": self._c517b0011857_deployment_uuid,
+                  "name": self._c517b0011857_deployment_uuid,
+                  "config": json.dumps({}),
+                  "enum_deployments_status":
+                      consts.DeployStatus.DEPLOY_FINISHED,
+                  "credentials": json.dumps({})}])
+            conn.execute(
+                verifiers_table.insert(),
+                [{"uuid": self._c517b0011857_verifier_uuid,
+                  "name": self._c517b0011857_verifier_uuid,
+                  "type": "some-type",
+                  "status": consts.VerifierStatus.INSTALLED}])
+            for v_uuid, tests in self._c517b0011857_verifications.items():
+                conn.execute(
+                    verifications_table.insert(),
+                    [{"uuid": v_uuid,
+                      "deployment_uuid": self._c517b0011857_deployment_uuid,
+                      "verifier_uuid": self._c517b0011857_verifier_uuid,
+                      "status": consts.VerificationStatus.FINISHED,
+                      "tests": json.dumps(tests)}])
+
+    def _check_c517b0011857(self, engine, data):
+        self.assertEqual("c517b0011857",
+                         api.get_backend().schema_revision(engine=engine))
+
+        verifications_table = db_utils.get_table(engine, "verifications")
+        tests_table = db_utils.get_table(engine, "verification_tests")
+        self.assertNotIn("tests", verifications_table.c)
+
+        with engine.connect() as conn:
+            rows = conn.execute(tests_table.select().order_by(
+                tests_table.c.test_id)).fetchall()
+            self.assertEqual(
+                [("c517b0011857-verification-1", "test_1", "success", 0.1,
+                  [], {"name": "test_1", "duration": "0.100"}),
+                 ("c517b0011857-verification-1", "test_2", "fail", 1.5,
+                  ["smoke"], {"name": "test_2", "duration": "1.500",
+                              "traceback": "Trace"})],
+                [(r.verification_uuid, r.test_id, r.status, r.duration,
+                  json.loads(r.tags), json.loads(r.details))
+                 for r in rows])
+
+            conn.execute(tests_table.delete())
+            for v_uuid in self._c517b0011857_verifications:
+                conn.execute(
+                    verifications_table.delete().where(
+                        verifications_table.c.uuid == v_uuid))
+            verifiers_table = db_utils.get_table(engine, "verifiers")
+            conn.execute(
+                verifiers_table.delete().where(
+                    verifiers_table.c.uuid ==
+                    self._c517b0011857_verifier_uuid))
+            deployment_table = db_utils.get_table(engine, "deployments")
+            conn.execute(
+                deployment_table.delete().where(
+                    deployment_table.c.uuid ==
+                    self._c517b0011857_deployment_uuid))
@@ -14,6 +14,9 @@
 
 """Tests for custom sqlalchemy types"""
 
+import collections
+import json
+
 import mock
 import sqlalchemy as sa
 import testtools
@@ -53,6 +56,93 @@ class JsonEncodedTest(testtools.TestCase):
         self.assertIsNone(t.process_result_value(None, None))
 
 
+class CompressedChunkDataTest(testtools.TestCase):
+    def setUp(self):
+        super(CompressedChunkDataTest, self).setUp()
+        self.chunk = {"raw": [
+            {"duration": 1.5, "timestamp": 1.0, "idle_duration": 0.0,
+             "error": [], "output": {"additive": [], "complete": []},
+             "atomic_actions": [
+                 {"name": "foo", "started_at": 1.0, "finished_at": 2.0,
+                  "children": [{"name": "bar", "started_at": 1.5,
+                                "finished_at": 1.7, "children": []}]},
+                 {"name": "bar", "started_at": 2.0, "finished_at": 2.5,
+                  "children": [], "failed": True}]},
+            {"duration": 3.0, "timestamp": 3.0, "idle_duration": 0.5,
+             "error": ["KeyError", "msg", "trace"],
+             "output": {"additive": [], "complete": []},
+             "atomic_actions": []}]}
+
+    def test_impl(self):
+        self.assertEqual(sa.Text, types.CompressedChunkData.impl)
+
+    def test_process_bind_param(self):
+        t = types.CompressedChunkData()
+        value = t.process_bind_param(self.chunk, None)
+        self.assertTrue(value.startswith(types.CHUNK_PREFIX))
+        self.assertEqual(self.chunk, t.process_result_value(value, None))
+
+    def test_process_bind_param_chunk_data(self):
+        t = types.CompressedChunkData()
+        chunk = types.ChunkData(self.chunk)
+        self.assertEqual(chunk.encoded, t.process_bind_param(chunk, None))
+        self.assertLess(chunk.compressed_size, chunk.size)
+
+    def test_process_bind_param_none(self):
+        t = types.CompressedChunkData()
+        self.assertIsNone(t.process_bind_param(None, None))
+
+    def test_process_result_value_irregular(self):
+        t = types.CompressedChunkData()
+        for chunk in ({},
+                      {"raw": []},
+                      {"raw": [{"duration": 1, "error": "anError"},
+                               {"timestamp": 1}]},
+                      {"raw": [{"duration": 1.0, "atomic_actions": {"a": 1}}],
+                       "foo": "bar"}):
+            value = t.process_bind_param(chunk, None)
+            self.assertEqual(chunk, t.process_result_value(value, None))
+
+    def test_process_result_value_types_and_order(self):
+        t = types.CompressedChunkData()
+        chunk = collections.OrderedDict([
+            ("raw", [
+                collections.OrderedDict([
+                    ("timestamp", 5), ("duration", 1), ("error", []),
+                    ("idle_duration", 0.5), ("output", {"complete": []}),
+                    ("atomic_actions", [collections.OrderedDict([
+                        ("started_at", 5), ("name", "foo"),
+                        ("children", []), ("failed", True),
+                        ("finished_at", 6.5)])])]),
+                collections.OrderedDict([
+                    ("atomic_actions", []), ("output", {"complete": []}),
+                    ("error", ["KeyError", "msg", "trace"]),
+                    ("idle_duration", 1), ("duration", 2),
+                    ("timestamp", 7)])]),
+            ("foo", "bar"), ("data", {"b": 1, "a": 2.0})])
+
+        result = t.process_result_value(t.process_bind_param(chunk, None),
+                                        None)
+
+        self.assertEqual(chunk, result)
+        # json keeps the order of keys and distinguishes 1 from 1.0
+        self.assertEqual(json.dumps(chunk), json.dumps(result))
+        it = result["raw"][0]
+        self.assertIsInstance(it["duration"], int)
+        self.assertIsInstance(it["idle_duration"], float)
+        self.assertIsInstance(it["atomic_actions"][0]["started_at"], int)
+        self.assertIsInstance(it["atomic_actions"][0]["finished_at"], float)
+
+    def test_process_result_value_json(self):
+        t = types.CompressedChunkData()
+        self.assertEqual(self.chunk, t.process_result_value(
+            json.dumps(self.chunk), None))
+
+    def test_process_result_value_none(self):
+        t = types.CompressedChunkData()
+        self.assertIsNone(t.process_result_value(None, None))
+
+
 class MutableDictTest(testtools.TestCase):
     def test_creation(self):
         sample = {"a": 1, "b": 2}
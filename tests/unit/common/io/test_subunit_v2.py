@@ -11,6 +11,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime as dt
 import os
 
 import mock
@@ -145,3 +146,75 @@ RuntimeError: broken setUp method
         self.assertEqual("skip", tests[test_id]["status"])
         self.assertEqual("Some details why this test skipped",
                          tests[test_id]["reason"])
+
+    def test_parse_file_with_on_test_finished(self):
+        test_id = "test_foo.SimpleTestCase.test_to_skip"
+        skipped_tests = {test_id: "Some details why this test skipped"}
+        finished = {}
+
+        def on_test_finished(t_id, result):
+            self.assertNotIn(t_id, finished)
+            finished[t_id] = result
+
+        result = subunit_v2.parse_file(
+            self.fake_stream, skipped_tests=skipped_tests,
+            on_test_finished=on_test_finished)
+
+        self.assertEqual(result.tests, finished)
+
+    def test_status_of_test_class(self):
+        results = subunit_v2.SubunitV2StreamResult()
+        ts = dt.datetime(2017, 1, 1)
+        for test_id in ("pkg.TestCase.test_1", "pkg.TestCase.test_2[id-1]",
+                        "pkg.TestCaseOther.test_1", "pkg.Test.test_1"):
+            results.status(test_id=test_id, test_status="exists")
+        results.status(test_id="pkg.Test.test_1", test_status="inprogress",
+                       timestamp=ts)
+        results.status(test_id="pkg.Test.test_1", test_status="success",
+                       timestamp=ts)
+        for chunk in (b"Trace", b"back"):
+            results.status(test_id="setUpClass (pkg.TestCase)",
+                           file_name="traceback", file_bytes=chunk,
+                           mime_type="text/plain; charset=utf8",
+                           timestamp=ts)
+        results.status(test_id="setUpClass (pkg.TestCase)",
+                       test_status="fail", timestamp=ts)
+
+        tests = results.tests
+        self.assertEqual("fail", tests["pkg.TestCase.test_1"]["status"])
+        self.assertEqual("Traceback",
+                         tests["pkg.TestCase.test_1"]["traceback"])
+        self.assertEqual("fail", tests["pkg.TestCase.test_2[id-1]"]["status"])
+        self.assertEqual("init", tests["pkg.TestCaseOther.test_1"]["status"])
+        self.assertNotIn("traceback", tests["pkg.TestCaseOther.test_1"])
+        self.assertEqual("success", tests["pkg.Test.test_1"]["status"])
+        self.assertEqual({"tests_count": 4, "tests_duration": "0.000",
+                          "failures": 2, "skipped": 0, "success": 1,
+                          "unexpected_success": 0, "expected_failures": 0},
+                         results.totals)
+
+    def test_status_with_chunked_traceback(self):
+        results = subunit_v2.SubunitV2StreamResult(
+            expected_failures={"pkg.TestCase.test_2": None})
+        ts = dt.datetime(2017, 1, 1)
+        for test_id in ("pkg.TestCase.test_1", "pkg.TestCase.test_2"):
+            results.status(test_id=test_id, test_status="exists")
+            results.status(test_id=test_id, test_status="inprogress",
+                           timestamp=ts)
+            for i in range(3):
+                results.status(test_id=test_id, file_name="traceback",
+                               file_bytes=b"line %d\n" % i,
+                               mime_type="text/plain; charset=utf8",
+                               timestamp=ts)
+            results.status(test_id=test_id, test_status="fail",
+                           timestamp=ts + dt.timedelta(seconds=2))
+
+        self.assertEqual({"status": "fail", "name": "pkg.TestCase.test_1",
+                          "duration": "2.000", "tags": [],
+                          "timestamp": "2017-01-01T00:00:00",
+                          "traceback": "line 0\nline 1\nline 2\n"},
+                         results.tests["pkg.TestCase.test_1"])
+        self.assertEqual("xfail",
+                         results.tests["pkg.TestCase.test_2"]["status"])
+        self.assertEqual(1, results.totals["failures"])
+        self.assertEqual(1, results.totals["expected_failures"])
@@ -16,12 +16,15 @@
 """Tests for db.task layer."""
 
 import datetime as dt
+import json
 
 import ddt
 import jsonschema
 import mock
 
 from rally.common import objects
+from rally.common import streaming_algorithms as streaming
+from rally.common import utils
 from rally import consts
 from rally import exceptions
 from tests.unit import test
@@ -111,12 +114,13 @@ class TaskTestCase(test.TestCase):
                                "status": consts.TaskStatus.CRASHED,
                                "tag": "d",
                                "deployment_name": "some_name"}])
-    def list(self, mock_db_task_list):
-        tasks = objects.Task.list(status="somestatus")
-        mock_db_task_list.assert_called_once_with("somestatus", None)
+    def test_list(self, mock_db_task_list):
+        tasks = objects.Task.list(status="somestatus", limit=10)
+        mock_db_task_list.assert_called_once_with(
+            "somestatus", None, limit=10, offset=None, since=None)
         self.assertIs(type(tasks), list)
         self.assertIsInstance(tasks[0], objects.Task)
-        self.assertEqual(mock_db_task_list.return_value["uuis"],
+        self.assertEqual(mock_db_task_list.return_value[0]["uuid"],
                          tasks[0]["uuid"])
 
     @mock.patch("rally.common.objects.deploy.db.task_update")
@@ -206,7 +210,8 @@ class TaskTestCase(test.TestCase):
                  "iterations_count": 10, "iterations_failed": 0,
                  "max_duration": 14, "min_duration": 5, "tstamp_start": 2,
                  "full_duration": 40, "load_duration": 32,
-                 "stat": "durations_stat"}}]
+                 "stat": "durations_stat", "durations": mock.ANY,
+                 "errors": [], "output": []}}]
 
         # serializable is default
         results = objects.Task.extend_results(obsolete)
@@ -232,16 +237,35 @@ class TaskTestCase(test.TestCase):
         results[0]["iterations"] = "foo_iterations"
         self.assertEqual(results, expected)
 
+    def test_extend_results_lazy(self):
+        chunks = [[{"timestamp": ts, "duration": 1, "error": [],
+                    "idle_duration": 0, "atomic_actions": []}
+                   for ts in timestamps] for timestamps in ((2, 4), (1, 3))]
+        load_chunks = mock.Mock(side_effect=lambda: iter(chunks))
+        raw = utils.LazyChunkedList(load_chunks)
+        result = {"task_uuid": "foo_uuid", "created_at": None,
+                  "updated_at": None, "id": 11,
+                  "key": {"kw": {}, "name": "Foo.bar", "pos": 0},
+                  "data": {"raw": raw, "sla": [], "hooks": [],
+                           "full_duration": 40, "load_duration": 32}}
+
+        extended = objects.Task.extend_results([result], serializable=True)
+
+        self.assertEqual(4, extended[0]["info"]["iterations_count"])
+        self.assertEqual(1, load_chunks.call_count)
+        iterations = list(extended[0]["iterations"])
+        self.assertEqual([1, 2, 3, 4], [i["timestamp"] for i in iterations])
+        self.assertEqual([{"additive": [], "complete": []}] * 4,
+                         [i["output"] for i in iterations])
+
     @mock.patch("rally.common.objects.task.db.deployment_get")
     @mock.patch("rally.common.objects.task.Task.get_results")
     def test_to_dict(self, mock_get_results, mock_deployment_get):
         results = [{"created_at": dt.datetime.now(),
                     "updated_at": dt.datetime.now()}]
         self.task.update({"deployment_uuid": "deployment_uuid",
-                          "deployment_name": "deployment_name",
                           "created_at": dt.datetime.now(),
-                          "updated_at": dt.datetime.now(),
-                          "results": results})
+                          "updated_at": dt.datetime.now()})
 
         mock_get_results.return_value = results
         mock_deployment_get.return_value = {"name": "deployment_name"}
@@ -250,10 +274,34 @@ class TaskTestCase(test.TestCase):
         serialized_task = task.to_dict()
 
         mock_get_results.assert_called_once_with()
-        mock_deployment_get.assert_called_once_with(
-            self.task["deployment_uuid"])
+        mock_deployment_get.assert_called_once_with("deployment_uuid")
+        self.assertEqual("deployment_name",
+                         serialized_task["deployment_name"])
+        self.assertEqual(results, serialized_task["results"])
         self.assertEqual(self.task, serialized_task)
 
+    @mock.patch("rally.common.objects.task.db.deployment_get")
+    @mock.patch("rally.common.objects.task.Task.get_results")
+    def test_to_dict_without_results(self, mock_get_results,
+                                     mock_deployment_get):
+        created_at = dt.datetime(2017, 1, 31, 18, 0, 0)
+        self.task.update({"deployment_uuid": "deployment_uuid",
+                          "deployment_name": "deployment_name",
+                          "created_at": created_at,
+                          "updated_at": created_at + dt.timedelta(
+                              seconds=5)})
+
+        task = objects.Task(task=self.task)
+        serialized_task = task.to_dict(include_results=False)
+
+        self.assertFalse(mock_get_results.called)
+        self.assertFalse(mock_deployment_get.called)
+        self.assertNotIn("results", serialized_task)
+        self.assertEqual("deployment_name",
+                         serialized_task["deployment_name"])
+        self.assertEqual(dt.timedelta(seconds=5),
+                         serialized_task["duration"])
+
     @mock.patch("rally.common.db.api.task_get_detailed")
     def test_get_detailed(self, mock_task_get_detailed):
         task = objects.Task(task=self.task)
@@ -262,7 +310,9 @@ class TaskTestCase(test.TestCase):
             "updated_at": dt.datetime.now()}]}
 
         task_detailed = task.get_detailed(task_id="task_id")
-        mock_task_get_detailed.assert_called_once_with("task_id")
+        mock_task_get_detailed.assert_called_once_with("task_id",
+                                                       include_data=True,
+                                                       lazy=False)
         self.assertEqual(mock_task_get_detailed.return_value, task_detailed)
 
     @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid",
@@ -427,3 +477,101 @@ class WorkloadTestCase(test.TestCase):
         workload = workload.set_results({"data": "foo"})
         mock_workload_set_results.assert_called_once_with(
             self.workload["uuid"], {"data": "foo"})
+
+
+class WorkloadStatisticsTestCase(test.TestCase):
+
+    def test_to_dict_empty(self):
+        statistics = objects.WorkloadStatistics().to_dict()
+        self.assertEqual(0, statistics["iterations_count"])
+        self.assertEqual(0, statistics["iterations_failed"])
+        self.assertEqual(0, statistics["min_duration"])
+        self.assertEqual(0, statistics["max_duration"])
+        self.assertEqual(0, statistics["tstamp_start"])
+        self.assertEqual({}, statistics["atomic"])
+        self.assertEqual(["total"], list(statistics["durations"]))
+        self.assertEqual([], statistics["errors"])
+        self.assertEqual([], statistics["output"])
+
+    def test_add_iteration(self):
+        statistics = objects.WorkloadStatistics()
+        iterations = [
+            {"timestamp": 3, "duration": 0, "error": [],
+             "atomic_actions": [
+                 {"name": "foo", "started_at": 0, "finished_at": 1}]},
+            {"timestamp": 1, "duration": 5, "error": [],
+             "atomic_actions": [
+                 {"name": "foo", "started_at": 0, "finished_at": 1},
+                 {"name": "bar", "started_at": 1, "finished_at": 3},
+                 {"name": "foo", "started_at": 3, "finished_at": 6}]},
+            {"timestamp": 2, "duration": 7, "error": ["Error"],
+             "atomic_actions": [
+                 {"name": "foo", "started_at": 0, "finished_at": 2},
+                 {"name": "foo", "started_at": 2, "finished_at": 5}]}]
+        for iteration in iterations:
+            statistics.add_iteration(iteration)
+
+        result = statistics.to_dict()
+        self.assertEqual(3, result["iterations_count"])
+        self.assertEqual(1, result["iterations_failed"])
+        self.assertEqual(0, result["min_duration"])
+        self.assertEqual(5, result["max_duration"])
+        self.assertEqual(1, result["tstamp_start"])
+        self.assertEqual(
+            {"foo": {"min_duration": 4, "max_duration": 5, "count": 2},
+             "bar": {"min_duration": 2, "max_duration": 2, "count": 1}},
+            result["atomic"])
+        self.assertEqual(["foo (x2)", "bar", "total"],
+                         [row[0] for row in result["stat"]["rows"]])
+        self.assertEqual([["Error"]], result["errors"])
+
+        # durations of successful iterations with the biggest number of
+        # calls of atomic actions are saved, as in the table
+        durations = json.loads(json.dumps(result["durations"]))
+        self.assertEqual(["foo", "bar", "total"], list(durations))
+        self.assertEqual({"count": 1, "total": 4.0},
+                         durations["foo"]["mean"])
+        self.assertEqual(2, durations["foo"]["count"])
+        self.assertEqual([0, 5], durations["total"]["percentile"]["values"])
+        median = streaming.PercentileComputation.from_dict(
+            durations["total"]["percentile"])
+        self.assertEqual(2.5, median.result())
+        mean = streaming.MeanComputation.from_dict(
+            durations["total"]["mean"])
+        self.assertEqual(2.5, mean.result())
+        for name, row in zip(["foo", "bar", "total"],
+                             result["stat"]["rows"]):
+            percentile = streaming.PercentileComputation.from_dict(
+                durations[name]["percentile"], percent=0.9)
+            self.assertEqual(row[3], round(percentile.result(), 3))
+
+    def test_add_iteration_output(self):
+        statistics = objects.WorkloadStatistics()
+        for i in range(3):
+            statistics.add_iteration(
+                {"timestamp": i, "duration": 1, "error": [],
+                 "atomic_actions": [],
+                 "output": {"additive": [{"title": "Foo", "description": "",
+                                          "chart_plugin": "StatsTable",
+                                          "data": [["bar", i]]}],
+                            "complete": []}})
+
+        output = statistics.to_dict()["output"]
+        self.assertEqual(1, len(output))
+        self.assertEqual("Foo", output[0]["title"])
+        self.assertEqual([["bar", 0, 1.0, 1.8, 1.9, 2, 1.0, 3]],
+                         output[0]["data"]["rows"])
+
+    def test_max_errors(self):
+        statistics = objects.WorkloadStatistics()
+        statistics.max_errors = 2
+        for i in (2, 1, 0):
+            statistics.add_iteration({"timestamp": i, "duration": 1,
+                                      "atomic_actions": [],
+                                      "error": ["KeyError", str(i), ""]})
+
+        result = statistics.to_dict()
+        self.assertEqual(3, result["iterations_failed"])
+        # errors are sorted by timestamps of iterations
+        self.assertEqual([["KeyError", "1", ""], ["KeyError", "2", ""]],
+                         result["errors"])
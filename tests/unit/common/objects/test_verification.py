@@ -56,12 +56,66 @@ class VerificationTestCase(test.TestCase):
                 "expected_failures": 2,
                 "tests_count": 3,
                 "failures": 2}
+        tests = data.pop("tests")
         verification = objects.Verification("verification_id")
         verification._db_entry = data
+        verification._tests = tests
         result = objects.Verification.to_dict(verification)
+        result_without_tests = verification.to_dict(include_tests=False)
         data["created_at"] = data["created_at"].strftime(TIME_FORMAT)
         data["updated_at"] = data["updated_at"].strftime(TIME_FORMAT)
-        self.assertEqual(data, result)
+        self.assertEqual(dict(data, tests=tests), result)
+        self.assertEqual(data, result_without_tests)
+
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_tests_get")
+    def test_tests(self, mock_verification_tests_get):
+        mock_verification_tests_get.return_value = {
+            "uuid-1": {"test": {"status": "success"}}}
+        v = objects.Verification(self.db_obj)
+
+        self.assertEqual({"test": {"status": "success"}}, v.tests)
+        self.assertEqual({"test": {"status": "success"}}, v.tests)
+        mock_verification_tests_get.assert_called_once_with(
+            ["uuid-1"], status=None, min_duration=None)
+
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_tests_get")
+    def test_get_tests(self, mock_verification_tests_get):
+        mock_verification_tests_get.return_value = {"uuid-1": {}}
+        v = objects.Verification(self.db_obj)
+
+        self.assertEqual({}, v.get_tests(status="fail", min_duration=1.5))
+        mock_verification_tests_get.assert_called_once_with(
+            ["uuid-1"], status="fail", min_duration=1.5)
+
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_tests_compare")
+    def test_compare_tests(self, mock_verification_tests_compare):
+        vs = [objects.Verification({"uuid": "uuid-1"}),
+              objects.Verification({"uuid": "uuid-2"})]
+
+        self.assertEqual(mock_verification_tests_compare.return_value,
+                         objects.Verification.compare_tests(vs))
+        mock_verification_tests_compare.assert_called_once_with(
+            ["uuid-1", "uuid-2"])
+
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_tests_add")
+    def test_add_test(self, mock_verification_tests_add):
+        v = objects.Verification(self.db_obj)
+        v.TESTS_BATCH_SIZE = 2
+
+        v.add_test("test_1", {"status": "success"})
+        self.assertFalse(mock_verification_tests_add.called)
+        v.add_test("test_2", {"status": "fail"})
+        mock_verification_tests_add.assert_called_once_with(
+            "uuid-1", {"test_1": {"status": "success"},
+                       "test_2": {"status": "fail"}})
+
+        mock_verification_tests_add.reset_mock()
+        v.add_test("test_3", {"status": "skip"})
+        self.assertFalse(mock_verification_tests_add.called)
 
     @mock.patch("rally.common.objects.verification.db.verification_create")
     def test_create(self, mock_verification_create):
@@ -95,8 +149,11 @@ class VerificationTestCase(test.TestCase):
         mock_verification_update.assert_called_once_with(self.db_obj["uuid"],
                                                          status="some-status")
 
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_tests_add")
     @mock.patch("rally.common.objects.verification.db.verification_update")
-    def test_finish(self, mock_verification_update):
+    def test_finish(self, mock_verification_update,
+                    mock_verification_tests_add):
         v = objects.Verification(self.db_obj)
         totals = {
             "tests_count": 2,
@@ -124,7 +181,10 @@ class VerificationTestCase(test.TestCase):
         v.finish(totals, tests)
         mock_verification_update.assert_called_once_with(
             self.db_obj["uuid"], status=consts.VerificationStatus.FINISHED,
-            tests=tests, **totals)
+            **totals)
+        mock_verification_tests_add.assert_called_once_with(
+            self.db_obj["uuid"], tests)
+        self.assertEqual(tests, v.tests)
 
         v = objects.Verification(self.db_obj)
         totals.update(failures=1)
@@ -132,7 +192,7 @@ class VerificationTestCase(test.TestCase):
         v.finish(totals, tests)
         mock_verification_update.assert_called_once_with(
             self.db_obj["uuid"], status=consts.VerificationStatus.FAILED,
-            tests=tests, **totals)
+            **totals)
 
         v = objects.Verification(self.db_obj)
         totals.update(failures=0, unexpected_success=1)
@@ -140,7 +200,49 @@ class VerificationTestCase(test.TestCase):
         v.finish(totals, tests)
         mock_verification_update.assert_called_once_with(
             self.db_obj["uuid"], status=consts.VerificationStatus.FAILED,
-            tests=tests, **totals)
+            **totals)
+
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_tests_add")
+    @mock.patch("rally.common.objects.verification.db.verification_update")
+    def test_finish_after_add_test(self, mock_verification_update,
+                                   mock_verification_tests_add):
+        v = objects.Verification(self.db_obj)
+        v.TESTS_BATCH_SIZE = 2
+        v.add_test("test_1", {"status": "success"})
+        v.add_test("test_2", {"status": "init"})
+        v.add_test("test_3", {"status": "success"})
+        mock_verification_tests_add.reset_mock()
+
+        tests = {"test_1": {"status": "success"},
+                 "test_2": {"status": "fail"},
+                 "test_3": {"status": "success"},
+                 "test_4": {"status": "skip"}}
+        v.finish({"failures": 1}, tests)
+
+        # only changed and not stored tests are saved
+        mock_verification_tests_add.assert_called_once_with(
+            self.db_obj["uuid"], {"test_2": {"status": "fail"},
+                                  "test_3": {"status": "success"},
+                                  "test_4": {"status": "skip"}})
+        mock_verification_update.assert_called_once_with(
+            self.db_obj["uuid"], status=consts.VerificationStatus.FAILED,
+            failures=1)
+
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_tests_add")
+    @mock.patch("rally.common.objects.verification.db.verification_update")
+    def test_set_error_stores_tests(self, mock_verification_update,
+                                    mock_verification_tests_add):
+        v = objects.Verification(self.db_obj)
+        v.add_test("test_1", {"status": "success"})
+
+        v.set_error("Some error")
+
+        mock_verification_tests_add.assert_called_once_with(
+            self.db_obj["uuid"], {"test_1": {"status": "success"}})
+        mock_verification_update.assert_called_once_with(
+            self.db_obj["uuid"], status=consts.VerificationStatus.CRASHED)
 
     @mock.patch("rally.common.objects.verification.db.verification_update")
     def test_set_error(self, mock_verification_update):
@@ -189,3 +189,132 @@ class LoadExtraModulesTestCase(test.TestCase):
                          mock_walk_packages.call_args_list)
         self.assertEqual([mock.call(n[0][1]) for n in packages],
                          mock_importlib.import_module.call_args_list)
+
+    @mock.patch("%s.os.walk" % DISCOVER)
+    def test_find_modules_from_package(self, mock_walk):
+        path = discover.os.path.join(
+            discover.os.path.dirname(discover.rally.__file__), "..",
+            "rally", "foo")
+        mock_walk.return_value = [
+            (path, ["bar"], ["__init__.py", "a.py", "b.pyc"]),
+            (discover.os.path.join(path, "bar"), [], ["c.py"])]
+
+        self.assertEqual(
+            [("rally.foo.a", discover.os.path.join(path, "a.py")),
+             ("rally.foo.bar.c",
+              discover.os.path.join(path, "bar", "c.py"))],
+            discover.find_modules_from_package("rally.foo"))
+        mock_walk.assert_called_once_with(path)
+
+    @mock.patch("%s.importutils.import_module" % DISCOVER)
+    @mock.patch("%s.find_modules_from_package" % DISCOVER)
+    def test_import_modules_from_package(self, mock_find_modules_from_package,
+                                         mock_import_module):
+        name = str(uuid.uuid4())
+        mock_find_modules_from_package.return_value = [
+            (name, "/foo.py"), (__name__, "/bar.py")]
+
+        try:
+            discover.import_modules_from_package("rally.foo")
+            self.assertEqual(mock_import_module.return_value,
+                             discover.sys.modules[name])
+        finally:
+            discover.sys.modules.pop(name, None)
+        mock_import_module.assert_called_once_with(name)
+
+    @mock.patch("%s.pkgutil.walk_packages" % DISCOVER)
+    @mock.patch("%s.pkg_resources" % DISCOVER)
+    def test_find_modules_by_entry_point(self, mock_pkg_resources,
+                                         mock_walk_packages):
+        package = mock.Mock(__path__=["/foo"], __name__="foo")
+        entry_points = [mock.Mock(), mock.Mock()]
+        entry_points[0].name = "path"
+        entry_points[0].load.return_value = package
+        entry_points[1].name = "path"
+        entry_points[1].load.side_effect = ImportError()
+        mock_pkg_resources.iter_entry_points.return_value = entry_points
+        loader = mock.Mock(path="/foo")
+        mock_walk_packages.return_value = [(loader, "foo.bar", True),
+                                           (loader, "foo.baz", False)]
+
+        self.assertEqual(
+            [("foo.bar", discover.os.path.join("/foo", "bar", "__init__.py")),
+             ("foo.baz", discover.os.path.join("/foo", "baz.py"))],
+            discover.find_modules_by_entry_point())
+        mock_walk_packages.assert_called_once_with(["/foo"], prefix="foo.")
+
+
+class LazyModulesTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LazyModulesTestCase, self).setUp()
+        lazy_plugins = mock.patch.dict("%s._LAZY_PLUGINS" % DISCOVER,
+                                       clear=True)
+        lazy_plugins.start()
+        self.addCleanup(lazy_plugins.stop)
+        lazy_modules = mock.patch("%s._LAZY_MODULES" % DISCOVER, [])
+        lazy_modules.start()
+        self.addCleanup(lazy_modules.stop)
+        self.modules = dict(("module%s" % i, str(uuid.uuid4()))
+                            for i in range(4))
+        plugins = [("foo", "a", "module0"), ("foo", "b", "module1"),
+                   ("bar", "a", "module2")]
+        discover.import_lazily([
+            {"name": name, "namespace": ns, "module": self.modules[module]}
+            for name, ns, module in plugins], [self.modules["module3"]])
+
+    def test_import_lazily(self):
+        self.assertEqual(
+            {"foo": [("a", self.modules["module0"]),
+                     ("b", self.modules["module1"])],
+             "bar": [("a", self.modules["module2"])]},
+            discover._LAZY_PLUGINS)
+        self.assertEqual([self.modules["module3"]], discover._LAZY_MODULES)
+
+    @mock.patch("%s.importutils.import_module" % DISCOVER)
+    def test_import_lazy_modules(self, mock_import_module):
+        discover.import_lazy_modules()
+
+        self.assertEqual(sorted(self.modules.values()),
+                         sorted(c[0][0] for c in
+                                mock_import_module.call_args_list))
+        self.assertEqual({}, discover._LAZY_PLUGINS)
+        self.assertEqual([], discover._LAZY_MODULES)
+
+        mock_import_module.reset_mock()
+        discover.import_lazy_modules()
+        self.assertFalse(mock_import_module.called)
+
+    @mock.patch("%s.importutils.import_module" % DISCOVER)
+    def test_import_lazy_modules_by_name(self, mock_import_module):
+        discover.import_lazy_modules("foo", "b")
+
+        mock_import_module.assert_called_once_with(self.modules["module1"])
+        self.assertEqual(
+            {"foo": [("a", self.modules["module0"])],
+             "bar": [("a", self.modules["module2"])]},
+            discover._LAZY_PLUGINS)
+
+        mock_import_module.reset_mock()
+        discover.import_lazy_modules("foo")
+
+        mock_import_module.assert_called_once_with(self.modules["module0"])
+        self.assertEqual({"bar": [("a", self.modules["module2"])]},
+                         discover._LAZY_PLUGINS)
+
+        mock_import_module.reset_mock()
+        discover.import_lazy_modules("unknown")
+        self.assertFalse(mock_import_module.called)
+        self.assertEqual([self.modules["module3"]], discover._LAZY_MODULES)
+
+    @mock.patch("%s.import_lazy_modules" % DISCOVER)
+    def test_itersubclasses_imports_lazy_modules(self,
+                                                 mock_import_lazy_modules):
+        class A(object):
+            pass
+
+        class B(A):
+            pass
+
+        self.assertEqual([B], list(discover.itersubclasses(A)))
+        mock_import_lazy_modules.assert_called_once_with()
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from rally.common.plugin import plugin
 from rally import exceptions
 from tests.unit import test
@@ -248,6 +250,26 @@ class PluginTestCase(test.TestCase):
         self.assertEqual(set([MyPluginInDefault, MyPluginInFoo]),
                          set(BasePlugin.get_all(name="test_my_plugin")))
 
+    @mock.patch("rally.common.plugin.plugin.discover.itersubclasses")
+    def test_get_all_by_name_uses_index(self, mock_itersubclasses):
+        self.assertEqual([SomePlugin],
+                         BasePlugin.get_all(name="test_some_plugin"))
+        self.assertEqual([], SomePlugin.get_all(name="test_some_plugin"))
+        self.assertEqual([], BasePlugin.get_all(name="test_base_plugin"))
+        self.assertFalse(mock_itersubclasses.called)
+
+    def test_get_all_by_name_reinited_plugin(self):
+
+        @plugin.configure(name="test_reinited_plugin")
+        class SomeTempPlugin(BasePlugin):
+            pass
+
+        SomeTempPlugin._meta_init()
+        self.assertEqual([],
+                         BasePlugin.get_all(name="test_reinited_plugin"))
+
+        SomeTempPlugin.unregister()
+
     def test_get_all_hidden(self):
         self.assertEqual(set([SomePlugin, DeprecatedPlugin, HiddenPlugin,
                               MyPluginInDefault, MyPluginInFoo]),
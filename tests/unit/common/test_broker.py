@@ -14,6 +14,7 @@
 #    under the License.
 
 import collections
+import threading
 
 import mock
 
@@ -58,6 +59,34 @@ class BrokerTestCase(test.TestCase):
         broker._consumer(mock_consume, queue)
         self.assertEqual(0, len(queue))
 
+    def test__consumer_stats(self):
+        queue = collections.deque([1, 2, 3])
+        stats = broker.Statistics()
+        consume = mock.Mock(side_effect=[None, Exception(), None])
+        broker._consumer(consume, queue, stats)
+        result = stats.to_dict(2)
+        self.assertEqual(3, result["jobs"])
+        self.assertEqual(1, result["failed"])
+        self.assertEqual(1.5, result["throughput"])
+        self.assertIsNone(result["queue_wait"])
+
+    def test__stream_consumer(self):
+        queue = broker.StreamingQueue()
+        queue.extend([1, 2, 3])
+        queue.close()
+        stats = broker.Statistics()
+        consumed = []
+
+        def consume(cache, item):
+            cache[item] = True
+            consumed.append((item, sorted(cache)))
+
+        broker._stream_consumer(consume, queue, stats)
+        self.assertEqual([(1, [1]), (2, [1, 2]), (3, [1, 2, 3])], consumed)
+        self.assertEqual(0, len(queue))
+        self.assertEqual(3, stats.jobs)
+        self.assertIsNotNone(stats.to_dict(1)["queue_wait"])
+
     @mock.patch("rally.common.broker.LOG")
     def test__consumer_indexerror(self, mock_log):
         consume = mock.Mock()
@@ -84,3 +113,100 @@ class BrokerTestCase(test.TestCase):
         consumer_count = 2
         broker.run(publish, consume, consumer_count)
         self.assertEqual(set([1, 2, 3]), consumed)
+
+    def test_run_streaming(self):
+        consumed = []
+        published = threading.Event()
+
+        def publish(queue):
+            queue.append(1)
+            # the item is consumed while publishing is still going
+            for i in range(100):
+                if consumed:
+                    break
+                published.wait(0.01)
+            queue.append(2)
+
+        def consume(cache, item):
+            consumed.append(item)
+
+        stats = broker.run(publish, consume, 2, streaming=True)
+        self.assertEqual([1, 2], consumed)
+        self.assertEqual(2, stats["jobs"])
+
+    def test_run_streaming_bounded_queue(self):
+        sizes = []
+
+        def publish(queue):
+            for i in range(20):
+                queue.append(i)
+                sizes.append(len(queue))
+
+        consumed = set()
+
+        def consume(cache, item):
+            consumed.add(item)
+
+        stats = broker.run(publish, consume, 2, streaming=True, queue_size=3)
+        self.assertEqual(set(range(20)), consumed)
+        self.assertLessEqual(max(sizes), 3)
+        self.assertEqual(20, stats["jobs"])
+        self.assertEqual(0, stats["failed"])
+        self.assertEqual(
+            set(["min", "median", "90%ile", "max", "avg"]),
+            set(stats["latency"]))
+
+    def test_run_streaming_publisher_fails(self):
+        def publish(queue):
+            queue.append(1)
+            raise Exception()
+
+        consume = mock.Mock()
+        stats = broker.run(publish, consume, 3, streaming=True)
+        consume.assert_called_once_with({}, 1)
+        self.assertEqual(1, stats["jobs"])
+
+
+class StreamingQueueTestCase(test.TestCase):
+
+    def test_append_and_popleft(self):
+        queue = broker.StreamingQueue()
+        queue.append(1)
+        queue.extend([2, 3])
+        self.assertEqual(3, len(queue))
+        self.assertEqual(1, queue.popleft())
+        item, timestamp = queue.popleft(with_timestamp=True)
+        self.assertEqual(2, item)
+        self.assertIsInstance(timestamp, float)
+        queue.close()
+        self.assertEqual(3, queue.popleft())
+        self.assertRaises(IndexError, queue.popleft)
+
+    def test_append_blocks_when_full(self):
+        queue = broker.StreamingQueue(maxsize=1)
+        queue.append(1)
+        publisher = threading.Thread(target=queue.append, args=(2,))
+        publisher.start()
+        publisher.join(0.05)
+        self.assertTrue(publisher.is_alive())
+        self.assertEqual(1, queue.popleft())
+        publisher.join()
+        self.assertEqual(2, queue.popleft())
+
+    def test_popleft_blocks_until_closed(self):
+        queue = broker.StreamingQueue()
+        consumed = []
+
+        def consume():
+            try:
+                consumed.append(queue.popleft())
+            except IndexError:
+                consumed.append(None)
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        consumer.join(0.05)
+        self.assertTrue(consumer.is_alive())
+        queue.close()
+        consumer.join()
+        self.assertEqual([None], consumed)
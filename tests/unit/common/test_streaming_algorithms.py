@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
 import math
 
 import ddt
@@ -62,6 +63,18 @@ class MeanComputationTestCase(test.TestCase):
         self.assertEqual(single_mean.total, merged_mean.total)
         self.assertEqual(single_mean.result(), merged_mean.result())
 
+    def test_to_dict_and_from_dict(self):
+        mean_computation = algo.MeanComputation()
+        for value in range(10):
+            mean_computation.add(value)
+
+        data = json.loads(json.dumps(mean_computation.to_dict()))
+        restored = algo.MeanComputation.from_dict(data)
+
+        self.assertEqual(mean_computation.result(), restored.result())
+        restored.add(10)
+        self.assertEqual(5, restored.result())
+
 
 class StdDevComputationTestCase(test.TestCase):
 
@@ -191,6 +204,41 @@ class MaxComputationTestCase(test.TestCase):
         self.assertEqual(single_max_algo.result(), merged_max_algo.result())
 
 
+@ddt.ddt
+class LogHistogramTestCase(test.TestCase):
+
+    def test_add_and_iter(self):
+        histogram = algo._LogHistogram(0.01)
+        for value in (-2.0, 3.0, 0, 1.0, 3.0, 0):
+            histogram.add(value)
+
+        items = list(histogram)
+        self.assertEqual([1, 2, 1, 2], [count for value, count in items])
+        for (value, count), expected in zip(items, (-2.0, 0, 1.0, 3.0)):
+            self.assertLessEqual(abs(value - expected), abs(expected) * 0.01)
+
+    def test_merge(self):
+        histogram = algo._LogHistogram(0.01, max_buckets=2)
+        other = algo._LogHistogram(0.01)
+        for value in (1.0, 2.0, 0):
+            histogram.add(value)
+        for value in (4.0, -1.0, 0):
+            other.add(value)
+
+        histogram.merge(other)
+
+        # buckets of 1.0 and 2.0 are collapsed
+        self.assertEqual([1, 2, 2, 1], [count for value, count in histogram])
+
+    @ddt.data((-1.5, 5), (-0.5, 4), (0, 2), (1.5, 1), (5, 0))
+    @ddt.unpack
+    def test_count_greater(self, threshold, expected):
+        histogram = algo._LogHistogram(0.01)
+        for value in (-1.0, 0, 0, 1.0, 2.0):
+            histogram.add(value)
+        self.assertEqual(expected, histogram.count_greater(threshold))
+
+
 @ddt.ddt
 class PercentileComputationTestCase(test.TestCase):
 
@@ -221,11 +269,13 @@ class PercentileComputationTestCase(test.TestCase):
         {"stream": "mixed50", "percent": 0.50, "expected": 51.89},
         {"stream": "mixed50", "percent": 0.90, "expected":
             82.81300000000002},
+        # exact values are 25.03, 51.89 and 82.813
         {"stream": "mixed5000", "percent": 0.25, "expected":
-            35.54600000000001},
-        {"stream": "mixed5000", "percent": 0.50, "expected": 48.351},
+            25.153935747254298},
+        {"stream": "mixed5000", "percent": 0.50, "expected":
+            51.67739104562815},
         {"stream": "mixed5000", "percent": 0.90, "expected":
-            66.05880000000437},
+            82.5429277870941},
         {"stream": "range5000", "percent": 0.25, "expected": 1249.75},
         {"stream": "range5000", "percent": 0.50, "expected": 2499.5},
         {"stream": "range5000", "percent": 0.90, "expected": 4499.1})
@@ -245,6 +295,107 @@ class PercentileComputationTestCase(test.TestCase):
         comp = algo.PercentileComputation(0.50, 100)
         self.assertIsNone(comp.result())
 
+    def _exact_percentile(self, values, percent):
+        comp = algo.PercentileComputation(percent, exact_size=len(values))
+        for value in values:
+            comp.add(value)
+        self.assertIsNotNone(comp._values)
+        return comp.result()
+
+    @ddt.data(0.01, 0.5, 0.9, 0.95, 0.999)
+    def test_result_of_histogram(self, percent):
+        values = [math.exp(i % 997 / 50.0) * (-1) ** (i % 3 == 0)
+                  for i in range(10000)] + [0] * 100
+        comp = algo.PercentileComputation(percent, exact_size=100)
+        for value in values:
+            comp.add(value)
+
+        self.assertIsNone(comp._values)
+        expected = self._exact_percentile(values, percent)
+        self.assertLessEqual(abs(comp.result() - expected),
+                             abs(expected) * 0.005)
+
+    def test_histogram_is_bounded(self):
+        comp = algo.PercentileComputation(0.5, exact_size=10,
+                                          max_buckets=100)
+        for i in range(1, 5000):
+            comp.add(1.1 ** (i % 1000))
+            comp.add(-1.1 ** (i % 1000))
+
+        self.assertEqual(100, len(comp._histogram.positive))
+        self.assertEqual(100, len(comp._histogram.negative))
+        self.assertEqual(9998, sum(comp._histogram.positive.values()) +
+                         sum(comp._histogram.negative.values()))
+
+    @ddt.data({"exact_size": 10000, "streams": 10},
+              {"exact_size": 100, "streams": 10},
+              {"exact_size": 600, "streams": 2},
+              {"exact_size": 10, "streams": 1})
+    @ddt.unpack
+    def test_merge(self, exact_size, streams):
+        values = [math.sin(i) * 100 for i in range(1000)]
+        single = algo.PercentileComputation(0.9, exact_size=exact_size)
+        for value in values:
+            single.add(value)
+
+        comps = [algo.PercentileComputation(0.9, exact_size=exact_size)
+                 for i in range(streams)]
+        for idx, value in enumerate(values):
+            comps[idx % streams].add(value)
+        merged = comps[0]
+        for comp in comps[1:]:
+            merged.merge(comp)
+        merged.merge(algo.PercentileComputation(0.9))
+
+        self.assertEqual(single._count, merged._count)
+        self.assertEqual(single._min, merged._min)
+        self.assertEqual(single._max, merged._max)
+        self.assertAlmostEqual(single.result(), merged.result())
+        expected = self._exact_percentile(values, 0.9)
+        self.assertLessEqual(abs(merged.result() - expected),
+                             abs(expected) * 0.005)
+
+    def test_merge_with_different_accuracy(self):
+        comp = algo.PercentileComputation(0.5)
+        other = algo.PercentileComputation(0.5, accuracy=0.01)
+        other.add(42)
+        self.assertRaises(ValueError, comp.merge, other)
+
+    @ddt.data(10000, 100)
+    def test_to_dict_and_from_dict(self, exact_size):
+        values = [math.sin(i) * 100 for i in range(1000)] + [0]
+        comp = algo.PercentileComputation(0.9, exact_size=exact_size,
+                                          max_buckets=100)
+        for value in values[:500]:
+            comp.add(value)
+
+        data = json.loads(json.dumps(comp.to_dict()))
+        self.assertEqual(exact_size > 500, "values" in data)
+        restored = algo.PercentileComputation.from_dict(data)
+        self.assertEqual(comp.result(), restored.result())
+        median = algo.PercentileComputation(0.5, exact_size=exact_size,
+                                            max_buckets=100)
+        for value in values[:500]:
+            median.add(value)
+        self.assertEqual(median.result(),
+                         algo.PercentileComputation.from_dict(
+                             data, percent=0.5).result())
+
+        # restored computations can be merged and updated further
+        other = algo.PercentileComputation(0.9, exact_size=exact_size,
+                                           max_buckets=100)
+        for value in values[500:]:
+            other.add(value)
+        restored.merge(algo.PercentileComputation.from_dict(
+            json.loads(json.dumps(other.to_dict()))))
+        for value in values[500:]:
+            comp.add(value)
+
+        self.assertEqual(comp._count, restored._count)
+        self.assertEqual(comp._min, restored._min)
+        self.assertEqual(comp._max, restored._max)
+        self.assertAlmostEqual(comp.result(), restored.result())
+
 
 class IncrementComputationTestCase(test.TestCase):
 
@@ -318,3 +469,70 @@ class DegradationComputationTestCase(test.TestCase):
         self.assertEqual(min_value, comp1.min_value.result())
         self.assertEqual(max_value, comp1.max_value.result())
         self.assertEqual(result, comp1.result())
+
+
+@ddt.ddt
+class ThresholdCountComputationTestCase(test.TestCase):
+
+    def _exact_count(self, values, threshold):
+        return len([value for value in values if value > threshold])
+
+    @ddt.data(-50.5, -1, 0, 0.5, 42, 99.9, 1000)
+    def test_count_greater(self, threshold):
+        values = [math.sin(i) * 100 for i in range(1000)] + [0] * 10
+        comp = algo.ThresholdCountComputation()
+        for idx, value in enumerate(values):
+            comp.add(value)
+            if idx % 97 == 0:
+                self.assertEqual(self._exact_count(values[:idx + 1],
+                                                   threshold),
+                                 comp.count_greater(threshold))
+
+        self.assertEqual(len(values), comp.result())
+        self.assertEqual(self._exact_count(values, threshold),
+                         comp.count_greater(threshold))
+        self.assertLess(len(comp._pending), 50)
+
+    @ddt.data(-50.5, -1, 0, 0.5, 42, 99.9, 1000)
+    def test_count_greater_of_histogram(self, threshold):
+        values = [math.sin(i) * 100 for i in range(1000)] + [0] * 10
+        comp = algo.ThresholdCountComputation(max_values=100)
+        for value in values:
+            comp.add(value)
+
+        self.assertIsNone(comp._sorted)
+        close = [value for value in values
+                 if abs(value - threshold) <= abs(threshold) * 0.01]
+        self.assertLessEqual(abs(self._exact_count(values, threshold)
+                                 - comp.count_greater(threshold)),
+                             len(close))
+
+    @ddt.data({"max_values": 100000, "streams": 10},
+              {"max_values": 500, "streams": 10},
+              {"max_values": 600, "streams": 2},
+              {"max_values": 10, "streams": 1})
+    @ddt.unpack
+    def test_merge(self, max_values, streams):
+        values = [math.sin(i) * 100 for i in range(1000)]
+        single = algo.ThresholdCountComputation(max_values=max_values)
+        for value in values:
+            single.add(value)
+
+        comps = [algo.ThresholdCountComputation(max_values=max_values)
+                 for i in range(streams)]
+        for idx, value in enumerate(values):
+            comps[idx % streams].add(value)
+        merged = comps[0]
+        for comp in comps[1:]:
+            merged.merge(comp)
+        merged.merge(algo.ThresholdCountComputation())
+
+        self.assertEqual(single.result(), merged.result())
+        for threshold in (-42, 0, 13.3, 90):
+            self.assertEqual(single.count_greater(threshold),
+                             merged.count_greater(threshold))
+
+    def test_merge_with_different_accuracy(self):
+        comp = algo.ThresholdCountComputation()
+        other = algo.ThresholdCountComputation(accuracy=0.01)
+        self.assertRaises(ValueError, comp.merge, other)
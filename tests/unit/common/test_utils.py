@@ -14,6 +14,9 @@
 
 from __future__ import print_function
 import collections
+import json
+import operator
+import pickle
 import string
 import sys
 import threading
@@ -460,6 +463,77 @@ class MergeTestCase(test.TestCase):
         self.assertEqual(out, expected_output)
 
 
+@ddt.ddt
+class LazyChunkedListTestCase(test.TestCase):
+
+    def test___iter__(self):
+        load_chunks = mock.Mock(side_effect=lambda: iter([[1, 2], [], [3]]))
+        lazy_list = utils.LazyChunkedList(load_chunks)
+        self.assertFalse(load_chunks.called)
+        self.assertEqual([1, 2, 3], list(lazy_list))
+        self.assertEqual([1, 2, 3], list(lazy_list))
+        self.assertEqual(2, load_chunks.call_count)
+
+    @ddt.data(
+        [],
+        [[]],
+        [[3, 5], [1, 2, 7], [], [6], [4]],
+        [[1, 2], [3, 4], [5]],
+        [[5, 1, 3], [2, 2], [0]],
+    )
+    def test_iter_sorted(self, chunks):
+        chunks = [[{"key": value, "idx": (i, j)}
+                   for j, value in enumerate(chunk)]
+                  for i, chunk in enumerate(chunks)]
+        lazy_list = utils.LazyChunkedList(lambda: iter(chunks))
+        key = operator.itemgetter("key")
+        self.assertEqual(sorted(lazy_list, key=key),
+                         list(lazy_list.iter_sorted(key=key)))
+
+    def test_iter_sorted_releases_chunks(self):
+        chunks = [[1, 2], [3, 4], [5]]
+        yielded = []
+
+        def load_chunks():
+            for chunk in chunks:
+                yielded.append(chunk)
+                yield chunk
+
+        iterator = utils.LazyChunkedList(load_chunks).iter_sorted(
+            key=lambda x: x)
+        self.assertEqual([1, 2], [next(iterator), next(iterator)])
+        # least keys are collected at first, then only the first
+        # chunk is loaded to yield its items
+        self.assertEqual(chunks + chunks[:1], yielded)
+
+
+@ddt.ddt
+class JsonIterencodeTestCase(test.TestCase):
+
+    @ddt.data(
+        {},
+        [],
+        "foo",
+        1.5,
+        None,
+        {"foo": [1, 2.5, {"bar": []}, {}], "baz": None, 1: True},
+        collections.OrderedDict([("b", [[]]), ("a", ("x", "y"))]),
+    )
+    def test_json_iterencode(self, obj):
+        self.assertEqual(
+            json.dumps(obj, indent=4, separators=(",", ": ")),
+            "".join(utils.json_iterencode(obj)))
+
+    def test_json_iterencode_iterables(self):
+        lazy_list = utils.LazyChunkedList(lambda: iter([[1], [2]]))
+        obj = {"foo": (i for i in range(2)), "bar": lazy_list,
+               "baz": iter([])}
+        expected = {"foo": [0, 1], "bar": [1, 2], "baz": []}
+        self.assertEqual(
+            json.dumps(expected, indent=2, separators=(",", ": ")),
+            "".join(utils.json_iterencode(obj, indent=2)))
+
+
 class TimeoutThreadTestCase(test.TestCase):
     def test_timeout_thread(self):
         """Create and kill thread by timeout.
@@ -494,6 +568,17 @@ class TimeoutThreadTestCase(test.TestCase):
         self.assertLess(time_elapsed, 11,
                         "Thread killed too late (%s seconds)" % time_elapsed)
 
+    def test_timeout_thread_terminate(self):
+        queue = Queue.Queue()
+        tracker = mock.Mock()
+        queue.put((tracker, time.time() - 1))
+        queue.put((None, None))
+
+        utils.timeout_thread(queue)
+
+        tracker.terminate.assert_called_once_with()
+        self.assertFalse(tracker.isAlive.called)
+
 
 class LockedDictTestCase(test.TestCase):
 
@@ -558,6 +643,18 @@ class LockedDictTestCase(test.TestCase):
                          args)
         self.assertEqual({"memo": "foo_memo"}, kw)
 
+    def test_pickle(self):
+        d = utils.LockedDict(foo="bar", spam={"a": ["b", {"c": "d"}]})
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            loaded = pickle.loads(pickle.dumps(d, protocol))
+            self.assertEqual(d, loaded)
+            self.assertIsInstance(loaded, utils.LockedDict)
+            self.assertIsInstance(loaded["spam"]["a"][1], utils.LockedDict)
+            self.assertRaises(RuntimeError, loaded.__setitem__, "foo", 42)
+            self.assertRaises(RuntimeError,
+                              loaded["spam"]["a"][1].__setitem__, "c", 42)
+
 
 @ddt.ddt
 class FloatFormatterTestCase(test.TestCase):
@@ -624,6 +721,35 @@ class DequeAsQueueTestCase(test.TestCase):
         self.assertTrue(self.deque_as_queue.empty())
 
 
+class WaitableDequeTestCase(test.TestCase):
+
+    def test_deque_interface(self):
+        deque = utils.WaitableDeque([1])
+        deque.append(2)
+        self.assertEqual([1, 2], list(deque))
+        self.assertEqual(1, deque.popleft())
+        self.assertEqual(1, len(deque))
+
+    def test_wait(self):
+        deque = utils.WaitableDeque()
+        self.assertFalse(deque.wait(0.001))
+
+        thread = threading.Thread(target=deque.append, args=(42,))
+        thread.start()
+        self.assertTrue(deque.wait(10))
+        thread.join()
+        self.assertEqual([42], list(deque))
+        # it doesn't block if there are items
+        self.assertTrue(deque.wait())
+
+    def test_wake_up(self):
+        deque = utils.WaitableDeque()
+        thread = threading.Timer(0.01, deque.wake_up)
+        thread.start()
+        self.assertFalse(deque.wait(10))
+        thread.join()
+
+
 class StopwatchTestCase(test.TestCase):
 
     @mock.patch("rally.common.utils.interruptable_sleep")
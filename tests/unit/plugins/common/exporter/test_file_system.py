@@ -13,6 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import shutil
+import tempfile
+
 import ddt
 import mock
 import six
@@ -30,12 +34,14 @@ if six.PY3:
 @ddt.ddt
 class FileExporterTestCase(test.TestCase):
 
+    @mock.patch("rally.plugins.common.exporter.file_system.os.rename")
     @mock.patch("rally.plugins.common.exporter.file_system.os.path.exists")
     @mock.patch.object(__builtin__, "open", autospec=True)
-    @mock.patch("rally.plugins.common.exporter.file_system.json.dumps")
+    @mock.patch("rally.plugins.common.exporter.file_system.utils."
+                "json_iterencode")
     @mock.patch("rally.api.API")
-    def test_file_exporter_export(self, mock_api, mock_dumps,
-                                  mock_open, mock_exists):
+    def test_file_exporter_export(self, mock_api, mock_json_iterencode,
+                                  mock_open, mock_exists, mock_rename):
         rapi = mock_api.return_value
         mock_exists.return_value = True
         rapi.task.get_detailed.return_value = {"results": [{
@@ -47,15 +53,20 @@ class FileExporterTestCase(test.TestCase):
                 "load_duration": "foo_load_duration",
                 "full_duration": "foo_full_duration",
             }}]}
-        mock_dumps.return_value = "fake_results"
+        mock_json_iterencode.return_value = iter(["fake", "_results"])
         input_mock = mock.MagicMock(spec=file)
         mock_open.return_value = input_mock
 
         exporter = file_system.FileExporter("file-exporter:///fake_path.json")
         exporter.export("fake_uuid")
 
-        mock_open().__enter__().write.assert_called_once_with("fake_results")
-        rapi.task.get_detailed.assert_called_once_with(task_id="fake_uuid")
+        self.assertEqual([mock.call("fake"), mock.call("_results")],
+                         mock_open().__enter__().write.mock_calls)
+        tmp_path = mock_open.call_args_list[0][0][0]
+        self.assertTrue(tmp_path.startswith("fake_path.json."))
+        mock_rename.assert_called_once_with(tmp_path, "fake_path.json")
+        rapi.task.get_detailed.assert_called_once_with(task_id="fake_uuid",
+                                                       lazy=True)
         expected_dict = [
             {
                 "load_duration": "foo_load_duration",
@@ -66,8 +77,40 @@ class FileExporterTestCase(test.TestCase):
                 "sla": "baz_sla"
             }
         ]
-        mock_dumps.assert_called_once_with(expected_dict, sort_keys=False,
-                                           indent=4, separators=(",", ": "))
+        mock_json_iterencode.assert_called_once_with(expected_dict, indent=4)
+
+    @mock.patch("rally.plugins.common.exporter.file_system.utils."
+                "json_iterencode")
+    @mock.patch("rally.api.API")
+    def test_file_exporter_export_replaces_file(self, mock_api,
+                                                mock_json_iterencode):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, "results.json")
+        with open(path, "w") as f:
+            f.write("old")
+        mock_api.return_value.task.get_detailed.return_value = {
+            "results": [{"key": "fake_key", "data": {
+                "raw": [], "sla": [], "load_duration": 1,
+                "full_duration": 2}}]}
+
+        def iterencode_failure():
+            yield "fake"
+            raise KeyError()
+
+        mock_json_iterencode.return_value = iterencode_failure()
+        exporter = file_system.FileExporter("file:///%s" % path)
+        self.assertRaises(KeyError, exporter.export, "fake_uuid")
+        # the file is not truncated and the temporary file is removed
+        self.assertEqual(["results.json"], os.listdir(tmp_dir))
+        with open(path) as f:
+            self.assertEqual("old", f.read())
+
+        mock_json_iterencode.return_value = iter(["fake", "_results"])
+        exporter.export("fake_uuid")
+        self.assertEqual(["results.json"], os.listdir(tmp_dir))
+        with open(path) as f:
+            self.assertEqual("fake_results", f.read())
 
     @mock.patch("rally.api.API")
     def test_file_exporter_export_running_task(self, mock_api):
@@ -16,6 +16,7 @@
 import ddt
 import mock
 
+from rally import exceptions
 from rally.plugins.common.runners import constant
 from rally.task import runner
 from tests.unit import fakes
@@ -54,59 +55,123 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
         else:
             self.assertGreater(len(results), 0)
 
-    @mock.patch(RUNNERS + "constant.runner")
-    def test__run_scenario_once_with_unpack_args(self, mock_runner):
-        result = constant._run_scenario_once_with_unpack_args(
-            ("FOO", ("BAR", "QUUZ")))
-
-        self.assertEqual(mock_runner._run_scenario_once.return_value, result)
-        mock_runner._run_scenario_once.assert_called_once_with(
-            "FOO", ("BAR", "QUUZ"))
-
-    @mock.patch(RUNNERS + "constant.time")
     @mock.patch(RUNNERS + "constant.threading.Thread")
     @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
     @mock.patch(RUNNERS + "constant.runner")
-    def test__worker_process(self, mock_runner, mock_queue, mock_thread,
-                             mock_time):
-
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
-
+    def test__worker_process(self, mock_runner, mock_queue, mock_thread):
         mock_event = mock.MagicMock(
             is_set=mock.MagicMock(return_value=False))
-
         mock_event_queue = mock.MagicMock()
-
-        times = 4
-
         fake_ram_int = iter(range(10))
-
         context = {"users": [{"tenant_id": "t1", "credential": "c1",
                               "id": "uuid1"}]}
         info = {"processes_to_start": 1, "processes_counter": 1}
 
-        constant._worker_process(mock_queue, fake_ram_int, 1, 2, times,
+        constant._worker_process(mock_queue, fake_ram_int, 1, 3, 4, None,
                                  context, "Dummy", "dummy", (),
                                  mock_event_queue, mock_event, info)
 
-        self.assertEqual(times + 1, mock_thread.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.start.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.join.call_count)
-        # NOTE(rvasilets): `times` + 1 here because `times` the number of
-        # scenario repetition and one more need on "initialization" stage
-        # of the thread stuff.
-        self.assertEqual(times, mock_runner._get_scenario_context.call_count)
-
-        for i in range(times):
-            scenario_context = mock_runner._get_scenario_context(i, context)
-            call = mock.call(
-                args=(mock_queue, "Dummy", "dummy", scenario_context, (),
-                      mock_event_queue),
-                target=mock_runner._worker_thread,
-            )
-            self.assertIn(call, mock_thread.mock_calls)
+        # one thread per concurrent iteration plus the timeout collector
+        self.assertEqual(4, mock_thread.call_count)
+        self.assertEqual(4, mock_thread.return_value.start.call_count)
+        self.assertEqual(4, mock_thread.return_value.join.call_count)
+        workers = [c for c in mock_thread.call_args_list
+                   if c[1]["target"] == constant._run_iterations]
+        self.assertEqual(3, len(workers))
+        for c in workers:
+            self.assertEqual(
+                (mock_queue, fake_ram_int, 4, None, context, "Dummy",
+                 "dummy", (), mock_event_queue, mock_event, 1),
+                c[1]["args"][:-1])
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__run_iterations(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_event_queue = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+        timeout_queue = mock.MagicMock()
+        context = {"foo": "bar"}
+
+        constant._run_iterations(mock_queue, iter(range(10)), 4, None,
+                                 context, "Dummy", "dummy", {},
+                                 mock_event_queue, mock_event, 1,
+                                 timeout_queue)
+
+        self.assertEqual(
+            [mock.call(i, context) for i in range(4)],
+            mock_runner._get_scenario_context.call_args_list)
+        self.assertEqual(4, mock_runner._run_scenario_once.call_count)
+        mock_runner._run_scenario_once.assert_called_with(
+            "Dummy", "dummy", mock_runner._get_scenario_context.return_value,
+            {}, mock_event_queue)
+        self.assertEqual(
+            [mock.call(mock_runner._run_scenario_once.return_value)] * 4,
+            mock_queue.put.call_args_list)
+        self.assertEqual(4, timeout_queue.put.call_count)
+        tracker = mock_runner._IterationTracker.return_value
+        self.assertEqual(4, tracker.start.call_count)
+        self.assertTrue(tracker.finish.called)
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__run_iterations_aborted(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(side_effect=[False, False, True]))
+
+        constant._run_iterations(mock_queue, iter(range(10)), 4, None, {},
+                                 "Dummy", "dummy", {}, mock.MagicMock(),
+                                 mock_event, 0, None)
+
+        self.assertEqual(2, mock_runner._run_scenario_once.call_count)
+        self.assertEqual(2, mock_queue.put.call_count)
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__run_iterations_late_timeout(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        tracker = mock_runner._IterationTracker.return_value
+        # the termination hits the thread when the iteration is finished
+        tracker.finish.side_effect = [exceptions.ThreadTimeoutException(),
+                                      None, None, None]
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+
+        constant._run_iterations(mock_queue, iter(range(10)), 2, None, {},
+                                 "Dummy", "dummy", {}, mock.MagicMock(),
+                                 mock_event, 1, mock.MagicMock())
+
+        self.assertEqual(2, mock_runner._run_scenario_once.call_count)
+        self.assertEqual(
+            [mock.call(mock_runner._run_scenario_once.return_value)] * 2,
+            mock_queue.put.call_args_list)
+
+    @mock.patch(RUNNERS + "constant.time.time")
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__run_iterations_with_deadline(self, mock_runner, mock_time):
+        mock_queue = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+        mock_time.side_effect = [10, 11, 12, 20]
+
+        constant._run_iterations(mock_queue, iter(range(10)), None, 15, {},
+                                 "Dummy", "dummy", {}, mock.MagicMock(),
+                                 mock_event, 0, None)
+
+        # the first iteration doesn't check the deadline
+        self.assertEqual(4, mock_runner._run_scenario_once.call_count)
+        self.assertEqual(4, mock_queue.put.call_count)
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__run_iterations_with_expired_deadline(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+
+        constant._run_iterations(mock_queue, iter(range(10)), None, 0, {},
+                                 "Dummy", "dummy", {}, mock.MagicMock(),
+                                 mock_event, 0, None)
+
+        self.assertEqual(1, mock_runner._run_scenario_once.call_count)
 
     @mock.patch(RUNNERS_BASE + "_run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
@@ -255,6 +320,24 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
         runner_obj.abort()
         self.assertTrue(runner_obj.aborted.is_set())
 
+    @ddt.data(
+        {"config": {"times": 10, "concurrency": 5}, "parts": 3,
+         "expected": [(4, 2), (3, 2), (3, 1)]},
+        {"config": {"times": 5, "concurrency": 2}, "parts": 3,
+         "expected": [(3, 1), (2, 1)]},
+        {"config": {"times": 5, "concurrency": 5}, "parts": 2,
+         "expected": [(3, 3), (2, 2)]},
+        {"config": {}, "parts": 4, "expected": [(1, 1)]})
+    @ddt.unpack
+    def test_split_config(self, config, parts, expected):
+        config = dict(config, type="constant", timeout=3)
+        configs = constant.ConstantScenarioRunner.split_config(config, parts)
+        self.assertEqual(expected,
+                         [(c["times"], c["concurrency"]) for c in configs])
+        for c in configs:
+            self.assertEqual("constant", c["type"])
+            self.assertEqual(3, c["timeout"])
+
 
 @ddt.ddt
 class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
@@ -266,6 +349,7 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
         self.context = fakes.FakeContext({"task": {"uuid": "uuid"}}).context
         self.context["iteration"] = 14
         self.args = {"a": 1}
+        self.task = mock.MagicMock()
 
     @ddt.data(({"duration": 0, "concurrency": 2,
                 "timeout": 2, "type": "constant_for_duration"}, True),
@@ -281,7 +365,7 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
 
     def test_run_scenario_constantly_for_duration(self):
         runner_obj = constant.ConstantForDurationScenarioRunner(
-            None, self.config)
+            self.task, self.config)
 
         runner_obj._run_scenario(fakes.FakeScenario, "do_it",
                                  self.context, self.args)
@@ -294,7 +378,7 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
 
     def test_run_scenario_constantly_for_duration_exception(self):
         runner_obj = constant.ConstantForDurationScenarioRunner(
-            None, self.config)
+            self.task, self.config)
 
         runner_obj._run_scenario(fakes.FakeScenario, "something_went_wrong",
                                  self.context, self.args)
@@ -308,7 +392,7 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
 
     def test_run_scenario_constantly_for_duration_timeout(self):
         runner_obj = constant.ConstantForDurationScenarioRunner(
-            None, self.config)
+            self.task, self.config)
 
         runner_obj._run_scenario(fakes.FakeScenario, "raise_timeout",
                                  self.context, self.args)
@@ -321,17 +405,60 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
         self.assertIn("error", runner_obj.result_queue[0][0])
 
     def test__run_scenario_constantly_aborted(self):
-        runner_obj = constant.ConstantForDurationScenarioRunner(None,
-                                                                self.config)
+        runner_obj = constant.ConstantForDurationScenarioRunner(
+            self.task, self.config)
 
         runner_obj.abort()
         runner_obj._run_scenario(fakes.FakeScenario, "do_it",
                                  self.context, self.args)
         self.assertEqual(len(runner_obj.result_queue), 0)
 
+    @mock.patch(RUNNERS + "constant.time.time", return_value=100)
+    @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
+    @mock.patch(RUNNERS + "constant.multiprocessing.cpu_count",
+                return_value=4)
+    @mock.patch(RUNNERS + "constant.ConstantForDurationScenarioRunner"
+                "._create_process_pool")
+    @mock.patch(RUNNERS + "constant.ConstantForDurationScenarioRunner"
+                "._join_processes")
+    def test__run_scenario_process_pool(self, mock__join_processes,
+                                        mock__create_process_pool,
+                                        mock_cpu_count, mock_queue,
+                                        mock_time):
+        config = {"duration": 10, "concurrency": 11, "max_cpu_count": 3,
+                  "type": "constant_for_duration"}
+        runner_obj = constant.ConstantForDurationScenarioRunner(
+            self.task, config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it",
+                                 self.context, self.args)
+
+        processes_to_start, worker, args_gen = (
+            mock__create_process_pool.call_args[0])
+        self.assertEqual(3, processes_to_start)
+        self.assertEqual(constant._worker_process, worker)
+        worker_args = [next(args_gen) for i in range(3)]
+        # concurrency is split between processes
+        self.assertEqual([4, 4, 3], [a[3] for a in worker_args])
+        for a in worker_args:
+            # no limit of iterations, but the same deadline for all
+            self.assertIsNone(a[4])
+            self.assertEqual(110, a[5])
+            self.assertEqual(600, a[2])
+        mock__join_processes.assert_called_once_with(
+            mock__create_process_pool.return_value,
+            mock_queue.return_value, mock_queue.return_value)
+
     def test_abort(self):
-        runner_obj = constant.ConstantForDurationScenarioRunner(None,
-                                                                self.config)
+        runner_obj = constant.ConstantForDurationScenarioRunner(
+            self.task, self.config)
         self.assertFalse(runner_obj.aborted.is_set())
         runner_obj.abort()
         self.assertTrue(runner_obj.aborted.is_set())
+
+    def test_split_config(self):
+        config = dict(self.config, concurrency=5)
+        self.assertEqual(
+            [dict(config, concurrency=3), dict(config, concurrency=2)],
+            constant.ConstantForDurationScenarioRunner.split_config(config,
+                                                                    2))
@@ -0,0 +1,248 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import socket
+
+import ddt
+import mock
+
+from rally import exceptions
+from rally.plugins.common.runners import distributed
+from rally.task import runner
+from tests.unit import test
+
+
+BASE = "rally.plugins.common.runners.distributed."
+
+
+def _line(message):
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+@ddt.ddt
+class DistributedScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DistributedScenarioRunnerTestCase, self).setUp()
+        self.task = {"uuid": "task-uuid"}
+        self.config = {"type": "distributed",
+                       "runner": {"type": "constant", "times": 5,
+                                  "concurrency": 2}}
+        self.runner = distributed.DistributedScenarioRunner(self.task,
+                                                            self.config)
+
+    @ddt.data(
+        {"config": {"type": "distributed",
+                    "runner": {"type": "constant", "times": 5}}},
+        {"config": {"type": "distributed", "agents": 2,
+                    "runner": {"type": "rps", "times": 5, "rps": 2}}},
+        {"config": {"type": "distributed"}, "valid": False},
+        {"config": {"type": "distributed", "agents": 0,
+                    "runner": {"type": "constant"}}, "valid": False},
+        {"config": {"type": "distributed",
+                    "runner": {"type": "constant", "times": 1,
+                               "concurrency": 2}}, "valid": False},
+        {"config": {"type": "distributed",
+                    "runner": {"type": "distributed",
+                               "runner": {"type": "constant"}}},
+         "valid": False})
+    @ddt.unpack
+    def test_validate(self, config, valid=True):
+        results = runner.ScenarioRunner.validate("distributed", None, None,
+                                                 config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertGreater(len(results), 0)
+
+    @mock.patch(BASE + "agent_utils.get_agents")
+    def test__get_agents(self, mock_get_agents):
+        mock_get_agents.return_value = ["a:1", "b:2"]
+        self.assertEqual(["a:1", "b:2"], self.runner._get_agents())
+
+        mock_get_agents.return_value = []
+        self.assertRaises(exceptions.RallyException, self.runner._get_agents)
+
+    @mock.patch(BASE + "random.sample")
+    @mock.patch(BASE + "agent_utils.get_agents")
+    def test__get_agents_limited(self, mock_get_agents, mock_sample):
+        mock_get_agents.return_value = ["a:1", "b:2", "c:3"]
+        self.runner.config["agents"] = 2
+
+        self.assertEqual(mock_sample.return_value, self.runner._get_agents())
+        mock_sample.assert_called_once_with(["a:1", "b:2", "c:3"], 2)
+
+    @mock.patch(BASE + "DistributedScenarioRunner._run_on_agent")
+    @mock.patch(BASE + "DistributedScenarioRunner._get_agents")
+    def test_run(self, mock__get_agents, mock__run_on_agent):
+        mock__get_agents.return_value = ["a:1", "b:2", "c:3"]
+        context = {"task": self.task, "config": {"users": {}}}
+
+        self.runner.run("Dummy.dummy", context, {"sleep": 1})
+
+        expected_context = {"task": {"uuid": "task-uuid"},
+                            "config": {"users": {}}}
+        errors = mock__run_on_agent.call_args[0][-1]
+        self.assertEqual(
+            [mock.call("a:1", {"type": "constant", "times": 3,
+                               "concurrency": 1},
+                       "Dummy.dummy", expected_context, {"sleep": 1}, errors),
+             mock.call("b:2", {"type": "constant", "times": 2,
+                               "concurrency": 1},
+                       "Dummy.dummy", expected_context, {"sleep": 1}, errors)],
+            sorted(mock__run_on_agent.call_args_list))
+        self.assertGreater(self.runner.run_duration, 0)
+
+    @mock.patch(BASE + "DistributedScenarioRunner._run_on_agent")
+    @mock.patch(BASE + "DistributedScenarioRunner._get_agents")
+    def test_run_failed(self, mock__get_agents, mock__run_on_agent):
+        mock__get_agents.return_value = ["a:1"]
+        mock__run_on_agent.side_effect = (
+            lambda *args: args[-1].append("a:1: foo"))
+
+        e = self.assertRaises(exceptions.RallyException, self.runner.run,
+                              "Dummy.dummy", {}, {})
+        self.assertIn("a:1: foo", e.format_message())
+
+    def test__run_scenario(self):
+        self.assertRaises(NotImplementedError, self.runner._run_scenario,
+                          None, None, {}, {})
+
+    def _mock_connection(self, lines, status=200):
+        conn = mock.Mock()
+        response = conn.getresponse.return_value
+        response.status = status
+        response.readline.side_effect = lines + [b""]
+        self.runner._connect = mock.Mock(return_value=conn)
+        return conn
+
+    @mock.patch(BASE + "agent_utils.CONF")
+    @mock.patch(BASE + "CONF")
+    def test__run_on_agent(self, mock_conf, mock_agent_utils_conf):
+        mock_conf.agent.heartbeat_timeout = 30
+        mock_agent_utils_conf.agent.secret = "foo"
+        results = [{"duration": 1.0, "timestamp": 1.0, "idle_duration": 0.0,
+                    "output": {}, "atomic_actions": [], "error": []},
+                   {"duration": 2.0, "timestamp": 2.0, "idle_duration": 0.0,
+                    "output": {}, "atomic_actions": [], "error": []}]
+        conn = self._mock_connection([
+            _line({"event": {"type": "iteration", "value": 1}}),
+            _line({"results": results[:1]}),
+            b"\n",
+            _line({"event": {"type": "iteration", "value": 1}}),
+            _line({"results": results[1:]}),
+            _line({"finished": True})])
+        errors = []
+
+        self.runner._run_on_agent("a:1", {"type": "constant"}, "Dummy.dummy",
+                                  {"task": "foo"}, {"sleep": 1}, errors)
+
+        self.assertEqual([], errors)
+        self.runner._connect.assert_called_once_with("a:1", 30)
+        path, body, headers = conn.request.call_args[0][1:]
+        self.assertEqual("/run", path)
+        self.assertEqual({"Content-Type": "application/json",
+                          "X-Rally-Agent-Secret": "foo"}, headers)
+        body = json.loads(body)
+        self.assertEqual({"name": "Dummy.dummy",
+                          "config": {"type": "constant"},
+                          "context": {"task": "foo"},
+                          "args": {"sleep": 1},
+                          "run": mock.ANY}, body)
+        self.assertEqual([results[:1], results[1:]],
+                         list(self.runner.result_queue))
+        self.assertEqual([{"type": "iteration", "value": 1},
+                          {"type": "iteration", "value": 2}],
+                         list(self.runner.event_queue))
+        conn.close.assert_called_once_with()
+        self.assertEqual([], self.runner._runs)
+
+    @ddt.data(
+        {"lines": [_line({"error": "KeyError: 'foo'"})],
+         "error": "KeyError: 'foo'"},
+        {"lines": [b"\n"], "error": "closed unexpectedly"},
+        {"lines": [b"{"], "error": "a:1"},
+        {"lines": [_line({"error": "PluginNotFound: foo"})], "status": 400,
+         "error": "PluginNotFound: foo"})
+    @ddt.unpack
+    @mock.patch(BASE + "CONF")
+    def test__run_on_agent_failed(self, mock_conf, lines, error, status=200):
+        conn = self._mock_connection(lines, status=status)
+        conn.getresponse.return_value.read.return_value = lines[0]
+        errors = []
+
+        self.runner._run_on_agent("a:1", {}, "Dummy.dummy", {}, {}, errors)
+
+        self.assertEqual(1, len(errors))
+        self.assertIn(error, errors[0])
+        self.assertTrue(errors[0].startswith("a:1: "))
+        conn.close.assert_called_once_with()
+        self.assertEqual([], self.runner._runs)
+
+    @mock.patch(BASE + "CONF")
+    def test__run_on_agent_unexpected_error(self, mock_conf):
+        # e.g. a malformed event
+        conn = self._mock_connection([_line({"event": {"foo": "bar"}})])
+        errors = []
+
+        self.runner._run_on_agent("a:1", {}, "Dummy.dummy", {}, {}, errors)
+
+        self.assertEqual(1, len(errors))
+        self.assertTrue(errors[0].startswith("a:1: "))
+        conn.close.assert_called_once_with()
+        self.assertEqual([], self.runner._runs)
+
+    @mock.patch(BASE + "CONF")
+    def test__run_on_agent_connection_failed(self, mock_conf):
+        conn = self._mock_connection([])
+        conn.request.side_effect = socket.error("Connection refused")
+        errors = []
+
+        self.runner._run_on_agent("a:1", {}, "Dummy.dummy", {}, {}, errors)
+
+        self.assertEqual(["a:1: Connection refused"], errors)
+
+    def test__run_on_agent_aborted(self):
+        self.runner._connect = mock.Mock()
+        self.runner.abort()
+        errors = []
+
+        self.runner._run_on_agent("a:1", {}, "Dummy.dummy", {}, {}, errors)
+
+        self.assertEqual([], errors)
+        self.assertFalse(self.runner._connect.called)
+
+    @mock.patch(BASE + "agent_utils.CONF")
+    @mock.patch(BASE + "CONF")
+    def test_abort(self, mock_conf, mock_agent_utils_conf):
+        mock_agent_utils_conf.agent.secret = None
+        self.runner._runs = [("a:1", "r1"), ("b:2", "r2")]
+        conn = self._mock_connection([])
+        conn.request.side_effect = [None, socket.error()]
+
+        self.runner.abort()
+
+        self.assertTrue(self.runner.aborted.is_set())
+        self.assertEqual([mock.call("a:1", mock_conf.agent.heartbeat_timeout),
+                          mock.call("b:2", mock_conf.agent.heartbeat_timeout)],
+                         self.runner._connect.call_args_list)
+        self.assertEqual(
+            [mock.call("POST", "/abort", json.dumps({"run": "r1"}),
+                       {"Content-Type": "application/json"}),
+             mock.call("POST", "/abort", json.dumps({"run": "r2"}),
+                       {"Content-Type": "application/json"})],
+            conn.request.call_args_list)
+        self.assertEqual(2, conn.close.call_count)
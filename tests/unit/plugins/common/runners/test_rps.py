@@ -136,6 +136,23 @@ class RPSScenarioRunnerTestCase(test.TestCase):
             },
             "valid": False
         },
+        {
+            "config": {
+                "type": "rps",
+                "rps": 2,
+                "times": 55,
+                "distribution": "poisson"
+            }
+        },
+        {
+            "config": {
+                "type": "rps",
+                "rps": 2,
+                "times": 55,
+                "distribution": "foo"
+            },
+            "valid": False
+        },
 
     )
     @ddt.unpack
@@ -146,70 +163,116 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         else:
             self.assertGreater(len(results), 0)
 
-    @mock.patch(RUNNERS + "rps.LOG")
-    @mock.patch(RUNNERS + "rps.time")
+    def test__arrival_schedule(self):
+        self.assertEqual([0.0, 0.25, 0.5, 0.75],
+                         list(rps._arrival_schedule(4, 4)))
+
+    def test__arrival_schedule_with_steps(self):
+        schedule = rps._arrival_schedule(
+            {"start": 1, "end": 3, "step": 1, "duration": 2}, 9)
+        self.assertEqual([0.0, 1.0, 2.0, 2.5, 3.0, 3.5, 4.0],
+                         list(schedule[:7]))
+        self.assertAlmostEqual(1.0 / 3, schedule[8] - schedule[7])
+
+    def test__arrival_schedule_poisson(self):
+        mock_expovariate = mock.Mock(return_value=0.2)
+        with mock.patch.dict(rps.ARRIVAL_DISTRIBUTIONS,
+                             {"poisson": mock_expovariate}):
+            schedule = rps._arrival_schedule(10, 3, "poisson")
+        self.assertEqual([0.0, 0.2, 0.4], list(schedule))
+        self.assertEqual([mock.call(10.0)] * 3,
+                         mock_expovariate.call_args_list)
+
     @mock.patch(RUNNERS + "rps.threading.Thread")
-    @mock.patch(RUNNERS + "rps.multiprocessing.Queue")
     @mock.patch(RUNNERS + "rps.runner")
-    def test__worker_process(self, mock_runner, mock_queue, mock_thread,
-                             mock_time, mock_log):
-
-        def time_side():
-            time_side.last += 0.03
-            time_side.count += 1
-            return time_side.last
-        time_side.last = 0
-        time_side.count = 0
-
-        mock_time.time = time_side
-
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
-
+    def test__thread_pool(self, mock_runner, mock_thread):
+        mock_queue = mock.MagicMock()
+        mock_event_queue = mock.MagicMock()
+        context = {"foo": "bar"}
+        mock_runner._run_scenario_once.side_effect = lambda *a: {
+            "output": {"additive": [], "complete": []}}
+
+        pool = rps._ThreadPool(mock_queue, 2, context, "Dummy", "dummy", {},
+                               mock_event_queue, 0, None)
+        pool.acquire()
+        pool.dispatch(0, 10)
+        pool.acquire()
+        pool.dispatch(1, 11)
+        self.assertEqual(2, mock_thread.call_count)
+        # both slots are taken
+        self.assertFalse(pool.slots.acquire(False))
+
+        with mock.patch(RUNNERS + "rps.time.time", return_value=12):
+            pool.iterations.put(None)
+            pool._run_iterations()
+
+        self.assertEqual(2, mock_queue.put.call_count)
+        for call, lag in zip(mock_queue.put.call_args_list, (2, 1)):
+            self.assertEqual(rps._format_start_lag(lag),
+                             call[0][0]["output"]["additive"][-1])
+        # both slots are free again and the next iteration is run by one of
+        # already started threads
+        pool.acquire()
+        pool.dispatch(2, 13)
+        self.assertEqual(2, mock_thread.call_count)
+
+        pool.stop()
+        self.assertEqual(2, mock_thread.return_value.join.call_count)
+
+    @mock.patch(RUNNERS + "rps.time.time")
+    @mock.patch(RUNNERS + "rps._ThreadPool")
+    @mock.patch(RUNNERS + "rps.threading.Thread")
+    @mock.patch(RUNNERS + "rps.runner")
+    def test__worker_process(self, mock_runner, mock_thread,
+                             mock___thread_pool, mock_time):
+        mock_time.return_value = 100.0
         mock_event = mock.MagicMock(
-            is_set=mock.MagicMock(return_value=False))
-
+            is_set=mock.MagicMock(return_value=False),
+            wait=mock.MagicMock(return_value=False))
+        mock_queue = mock.MagicMock()
         mock_event_queue = mock.MagicMock()
-
-        times = 4
-        max_concurrent = 3
-
-        fake_ram_int = iter(range(10))
-
         context = {"users": [{"tenant_id": "t1", "credential": "c1",
                               "id": "uuid1"}]}
         info = {"processes_to_start": 1, "processes_counter": 1}
-        mock_runs_per_second = mock.MagicMock(return_value=10)
-
-        rps._worker_process(mock_queue, fake_ram_int, 1, times,
-                            max_concurrent, context, "Dummy", "dummy",
-                            (), mock_event_queue, mock_event,
-                            mock_runs_per_second, 10, 1,
-                            info)
-
-        self.assertEqual(times, mock_log.debug.call_count)
-        self.assertEqual(times + 1, mock_thread.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.start.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.join.call_count)
-        # NOTE(rvasilets): `times` + 1 here because `times` the number of
-        # scenario repetition and one more need on "initialization" stage
-        # of the thread stuff.
-
-        self.assertEqual(1, mock_time.sleep.call_count)
-        self.assertEqual(2, mock_thread_instance.isAlive.call_count)
-        self.assertEqual(times * 4 - 1, mock_time.time.count)
-
-        self.assertEqual(times, mock_runner._get_scenario_context.call_count)
-
-        for i in range(times):
-            scenario_context = mock_runner._get_scenario_context(i, context)
-            call = mock.call(
-                args=(mock_queue, "Dummy", "dummy", scenario_context, (),
-                      mock_event_queue),
-                target=mock_runner._worker_thread,
-            )
-            self.assertIn(call, mock_thread.mock_calls)
+
+        rps._worker_process(mock_queue, iter(range(10)), 1, 4, 3,
+                            context, "Dummy", "dummy", (), mock_event_queue,
+                            mock_event, [0.0, 0.1, 0.2, 0.3], 100.0, info)
+
+        mock___thread_pool.assert_called_once_with(
+            mock_queue, 3, context, "Dummy", "dummy", (), mock_event_queue,
+            1, mock.ANY)
+        pool = mock___thread_pool.return_value
+        self.assertEqual(
+            [mock.call(0, 100.0), mock.call(1, 100.1), mock.call(2, 100.2),
+             mock.call(3, 100.3)],
+            pool.dispatch.call_args_list)
+        self.assertEqual(4, pool.acquire.call_count)
+        pool.stop.assert_called_once_with()
+        # the first iteration is started without waiting
+        self.assertEqual(3, mock_event.wait.call_count)
+        # the timeout collector
+        mock_thread.assert_called_once_with(
+            target=rps.utils.timeout_thread, args=(mock.ANY,))
+
+    @mock.patch(RUNNERS + "rps.time.time", return_value=100.0)
+    @mock.patch(RUNNERS + "rps._ThreadPool")
+    @mock.patch(RUNNERS + "rps.runner")
+    def test__worker_process_aborted_while_waiting(
+            self, mock_runner, mock___thread_pool, mock_time):
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False),
+            wait=mock.MagicMock(return_value=True))
+        info = {"processes_to_start": 1, "processes_counter": 1}
+
+        rps._worker_process(mock.MagicMock(), iter(range(10)), 0, 4, 3,
+                            {}, "Dummy", "dummy", (), mock.MagicMock(),
+                            mock_event, [0.0, 0.1, 0.2, 0.3], 100.0, info)
+
+        pool = mock___thread_pool.return_value
+        pool.dispatch.assert_called_once_with(0, 100.0)
+        mock_event.wait.assert_called_once_with(mock.ANY)
+        pool.stop.assert_called_once_with()
 
     @mock.patch(RUNNERS + "rps.runner._run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
@@ -269,8 +332,9 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         },
     )
     @ddt.unpack
-    @mock.patch(RUNNERS + "rps.time.sleep")
-    def test__run_scenario(self, mock_sleep, config):
+    @mock.patch(RUNNERS + "rps._arrival_schedule",
+                side_effect=lambda rps_cfg, times, distribution: [0] * times)
+    def test__run_scenario(self, mock__arrival_schedule, config):
         runner_obj = rps.RPSScenarioRunner(self.task, config)
 
         runner_obj._run_scenario(fakes.FakeScenario, "do_it",
@@ -282,8 +346,9 @@ class RPSScenarioRunnerTestCase(test.TestCase):
             for result in result_batch:
                 self.assertIsNotNone(result)
 
-    @mock.patch(RUNNERS + "rps.time.sleep")
-    def test__run_scenario_exception(self, mock_sleep):
+    @mock.patch(RUNNERS + "rps._arrival_schedule",
+                side_effect=lambda rps_cfg, times, distribution: [0] * times)
+    def test__run_scenario_exception(self, mock__arrival_schedule):
         config = {"times": 4, "rps": 10}
         runner_obj = rps.RPSScenarioRunner(self.task, config)
 
@@ -294,8 +359,7 @@ class RPSScenarioRunnerTestCase(test.TestCase):
             for result in result_batch:
                 self.assertIsNotNone(result)
 
-    @mock.patch(RUNNERS + "rps.time.sleep")
-    def test__run_scenario_aborted(self, mock_sleep):
+    def test__run_scenario_aborted(self):
         config = {"times": 20, "rps": 20, "timeout": 5}
         runner_obj = rps.RPSScenarioRunner(self.task, config)
 
@@ -330,8 +394,6 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                     # min(max_cpu_used, times, max_concurrency))
                     "processes_to_start": 1,
                     "rps_per_worker": 20,
-                    "times_per_worker": 20,
-                    "times_overhead": 0,
                     "concurrency_per_worker": 10,
                     "concurrency_overhead": 0
                 }
@@ -344,8 +406,6 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                     "max_cpu_used": 3,
                     "processes_to_start": 3,
                     "rps_per_worker": 3,
-                    "times_per_worker": 6,
-                    "times_overhead": 2,
                     "concurrency_per_worker": 1,
                     "concurrency_overhead": 2
                 }
@@ -358,8 +418,6 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                     "max_cpu_used": 20,
                     "processes_to_start": 10,
                     "rps_per_worker": 2,
-                    "times_per_worker": 1,
-                    "times_overhead": 0,
                     "concurrency_per_worker": 1,
                     "concurrency_overhead": 2
                 }
@@ -372,8 +430,6 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                     "max_cpu_used": 20,
                     "processes_to_start": 10,
                     "rps_per_worker": 2,
-                    "times_per_worker": 2,
-                    "times_overhead": 0,
                     "concurrency_per_worker": 1,
                     "concurrency_overhead": 0
                 }
@@ -400,8 +456,6 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                 timeout=0,
                 max_cpu_used=sample["expected"]["max_cpu_used"],
                 processes_to_start=sample["expected"]["processes_to_start"],
-                times_per_worker=sample["expected"]["times_per_worker"],
-                times_overhead=sample["expected"]["times_overhead"],
                 concurrency_per_worker=(
                     sample["expected"]["concurrency_per_worker"]),
                 concurrency_overhead=(
@@ -420,3 +474,24 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         self.assertFalse(runner_obj.aborted.is_set())
         runner_obj.abort()
         self.assertTrue(runner_obj.aborted.is_set())
+
+    @ddt.data(
+        {"config": {"times": 10, "rps": 20}, "parts": 3,
+         "expected": [{"times": 4, "rps": 8}, {"times": 3, "rps": 6},
+                      {"times": 3, "rps": 6}]},
+        {"config": {"times": 4, "rps": {"start": 4, "end": 8, "step": 2,
+                                        "duration": 5}},
+         "parts": 2,
+         "expected": [{"times": 2,
+                       "rps": {"start": 2, "end": 4, "step": 1,
+                               "duration": 5}}] * 2},
+        {"config": {"times": 10, "rps": 10, "max_concurrency": 3},
+         "parts": 4,
+         "expected": [{"times": 4, "rps": 4, "max_concurrency": 1},
+                      {"times": 3, "rps": 3, "max_concurrency": 1},
+                      {"times": 3, "rps": 3, "max_concurrency": 1}]})
+    @ddt.unpack
+    def test_split_config(self, config, parts, expected):
+        config = dict(config, type="rps")
+        self.assertEqual([dict(config, **part) for part in expected],
+                         rps.RPSScenarioRunner.split_config(config, parts))
@@ -68,3 +68,9 @@ class SerialScenarioRunnerTestCase(test.TestCase):
         self.assertFalse(runner.aborted.is_set())
         runner.abort()
         self.assertTrue(runner.aborted.is_set())
+
+    def test_split_config(self):
+        self.assertEqual(
+            [{"type": "serial", "times": 3}, {"type": "serial", "times": 2}],
+            serial.SerialScenarioRunner.split_config(
+                {"type": "serial", "times": 5}, 2))
@@ -28,6 +28,8 @@ class OutliersTestCase(test.TestCase):
               ({"max": -1}, False),
               ({"max": 0, "min_iterations": 2}, False),
               ({"max": 0, "sigmas": 0}, False),
+              ({"max": 0, "exact": True}, True),
+              ({"max": 0, "exact": "yes"}, False),
               ({"foo": "bar"}, False))
     @ddt.unpack
     def test_validate(self, config, valid):
@@ -126,3 +128,45 @@ class OutliersTestCase(test.TestCase):
         # but may fail as well on another data
 
         self.assertEqual(single_sla.outliers, merged_sla.outliers)
+
+    def test_result_exact(self):
+        sla_inst = outliers.Outliers({"max": 0, "sigmas": 2, "exact": True})
+        iteration_durations = [3.1, 4.2, 3.6, 4.5, 2.8, 3.3, 4.1, 3.8, 4.3,
+                               2.9, 10.2, 3.4]
+        for d in iteration_durations:
+            sla_inst.add_iteration({"duration": d})
+        sla_inst.add_iteration({"duration": 100, "error": ["Error"]})
+        self.assertEqual(12, sla_inst.iterations)
+        self.assertEqual(1, sla_inst.outliers)  # outlier: 10.2
+        self.assertFalse(sla_inst.result()["success"])
+
+    def test_add_iteration_exact(self):
+        sla_inst = outliers.Outliers({"max": 0, "sigmas": 2, "exact": True})
+        for d in [3.1, 4.2, 3.6, 4.5, 2.8, 3.3, 4.1, 3.8, 4.3, 2.9, 5.3]:
+            self.assertTrue(sla_inst.add_iteration({"duration": d}))
+        # The threshold goes down, so 5.3 becomes an outlier
+        self.assertFalse(sla_inst.add_iteration({"duration": 3.1}))
+        self.assertEqual(1, sla_inst.outliers)
+
+    @ddt.data([[3.1, 4.2, 3.6, 4.5, 2.8, 3.3, 4.1, 3.8, 4.3, 2.9, 10.2],
+               [3.1, 4.2, 3.6, 4.5, 2.8, 3.3, 20.1, 3.8, 4.3, 2.9, 24.2],
+               [3.1, 4.2, 3.6, 4.5, 2.8, 3.3, 4.1, 30.8, 4.3, 49.9, 69.2]])
+    def test_merge_exact(self, durations):
+        config = {"max": 1, "sigmas": 2, "exact": True}
+        single_sla = outliers.Outliers(config)
+        for dd in durations:
+            for d in dd:
+                single_sla.add_iteration({"duration": d})
+
+        slas = [outliers.Outliers(config) for _ in durations]
+        for idx, sla_inst in enumerate(slas):
+            for duration in durations[idx]:
+                sla_inst.add_iteration({"duration": duration})
+        merged_sla = slas[0]
+        for sla_inst in slas[1:]:
+            merged_sla.merge(sla_inst)
+
+        self.assertEqual(single_sla.success, merged_sla.success)
+        self.assertEqual(single_sla.iterations, merged_sla.iterations)
+        self.assertAlmostEqual(single_sla.threshold, merged_sla.threshold)
+        self.assertEqual(single_sla.outliers, merged_sla.outliers)
@@ -154,6 +154,16 @@ def get_verifications():
     ]
 
 
+def compare_tests(verifications):
+    # the same as the database does it
+    test_ids = sorted(set(test_id for v in verifications
+                          for test_id in v.tests))
+    for test_id in test_ids:
+        yield test_id, collections.OrderedDict(
+            (v.uuid, v.tests[test_id]) for v in verifications
+            if test_id in v.tests)
+
+
 class JSONReporterTestCase(test.TestCase):
     def test_validate(self):
         # nothing should fail
@@ -161,10 +171,16 @@ class JSONReporterTestCase(test.TestCase):
         reporters.JSONReporter.validate("")
         reporters.JSONReporter.validate(None)
 
-    def test__generate(self):
-        reporter = reporters.JSONReporter(get_verifications(), None)
+    @mock.patch("%s.objects.Verification.compare_tests" % PATH,
+                side_effect=compare_tests)
+    def test__generate(self, mock_verification_compare_tests):
+        verifications = get_verifications()
+        reporter = reporters.JSONReporter(verifications, None)
         report = reporter._generate()
 
+        mock_verification_compare_tests.assert_called_once_with(
+            verifications)
+
         self.assertEqual(
             collections.OrderedDict(
                 [("foo-bar-1", {"status": "finished",
@@ -287,12 +303,15 @@ class JSONReporterTestCase(test.TestCase):
 
 @ddt.ddt
 class HTMLReporterTestCase(test.TestCase):
+    @mock.patch("%s.objects.Verification.compare_tests" % PATH,
+                side_effect=compare_tests)
     @mock.patch("%s.utils" % PATH)
     @mock.patch("%s.json.dumps" % PATH)
     @ddt.data((reporters.HTMLReporter, False),
               (reporters.HTMLStaticReporter, True))
     @ddt.unpack
-    def test_generate(self, cls, include_libs, mock_dumps, mock_utils):
+    def test_generate(self, cls, include_libs, mock_dumps, mock_utils,
+                      mock_verification_compare_tests):
         mock_render = mock_utils.get_template.return_value.render
 
         reporter = cls(get_verifications(), None)
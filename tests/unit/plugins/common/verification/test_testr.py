@@ -250,7 +250,23 @@ class TestrLauncherTestCase(test.TestCase):
             mock_popen.return_value.stdout, live=True,
             expected_failures=ctx["run_args"]["xfail_list"],
             skipped_tests=ctx["run_args"]["skip_list"],
-            logger_name=launcher.verifier.name)
+            logger_name=launcher.verifier.name, on_test_finished=None)
+
+    @mock.patch("%s.subunit_v2.parse" % PATH)
+    @mock.patch("%s.subprocess.Popen" % PATH)
+    def test_run_with_verification(self, mock_popen, mock_parse):
+        launcher = testr.TestrLauncher(mock.Mock())
+        ctx = {"testr_cmd": ["ls", "-la"],
+               "run_args": {},
+               "verification": mock.Mock()}
+
+        self.assertEqual(mock_parse.return_value, launcher.run(ctx))
+
+        mock_parse.assert_called_once_with(
+            mock_popen.return_value.stdout, live=True,
+            expected_failures=None, skipped_tests=None,
+            logger_name=launcher.verifier.name,
+            on_test_finished=ctx["verification"].add_test)
 
     @mock.patch("%s.manager.VerifierManager.install" % PATH)
     def test_install(self, mock_verifier_manager_install):
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import mock
 
 from rally.common import utils
@@ -63,6 +65,26 @@ class SeekAndDestroyTestCase(test.TestCase):
         # NOTE(boris-42): No logs and no exceptions means no bugs!
         self.assertEqual(0, mock_log.call_count)
 
+    @mock.patch("%s.LOG" % BASE)
+    def test__delete_single_resource_batched(self, mock_log):
+        client_manager = mock.Mock()
+        client_manager.list.side_effect = [
+            [mock.Mock(id="a")], [mock.Mock(id="a")], []]
+        resource = FakeResource(resource="a")
+        resource._manager = mock.Mock(return_value=client_manager)
+        resource._interval = 0
+        resource.is_deleted = mock.Mock(return_value=True)
+
+        self.assertTrue(
+            manager.SeekAndDestroy(None, None, None)._delete_single_resource(
+                resource))
+
+        client_manager.delete.assert_called_once_with("a")
+        self.assertEqual(3, client_manager.list.call_count)
+        # the resource is fetched only when it is missing in the listing
+        resource.is_deleted.assert_called_once_with()
+        self.assertFalse(mock_log.warning.called)
+
     @mock.patch("%s.LOG" % BASE)
     def test__delete_single_resource_timeout(self, mock_log):
 
@@ -289,11 +311,132 @@ class SeekAndDestroyTestCase(test.TestCase):
         cleaner = manager.SeekAndDestroy(manager_cls, None, None)
         cleaner._publisher = mock.Mock()
         cleaner._consumer = mock.Mock()
-        cleaner.exterminate()
+        stats = cleaner.exterminate()
 
         mock_broker_run.assert_called_once_with(cleaner._publisher,
                                                 cleaner._consumer,
-                                                consumers_count=5)
+                                                consumers_count=5,
+                                                streaming=True)
+        self.assertEqual(0, stats["deleted"])
+        self.assertEqual(0, stats["failed"])
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE,
+                side_effect=[True, False, True])
+    def test_exterminate_reports_throughput(self, mock__delete_single_resource,
+                                            mock_log):
+        manager_cls = mock.MagicMock(_threads=2, _service="foo",
+                                     _resource="bar")
+        manager_cls.return_value.name.return_value = base.NoName("bar")
+        cleaner = manager.SeekAndDestroy(manager_cls, None, None)
+        cleaner._publisher = lambda queue: queue.extend(
+            [(None, None, "res%d" % i) for i in range(3)])
+
+        stats = cleaner.exterminate()
+
+        self.assertEqual(2, stats["deleted"])
+        self.assertEqual(1, stats["failed"])
+        self.assertIn("duration", stats)
+        self.assertIn("throughput", stats)
+        self.assertEqual(1, mock_log.info.call_count)
+        self.assertIn("foo.bar", mock_log.info.call_args[0][0])
+
+
+class FakeResource(base.ResourceManager):
+    _interval = 10
+
+    def id(self):
+        return self.raw_resource
+
+    def name(self):
+        return self.raw_resource
+
+
+class DeletionCheckerTestCase(test.TestCase):
+
+    def _resource(self, res_id, client_manager):
+        resource = FakeResource(resource=res_id)
+        resource._manager = mock.Mock(return_value=client_manager)
+        return resource
+
+    def test_is_supported(self):
+        class CustomResource(base.ResourceManager):
+            def is_deleted(self):
+                return True
+
+        checker = manager._DeletionChecker()
+        self.assertTrue(checker.is_supported(FakeResource()))
+        self.assertFalse(checker.is_supported(CustomResource()))
+        self.assertFalse(checker.is_supported(mock.MagicMock()))
+
+    def test_is_listed(self):
+        client_manager = mock.Mock()
+        client_manager.list.return_value = [
+            mock.Mock(id="a", status="ACTIVE"),
+            mock.Mock(id="b", status="DELETED")]
+        checker = manager._DeletionChecker()
+
+        self.assertTrue(checker.is_listed(self._resource("a", client_manager)))
+        self.assertFalse(checker.is_listed(self._resource("b",
+                                                          client_manager)))
+        self.assertFalse(checker.is_listed(self._resource("c",
+                                                          client_manager)))
+        # resources of one client manager share the single listing
+        client_manager.list.assert_called_once_with()
+        self.assertEqual(1, checker.list_calls)
+
+    @mock.patch("%s.time.time" % BASE)
+    def test_is_listed_refreshes_listing(self, mock_time):
+        mock_time.side_effect = [0, 5, 10, 10]
+        client_manager = mock.Mock()
+        client_manager.list.side_effect = [[mock.Mock(id="a")], []]
+        checker = manager._DeletionChecker()
+        resource = self._resource("a", client_manager)
+
+        self.assertTrue(checker.is_listed(resource))
+        self.assertTrue(checker.is_listed(resource))
+        self.assertFalse(checker.is_listed(resource))
+        self.assertEqual(2, client_manager.list.call_count)
+
+    def test_is_listed_does_not_block_other_listings(self):
+        listing_started = threading.Event()
+        release_listing = threading.Event()
+
+        def slow_list():
+            listing_started.set()
+            release_listing.wait(5)
+            return [mock.Mock(id="a")]
+
+        slow_manager = mock.Mock()
+        slow_manager.list.side_effect = slow_list
+        client_manager = mock.Mock()
+        client_manager.list.return_value = [mock.Mock(id="b")]
+        checker = manager._DeletionChecker()
+        results = []
+        thread = threading.Thread(target=lambda: results.append(
+            checker.is_listed(self._resource("a", slow_manager))))
+        thread.start()
+        listing_started.wait(5)
+
+        try:
+            self.assertTrue(checker.is_listed(self._resource("b",
+                                                             client_manager)))
+        finally:
+            release_listing.set()
+            thread.join(5)
+        self.assertEqual([True], results)
+        self.assertEqual(2, checker.list_calls)
+
+    def test_is_listed_fails(self):
+        client_manager = mock.Mock()
+        client_manager.list.side_effect = Exception
+        checker = manager._DeletionChecker()
+        self.assertFalse(checker.is_listed(self._resource("a",
+                                                          client_manager)))
+
+        resource = FakeResource(resource="a")
+        resource._manager = mock.Mock(side_effect=Exception)
+        self.assertFalse(checker.is_listed(resource))
 
 
 class ResourceManagerTestCase(test.TestCase):
@@ -393,6 +536,71 @@ class ResourceManagerTestCase(test.TestCase):
             mock.call().exterminate()
         ])
 
+    @mock.patch("rally.common.plugin.discover.itersubclasses")
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE,
+                return_value=[mock.MagicMock(), mock.MagicMock()])
+    def test_cleanup_parallel(self, mock_find_resource_managers,
+                              mock_seek_and_destroy, mock_itersubclasses):
+        mock_itersubclasses.return_value = []
+        managers = [mock.MagicMock(_order=1), mock.MagicMock(_order=2),
+                    mock.MagicMock(_order=2), mock.MagicMock(_order=3)]
+        mock_find_resource_managers.return_value = managers
+        running = []
+        finished = []
+        parallel = []
+
+        def exterminate(manager, *args, **kwargs):
+            def run():
+                running.append(manager)
+                if manager._order == 2:
+                    # both managers with the same order run simultaneously
+                    for i in range(100):
+                        if len(running) == 3:
+                            parallel.append(manager)
+                            break
+                        utils.interruptable_sleep(0.01)
+                self.assertEqual(
+                    set(m for m in managers if m._order < manager._order),
+                    set(m for m in finished if m._order < manager._order))
+                finished.append(manager)
+            return mock.Mock(exterminate=run)
+
+        mock_seek_and_destroy.side_effect = exterminate
+
+        manager.cleanup(names=["a"], admin="admin", users=["user"])
+
+        self.assertEqual(set(managers[1:3]), set(parallel))
+        self.assertEqual(managers[0], finished[0])
+        self.assertEqual(set(managers[1:3]), set(finished[1:3]))
+        self.assertEqual(managers[3], finished[3])
+
+    @mock.patch("rally.common.plugin.discover.itersubclasses")
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE)
+    def test_cleanup_parallel_fails(self, mock_find_resource_managers,
+                                    mock_seek_and_destroy,
+                                    mock_itersubclasses):
+        mock_itersubclasses.return_value = []
+        managers = [mock.MagicMock(_order=1), mock.MagicMock(_order=1),
+                    mock.MagicMock(_order=2)]
+        mock_find_resource_managers.return_value = managers
+        exterminated = []
+
+        def exterminate(manager, *args, **kwargs):
+            def run():
+                exterminated.append(manager)
+                if manager is managers[0]:
+                    raise KeyError("foo")
+            return mock.Mock(exterminate=run)
+
+        mock_seek_and_destroy.side_effect = exterminate
+
+        self.assertRaises(KeyError, manager.cleanup, names=["a"],
+                          admin="admin", users=["user"])
+        # managers of the same order are processed anyway
+        self.assertEqual(set(managers[:2]), set(exterminated))
+
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
@@ -65,14 +65,9 @@ class NetworkTestCase(test.TestCase):
               {"dns_nameservers": ["1.2.3.4", "5.6.7.8"]})
     @ddt.unpack
     @mock.patch(NET + "wrap")
-    @mock.patch("rally.plugins.openstack.context.network.networks.utils")
     @mock.patch("rally.osclients.Clients")
-    def test_setup(self, mock_clients, mock_utils, mock_wrap, **dns_kwargs):
-        mock_utils.iterate_per_tenants.return_value = [
-            ("foo_user", "foo_tenant"),
-            ("bar_user", "bar_tenant")]
+    def test_setup(self, mock_clients, mock_wrap, **dns_kwargs):
         mock_create = mock.Mock(side_effect=lambda t, **kw: t + "-net")
-        mock_utils.generate_random_name = mock.Mock()
         mock_wrap.return_value = mock.Mock(create_network=mock_create)
         nets_per_tenant = 2
         net_context = network_context.Network(
@@ -89,11 +84,9 @@ class NetworkTestCase(test.TestCase):
             mock.call(tenant, add_router=True,
                       subnets_num=1, network_create_args={"fakearg": "fake"},
                       **dns_kwargs)
-            for user, tenant in mock_utils.iterate_per_tenants.return_value]
-        mock_create.assert_has_calls(create_calls)
+            for tenant in ("foo_tenant", "bar_tenant")] * nets_per_tenant
+        mock_create.assert_has_calls(create_calls, any_order=True)
 
-        mock_utils.iterate_per_tenants.assert_called_once_with(
-            net_context.context["users"])
         expected_networks = ["bar_tenant-net",
                              "foo_tenant-net"] * nets_per_tenant
         actual_networks = []
@@ -0,0 +1,79 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+
+from rally import exceptions
+from rally.plugins.openstack.context import utils
+from tests.unit import test
+
+
+class RunPerTenantsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(RunPerTenantsTestCase, self).setUp()
+        self.ctx = mock.Mock(context={
+            "users": [{"id": "u1", "tenant_id": "t1"},
+                      {"id": "u2", "tenant_id": "t1"},
+                      {"id": "u3", "tenant_id": "t2"},
+                      {"id": "u4", "tenant_id": "t3"}]})
+        self.ctx.get_name.return_value = "foo"
+
+    def test_run_per_tenants(self):
+        calls = []
+        threads = set()
+
+        def func(user, tenant_id, iteration):
+            calls.append((user["id"], tenant_id, iteration))
+            threads.add(threading.current_thread())
+
+        utils.run_per_tenants(self.ctx, func, workers=2)
+
+        self.assertEqual([("u1", "t1", 0), ("u3", "t2", 1), ("u4", "t3", 2)],
+                         sorted(calls))
+        self.assertLessEqual(len(threads), 2)
+
+    @mock.patch("rally.plugins.openstack.context.utils.CONF")
+    def test_run_per_tenants_default_workers(self, mock_conf):
+        mock_conf.tenants_context.resource_management_workers = 1
+        threads = set()
+        utils.run_per_tenants(
+            self.ctx,
+            lambda *args: threads.add(threading.current_thread()))
+        self.assertEqual(1, len(threads))
+
+    def test_run_per_tenants_without_users(self):
+        func = mock.Mock()
+        utils.run_per_tenants(mock.Mock(context={}), func)
+        self.assertFalse(func.called)
+
+    @mock.patch("rally.plugins.openstack.context.utils.LOG")
+    def test_run_per_tenants_failures(self, mock_log):
+        calls = []
+
+        def func(user, tenant_id, iteration):
+            calls.append(tenant_id)
+            if tenant_id != "t2":
+                raise Exception("fail in %s" % tenant_id)
+
+        e = self.assertRaises(exceptions.ContextSetupFailure,
+                              utils.run_per_tenants, self.ctx, func,
+                              workers=1)
+
+        # a failure in one tenant does not stop others
+        self.assertEqual(["t1", "t2", "t3"], calls)
+        self.assertIn("Failed for 2 of 3 tenants", "%s" % e)
+        self.assertIn("t1: fail in t1", "%s" % e)
+        self.assertIn("t3: fail in t3", "%s" % e)
+        self.assertEqual(2, mock_log.error.call_count)
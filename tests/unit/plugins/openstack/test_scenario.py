@@ -51,7 +51,7 @@ class OpenStackScenarioTestCase(test.TestCase):
         scenario = base_scenario.OpenStackScenario(self.context)
         self.assertEqual(self.context, scenario.context)
         self.osclients.mock.assert_called_once_with(
-            self.context["admin"]["credential"], {})
+            self.context["admin"]["credential"], {}, cache={})
 
         scenario = base_scenario.OpenStackScenario(
             self.context, admin_clients="foobar")
@@ -75,7 +75,23 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context["tenants"]["foo"],
                          scenario.context["tenant"])
 
-        self.osclients.mock.assert_called_once_with(user["credential"], {})
+        self.osclients.mock.assert_called_once_with(
+            user["credential"], {}, cache={})
+
+    def test_init_shares_clients_cache(self):
+        self.context["admin"] = {"credential": mock.Mock()}
+        self.context["user"] = {"credential": mock.Mock()}
+
+        base_scenario.OpenStackScenario(self.context)
+        base_scenario.OpenStackScenario(self.context)
+
+        admin_call, user_call = self.osclients.mock.call_args_list[:2]
+        self.assertEqual(
+            [admin_call, user_call],
+            self.osclients.mock.call_args_list[2:])
+        self.assertIs(admin_call[1]["cache"],
+                      self.osclients.mock.call_args_list[2][1]["cache"])
+        self.assertIsNot(admin_call[1]["cache"], user_call[1]["cache"])
 
     def test_init_clients(self):
         scenario = base_scenario.OpenStackScenario(self.context,
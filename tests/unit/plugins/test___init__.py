@@ -0,0 +1,190 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import mock
+
+from rally import plugins
+from tests.unit import test
+
+
+PLUGINS = "rally.plugins"
+
+
+class LoadTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LoadTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.manifest_path = os.path.join(self.tmp_dir, "manifest.json")
+        self.module_path = os.path.join(self.tmp_dir, "foo.py")
+        with open(self.module_path, "w") as f:
+            f.write("")
+        self.modules = {"foo": self.module_path}
+        for name, value in (("MANIFEST_PATH", self.manifest_path),
+                            ("PLUGINS_LOADED", False)):
+            patcher = mock.patch("%s.%s" % (PLUGINS, name), value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _make_plugin(self, name="bar", module="foo"):
+        plugin = mock.Mock(__module__=module, spec=["get_name",
+                                                    "get_namespace",
+                                                    "_get_base",
+                                                    "_meta_is_inited"])
+        plugin.get_name.return_value = name
+        plugin.get_namespace.return_value = "ns"
+        plugin._get_base.return_value.__name__ = "Base"
+        return plugin
+
+    @mock.patch("%s.discover.itersubclasses" % PLUGINS)
+    def test__make_manifest(self, mock_itersubclasses):
+        not_inited = self._make_plugin()
+        not_inited._meta_is_inited.return_value = False
+        mock_itersubclasses.return_value = [
+            self._make_plugin(), not_inited,
+            self._make_plugin("from_dir", module="some_dir_module")]
+
+        self.assertEqual(
+            {"format": plugins.MANIFEST_FORMAT,
+             "files": {self.module_path: os.path.getmtime(self.module_path)},
+             "plugins": [{"name": "bar", "namespace": "ns", "base": "Base",
+                          "module": "foo"}],
+             "modules": ["foo"]},
+            plugins._make_manifest(self.modules))
+
+    def test__write_manifest_and__read_manifest(self):
+        self.assertIsNone(plugins._read_manifest(self.modules))
+
+        manifest = {"format": plugins.MANIFEST_FORMAT,
+                    "files": {self.module_path:
+                              os.path.getmtime(self.module_path)},
+                    "plugins": []}
+        plugins._write_manifest(manifest)
+        self.assertEqual(manifest, plugins._read_manifest(self.modules))
+        self.assertEqual(["foo.py", "manifest.json"],
+                         sorted(os.listdir(self.tmp_dir)))
+
+        # new module is added
+        self.assertIsNone(plugins._read_manifest(
+            dict(self.modules, bar="/bar.py")))
+
+        # module is changed
+        os.utime(self.module_path, (0, 0))
+        self.assertIsNone(plugins._read_manifest(self.modules))
+
+    def test__read_manifest_of_other_format(self):
+        with open(self.manifest_path, "w") as f:
+            json.dump({"format": -1}, f)
+        self.assertIsNone(plugins._read_manifest(self.modules))
+
+    @mock.patch("%s.LOG" % PLUGINS)
+    def test__write_manifest_fails(self, mock_log):
+        with mock.patch("%s.MANIFEST_PATH" % PLUGINS,
+                        os.path.join(self.module_path, "manifest.json")):
+            plugins._write_manifest({})
+        self.assertTrue(mock_log.debug.called)
+
+    @mock.patch("%s.discover" % PLUGINS)
+    def test_load(self, mock_discover):
+        plugins.load()
+
+        self.assertEqual(
+            [mock.call(p) for p in plugins.PACKAGES],
+            mock_discover.import_modules_from_package.call_args_list)
+        mock_discover.import_modules_by_entry_point.assert_called_once_with()
+        self.assertEqual(2, mock_discover.load_plugins.call_count)
+        self.assertTrue(plugins.PLUGINS_LOADED)
+
+        plugins.load()
+        mock_discover.import_lazy_modules.assert_called_once_with()
+        self.assertEqual(2, mock_discover.load_plugins.call_count)
+
+    @mock.patch("%s._make_manifest" % PLUGINS)
+    @mock.patch("%s._find_modules" % PLUGINS)
+    @mock.patch("%s.discover" % PLUGINS)
+    def test_load_lazy(self, mock_discover, mock__find_modules,
+                       mock__make_manifest):
+        mock__find_modules.return_value = self.modules
+        manifest = {"format": plugins.MANIFEST_FORMAT,
+                    "files": {self.module_path:
+                              os.path.getmtime(self.module_path)},
+                    "plugins": [{"name": "bar", "namespace": "ns",
+                                 "base": "Base", "module": "foo"}],
+                    "modules": ["foo", "baz"]}
+        mock__make_manifest.return_value = manifest
+
+        # the manifest is missed, so all the modules are imported
+        plugins.load(lazy=True)
+
+        mock_discover.import_modules_by_entry_point.assert_called_once_with()
+        mock__make_manifest.assert_called_once_with(self.modules)
+        self.assertFalse(mock_discover.import_lazily.called)
+        with open(self.manifest_path) as f:
+            self.assertEqual(manifest, json.load(f))
+
+        # the manifest is used
+        mock_discover.reset_mock()
+        plugins.PLUGINS_LOADED = False
+        plugins.load(lazy=True)
+
+        self.assertFalse(mock_discover.import_modules_from_package.called)
+        self.assertFalse(mock_discover.import_modules_by_entry_point.called)
+        mock_discover.import_lazily.assert_called_once_with(
+            manifest["plugins"], ["foo", "baz"])
+        self.assertEqual(2, mock_discover.load_plugins.call_count)
+
+        # plugins are already loaded
+        mock_discover.reset_mock()
+        plugins.load(lazy=True)
+        self.assertFalse(mock_discover.import_lazy_modules.called)
+        self.assertFalse(mock_discover.load_plugins.called)
+
+    def test_load_lazy_from_manifest_finds_subclasses(self):
+        # NOTE: modules can not be unloaded, so plugins are loaded by
+        # separate processes: the first one makes the manifest and the
+        # second one loads plugins from it
+        code = ("from rally.common.plugin import discover\n"
+                "from rally import plugins\n"
+                "from rally.plugins.openstack.cleanup import base\n"
+                "plugins.load(lazy=True)\n"
+                "print(len(list(discover.itersubclasses("
+                "base.ResourceManager))))\n")
+        env = dict(os.environ, HOME=self.tmp_dir)
+        with open(os.devnull, "w") as devnull:
+            counts = [int(subprocess.check_output(
+                [sys.executable, "-c", code], env=env,
+                stderr=devnull).split()[-1]) for i in range(2)]
+
+        self.assertTrue(os.path.exists(
+            os.path.join(self.tmp_dir, ".rally", "plugins_manifest.json")))
+        self.assertGreater(counts[0], 0)
+        self.assertEqual(counts[0], counts[1])
+
+    @mock.patch("%s.load" % PLUGINS)
+    def test_ensure_plugins_are_loaded(self, mock_load):
+        @plugins.ensure_plugins_are_loaded
+        def f(*args, **kwargs):
+            return args, kwargs
+
+        self.assertEqual(((1,), {"a": 2}), f(1, a=2))
+        mock_load.assert_called_once_with(lazy=True)
@@ -14,12 +14,14 @@
 #    under the License.
 
 import collections
+import json
 
 import ddt
 import mock
 
 from rally.common.plugin import plugin
 from rally.task.processing import charts
+from rally.task.processing import utils
 from tests.unit import test
 
 CHARTS = "rally.task.processing.charts."
@@ -92,6 +94,20 @@ class ChartTestCase(test.TestCase):
             chart._merge_atomic_actions(atomic_actions)
         )
 
+    @mock.patch(CHARTS + "utils.AtomicMerger")
+    def test__get_atomic_merger(self, mock_atomic_merger):
+        chart = self.Chart(self.wload_info)
+        merger = mock_atomic_merger.return_value
+        merger.get_merged_names.return_value = ["a", "b"]
+        for i in range(3):
+            self.assertEqual(["a", "b"], chart._get_atomic_names())
+            chart._merge_atomic_actions([])
+        mock_atomic_merger.assert_called_once_with(
+            self.wload_info["atomic"])
+        merger.get_merged_names.assert_called_once_with()
+        self.assertEqual([mock.call([])] * 3,
+                         merger.merge_atomic_actions.mock_calls)
+
 
 class MainStackedAreaChartTestCase(test.TestCase):
 
@@ -283,6 +299,13 @@ class HistogramChartTestCase(test.TestCase):
                       {"id": 2, "name": "Rice Rule"}]}
         self.assertEqual(expected, chart.render())
 
+    def test_add_iteration_bins_edges(self):
+        chart = self.HistogramChart({"iterations_count": 4})
+        # Sturges Formula gives 3 bins: 2.2, 3.2 and 4.2
+        [chart.add_iteration({"foo": {"bar": x}})
+         for x in (None, 2.2, 2.2000001, 3.2, 4.2, 4.3)]
+        self.assertEqual([2, 2, 1], chart._data["bar"]["views"][1]["y"])
+
     @ddt.data(
         {"base_size": 2, "min_value": 1, "max_value": 4,
          "expected": [{"bins": 2, "view": "Square Root Choice",
@@ -547,6 +570,103 @@ class MainStatsTableTestCase(test.TestCase):
                     "rows": expected_rows}
         self.assertEqual(expected, table.render())
 
+        # atomic actions are collected from iterations if info has no them
+        table = charts.MainStatsTable(
+            {"iterations_count": info["iterations_count"]})
+        for el in data:
+            table.add_iteration(el)
+        self.assertEqual(expected, table.render())
+
+    def test_add_iteration_and_render_repeated_atomics(self):
+        table = charts.MainStatsTable({})
+        table.add_iteration(generate_iteration(5.0, False, ("foo", 1.0)))
+        table.add_iteration(generate_iteration(
+            10.0, False, ("foo", 1.0), ("bar", 2.0), ("foo", 3.0)))
+        table.add_iteration(generate_iteration(
+            10.0, True, ("foo", 2.0), ("foo", 2.0)))
+        self.assertEqual(
+            [["foo (x2)", 4.0, 4.0, 4.0, 4.0, 4.0, 4.0, "50.0%", 2],
+             ["bar", 2.0, 2.0, 2.0, 2.0, 2.0, 2.0, "100.0%", 1],
+             ["total", 5.0, 7.5, 9.5, 9.75, 10.0, 7.5, "66.7%", 3]],
+            table.render()["rows"])
+
+
+@ddt.ddt
+class AddColumnsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AddColumnsTestCase, self).setUp()
+        self.iterations = []
+        for i in range(13):
+            actions = [("bar", 0.1 * i), ("foo", 1), ("bar", 0.3)]
+            if i % 4 == 0:
+                # the first iteration has no `foo' action
+                actions = actions[:1]
+            self.iterations.append(
+                {"duration": 1.5 + 0.7 * i if i % 3 else i + 2,
+                 "idle_duration": 0.2 * (i % 2), "timestamp": 100 + i,
+                 "error": ["Error", "msg", ""] if i % 5 == 1 else [],
+                 "atomic_actions": [
+                     {"name": name, "started_at": 1.0,
+                      "finished_at": 1.0 + duration}
+                     for name, duration in actions]})
+        self.info = {
+            "iterations_count": 13, "iterations_failed": 3,
+            "min_duration": 1.5, "max_duration": 11,
+            "tstamp_start": 100, "load_duration": 30,
+            "atomic": collections.OrderedDict([
+                ("foo", {"min_duration": 1, "max_duration": 1}),
+                ("bar", {"min_duration": 0.3, "max_duration": 1.5,
+                         "count": 2})])}
+
+    class Chart(charts.Chart):
+
+        widget = "FooWidget"
+
+        def _map_iteration_values(self, iteration):
+            return [("errors", len(iteration["error"])),
+                    ("actions", len(iteration["atomic_actions"]))]
+
+    def _assert_add_columns(self, chart_cls):
+        expected = chart_cls(self.info)
+        chart = chart_cls(self.info)
+        columns = utils.IterationColumns(self.info)
+        for iteration in self.iterations:
+            expected.add_iteration(iteration)
+            columns.add_iteration(iteration)
+
+        chart.add_columns(columns)
+
+        self.assertEqual(json.dumps(expected.render()),
+                         json.dumps(chart.render()))
+
+    @ddt.data(charts.MainStackedAreaChart, charts.AtomicStackedAreaChart,
+              charts.AtomicAvgChart, charts.LoadProfileChart,
+              charts.MainHistogramChart, charts.AtomicHistogramChart,
+              charts.MainStatsTable, Chart)
+    def test_add_columns(self, chart_cls):
+        self._assert_add_columns(chart_cls)
+
+    @ddt.data(charts.MainStackedAreaChart, charts.AtomicStackedAreaChart,
+              charts.AtomicAvgChart, charts.LoadProfileChart,
+              charts.MainHistogramChart, charts.AtomicHistogramChart,
+              charts.MainStatsTable, Chart)
+    def test_add_columns_without_atomic_actions(self, chart_cls):
+        self.info["atomic"] = collections.OrderedDict()
+        for iteration in self.iterations:
+            iteration["atomic_actions"] = []
+        self._assert_add_columns(chart_cls)
+
+    @ddt.data(charts.MainStackedAreaChart, charts.AtomicStackedAreaChart,
+              charts.AtomicAvgChart, charts.MainHistogramChart,
+              charts.AtomicHistogramChart, charts.MainStatsTable)
+    def test_add_columns_empty(self, chart_cls):
+        self.info["iterations_count"] = 0
+        chart = chart_cls(self.info)
+        chart.add_columns(utils.IterationColumns(self.info))
+        self.assertEqual(json.dumps(chart_cls(self.info).render()),
+                         json.dumps(chart.render()))
+
 
 class OutputChartTestCase(test.TestCase):
 
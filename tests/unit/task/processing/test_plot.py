@@ -44,7 +44,9 @@ class PlotTestCase(test.TestCase):
             {"timestamp": i + 2, "error": [],
              "duration": i + 5, "idle_duration": i,
              "output": {"additive": [], "complete": []},
-             "atomic_actions": {"foo_action": i + 10}} for i in range(10)]
+             "atomic_actions": [{"name": "foo_action", "started_at": 0,
+                                 "finished_at": i + 10}]}
+            for i in range(10)]
         data = {"iterations": iterations, "sla": [],
                 "key": {"kw": {"runner": {"type": "constant"}}, "pos": 0,
                         "name": "Foo.bar", "description": "Description!!"},
@@ -80,6 +82,19 @@ class PlotTestCase(test.TestCase):
              "output_errors": [],
              "sla": [], "sla_success": True, "table": "main_stats"},
             result)
+        for mock_ins in (mock_charts.MainStatsTable,
+                         mock_charts.MainStackedAreaChart,
+                         mock_charts.AtomicStackedAreaChart,
+                         mock_charts.LoadProfileChart,
+                         mock_charts.MainHistogramChart,
+                         mock_charts.AtomicHistogramChart,
+                         mock_charts.AtomicAvgChart):
+            mock_ins.assert_called_once_with(data["info"])
+            columns = mock_ins.return_value.add_columns.call_args[0][0]
+            self.assertEqual([i + 5 for i in range(10)], columns.duration)
+            self.assertEqual({"foo_action": [i + 10 for i in range(10)]},
+                             dict(columns.atomic))
+            self.assertFalse(mock_ins.return_value.add_iteration.called)
 
     @ddt.data(
         {"hooks": [], "expected": []},
@@ -223,6 +238,7 @@ class PlotTestCase(test.TestCase):
             {"id": None, "created_at": None, "updated_at": None,
              "task_uuid": None, "key": "%s_key" % k,
              "data": {"raw": "%s_result" % k,
+                      "statistics": None,
                       "full_duration": "%s_full_duration" % k,
                       "load_duration": "%s_load_duration" % k,
                       "hooks": "%s_hooks" % k,
@@ -95,3 +95,52 @@ class AtomicMergerTestCase(test.TestCase):
         self.assertEqual(collections.OrderedDict([("foo", 1.1),
                                                   ("bar (x2)", 2.4)]),
                          atomic_merger.merge_atomic_actions(atomic_actions))
+
+    def test_merge_atomic_actions_unordered(self):
+        atomic_merger = utils.AtomicMerger(self.atomic)
+        atomic_actions = [{"name": "bar",
+                           "started_at": 0,
+                           "finished_at": 0.1},
+                          {"name": "spam",
+                           "started_at": 0.1,
+                           "finished_at": 0.5},
+                          {"name": "foo",
+                           "started_at": 0.5,
+                           "finished_at": 1.5},
+                          {"name": "bar",
+                           "started_at": 1.5,
+                           "finished_at": 1.7}]
+        self.assertEqual(
+            [("foo", 1.0), ("bar (x2)", (0.1 - 0) + (1.7 - 1.5))],
+            list(atomic_merger.merge_atomic_actions(atomic_actions).items()))
+
+
+class IterationColumnsTestCase(test.TestCase):
+
+    def test_add_iteration(self):
+        columns = utils.IterationColumns(
+            {"atomic": collections.OrderedDict([("foo", {}),
+                                                ("bar", {"count": 2})])})
+        self.assertEqual(0, len(columns))
+
+        iterations = [
+            {"duration": 5, "idle_duration": 1, "timestamp": 10, "error": [],
+             "atomic_actions": [
+                 {"name": "bar", "started_at": 0, "finished_at": 1},
+                 {"name": "foo", "started_at": 1, "finished_at": 3},
+                 {"name": "bar", "started_at": 3, "finished_at": 4.5}]},
+            {"duration": 2.5, "idle_duration": 0, "timestamp": 11,
+             "error": ["KeyError", "foo", "trace"],
+             "atomic_actions": [
+                 {"name": "foo", "started_at": 0, "finished_at": 2}]}]
+        for iteration in iterations:
+            columns.add_iteration(iteration)
+
+        self.assertEqual(2, len(columns))
+        self.assertEqual([5, 2.5], columns.duration)
+        self.assertEqual([1, 0], columns.idle_duration)
+        self.assertEqual([10, 11], columns.timestamp)
+        self.assertEqual([[], ["KeyError", "foo", "trace"]], columns.error)
+        self.assertEqual([("foo", [2, 2]), ("bar (x2)", [2.5, None])],
+                         list(columns.atomic.items()))
+        self.assertEqual(iterations, list(columns.rows()))
@@ -14,7 +14,9 @@
 #    under the License.
 
 import mock
+from oslo_config import fixture
 
+from rally import exceptions
 from rally.task import atomic
 from tests.unit import test
 
@@ -67,6 +69,18 @@ class AtomicActionTestCase(test.TestCase):
                            "started_at": 1, "finished_at": 3}],
                          inst.atomic_actions())
 
+    def test_action_timer_with_wrong_name(self):
+        inst = atomic.ActionTimerMixin()
+
+        self.assertRaises(exceptions.RallyException,
+                          atomic.ActionTimer, inst, 42)
+        self.assertEqual([], inst.atomic_actions())
+
+        self.useFixture(fixture.Config()).config(result_validation="off")
+        with atomic.ActionTimer(inst, 42):
+            pass
+        self.assertEqual(42, inst.atomic_actions()[0]["name"])
+
     @mock.patch("time.time", side_effect=[1, 3])
     def test_action_timer_decorator(self, mock_time):
 
@@ -15,13 +15,13 @@
 
 """Tests for the Test engine."""
 
-import collections
 import json
 import threading
 
 import mock
 
 from rally.common import objects
+from rally.common import utils as rutils
 from rally.common import validation
 from rally import consts
 from rally import exceptions
@@ -658,6 +658,95 @@ class TaskEngineTestCase(test.TestCase):
         self.assertEqual(result, expected_result)
         mock_scenario_get.assert_called_once_with(name)
 
+    @mock.patch("rally.task.engine.runner.ScenarioRunner.get")
+    def test__get_runner(self, mock_scenario_runner_get):
+        runner_cls = mock_scenario_runner_get.return_value
+        runner_cls.CONFIG_SCHEMA = {"properties": {"max_cpu_count": {}}}
+        task = mock.MagicMock()
+        eng = engine.TaskEngine({}, task, mock.Mock())
+
+        self.assertEqual(runner_cls.return_value,
+                         eng._get_runner({"type": "foo"}))
+        runner_cls.assert_called_once_with(task, {"type": "foo"})
+        mock_scenario_runner_get.assert_called_once_with("foo")
+
+        runner_cls.reset_mock()
+        eng._get_runner({"type": "foo"}, max_cpu_count=2)
+        runner_cls.assert_called_once_with(
+            task, {"type": "foo", "max_cpu_count": 2})
+
+        runner_cls.reset_mock()
+        eng._get_runner({"type": "foo", "max_cpu_count": 4}, max_cpu_count=2)
+        runner_cls.assert_called_once_with(
+            task, {"type": "foo", "max_cpu_count": 4})
+
+        runner_cls.reset_mock()
+        runner_cls.CONFIG_SCHEMA = {"properties": {}}
+        eng._get_runner({"type": "foo"}, max_cpu_count=2)
+        runner_cls.assert_called_once_with(task, {"type": "foo"})
+
+    @mock.patch("rally.task.engine.multiprocessing.cpu_count",
+                return_value=4)
+    @mock.patch("rally.task.engine.TaskEngine._run_workload")
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test__run_subtask_in_parallel(self, mock_task_config,
+                                      mock_task_engine__run_workload,
+                                      mock_cpu_count):
+        workloads = [mock.Mock(), mock.Mock()]
+        started = []
+        both_started = threading.Event()
+
+        def run_workload(subtask_obj, workload, max_cpu_count=None):
+            started.append(workload)
+            if len(started) == len(workloads):
+                both_started.set()
+            # workloads do not wait for each other to finish
+            self.assertTrue(both_started.wait(5))
+
+        mock_task_engine__run_workload.side_effect = run_workload
+        subtask = mock.Mock(workloads=workloads, run_in_parallel=True)
+        subtask.to_dict.return_value = {"title": "foo"}
+        task = mock.MagicMock()
+        eng = engine.TaskEngine(mock.MagicMock(), task, mock.Mock())
+
+        eng._run_subtask(subtask)
+
+        self.assertEqual(set(workloads), set(started))
+        subtask_obj = task.add_subtask.return_value
+        mock_task_engine__run_workload.assert_has_calls(
+            [mock.call(subtask_obj, w, max_cpu_count=2) for w in workloads],
+            any_order=True)
+        subtask_obj.update_status.assert_called_once_with(
+            consts.SubtaskStatus.FINISHED)
+
+    @mock.patch("rally.task.engine.TaskEngine._run_workload")
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test__run_subtask_in_parallel_failures(self, mock_task_config,
+                                               mock_task_engine__run_workload):
+        workloads = [mock.Mock(), mock.Mock(), mock.Mock()]
+        subtask = mock.Mock(workloads=workloads, run_in_parallel=True)
+        subtask.to_dict.return_value = {"title": "foo"}
+        task = mock.MagicMock()
+        subtask_obj = task.add_subtask.return_value
+        eng = engine.TaskEngine(mock.MagicMock(), task, mock.Mock())
+
+        mock_task_engine__run_workload.side_effect = [
+            engine.TaskAborted(), None, engine.TaskAborted()]
+        self.assertRaises(engine.TaskAborted, eng._run_subtask, subtask)
+        subtask_obj.update_status.assert_called_once_with(
+            consts.SubtaskStatus.ABORTED)
+        self.assertEqual(3, mock_task_engine__run_workload.call_count)
+
+        subtask_obj.update_status.reset_mock()
+        mock_task_engine__run_workload.side_effect = [
+            engine.TaskAborted(), MyException(), None]
+        # crash of any workload crashes the whole task
+        self.assertRaises(MyException, eng._run_subtask, subtask)
+        subtask_obj.update_status.assert_called_once_with(
+            consts.SubtaskStatus.CRASHED)
+        task.update_status.assert_called_once_with(
+            consts.TaskStatus.CRASHED)
+
 
 class ResultConsumerTestCase(test.TestCase):
 
@@ -681,8 +770,8 @@ class ResultConsumerTestCase(test.TestCase):
             [{"duration": 2, "timestamp": 2}]
         ]
 
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = rutils.WaitableDeque(results)
+        runner.event_queue = rutils.WaitableDeque()
         with engine.ResultConsumer(
                 key, task, subtask, workload, runner, False) as consumer_obj:
             pass
@@ -717,8 +806,8 @@ class ResultConsumerTestCase(test.TestCase):
         runner = mock.MagicMock()
 
         results = []
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = rutils.WaitableDeque(results)
+        runner.event_queue = rutils.WaitableDeque()
         with engine.ResultConsumer(
                 key, task, subtask, workload, runner, False):
             pass
@@ -727,6 +816,7 @@ class ResultConsumerTestCase(test.TestCase):
         workload.set_results.assert_called_once_with({
             "full_duration": 1,
             "sla": mock_sla_results,
+            "statistics": objects.WorkloadStatistics().to_dict(),
             "load_duration": 0
         })
 
@@ -746,7 +836,7 @@ class ResultConsumerTestCase(test.TestCase):
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
 
-        runner.result_queue = collections.deque(
+        runner.result_queue = rutils.WaitableDeque(
             [[{"duration": 1, "timestamp": 1},
               {"duration": 2, "timestamp": 2}]] * 4)
 
@@ -766,7 +856,7 @@ class ResultConsumerTestCase(test.TestCase):
                                             mock_event, mock_thread,
                                             mock_task_get_status,
                                             mock_hook_executor):
-        runner = mock.MagicMock(result_queue=False)
+        runner = mock.MagicMock(result_queue=rutils.WaitableDeque())
 
         is_done = mock.MagicMock()
         is_done.isSet.side_effect = (False, True)
@@ -803,9 +893,9 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque(
+        runner.result_queue = rutils.WaitableDeque(
             [[{"duration": 1, "timestamp": 4}]] * 4)
-        runner.event_queue = collections.deque()
+        runner.event_queue = rutils.WaitableDeque()
 
         with engine.ResultConsumer(key, task, subtask, workload,
                                    runner, False):
@@ -827,8 +917,8 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1])
-        runner.event_queue = collections.deque()
+        runner.result_queue = rutils.WaitableDeque([1])
+        runner.event_queue = rutils.WaitableDeque()
         exc = MyException()
         try:
             with engine.ResultConsumer(key, task, subtask, workload,
@@ -867,8 +957,8 @@ class ResultConsumerTestCase(test.TestCase):
             [{"duration": 7, "timestamp": 1}],
         ]
 
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = rutils.WaitableDeque(results)
+        runner.event_queue = rutils.WaitableDeque()
         with engine.ResultConsumer(
                 key, task, subtask, workload, runner, False) as consumer_obj:
             pass
@@ -920,8 +1010,8 @@ class ResultConsumerTestCase(test.TestCase):
             {"type": "iteration", "value": 2},
             {"type": "iteration", "value": 3}
         ]
-        runner.result_queue = collections.deque()
-        runner.event_queue = collections.deque(events)
+        runner.result_queue = rutils.WaitableDeque()
+        runner.event_queue = rutils.WaitableDeque(events)
 
         consumer_obj = engine.ResultConsumer(key, task, subtask,
                                              workload, runner, False)
@@ -946,6 +1036,7 @@ class ResultConsumerTestCase(test.TestCase):
         workload.set_results.assert_called_once_with({
             "full_duration": 1,
             "sla": mock_sla_results,
+            "statistics": objects.WorkloadStatistics().to_dict(),
             "hooks": mock_hook_results,
             "load_duration": 0
         })
@@ -1086,6 +1177,20 @@ class TaskTestCase(test.TestCase):
             mock.call(subtask_conf2)])
 
 
+class SubTaskTestCase(test.TestCase):
+
+    def test_to_dict(self):
+        subtask = engine.SubTask({"title": "foo", "workloads": []})
+        self.assertEqual({"title": "foo", "description": None,
+                          "context": {}, "run_in_parallel": False},
+                         subtask.to_dict())
+
+        subtask = engine.SubTask({"title": "foo", "workloads": [],
+                                  "run_in_parallel": True})
+        self.assertTrue(subtask.run_in_parallel)
+        self.assertTrue(subtask.to_dict()["run_in_parallel"])
+
+
 class WorkloadTestCase(test.TestCase):
 
     def setUp(self):
@@ -15,10 +15,13 @@
 
 import collections
 import multiprocessing
+import threading
 
 import ddt
 import mock
+from six.moves import queue as Queue
 
+from rally.common import utils as rutils
 from rally.plugins.common.runners import serial
 from rally.task import runner
 from rally.task import scenario
@@ -29,6 +32,7 @@ from tests.unit import test
 BASE = "rally.task.runner."
 
 
+@ddt.ddt
 class ScenarioRunnerHelpersTestCase(test.TestCase):
 
     @mock.patch(BASE + "utils.format_exc")
@@ -51,6 +55,37 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
         context_obj = {"foo": "bar"}
         result = runner._get_scenario_context(13, context_obj)
         self.assertEqual(result, {"foo": "bar", "iteration": 14})
+        self.assertEqual({"foo": "bar"}, context_obj)
+
+    def test_get_scenario_context_shares_locked_structures(self):
+        context_obj = rutils.LockedDict(
+            {"users": [{"id": "u1"}], "tenants": {"t1": {"id": "t1"}}})
+
+        first = runner._get_scenario_context(0, context_obj)
+        second = runner._get_scenario_context(1, context_obj)
+
+        self.assertEqual(1, first["iteration"])
+        self.assertEqual(2, second["iteration"])
+        # the top level is an usual dict which is unique for the iteration
+        first["user"] = first["users"][0]
+        self.assertNotIn("user", second)
+        self.assertNotIn("user", context_obj)
+        # nested structures are shared and read-only
+        self.assertIs(first["tenants"], second["tenants"])
+        self.assertRaises(RuntimeError,
+                          first["tenants"]["t1"].__setitem__, "foo", "bar")
+
+    def test_copy_scenario_args(self):
+        args = {"foo": "bar", "size": 1}
+        copied = runner._copy_scenario_args(args)
+        self.assertEqual(args, copied)
+        self.assertIsNot(args, copied)
+
+        args = {"foo": {"bar": [1]}, "size": 1}
+        copied = runner._copy_scenario_args(args)
+        self.assertEqual(args, copied)
+        self.assertIsNot(args["foo"], copied["foo"])
+        self.assertIsNot(args["foo"]["bar"], copied["foo"]["bar"])
 
     def test_run_scenario_once_internal_logic(self):
         context = runner._get_scenario_context(
@@ -129,6 +164,47 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
         self.assertEqual(expected_error[:2],
                          ["Exception", "Something went wrong"])
 
+    @ddt.data((10, 3, [4, 3, 3]), (9, 3, [3, 3, 3]), (2, 3, [1, 1]),
+              (5, 1, [5]), (0, 3, []))
+    @ddt.unpack
+    def test_split_evenly(self, number, parts, expected):
+        self.assertEqual(expected, runner.split_evenly(number, parts))
+
+    def test_iteration_tracker(self):
+        tracker = runner._IterationTracker()
+        self.assertEqual(threading.current_thread().ident, tracker.ident)
+        self.assertTrue(tracker.isAlive())
+        tracker.finish()
+        self.assertFalse(tracker.isAlive())
+
+    @mock.patch(BASE + "rutils.terminate_thread")
+    def test_iteration_tracker_terminate(self, mock_terminate_thread):
+        tracker = runner._IterationTracker()
+        tracker.start()
+        tracker.terminate()
+        mock_terminate_thread.assert_called_once_with(tracker.ident)
+        self.assertFalse(tracker.isAlive())
+
+        tracker.terminate()
+        self.assertEqual(1, mock_terminate_thread.call_count)
+
+    @ddt.data(False, True)
+    @mock.patch(BASE + "rutils.terminate_thread")
+    def test_iteration_tracker_terminate_not_running(
+            self, finished, mock_terminate_thread):
+        tracker = runner._IterationTracker()
+        if finished:
+            tracker.start()
+            tracker.finish()
+        tracker.terminate()
+        self.assertFalse(mock_terminate_thread.called)
+        self.assertFalse(tracker.isAlive())
+
+        # the iteration can't be started after the timeout
+        tracker.start()
+        tracker.terminate()
+        self.assertFalse(mock_terminate_thread.called)
+
 
 @ddt.ddt
 class ScenarioRunnerTestCase(test.TestCase):
@@ -166,7 +242,11 @@ class ScenarioRunnerTestCase(test.TestCase):
 
         expected_config_kwargs = {"image": 1, "flavor": 1}
         runner_obj._run_scenario.assert_called_once_with(
-            plugin_cls, method_name, context_obj, expected_config_kwargs)
+            plugin_cls, method_name, rutils.LockedDict(context_obj),
+            expected_config_kwargs)
+        ctx = runner_obj._run_scenario.call_args[0][2]
+        self.assertIsInstance(ctx, rutils.LockedDict)
+        self.assertRaises(RuntimeError, ctx["config"].__setitem__, "a", 1)
 
     @mock.patch(BASE + "rutils.Timer.duration", return_value=10)
     def test_run_classbased(self, mock_timer_duration):
@@ -191,6 +271,17 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner_obj._run_scenario.assert_called_once_with(
             scenario_class, "run", context_obj, {"foo": 11, "bar": "spam"})
 
+    def test_split_config(self):
+        @runner.configure(name="not_splittable_runner")
+        class NotSplittableRunner(runner.ScenarioRunner):
+            def _run_scenario(self, cls, method_name, context, args):
+                pass
+
+        self.addCleanup(NotSplittableRunner.unregister)
+        self.assertRaises(NotImplementedError,
+                          NotSplittableRunner.split_config,
+                          {"type": "not_splittable_runner"}, 2)
+
     def test_abort(self):
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -217,15 +308,19 @@ class ScenarioRunnerTestCase(test.TestCase):
         for process in process_pool:
             self.assertIsInstance(process, multiprocessing.Process)
 
+    @mock.patch(BASE + "ScenarioRunner.send_event")
     @mock.patch(BASE + "ScenarioRunner._send_result")
-    def test__join_processes(self, mock_scenario_runner__send_result):
+    def test__join_processes(self, mock_scenario_runner__send_result,
+                             mock_scenario_runner_send_event):
         process = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
         processes = 10
         process_pool = collections.deque([process] * processes)
-        mock_result_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
-        mock_event_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
+        mock_result_queue = Queue.Queue()
+        mock_result_queue.put("result")
+        mock_result_queue.close = mock.MagicMock()
+        mock_event_queue = Queue.Queue()
+        mock_event_queue.put({"type": "iteration", "value": 1})
+        mock_event_queue.close = mock.MagicMock()
 
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -235,7 +330,46 @@ class ScenarioRunnerTestCase(test.TestCase):
             process_pool, mock_result_queue, mock_event_queue)
 
         self.assertEqual(processes, process.join.call_count)
+        mock_scenario_runner__send_result.assert_called_once_with("result")
+        mock_scenario_runner_send_event.assert_called_once_with(
+            type="iteration", value=1)
         mock_result_queue.close.assert_called_once_with()
+        mock_event_queue.close.assert_called_once_with()
+
+    @mock.patch(BASE + "logging.is_debug", return_value=True)
+    def test__receive(self, mock_is_debug):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        runner_obj.RECEIVE_BATCH_SIZE = 2
+        queue = Queue.Queue()
+        for item in (1, 2, 3, None, 4):
+            queue.put(item)
+        handler = mock.MagicMock()
+
+        runner_obj._receive(queue, handler, "results")
+
+        self.assertEqual([mock.call(1), mock.call(2), mock.call(3)],
+                         handler.call_args_list)
+        # items after the end marker are not taken
+        self.assertEqual(4, queue.get_nowait())
+
+    @mock.patch(BASE + "LOG")
+    def test__receive_handler_failed(self, mock_log):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        queue = Queue.Queue()
+        for item in (1, 2, 3, None):
+            queue.put(item)
+        handler = mock.MagicMock(side_effect=[None, KeyError("foo"), None])
+
+        runner_obj._receive(queue, handler, "results")
+
+        self.assertEqual([mock.call(1), mock.call(2), mock.call(3)],
+                         handler.call_args_list)
+        self.assertEqual(1, mock_log.error.call_count)
+        self.assertTrue(queue.empty())
 
     def _get_runner(self, task="mock_me", config="mock_me", batch_size=0):
         class ScenarioRunner(runner.ScenarioRunner):
@@ -260,56 +394,13 @@ class ScenarioRunnerTestCase(test.TestCase):
                   "atomic_actions": [{"name": "foo", "started_at": 1.0,
                                       "finished_at": 5.2, "children": []}]},
          "expected": True},
+        # atomic actions and output are validated by scenarios
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [], "output": {"additive": ["a1", "a2"],
                                           "complete": ["c1", "c2"]},
-                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
-                                      "finished_at": 5.2, "children": []}]},
-         "validate_output_calls": [("additive", "a1"), ("additive", "a2"),
-                                   ("complete", "c1"), ("complete", "c2")],
-         "expected": True},
-        {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [], "output": {"additive": ["a1", "a2"],
-                                          "complete": ["c1", "c2"]},
-                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
-                                      "finished_at": 5.2, "children": []}]},
-         "validate_output_return_value": "validation error message"},
-        {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [42], "output": {"additive": [], "complete": []},
-                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
-                                      "finished_at": 5.2, "children": []}]}},
-        {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [], "output": {"additive": [], "complete": []},
-                  "atomic_actions": [{"name": "foo", "started_at": 10,
-                                      "finished_at": 52, "children": []}]}},
-        {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [], "output": {"additive": [], "complete": []},
-                  "atomic_actions": [{"name": "non-float", "started_at": 1.0,
-                                      "children": []}]}},
-        {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [], "output": {"additive": [], "complete": []},
-                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
-                                      "finished_at": 4.0,
-                                      "children": [{"name": "foo1",
-                                                    "started_at": 2.0,
-                                                    "finished_at": 3.0,
-                                                    "children": []}]}]},
+                  "atomic_actions": [{"name": "non-float", "started_at": 1,
+                                      "children": []}]},
          "expected": True},
-        {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [], "output": {"additive": [], "complete": []},
-                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
-                                      "finished_at": 4.0,
-                                      "children": [{"name": "foo1",
-                                                    "started_at": 20,
-                                                    "finished_at": 30,
-                                                    "children": []}]}]}},
-        {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [], "output": {"additive": [], "complete": []},
-                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
-                                      "finished_at": 4.0,
-                                      "children": [{"name": "foo1",
-                                                    "started_at": 2.0,
-                                                    "finished_at": 3.0}]}]}},
         {"data": {"duration": 1, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [], "output": {"additive": [], "complete": []},
                   "atomic_actions": []}},
@@ -323,13 +414,10 @@ class ScenarioRunnerTestCase(test.TestCase):
                   "error": "foo", "output": {"additive": [], "complete": []},
                   "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [], "output": {"additive": []},
-                  "atomic_actions": []}},
+                  "error": [], "output": [], "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [], "output": {"complete": []},
-                  "atomic_actions": []}},
-        {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [], "output": {}, "atomic_actions": []}},
+                  "error": [], "output": {"additive": [], "complete": []},
+                  "atomic_actions": {}}},
         {"data": {"timestamp": 1.0, "idle_duration": 1.0, "error": [],
                   "output": {"additive": [], "complete": []},
                   "atomic_actions": []}},
@@ -351,20 +439,11 @@ class ScenarioRunnerTestCase(test.TestCase):
         {"data": "foo"})
     @ddt.unpack
     @mock.patch("rally.task.runner.LOG")
-    @mock.patch(BASE + "charts.validate_output")
-    def test__result_has_valid_schema(self, mock_validate_output, mock_log,
-                                      data, expected=False,
-                                      validate_output_return_value=None,
-                                      validate_output_calls=None):
+    def test__result_has_valid_schema(self, mock_log, data, expected=False):
         runner_ = self._get_runner(task={"uuid": "foo_uuid"})
-        mock_validate_output.return_value = validate_output_return_value
         self.assertEqual(expected,
                          runner_._result_has_valid_schema(data),
                          message=repr(data))
-        if validate_output_calls:
-            mock_validate_output.assert_has_calls(
-                [mock.call(*args) for args in validate_output_calls],
-                any_order=True)
 
     def test__send_result(self):
         runner_ = self._get_runner(task={"uuid": "foo_uuid"})
@@ -14,6 +14,7 @@
 #    under the License.
 
 import mock
+from oslo_config import fixture
 
 from rally import exceptions
 from rally.task import context
@@ -195,3 +196,15 @@ class ScenarioTestCase(test.TestCase):
             self.assertRaises(exceptions.RallyException,
                               scenario_inst.add_output,
                               complete=broken_complete)
+
+    @mock.patch("rally.task.scenario.charts.validate_output")
+    def test_add_output_without_validation(self, mock_validate_output):
+        self.useFixture(fixture.Config()).config(result_validation="off")
+        scenario_inst = scenario.Scenario()
+        additive = {"title": "Foo title"}
+
+        scenario_inst.add_output(additive=additive)
+
+        self.assertFalse(mock_validate_output.called)
+        self.assertEqual({"additive": [additive], "complete": []},
+                         scenario_inst._output)
@@ -15,10 +15,15 @@
 
 import collections
 import datetime as dt
+import itertools
+import threading
+import time
 
 import ddt
+import fixtures
 from jsonschema import exceptions as schema_exceptions
 import mock
+from oslo_config import fixture
 import six
 
 from rally import exceptions
@@ -27,6 +32,7 @@ from tests.unit import fakes
 from tests.unit import test
 
 
+@ddt.ddt
 class BenchmarkUtilsTestCase(test.TestCase):
 
     def test_wait_for_delete(self):
@@ -69,6 +75,18 @@ class BenchmarkUtilsTestCase(test.TestCase):
             if i > 5:
                 break
 
+    @ddt.data({"mode": "full", "expected": [True] * 6},
+              {"mode": "off", "expected": [False] * 6},
+              {"mode": "sampled", "expected": [True, False, False] * 2})
+    @ddt.unpack
+    def test_need_result_validation(self, mode, expected):
+        self.useFixture(fixtures.MockPatch(
+            "rally.task.utils._validation_counter", itertools.count()))
+        self.useFixture(fixture.Config()).config(
+            result_validation=mode, result_validation_sample_rate=3)
+        self.assertEqual(expected,
+                         [utils.need_result_validation() for i in range(6)])
+
     def test_manager_list_sizes(self):
         manager = fakes.FakeManager()
 
@@ -529,6 +547,198 @@ class WaitForStatusTestCase(test.TestCase):
                           update_resource=upd, timeout=2, id_attr="uuid")
 
 
+class CountingManager(fakes.FakeManager):
+
+    def __init__(self):
+        super(CountingManager, self).__init__()
+        self.get_calls = 0
+        self.list_calls = 0
+        self.list_hook = None
+
+    def get(self, resource_uuid):
+        self.get_calls += 1
+        return super(CountingManager, self).get(resource_uuid)
+
+    def list(self, **kwargs):
+        self.list_calls += 1
+        if self.list_hook:
+            self.list_hook()
+        return super(CountingManager, self).list(**kwargs)
+
+
+class StatusPollerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(StatusPollerTestCase, self).setUp()
+        self.poller = utils.StatusPoller(interval=0)
+        self.manager = CountingManager()
+
+    def _make_resource(self, status="ACTIVE"):
+        return self.manager._cache(
+            fakes.FakeResource(manager=self.manager, status=status))
+
+    def test_is_supported(self):
+        resource = self._make_resource()
+        self.assertTrue(utils.StatusPoller.is_supported(
+            resource, utils.get_from_manager()))
+        self.assertFalse(utils.StatusPoller.is_supported(
+            resource, mock.Mock(spec=[])))
+        self.assertFalse(utils.StatusPoller.is_supported(
+            {"status": "ACTIVE"}, utils.get_from_manager()))
+
+    def test_update(self):
+        resource = self._make_resource()
+        self.assertEqual(resource, self.poller.update(
+            resource, utils.get_from_manager()))
+        self.assertEqual(1, self.manager.list_calls)
+        self.assertEqual(0, self.manager.get_calls)
+        self.assertEqual(1, self.poller.api_calls)
+        self.assertEqual(0, self.poller.api_calls_saved)
+
+    def test_update_concurrent(self):
+        resources = [self._make_resource() for i in range(5)]
+        results = {}
+        first_list_called = threading.Event()
+        release_first_list = threading.Event()
+
+        def list_hook():
+            if not first_list_called.is_set():
+                first_list_called.set()
+                release_first_list.wait(5)
+
+        def update(resource):
+            results[resource.id] = self.poller.update(
+                resource, utils.get_from_manager())
+
+        self.manager.list_hook = list_hook
+        threads = [threading.Thread(target=update, args=(r,))
+                   for r in resources]
+        threads[0].start()
+        first_list_called.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        # wait until the rest resources are registered for the next poll
+        for i in range(500):
+            with self.poller._lock:
+                pending = sum(len(waiters) for manager, waiters
+                              in self.poller._pending.values())
+            if pending == 4:
+                break
+            time.sleep(0.01)
+        release_first_list.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(dict((r.id, r) for r in resources), results)
+        self.assertEqual(2, self.manager.list_calls)
+        self.assertEqual(0, self.manager.get_calls)
+        self.assertEqual(2, self.poller.api_calls)
+        self.assertEqual(3, self.poller.api_calls_saved)
+
+    def test_update_error_status(self):
+        resource = self._make_resource(status="ERROR")
+        self.assertRaises(exceptions.GetResourceErrorStatus,
+                          self.poller.update, resource,
+                          utils.get_from_manager())
+
+    def test_update_deleted(self):
+        resource = self._make_resource(status="DELETED")
+        self.assertRaises(exceptions.GetResourceNotFound,
+                          self.poller.update, resource,
+                          utils.get_from_manager())
+
+    def test_update_not_listed(self):
+        resource = self._make_resource()
+        self.manager.resources_order.remove(resource.uuid)
+        self.assertEqual(resource, self.poller.update(
+            resource, utils.get_from_manager()))
+        self.assertEqual(1, self.manager.list_calls)
+        self.assertEqual(1, self.manager.get_calls)
+        self.assertEqual(1, self.poller.api_calls)
+        self.assertEqual(0, self.poller.api_calls_saved)
+
+    def test_update_groups_by_credential(self):
+        # the poll is not started, so updates fall back after the timeout
+        self.poller._run = mock.Mock()
+        managers = [CountingManager() for i in range(3)]
+        for manager, cache_id in zip(managers, ("u1", "u1", "u2")):
+            manager.api = mock.Mock()
+            manager.api.client.auth.get_cache_id.return_value = cache_id
+            resource = manager._cache(fakes.FakeResource(manager=manager))
+            self.assertEqual(resource, self.poller.update(
+                resource, utils.get_from_manager(), timeout=0))
+            self.assertEqual(1, manager.get_calls)
+
+        groups = list(self.poller._pending.values())
+        self.assertEqual([managers[0], managers[2]],
+                         [manager for manager, waiters in groups])
+        self.assertEqual([2, 1], [len(waiters) for manager, waiters in groups])
+
+    def test_update_list_failure(self):
+        resource = self._make_resource()
+        self.manager.list_hook = mock.Mock(side_effect=Exception)
+        self.assertEqual(resource, self.poller.update(
+            resource, utils.get_from_manager()))
+        self.assertEqual(1, self.manager.get_calls)
+        self.assertEqual(0, self.poller.api_calls)
+
+    @mock.patch("rally.task.utils.LOG")
+    def test__run_idle(self, mock_log):
+        self.poller.api_calls = 2
+        self.poller.api_calls_saved = 5
+        self.poller._thread = mock.Mock()
+
+        self.poller._run()
+
+        self.assertIsNone(self.poller._thread)
+        mock_log.debug.assert_called_once_with(
+            "Status poller is idle, 2 list calls made so far replaced 5 get "
+            "calls.")
+
+    @mock.patch("rally.task.utils.time.sleep")
+    def test_wait_for_status(self, mock_sleep):
+        self.useFixture(fixture.Config()).config(
+            batched_status_polling=True, batched_status_poll_interval=0)
+        resource = self._make_resource(status="BUILD")
+        self.manager.list_hook = lambda: setattr(resource, "status", "ACTIVE")
+
+        with mock.patch("rally.task.utils._status_poller", self.poller):
+            with mock.patch("rally.task.utils._status_poller_pid",
+                            utils.os.getpid()):
+                self.assertEqual(resource, utils.wait_for_status(
+                    resource, ready_statuses=["ACTIVE"],
+                    update_resource=utils.get_from_manager(),
+                    check_interval=3))
+        self.assertEqual(1, self.manager.list_calls)
+        self.assertEqual(0, self.manager.get_calls)
+        # polls are paced by the poller, so the check interval is not slept
+        self.assertNotIn(mock.call(3), mock_sleep.call_args_list)
+
+    @mock.patch("rally.task.utils.StatusPoller.update")
+    def test_wait_for_status_deletion(self, mock_status_poller_update):
+        self.useFixture(fixture.Config()).config(
+            batched_status_polling=True)
+        resource = self._make_resource()
+        # it has check_resource attribute, so updates could be batched
+        update_resource = mock.Mock(side_effect=exceptions.GetResourceNotFound(
+            resource=resource))
+
+        self.assertIsNone(utils.wait_for_status(
+            resource, ready_statuses=["DELETED"], check_deletion=True,
+            update_resource=update_resource))
+        update_resource.assert_called_once_with(resource)
+        self.assertFalse(mock_status_poller_update.called)
+
+    @mock.patch("rally.task.utils.os.getpid")
+    def test_get_status_poller(self, mock_getpid):
+        mock_getpid.return_value = 1
+        poller = utils.get_status_poller()
+        self.assertIsInstance(poller, utils.StatusPoller)
+        self.assertIs(poller, utils.get_status_poller())
+        mock_getpid.return_value = 2
+        self.assertIsNot(poller, utils.get_status_poller())
+
+
 @ddt.ddt
 class WrapperForAtomicActionsTestCase(test.TestCase):
 
@@ -22,6 +22,7 @@ from oslo_config import fixture
 from oslotest import base
 
 from rally.common import db
+from rally import osclients
 from rally import plugins
 from rally.task import utils as tutils
 from tests.unit import fakes
@@ -44,6 +45,7 @@ class TestCase(base.BaseTestCase):
     def setUp(self):
         super(TestCase, self).setUp()
         self.addCleanup(mock.patch.stopall)
+        self.addCleanup(osclients.SHARED_CACHE.clear)
         plugins.load()
 
     def _test_atomic_action_timer(self, atomic_actions, name):
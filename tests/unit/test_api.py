@@ -16,6 +16,7 @@
 """Test for api."""
 
 import copy
+import datetime as dt
 import os
 
 import ddt
@@ -424,7 +425,9 @@ class TaskAPITestCase(test.TestCase):
         mock_task.get_detailed.return_value = "detailed_task_data"
         self.assertEqual("detailed_task_data",
                          self.task_inst.get_detailed(task_id="task_uuid"))
-        mock_task.get_detailed.assert_called_once_with("task_uuid")
+        mock_task.get_detailed.assert_called_once_with("task_uuid",
+                                                       include_data=True,
+                                                       lazy=False)
 
     @mock.patch("rally.api.objects.Task")
     def test_list(self, mock_task):
@@ -433,6 +436,20 @@ class TaskAPITestCase(test.TestCase):
         mock_task.list.return_value = [task]
         tasks = self.task_inst.list()
         self.assertEqual([self.task], tasks)
+        mock_task.list.assert_called_once_with(
+            status=None, deployment=None, limit=None, offset=None,
+            since=None)
+        task.to_dict.assert_called_once_with(include_results=False)
+
+    @mock.patch("rally.api.objects.Task")
+    def test_list_paginated(self, mock_task):
+        mock_task.list.return_value = []
+        self.assertEqual([], self.task_inst.list(
+            status="finished", deployment="foo", limit=10, offset=20,
+            since="2017-01-31T18:00:00+01:00"))
+        mock_task.list.assert_called_once_with(
+            status="finished", deployment="foo", limit=10, offset=20,
+            since=dt.datetime(2017, 1, 31, 17, 0, 0))
 
     @mock.patch("rally.api.objects.Task")
     def test_get_detailed_with_extended_results(self, mock_task):
@@ -443,7 +460,9 @@ class TaskAPITestCase(test.TestCase):
         self.assertEqual({"uuid": "foo_uuid", "results": "extended_results"},
                          self.task_inst.get_detailed(task_id="foo_uuid",
                                                      extended_results=True))
-        mock_task.get_detailed.assert_called_once_with("foo_uuid")
+        mock_task.get_detailed.assert_called_once_with("foo_uuid",
+                                                       include_data=True,
+                                                       lazy=False)
         mock_task.extend_results.assert_called_once_with("raw_results")
 
     @mock.patch("rally.api.objects.Task")
@@ -936,9 +955,28 @@ class APITestCase(test.TestCase):
         mock_conf.assert_called_once_with(
             [], default_config_files=None, project="rally", version="0.0.0")
 
+    @mock.patch("rally.common.plugin.discover.load_plugins")
+    @mock.patch("rally.api.API.check_db_revision")
+    def test_init_rally_endpoint(self, mock_api_check_db_revision,
+                                 mock_load_plugins):
+        api_inst = api.API(rally_endpoint="http://example.com:8000/",
+                           plugin_paths=["/my/path"])
+        self.assertEqual("http://example.com:8000", api_inst.endpoint_url)
+        self.assertFalse(mock_api_check_db_revision.called)
+        self.assertFalse(mock_load_plugins.called)
+
+    @mock.patch("requests.request")
     @mock.patch("rally.api.API.check_db_revision")
-    def test_init_rally_endpoint(self, mock_api_check_db_revision):
-        self.assertRaises(NotImplementedError, api.API, rally_endpoint="foo")
+    def test_call_rally_endpoint(self, mock_api_check_db_revision,
+                                 mock_request):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"result": ["task"]}
+        api_inst = api.API(rally_endpoint="http://example.com:8000")
+
+        self.assertEqual(["task"], api_inst.task.list(status="finished"))
+        mock_request.assert_called_once_with(
+            "GET", "http://example.com:8000/api/task/list",
+            json={"status": "finished"}, headers=mock.ANY)
 
     def test_version(self):
         api_inst = api.API(skip_db_check=True)
@@ -953,6 +991,25 @@ class APITestCase(test.TestCase):
         response.status_code = 200
         response.json.return_value = {"result": "test"}
         self.assertEqual("test", api_inst._request(path=path, method=method))
+        self.assertNotIn("X-Rally-Service-Secret",
+                         mock_request.call_args[1]["headers"])
+
+    @mock.patch("rally.aas.service_utils.CONF")
+    @mock.patch("requests.request")
+    def test__request_with_secret(self, mock_request,
+                                  mock_service_utils_conf):
+        api_inst = api.API(skip_db_check=True)
+        mock_service_utils_conf.service.secret = "foo"
+        response = mock_request.return_value
+        response.status_code = 200
+        response.json.return_value = {"result": "test"}
+
+        self.assertEqual("test", api_inst._request(path="path",
+                                                   method="GET", a=1))
+        mock_request.assert_called_once_with(
+            "GET", "path", json={"a": 1}, headers=mock.ANY)
+        self.assertEqual("foo", mock_request.call_args[1]["headers"][
+            "X-Rally-Service-Secret"])
 
     @mock.patch("requests.request")
     @mock.patch("rally.exceptions.find_exception")
@@ -1634,6 +1691,8 @@ class VerificationAPITestCase(test.TestCase):
         mock_verification_list.assert_called_once_with(
             verifier_id, deployment_id=deployment_id, tags=tags,
             status=status)
+        mock_verification_list.return_value[0].to_dict.assert_called_with(
+            include_tests=False)
 
     @mock.patch("rally.api.vreporter.VerificationReporter")
     @mock.patch("rally.api.objects.Verification.get")
@@ -1889,7 +1948,7 @@ class VerificationAPITestCase(test.TestCase):
         self.verification_inst.rerun(verification_uuid="uuid",
                                      concurrency=1)
         mock_start.assert_called_once_with(
-            "v_uuid", "d_uuid", load_list=tests.keys(),
+            "v_uuid", "d_uuid", load_list=list(tests),
             tags=None, concurrency=1)
 
     @mock.patch("rally.api._Verification.start")
@@ -1899,31 +1958,29 @@ class VerificationAPITestCase(test.TestCase):
                                 mock_verification_get,
                                 mock_verification_create,
                                 mock_start):
-        tests = {"test_1": {"status": "success"},
-                 "test_2": {"status": "fail"},
-                 "test_3": {"status": "fail"}}
+        failed_tests = {"test_2": {"status": "fail"},
+                        "test_3": {"status": "fail"}}
         mock_verification_get.return_value = mock.Mock(
-            uuid="uuid", verifier_uuid="v_uuid", deployment_uuid="d_uuid",
-            tests=tests)
+            uuid="uuid", verifier_uuid="v_uuid", deployment_uuid="d_uuid")
+        verification = mock_verification_get.return_value
+        verification.get_tests.return_value = failed_tests
         self.verification_inst.return_value = mock.Mock()
         self.verification_inst.api.deployment.get.return_value = {
             "name": "deployment_name",
             "uuid": "deployment_uuid",
         }
-        expected_tests = [t for t, r in tests.items() if r["status"] == "fail"]
         self.verification_inst.rerun(verification_uuid="uuid", failed=True)
+        verification.get_tests.assert_called_once_with(status="fail")
         mock_start.assert_called_once_with(
-            "v_uuid", "deployment_uuid", load_list=expected_tests, tags=None)
+            "v_uuid", "deployment_uuid", load_list=list(failed_tests),
+            tags=None)
 
     @mock.patch("rally.api._Verification._get")
     def test_rerun_failed_tests_raise_exc(
             self, mock___verification__get):
-        tests = {"test_1": {"status": "success"},
-                 "test_2": {"status": "success"},
-                 "test_3": {"status": "skip"}}
         mock___verification__get.return_value = mock.Mock(
-            uuid="uuid", verifier_uuid="v_uuid", deployment_uuid="d_uuid",
-            tests=tests)
+            uuid="uuid", verifier_uuid="v_uuid", deployment_uuid="d_uuid")
+        mock___verification__get.return_value.get_tests.return_value = {}
 
         e = self.assertRaises(exceptions.RallyException,
                               self.verification_inst.rerun,
@@ -41,6 +41,34 @@ class ExceptionTestCase(test.TestCase):
         exc_instance = exceptions.find_exception(mock_response)
         self.assertEqual(exc_instance, exc_class.return_value)
 
+    def test_find_exception_from_service(self):
+        mock_response = mock.Mock(status_code=404)
+        mock_response.json.return_value = {
+            "error": {"args": None, "msg": "Task with uuid=foo not found.",
+                      "type": "TaskNotFound", "kwargs": {"uuid": "foo"}}}
+
+        exc_instance = exceptions.find_exception(mock_response)
+        self.assertIsInstance(exc_instance, exceptions.TaskNotFound)
+        self.assertEqual("Task with uuid=foo not found.", str(exc_instance))
+
+        mock_response.json.return_value = {
+            "error": {"args": None, "msg": "Some error",
+                      "type": "RallyException",
+                      "kwargs": {"message": "Some error"}}}
+        mock_response.status_code = 500
+        exc_instance = exceptions.find_exception(mock_response)
+        self.assertEqual(exceptions.RallyException, type(exc_instance))
+        self.assertEqual("Some error", str(exc_instance))
+
+        # arguments do not match the exception
+        mock_response.json.return_value = {
+            "error": {"args": None, "msg": "Task not found.",
+                      "type": "TaskNotFound", "kwargs": {}}}
+        mock_response.status_code = 404
+        exc_instance = exceptions.find_exception(mock_response)
+        self.assertEqual(exceptions.RallyException, type(exc_instance))
+        self.assertEqual("Task not found.", str(exc_instance))
+
     def test_make_exception(self):
         exc = exceptions.RallyException("exc")
         self.assertEqual(exc, exceptions.make_exception(exc))
@@ -279,6 +279,90 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
         mock_keystone_get_session.assert_called_once_with()
 
 
+class SharedCacheTestCase(test.TestCase, OSClientTestCaseUtils):
+
+    def setUp(self):
+        super(SharedCacheTestCase, self).setUp()
+        self.credential = oscredential.OpenStackCredential(
+            "http://auth_url/v2.0", "user", "pass", "tenant")
+        self.cache = osclients.SharedCache(max_size=2)
+
+    def test_get(self):
+        entry = self.cache.get(self.credential, {})
+        self.assertEqual({}, entry)
+        self.assertIs(entry, self.cache.get(self.credential))
+
+        other_credential = oscredential.OpenStackCredential(
+            "http://auth_url/v2.0", "user", "pass", "tenant")
+        self.assertIs(entry, self.cache.get(other_credential))
+
+        self.assertIsNot(entry, self.cache.get(
+            self.credential, {"nova": {"version": "2"}}))
+        self.assertEqual(2, self.cache.hits)
+        self.assertEqual(2, self.cache.misses)
+
+    def test_get_expired(self):
+        entry = self.cache.get(self.credential)
+        entry["keystone_auth_ref"] = mock.Mock(
+            **{"will_expire_soon.return_value": False})
+        self.assertIs(entry, self.cache.get(self.credential))
+
+        entry["keystone_auth_ref"].will_expire_soon.return_value = True
+        new_entry = self.cache.get(self.credential)
+        self.assertEqual({}, new_entry)
+        self.assertIsNot(entry, new_entry)
+        self.assertEqual(1, self.cache.expired)
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(2, self.cache.misses)
+
+    @mock.patch("rally.osclients.os.getpid")
+    def test_get_in_other_process(self, mock_getpid):
+        mock_getpid.return_value = 1
+        entry = self.cache.get(self.credential)
+        mock_getpid.return_value = 2
+        self.assertIsNot(entry, self.cache.get(self.credential))
+
+    def test_get_max_size(self):
+        entry = self.cache.get(self.credential, {"foo": {}})
+        self.cache.get(self.credential, {"bar": {}})
+        self.cache.get(self.credential, {"foo": {}})
+        self.cache.get(self.credential, {"baz": {}})
+
+        self.assertIs(entry, self.cache.get(self.credential, {"foo": {}}))
+        self.assertEqual(2, self.cache.hits)
+        self.cache.get(self.credential, {"bar": {}})
+        self.assertEqual(4, self.cache.misses)
+
+    def test_clear(self):
+        entry = self.cache.get(self.credential)
+        self.cache.clear()
+        self.assertIsNot(entry, self.cache.get(self.credential))
+
+    def test_clients_with_shared_cache(self):
+        self.set_up_keystone_mocks()
+        self.ksa_identity_plugin.get_access.return_value = mock.Mock(
+            **{"will_expire_soon.return_value": False})
+
+        api_info = {"keystone": {"version": "2"}}
+        # every iteration creates its own clients
+        for i in range(3):
+            clients = osclients.Clients(
+                self.credential, api_info,
+                cache=self.cache.get(self.credential, api_info))
+            self.assertEqual(self.ksc_client.Client.return_value,
+                             clients.keystone())
+            clients.keystone.auth_ref
+
+        # sessions for the client and for auth_ref are created only once
+        self.assertEqual(2, self.ksa_password.call_count)
+        self.assertEqual(2, self.ksa_session.Session.call_count)
+        self.assertEqual(1, self.ksc_client.Client.call_count)
+        self.ksa_identity_plugin.get_access.assert_called_once_with(
+            self.ksa_session.Session.return_value)
+        self.assertEqual(2, self.cache.hits)
+        self.assertEqual(1, self.cache.misses)
+
+
 @ddt.ddt
 class OSClientsTestCase(test.TestCase):
 